@@ -1,4 +1,5 @@
 from datetime import datetime, timezone, timedelta
+from typing import Dict, Optional
 
 from oss.src.utils.logging import get_module_logger
 
@@ -10,6 +11,12 @@ from ee.src.dbs.postgres.tracing.dao import TracingRetentionDAO
 log = get_module_logger(__name__)
 
 
+# A partition with some projects still retained is rewritten with only their
+# spans when they are at most this share of it; otherwise the row deletes
+# below take the expired ones out.
+COMPACT_MAX_KEPT_RATIO = 0.5
+
+
 class TracingRetentionService:
     def __init__(
         self,
@@ -32,6 +39,19 @@ class TracingRetentionService:
         total_traces = 0
         total_spans = 0
 
+        try:
+            dropped, compacted = await self._flush_partitions()
+
+            log.info(
+                f"[flush] [partitions] ✅ Completed: {dropped} dropped, {compacted} compacted"
+            )
+
+        except Exception:
+            log.error(
+                "[flush] [partitions] ❌ Failed",
+                exc_info=True,
+            )
+
         for plan, entitlements in get_plans().items():
             total_plans += 1
 
@@ -85,6 +105,88 @@ class TracingRetentionService:
         log.info(f"[flush] Total spans  deleted: {total_spans}")
         log.info("[flush] ============================================")
 
+    async def _flush_partitions(
+        self,
+        *,
+        now: Optional[datetime] = None,
+    ) -> tuple[int, int]:
+        """Drop or compact the daily spans partitions past every plan's retention.
+
+        Partitions are shared by all plans, so each one old enough for the
+        shortest retention is checked project by project: dropped when none of
+        its projects keeps it, compacted when the ones that do hold a small
+        share of it (never the legacy one), and left to the row deletes
+        otherwise.
+        """
+        now = now or datetime.now(timezone.utc)
+
+        retentions: Dict[str, Optional[int]] = {}
+        for plan, entitlements in get_plans().items():
+            traces_quota = (
+                (entitlements.get(Tracker.COUNTERS) or {}).get(Counter.TRACES_INGESTED)
+                if entitlements
+                else None
+            )
+            retentions[plan] = traces_quota.retention if traces_quota else None
+
+        finite = [minutes for minutes in retentions.values() if minutes is not None]
+        if not finite:
+            return 0, 0
+
+        horizon = now - timedelta(minutes=min(finite))
+
+        dropped = 0
+        compacted = 0
+
+        for partition in await self.tracing_dao.fetch_partitions():
+            # The default partition is unbounded; recent ones are kept by all.
+            if partition.upper is None or partition.upper > horizon:
+                continue
+
+            project_ids = await self.tracing_dao.fetch_partition_projects(
+                partition=partition.name,
+            )
+            plans = await self.tracing_dao.fetch_project_plans(
+                project_ids=project_ids,
+            )
+
+            kept_project_ids = []
+            for project_id in project_ids:
+                # No plan, an unknown plan or an unlimited one: keep.
+                retention = retentions.get(plans.get(project_id))
+                if retention is None or partition.upper > now - timedelta(
+                    minutes=retention
+                ):
+                    kept_project_ids.append(project_id)
+
+            if not kept_project_ids:
+                await self.tracing_dao.drop_partition(partition=partition.name)
+                dropped += 1
+                continue
+
+            # The legacy partition (open below) holds every span from before
+            # partitioning: too large to rewrite under lock, it is left to the
+            # row deletes.
+            if len(kept_project_ids) == len(project_ids) or partition.lower is None:
+                continue
+
+            total = await self.tracing_dao.count_partition_spans(
+                partition=partition.name,
+            )
+            kept = await self.tracing_dao.count_partition_spans(
+                partition=partition.name,
+                project_ids=kept_project_ids,
+            )
+
+            if kept <= total * COMPACT_MAX_KEPT_RATIO:
+                await self.tracing_dao.compact_partition(
+                    partition=partition.name,
+                    project_ids=kept_project_ids,
+                )
+                compacted += 1
+
+        return dropped, compacted
+
     async def _flush_spans_for_plan(
         self,
         *,
@@ -120,6 +222,21 @@ class TracingRetentionService:
             total_traces += traces
             total_spans += spans
 
+            await self.tracing_dao.delete_rollups_before_cutoff(
+                cutoff=cutoff,
+                project_ids=project_ids,
+            )
+
+            await self.tracing_dao.delete_trace_summaries_before_cutoff(
+                cutoff=cutoff,
+                project_ids=project_ids,
+            )
+
+            await self.tracing_dao.delete_directories_before_cutoff(
+                cutoff=cutoff,
+                project_ids=project_ids,
+            )
+
             # if traces > 0:
             #     log.debug(
             #         f"[flush] [{plan.value}] Chunk #{batch_idx}: {traces} traces, {spans} spans"
@@ -1,8 +1,17 @@
-from typing import Optional, List, Tuple
+from typing import Dict, Optional, List, Tuple
 from uuid import UUID
 from datetime import datetime
 
-from sqlalchemy import delete, func, literal, select, text, tuple_, bindparam
+from sqlalchemy import (
+    delete,
+    func,
+    literal,
+    literal_column,
+    select,
+    text,
+    tuple_,
+    bindparam,
+)
 from sqlalchemy.sql import any_
 from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
 
@@ -16,7 +25,14 @@ from oss.src.dbs.postgres.shared.engine import (
     get_transactions_engine,
     get_analytics_engine,
 )
-from oss.src.dbs.postgres.tracing.dbes import SpanDBE
+from oss.src.dbs.postgres.tracing.dbes import (
+    SessionDirectoryDBE,
+    SpanDBE,
+    SpanRollupDBE,
+    TraceDBE,
+    UserDirectoryDBE,
+)
+from oss.src.dbs.postgres.tracing.partitions import SpanPartition, SpansPartitionsDAO
 
 from ee.src.dbs.postgres.subscriptions.dbes import SubscriptionDBE
 
@@ -53,6 +69,7 @@ TRACING_DELETE_SQL = text(
           WHERE sp.parent_id IS NULL
             AND sp.project_id = ANY(:project_ids)
             AND sp.created_at < :cutoff
+            AND sp.start_time < :cutoff
           ORDER BY sp.created_at
           LIMIT :max_traces
         ),
@@ -86,6 +103,7 @@ class TracingRetentionDAO:
             analytics_engine = get_analytics_engine()
         self.transactions_engine = transactions_engine
         self.analytics_engine = analytics_engine
+        self.partitions_dao = SpansPartitionsDAO(engine=analytics_engine)
 
     # ---------------- #
     # Raw-SQL versions
@@ -200,6 +218,9 @@ class TracingRetentionDAO:
                     SpanDBE.parent_id.is_(None),
                     SpanDBE.project_id == any_(project_ids_param),
                     SpanDBE.created_at < bindparam("cutoff", value=cutoff),
+                    # Spans start before they are stored: same rows, but it
+                    # prunes the partitions newer than the cutoff.
+                    SpanDBE.start_time < bindparam("cutoff", value=cutoff),
                 )
                 .order_by(SpanDBE.created_at)
                 .limit(bindparam("max_traces", value=max_traces))
@@ -241,3 +262,150 @@ class TracingRetentionDAO:
             spans_deleted = int(row[1]) if row and row[1] is not None else 0
 
             return (traces_selected, spans_deleted)
+
+    async def delete_rollups_before_cutoff(
+        self,
+        *,
+        cutoff: datetime,
+        project_ids: List[UUID],
+    ) -> int:
+        if not project_ids:
+            return 0
+
+        async with self.analytics_engine.session() as session:
+            # Only buckets that end by the cutoff: the spans of the one
+            # straddling it are not all expired yet.
+            stmt = delete(SpanRollupDBE).where(
+                SpanRollupDBE.project_id.in_(project_ids),
+                SpanRollupDBE.bucket < cutoff,
+                SpanRollupDBE.bucket
+                + SpanRollupDBE.granularity * literal_column("interval '1 minute'")
+                <= cutoff,
+            )
+
+            result = await session.execute(stmt)
+
+            await session.commit()
+
+            return result.rowcount or 0
+
+    async def delete_trace_summaries_before_cutoff(
+        self,
+        *,
+        cutoff: datetime,
+        project_ids: List[UUID],
+    ) -> int:
+        if not project_ids:
+            return 0
+
+        async with self.analytics_engine.session() as session:
+            # Like the spans: traces that started before the cutoff, whether
+            # deleted row by row or dropped with their partitions.
+            stmt = delete(TraceDBE).where(
+                TraceDBE.project_id.in_(project_ids),
+                TraceDBE.start_time < cutoff,
+            )
+
+            result = await session.execute(stmt)
+
+            await session.commit()
+
+            return result.rowcount or 0
+
+    async def delete_directories_before_cutoff(
+        self,
+        *,
+        cutoff: datetime,
+        project_ids: List[UUID],
+    ) -> int:
+        if not project_ids:
+            return 0
+
+        deleted = 0
+
+        async with self.analytics_engine.session() as session:
+            # Sessions and users with no activity left: the spans of their
+            # last root started before the cutoff.
+            for directory in (SessionDirectoryDBE, UserDirectoryDBE):
+                stmt = delete(directory).where(
+                    directory.project_id.in_(project_ids),
+                    directory.last_active < cutoff,
+                )
+
+                result = await session.execute(stmt)
+
+                deleted += result.rowcount or 0
+
+            await session.commit()
+
+            return deleted
+
+    async def fetch_project_plans(
+        self,
+        *,
+        project_ids: List[UUID],
+    ) -> Dict[UUID, str]:
+        if not project_ids:
+            return {}
+
+        async with self.transactions_engine.session() as session:
+            stmt = (
+                select(ProjectDB.id, SubscriptionDBE.plan)
+                .select_from(
+                    ProjectDB.__table__.join(
+                        SubscriptionDBE.__table__,
+                        SubscriptionDBE.organization_id == ProjectDB.organization_id,
+                    )
+                )
+                .where(ProjectDB.id.in_(project_ids))
+            )
+
+            result = await session.execute(stmt)
+            rows = result.fetchall()
+
+            return {row[0]: row[1] for row in rows}
+
+    # ---------- #
+    # Partitions
+    # ---------- #
+
+    async def fetch_partitions(self) -> List[SpanPartition]:
+        return await self.partitions_dao.fetch_partitions()
+
+    async def fetch_partition_projects(
+        self,
+        *,
+        partition: str,
+    ) -> List[UUID]:
+        return await self.partitions_dao.fetch_partition_projects(
+            partition=partition,
+        )
+
+    async def count_partition_spans(
+        self,
+        *,
+        partition: str,
+        project_ids: Optional[List[UUID]] = None,
+    ) -> int:
+        return await self.partitions_dao.count_partition_spans(
+            partition=partition,
+            project_ids=project_ids,
+        )
+
+    async def drop_partition(
+        self,
+        *,
+        partition: str,
+    ) -> None:
+        await self.partitions_dao.drop_partition(partition=partition)
+
+    async def compact_partition(
+        self,
+        *,
+        partition: str,
+        project_ids: List[UUID],
+    ) -> int:
+        return await self.partitions_dao.compact_partition(
+            partition=partition,
+            project_ids=project_ids,
+        )
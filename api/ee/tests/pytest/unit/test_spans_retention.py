@@ -0,0 +1,228 @@
+"""Unit tests for the partition step of the spans retention service.
+
+Every daily partition past the shortest plan retention is checked project by
+project: dropped when no project keeps it, compacted when the kept projects
+hold a small share of it, and otherwise left to the row deletes, which also
+expire the analytics rollups, trace summaries and session and user directories
+of the same projects. The DAO is mocked; the partition DDL is exercised against
+Postgres by the benchmark.
+"""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, call
+from uuid import uuid4
+
+import pytest
+
+from ee.src.core.access.entitlements.types import (
+    Counter,
+    Period,
+    Quota,
+    Retention,
+    Tracker,
+)
+from ee.src.core.tracing.service import TracingRetentionService
+from oss.src.dbs.postgres.tracing.partitions import SpanPartition
+
+NOW = datetime(2025, 6, 30, 12, 0, tzinfo=timezone.utc)
+
+
+def _plan_with_retention(retention: Retention | None) -> dict:
+    return {
+        Tracker.COUNTERS: {
+            Counter.TRACES_INGESTED: Quota(period=Period.MONTHLY, retention=retention),
+        }
+    }
+
+
+def _partition(days_ago: int) -> SpanPartition:
+    upper = datetime(2025, 6, 30, tzinfo=timezone.utc) - timedelta(days=days_ago)
+    return SpanPartition(f"spans_{upper:%Y%m%d}", upper - timedelta(days=1), upper)
+
+
+def _dao(*, partitions, projects, plans, total=100, kept=10):
+    return SimpleNamespace(
+        fetch_partitions=AsyncMock(return_value=partitions),
+        fetch_partition_projects=AsyncMock(return_value=projects),
+        fetch_project_plans=AsyncMock(return_value=plans),
+        count_partition_spans=AsyncMock(
+            side_effect=lambda *, partition, project_ids=None: (
+                total if project_ids is None else kept
+            )
+        ),
+        drop_partition=AsyncMock(),
+        compact_partition=AsyncMock(return_value=kept),
+    )
+
+
+@pytest.fixture
+def plans(monkeypatch):
+    plans = {
+        "hobby": _plan_with_retention(Retention.WEEKLY),
+        "pro": _plan_with_retention(Retention.MONTHLY),
+        "enterprise": _plan_with_retention(None),
+    }
+    monkeypatch.setattr("ee.src.core.tracing.service.get_plans", lambda: plans)
+    return plans
+
+
+@pytest.mark.asyncio
+async def test_partitions_newer_than_the_shortest_retention_are_not_read(plans):
+    dao = _dao(
+        partitions=[
+            _partition(days_ago=3),
+            SpanPartition("spans_default", None, None),
+        ],
+        projects=[],
+        plans={},
+    )
+    service = TracingRetentionService(tracing_retention_dao=dao)
+
+    assert await service._flush_partitions(now=NOW) == (0, 0)
+
+    dao.fetch_partition_projects.assert_not_called()
+    dao.drop_partition.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_partition_expired_for_all_its_projects_is_dropped(plans):
+    hobby_a, hobby_b = uuid4(), uuid4()
+    dao = _dao(
+        partitions=[_partition(days_ago=10)],
+        projects=[hobby_a, hobby_b],
+        plans={hobby_a: "hobby", hobby_b: "hobby"},
+    )
+    service = TracingRetentionService(tracing_retention_dao=dao)
+
+    assert await service._flush_partitions(now=NOW) == (1, 0)
+
+    dao.drop_partition.assert_awaited_once_with(partition="spans_20250620")
+    dao.compact_partition.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_partition_mostly_expired_is_compacted_to_the_kept_projects(plans):
+    hobby, pro, enterprise, unknown = uuid4(), uuid4(), uuid4(), uuid4()
+    dao = _dao(
+        partitions=[_partition(days_ago=10)],
+        projects=[hobby, pro, enterprise, unknown],
+        plans={hobby: "hobby", pro: "pro", enterprise: "enterprise"},
+        total=100,
+        kept=30,
+    )
+    service = TracingRetentionService(tracing_retention_dao=dao)
+
+    assert await service._flush_partitions(now=NOW) == (0, 1)
+
+    # Longer, unlimited and missing plans all keep their spans.
+    dao.compact_partition.assert_awaited_once_with(
+        partition="spans_20250620",
+        project_ids=[pro, enterprise, unknown],
+    )
+    dao.drop_partition.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_legacy_partition_is_dropped_but_never_compacted(plans):
+    hobby, pro = uuid4(), uuid4()
+    legacy = SpanPartition("spans_legacy", None, NOW - timedelta(days=10))
+    dao = _dao(
+        partitions=[legacy],
+        projects=[hobby, pro],
+        plans={hobby: "hobby", pro: "pro"},
+        total=100,
+        kept=10,
+    )
+    service = TracingRetentionService(tracing_retention_dao=dao)
+
+    assert await service._flush_partitions(now=NOW) == (0, 0)
+
+    dao.compact_partition.assert_not_called()
+    dao.drop_partition.assert_not_called()
+
+    dao.fetch_partition_projects.return_value = [hobby]
+
+    assert await service._flush_partitions(now=NOW) == (1, 0)
+
+    dao.drop_partition.assert_awaited_once_with(partition="spans_legacy")
+
+
+@pytest.mark.asyncio
+async def test_partition_mostly_kept_is_left_to_the_row_deletes(plans):
+    hobby, pro = uuid4(), uuid4()
+    dao = _dao(
+        partitions=[_partition(days_ago=10)],
+        projects=[hobby, pro],
+        plans={hobby: "hobby", pro: "pro"},
+        total=100,
+        kept=90,
+    )
+    service = TracingRetentionService(tracing_retention_dao=dao)
+
+    assert await service._flush_partitions(now=NOW) == (0, 0)
+
+    dao.compact_partition.assert_not_called()
+    dao.drop_partition.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_partition_without_expired_projects_is_not_counted(plans):
+    pro = uuid4()
+    dao = _dao(
+        partitions=[_partition(days_ago=10)],
+        projects=[pro],
+        plans={pro: "pro"},
+    )
+    service = TracingRetentionService(tracing_retention_dao=dao)
+
+    assert await service._flush_partitions(now=NOW) == (0, 0)
+
+    dao.count_partition_spans.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_no_finite_retention_reads_no_partitions(monkeypatch):
+    monkeypatch.setattr(
+        "ee.src.core.tracing.service.get_plans",
+        lambda: {"enterprise": _plan_with_retention(None), "empty": {}},
+    )
+    dao = _dao(partitions=[_partition(days_ago=400)], projects=[], plans={})
+    service = TracingRetentionService(tracing_retention_dao=dao)
+
+    assert await service._flush_partitions(now=NOW) == (0, 0)
+
+    dao.fetch_partitions.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_rollups_summaries_and_directories_expire_with_the_spans_of_each_project_page():
+    first, second = [uuid4()], [uuid4()]
+    dao = SimpleNamespace(
+        fetch_projects_with_plan=AsyncMock(side_effect=[first, second, []]),
+        delete_traces_before_cutoff=AsyncMock(return_value=(1, 2)),
+        delete_rollups_before_cutoff=AsyncMock(return_value=3),
+        delete_trace_summaries_before_cutoff=AsyncMock(return_value=1),
+        delete_directories_before_cutoff=AsyncMock(return_value=1),
+    )
+    service = TracingRetentionService(tracing_retention_dao=dao)
+
+    assert await service._flush_spans_for_plan(
+        plan="hobby",
+        cutoff=NOW,
+        max_projects_per_batch=1,
+        max_traces_per_batch=10,
+    ) == (2, 4)
+
+    assert dao.delete_rollups_before_cutoff.await_args_list == [
+        call(cutoff=NOW, project_ids=first),
+        call(cutoff=NOW, project_ids=second),
+    ]
+    assert dao.delete_trace_summaries_before_cutoff.await_args_list == [
+        call(cutoff=NOW, project_ids=first),
+        call(cutoff=NOW, project_ids=second),
+    ]
+    assert dao.delete_directories_before_cutoff.await_args_list == [
+        call(cutoff=NOW, project_ids=first),
+        call(cutoff=NOW, project_ids=second),
+    ]
@@ -312,6 +312,8 @@ async def lifespan(*args, **kwargs):
 
     await _triggers_broker.shutdown()
 
+    otlp.close()
+
     for adapter in _composio_adapters.values():
         await adapter.close()
 
@@ -14,7 +14,7 @@ stream-consumer entrypoint.
 
 import sys
 import asyncio
-from typing import List
+from typing import List, Optional
 
 from redis.asyncio import Redis
 
@@ -23,18 +23,49 @@ from oss.src.tasks.taskiq.shared.broker import (
     prune_idle_consumers,
 )
 
+from oss.src.core.evaluations.live import LiveEvaluationsDispatcher, LiveRunsIndex
+from oss.src.core.evaluations.runtime.broker import (
+    build_evaluations_broker,
+    build_evaluations_worker,
+)
+from oss.src.core.evaluations.service import EvaluationsService
+from oss.src.core.evaluators.service import EvaluatorsService, SimpleEvaluatorsService
 from oss.src.core.events.service import EventsService
+from oss.src.core.queries.service import QueriesService
 from oss.src.core.secrets.services import VaultService
 from oss.src.core.sessions.interactions.service import SessionInteractionsService
 from oss.src.core.sessions.records.service import RecordsService
+from oss.src.core.testcases.service import TestcasesService
+from oss.src.core.testsets.service import TestsetsService
 from oss.src.core.tracing.service import TracingService
+from oss.src.core.workflows.service import WorkflowsService
+from oss.src.dbs.postgres.blobs.dao import BlobsDAO
+from oss.src.dbs.postgres.evaluations.dao import EvaluationsDAO
 from oss.src.dbs.postgres.events.dao import EventsDAO
+from oss.src.dbs.postgres.git.dao import GitDAO
+from oss.src.dbs.postgres.queries.dbes import (
+    QueryArtifactDBE,
+    QueryRevisionDBE,
+    QueryVariantDBE,
+)
 from oss.src.dbs.postgres.secrets.dao import SecretsDAO
 from oss.src.dbs.postgres.sessions.interactions.dao import SessionInteractionsDAO
 from oss.src.dbs.postgres.sessions.records.dao import RecordsDAO
+from oss.src.dbs.postgres.testcases.dbes import TestcaseBlobDBE
+from oss.src.dbs.postgres.testsets.dbes import (
+    TestsetArtifactDBE,
+    TestsetRevisionDBE,
+    TestsetVariantDBE,
+)
 from oss.src.dbs.postgres.tracing.dao import TracingDAO
 from oss.src.dbs.postgres.webhooks.dao import WebhooksDAO
+from oss.src.dbs.postgres.workflows.dbes import (
+    WorkflowArtifactDBE,
+    WorkflowRevisionDBE,
+    WorkflowVariantDBE,
+)
 from oss.src.dbs.redis.sessions.watch import SessionsWatchPublisher
+from oss.src.dbs.redis.tracing.watch import TracingWatchPublisher
 from oss.src.tasks.asyncio.events.worker import EventsWorker
 from oss.src.tasks.asyncio.sessions.records_worker import RecordsWorker
 from oss.src.tasks.asyncio.shared.consumer import StreamConsumer
@@ -71,12 +102,90 @@ def _selected_streams() -> List[str]:
     return selected
 
 
+async def _build_live_evaluations_dispatcher(
+    tracing_service: TracingService,
+) -> Optional[LiveEvaluationsDispatcher]:
+    if not env.agenta.api.evaluations.live_push_enabled:
+        return None
+
+    # Same services as the evaluations worker, behind a producer-only broker:
+    # this loop only enqueues (.kiq) the pushed traces of live runs.
+    broker = build_evaluations_broker(
+        consumer_group_name="worker-spans-evaluations-dispatcher",
+        producer_only=True,
+    )
+    await broker.startup()
+
+    queries_service = QueriesService(
+        queries_dao=GitDAO(
+            ArtifactDBE=QueryArtifactDBE,
+            VariantDBE=QueryVariantDBE,
+            RevisionDBE=QueryRevisionDBE,
+        )
+    )
+    testcases_service = TestcasesService(
+        testcases_dao=BlobsDAO(BlobDBE=TestcaseBlobDBE),
+    )
+    testsets_service = TestsetsService(
+        testsets_dao=GitDAO(
+            ArtifactDBE=TestsetArtifactDBE,
+            VariantDBE=TestsetVariantDBE,
+            RevisionDBE=TestsetRevisionDBE,
+        ),
+        testcases_service=testcases_service,
+    )
+    workflows_service = WorkflowsService(
+        workflows_dao=GitDAO(
+            ArtifactDBE=WorkflowArtifactDBE,
+            VariantDBE=WorkflowVariantDBE,
+            RevisionDBE=WorkflowRevisionDBE,
+        ),
+        watch_publisher=SessionsWatchPublisher(),
+    )
+    evaluators_service = EvaluatorsService(workflows_service=workflows_service)
+    evaluations_service = EvaluationsService(
+        evaluations_dao=EvaluationsDAO(),
+        tracing_service=tracing_service,
+        queries_service=queries_service,
+        testsets_service=testsets_service,
+        evaluators_service=evaluators_service,
+    )
+
+    build_evaluations_worker(
+        broker=broker,
+        tracing_service=tracing_service,
+        simple_evaluators_service=SimpleEvaluatorsService(
+            evaluators_service=evaluators_service
+        ),
+        testsets_service=testsets_service,
+        testcases_service=testcases_service,
+        queries_service=queries_service,
+        workflows_service=workflows_service,
+        evaluations_service=evaluations_service,
+    )
+
+    return LiveEvaluationsDispatcher(
+        index=LiveRunsIndex(
+            evaluations_service=evaluations_service,
+            queries_service=queries_service,
+            ttl=env.agenta.api.evaluations.live_index_ttl_seconds,
+        ),
+        evaluations_task_runner=evaluations_service.evaluations_task_runner,
+    )
+
+
 async def _build_spans_worker(redis_client: Redis) -> StreamConsumer:
+    tracing_service = TracingService(tracing_dao=TracingDAO())
     return TracingWorker(
-        service=TracingService(tracing_dao=TracingDAO()),
+        service=tracing_service,
         redis_client=redis_client,
         stream_name="streams:spans",
         consumer_group="worker-spans",
+        # Wakes `GET /tracing/traces/{trace_id}?wait=...` readers once a trace is
+        # committed, reusing this process's durable connection.
+        watch_publisher=TracingWatchPublisher(redis_client=redis_client),
+        # Pushes the committed traces into the live evaluation runs they match.
+        ingest_listener=await _build_live_evaluations_dispatcher(tracing_service),
     )
 
 
@@ -163,6 +272,8 @@ async def main_async() -> int:
 
         for consumer in consumers:
             await consumer.create_consumer_group()
+            # Dead consumers' pending entries are XAUTOCLAIMed by the run loop,
+            # so their PELs drain and a later boot can prune them here.
             removed = await prune_idle_consumers(
                 url=env.redis.uri_durable,
                 queue_name=consumer.stream_name,
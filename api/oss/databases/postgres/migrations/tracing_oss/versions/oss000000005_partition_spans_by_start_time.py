@@ -0,0 +1,287 @@
+"""partition_spans_by_start_time
+
+Revision ID: oss000000005
+Revises: oss000000004
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+
+from datetime import datetime, time, timedelta, timezone
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision: str = "oss000000005"
+down_revision: Union[str, None] = "oss000000004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Frozen copies of oss.src.dbs.postgres.tracing.partitions, as of this revision.
+PARTITIONS_AHEAD = 7  # day(s)
+SPANS_STORAGE_PARAMETERS = (
+    "autovacuum_vacuum_scale_factor = 0.02, "
+    "autovacuum_analyze_scale_factor = 0.01, "
+    "autovacuum_vacuum_cost_delay = 5, "
+    "autovacuum_vacuum_cost_limit = 4000"
+)
+
+# Unique on the new primary key, built on the existing table ahead of the
+# swap so attaching it as a partition does not build it under lock.
+LEGACY_PRIMARY_KEY_INDEX = "ux_spans_legacy_primary_key"
+# The primary key of the legacy partition, over that index (which it renames).
+LEGACY_PRIMARY_KEY = "spans_legacy_pkey"
+# The primary key of the table before this revision.
+PRIMARY_KEY = "spans_pkey"
+LEGACY_CUTOVER_CHECK = "ck_spans_legacy_start_time_cutover"
+
+
+def upgrade() -> None:
+    # Spans written until tomorrow stay where they are: the existing table
+    # becomes the `spans_legacy` partition (MINVALUE .. cutover) and the daily
+    # partitions start at the cutover. Only spans already starting after it
+    # (clock skew) are moved.
+    cutover = datetime.combine(
+        datetime.now(timezone.utc).date() + timedelta(days=1),
+        time.min,
+        tzinfo=timezone.utc,
+    )
+
+    with op.get_context().autocommit_block():
+        op.execute(
+            text(f"""
+            CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {LEGACY_PRIMARY_KEY_INDEX}
+            ON public.spans (project_id, trace_id, span_id, start_time);
+        """)
+        )
+
+    # Swap: rename the table and its indexes out of the way, then recreate
+    # every non-unique index on the partitioned parent under its own name, so
+    # the definitions match and ATTACH adopts the legacy ones as they are.
+    # `ux_spans_root_per_trace` has no start_time and cannot span partitions:
+    # it stays on the legacy partition only. The legacy primary key is swapped
+    # for one over the prebuilt unique index, which ATTACH adopts as the
+    # partition of the parent's: a table has one primary key.
+    op.execute(
+        text(f"""
+        DO $$
+        DECLARE
+          r record;
+          definitions text[] := ARRAY[]::text[];
+        BEGIN
+          ALTER TABLE public.spans RENAME TO spans_legacy;
+
+          FOR r IN
+            SELECT conname AS name
+            FROM pg_constraint
+            WHERE conrelid = 'public.spans_legacy'::regclass
+              AND contype = 'p'
+          LOOP
+            EXECUTE format(
+              'ALTER TABLE public.spans_legacy DROP CONSTRAINT %I', r.name
+            );
+          END LOOP;
+
+          ALTER TABLE public.spans_legacy
+            ADD CONSTRAINT {LEGACY_PRIMARY_KEY}
+            PRIMARY KEY USING INDEX {LEGACY_PRIMARY_KEY_INDEX};
+
+          FOR r IN
+            SELECT c.relname AS name,
+                   pg_get_indexdef(i.indexrelid) AS definition,
+                   i.indisunique AS is_unique
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE i.indrelid = 'public.spans_legacy'::regclass
+              AND c.relname <> '{LEGACY_PRIMARY_KEY}'
+          LOOP
+            IF NOT r.is_unique THEN
+              definitions := definitions || replace(
+                r.definition, ' ON public.spans_legacy ', ' ON public.spans '
+              );
+            END IF;
+            EXECUTE format(
+              'ALTER INDEX public.%I RENAME TO %I', r.name, r.name || '_legacy'
+            );
+          END LOOP;
+
+          CREATE TABLE public.spans (
+            LIKE public.spans_legacy INCLUDING DEFAULTS INCLUDING CONSTRAINTS
+          ) PARTITION BY RANGE (start_time);
+
+          ALTER TABLE public.spans
+            ADD CONSTRAINT spans_pkey
+            PRIMARY KEY (project_id, trace_id, span_id, start_time);
+
+          FOR i IN 1 .. coalesce(array_length(definitions, 1), 0) LOOP
+            EXECUTE definitions[i];
+          END LOOP;
+        END
+        $$;
+    """)
+    )
+
+    op.execute(
+        text(f"""
+        CREATE TABLE public.spans_default
+        PARTITION OF public.spans DEFAULT
+        WITH ({SPANS_STORAGE_PARAMETERS});
+    """)
+    )
+
+    for offset in range(PARTITIONS_AHEAD + 1):
+        lower = cutover + timedelta(days=offset)
+        upper = lower + timedelta(days=1)
+        op.execute(
+            text(f"""
+            CREATE TABLE public.spans_{lower:%Y%m%d}
+            PARTITION OF public.spans
+            FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')
+            WITH ({SPANS_STORAGE_PARAMETERS});
+        """)
+        )
+
+    # The swap holds `spans` exclusively; commit it before scanning the legacy
+    # rows. Until the legacy table is attached below, writes go to the daily
+    # and default partitions and reads miss the legacy rows. Nothing else
+    # touches `spans_legacy` in the meantime, so these scans block no one.
+    with op.get_context().autocommit_block():
+        op.execute(
+            text(f"""
+            WITH moved AS (
+              DELETE FROM public.spans_legacy
+              WHERE start_time >= '{cutover.isoformat()}'
+              RETURNING *
+            )
+            INSERT INTO public.spans SELECT * FROM moved;
+        """)
+        )
+
+        # The check lets ATTACH skip its own scan of the legacy rows.
+        op.execute(
+            text(f"""
+            ALTER TABLE public.spans_legacy
+              ADD CONSTRAINT {LEGACY_CUTOVER_CHECK}
+              CHECK (start_time < '{cutover.isoformat()}') NOT VALID;
+        """)
+        )
+        op.execute(
+            text(f"""
+            ALTER TABLE public.spans_legacy
+              VALIDATE CONSTRAINT {LEGACY_CUTOVER_CHECK};
+        """)
+        )
+
+    # Spans written since the swap with a start_time before the cutover landed
+    # in the default partition, which ATTACH requires to hold none: move them
+    # into the legacy table, newest write first, with writes to it held off.
+    op.execute(
+        text("""
+        LOCK TABLE public.spans_default IN SHARE ROW EXCLUSIVE MODE;
+    """)
+    )
+    op.execute(
+        text(f"""
+        DELETE FROM public.spans_legacy AS l
+        USING public.spans_default AS d
+        WHERE d.start_time < '{cutover.isoformat()}'
+          AND l.project_id = d.project_id
+          AND l.trace_id = d.trace_id
+          AND l.span_id = d.span_id
+          AND l.start_time = d.start_time;
+    """)
+    )
+    op.execute(
+        text(f"""
+        WITH moved AS (
+          DELETE FROM public.spans_default
+          WHERE start_time < '{cutover.isoformat()}'
+          RETURNING *
+        )
+        INSERT INTO public.spans_legacy SELECT * FROM moved
+        ON CONFLICT DO NOTHING;
+    """)
+    )
+
+    op.execute(
+        text(f"""
+        ALTER TABLE public.spans
+          ATTACH PARTITION public.spans_legacy
+          FOR VALUES FROM (MINVALUE) TO ('{cutover.isoformat()}');
+    """)
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        text("""
+        ALTER TABLE public.spans DETACH PARTITION public.spans_legacy;
+    """)
+    )
+    op.execute(
+        text(f"""
+        ALTER TABLE public.spans_legacy DROP CONSTRAINT {LEGACY_CUTOVER_CHECK};
+    """)
+    )
+
+    # Without start_time in the key, a span id seen on two start times keeps
+    # the first one written back, in the legacy partition or from the others.
+    op.execute(
+        text(f"""
+        ALTER TABLE public.spans_legacy DROP CONSTRAINT {LEGACY_PRIMARY_KEY};
+    """)
+    )
+    op.execute(
+        text("""
+        DELETE FROM public.spans_legacy AS a
+        USING public.spans_legacy AS b
+        WHERE a.project_id = b.project_id
+          AND a.trace_id = b.trace_id
+          AND a.span_id = b.span_id
+          AND a.ctid > b.ctid;
+    """)
+    )
+    op.execute(
+        text(f"""
+        ALTER TABLE public.spans_legacy
+          ADD CONSTRAINT {PRIMARY_KEY}_legacy
+          PRIMARY KEY (project_id, trace_id, span_id);
+    """)
+    )
+    op.execute(
+        text("""
+        INSERT INTO public.spans_legacy
+        SELECT * FROM public.spans
+        ON CONFLICT DO NOTHING;
+    """)
+    )
+
+    op.execute(
+        text("""
+        DO $$
+        DECLARE
+          r record;
+        BEGIN
+          DROP TABLE public.spans;
+
+          FOR r IN
+            SELECT c.relname AS name
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE i.indrelid = 'public.spans_legacy'::regclass
+              AND c.relname LIKE '%\\_legacy'
+          LOOP
+            EXECUTE format(
+              'ALTER INDEX public.%I RENAME TO %I',
+              r.name,
+              left(r.name, length(r.name) - length('_legacy'))
+            );
+          END LOOP;
+
+          ALTER TABLE public.spans_legacy RENAME TO spans;
+        END
+        $$;
+    """)
+    )
@@ -0,0 +1,64 @@
+"""add_span_rollups
+
+Revision ID: oss000000006
+Revises: oss000000005
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "oss000000006"
+down_revision: Union[str, None] = "oss000000005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Forward-fill only, like the rest of the tracing DB: rollups start with
+    # the spans ingested from here on, and span_rollups_coverage tells the
+    # analytics from when on a project can be read from them.
+    op.create_table(
+        "span_rollups",
+        sa.Column("project_id", sa.UUID(), nullable=False),
+        sa.Column("scope", sa.String(), nullable=False),
+        sa.Column("granularity", sa.Integer(), nullable=False),
+        sa.Column("bucket", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column("path", sa.String(), nullable=False),
+        sa.Column("key", sa.String(), nullable=False),
+        sa.Column("count", sa.BigInteger(), nullable=False),
+        sa.Column("sum", sa.Numeric(), nullable=True),
+        sa.Column("min", sa.Numeric(), nullable=True),
+        sa.Column("max", sa.Numeric(), nullable=True),
+        sa.PrimaryKeyConstraint(
+            "project_id",
+            "scope",
+            "granularity",
+            "bucket",
+            "path",
+            "key",
+        ),
+    )
+    op.create_index(
+        "ix_span_rollups_bucket",
+        "span_rollups",
+        ["bucket"],
+        unique=False,
+    )
+
+    op.create_table(
+        "span_rollups_coverage",
+        sa.Column("project_id", sa.UUID(), nullable=False),
+        sa.Column("since", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("project_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("span_rollups_coverage")
+    op.drop_index("ix_span_rollups_bucket", table_name="span_rollups")
+    op.drop_table("span_rollups")
@@ -0,0 +1,90 @@
+"""add_traces
+
+Revision ID: oss000000007
+Revises: oss000000006
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "oss000000007"
+down_revision: Union[str, None] = "oss000000006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Forward-fill only, like the rest of the tracing DB: summaries start with
+    # the spans ingested from here on, and traces_coverage tells the trace
+    # lists from when on a project can be read from them.
+    op.create_table(
+        "traces",
+        sa.Column("project_id", sa.UUID(), nullable=False),
+        sa.Column("trace_id", sa.UUID(), nullable=False),
+        sa.Column("span_id", sa.UUID(), nullable=True),
+        sa.Column(
+            "trace_type",
+            postgresql.ENUM(name="tracetype", create_type=False),
+            nullable=True,
+        ),
+        sa.Column("span_name", sa.String(), nullable=True),
+        sa.Column("start_time", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column("end_time", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column(
+            "status_code",
+            postgresql.ENUM(name="otelstatuscode", create_type=False),
+            nullable=True,
+        ),
+        sa.Column("session_id", sa.String(), nullable=True),
+        sa.Column("user_id", sa.String(), nullable=True),
+        sa.Column("agent_id", sa.String(), nullable=True),
+        sa.Column("costs", sa.Numeric(), nullable=True),
+        sa.Column("tokens", sa.Numeric(), nullable=True),
+        sa.Column(
+            "references",
+            postgresql.JSONB(none_as_null=True, astext_type=sa.Text()),
+            nullable=True,
+        ),
+        sa.PrimaryKeyConstraint("project_id", "trace_id"),
+    )
+    op.create_index(
+        "ix_traces_project_id_start_time_trace_id",
+        "traces",
+        ["project_id", "start_time", "trace_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_traces_project_id_session_id",
+        "traces",
+        ["project_id", "session_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_traces_references_gin",
+        "traces",
+        ["references"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"references": "jsonb_path_ops"},
+    )
+
+    op.create_table(
+        "traces_coverage",
+        sa.Column("project_id", sa.UUID(), nullable=False),
+        sa.Column("since", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("project_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("traces_coverage")
+    op.drop_index("ix_traces_references_gin", table_name="traces")
+    op.drop_index("ix_traces_project_id_session_id", table_name="traces")
+    op.drop_index("ix_traces_project_id_start_time_trace_id", table_name="traces")
+    op.drop_table("traces")
@@ -0,0 +1,71 @@
+"""add_directories
+
+Revision ID: oss000000008
+Revises: oss000000007
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "oss000000008"
+down_revision: Union[str, None] = "oss000000007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_DIRECTORIES = (
+    ("session_directory", "session_id"),
+    ("user_directory", "user_id"),
+)
+
+
+def upgrade() -> None:
+    # Forward-fill only, like the trace summaries: directories start with the
+    # root spans ingested from here on, and directories_coverage tells the
+    # session and user lists from when on a project can be read from them.
+    for table, column in _DIRECTORIES:
+        op.create_table(
+            table,
+            sa.Column("project_id", sa.UUID(), nullable=False),
+            sa.Column(column, sa.String(), nullable=False),
+            sa.Column("first_active", sa.TIMESTAMP(timezone=True), nullable=False),
+            sa.Column("last_active", sa.TIMESTAMP(timezone=True), nullable=False),
+            sa.Column("traces", sa.BigInteger(), nullable=False),
+            sa.Column("errors", sa.BigInteger(), nullable=False),
+            sa.Column("costs", sa.Numeric(), nullable=True),
+            sa.Column("tokens", sa.Numeric(), nullable=True),
+            sa.PrimaryKeyConstraint("project_id", column),
+        )
+        op.create_index(
+            f"ix_{table}_project_id_first_active",
+            table,
+            ["project_id", "first_active"],
+            unique=False,
+        )
+        op.create_index(
+            f"ix_{table}_project_id_last_active",
+            table,
+            ["project_id", "last_active"],
+            unique=False,
+        )
+
+    op.create_table(
+        "directories_coverage",
+        sa.Column("project_id", sa.UUID(), nullable=False),
+        sa.Column("since", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("project_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("directories_coverage")
+
+    for table, _ in reversed(_DIRECTORIES):
+        op.drop_index(f"ix_{table}_project_id_last_active", table_name=table)
+        op.drop_index(f"ix_{table}_project_id_first_active", table_name=table)
+        op.drop_table(table)
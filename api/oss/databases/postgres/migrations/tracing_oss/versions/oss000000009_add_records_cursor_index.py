@@ -0,0 +1,36 @@
+"""add_records_cursor_index
+
+Revision ID: oss000000009
+Revises: oss000000008
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "oss000000009"
+down_revision: Union[str, None] = "oss000000008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # For reads of a session's records from a timestamp or after a cursor on, in
+    # (timestamp, record_id) order. Rows without a timestamp sort last, as NULLs
+    # do in an ascending index.
+    op.create_index(
+        "ix_records_project_id_session_id_timestamp_record_id",
+        "records",
+        ["project_id", "session_id", "timestamp", "record_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_records_project_id_session_id_timestamp_record_id",
+        table_name="records",
+    )
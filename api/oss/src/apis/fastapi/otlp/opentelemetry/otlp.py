@@ -1,8 +1,9 @@
-from typing import List
+from typing import Any, List
 from datetime import datetime
-import gzip
-import zlib
+from base64 import b64encode
 
+from orjson import loads
+from google.protobuf import json_format
 
 # Use official OpenTelemetry proto definitions
 from opentelemetry.proto.trace.v1 import trace_pb2 as Trace_Proto
@@ -36,33 +37,6 @@ SPAN_STATUS_CODES = [
 ]
 
 
-def _is_gzip(data):
-    return data[:2] == b"\x1f\x8b"
-
-
-def _is_zlib(data):
-    return data[:2] in [b"\x78\x01", b"\x78\x9c", b"\x78\xda"]
-
-
-def _detect_compression(data):
-    if _is_gzip(data):
-        return "gzip"
-    elif _is_zlib(data):
-        return "zlib"
-    else:
-        return "unknown or uncompressed"
-
-
-def _decompress_data(data: bytes) -> bytes:
-    compression_type = _detect_compression(data)
-    if compression_type == "gzip":
-        return gzip.decompress(data)
-    elif compression_type == "zlib":
-        return zlib.decompress(data)
-    else:
-        return data
-
-
 def _decode_value(any_value):
     """Decode an AnyValue protobuf object to its Python equivalent."""
     which = any_value.WhichOneof("value")
@@ -99,12 +73,48 @@ def _parse_timestamp(timestamp_ns: int) -> str:
     return datetime.fromtimestamp(timestamp).isoformat(timespec="microseconds")
 
 
-def parse_otlp_stream(otlp_stream: bytes) -> List[OTelSpanDTO]:
-    try:
-        otlp_stream = _decompress_data(otlp_stream)
-    except (OSError, zlib.error) as e:
-        log.error("Decompression failed: {%s}", e)
+_JSON_ID_FIELDS = (
+    "traceId",
+    "spanId",
+    "parentSpanId",
+    "trace_id",
+    "span_id",
+    "parent_span_id",
+)
 
+
+def _hex_ids_to_base64(obj: dict) -> None:
+    for key in _JSON_ID_FIELDS:
+        value = obj.get(key)
+        if isinstance(value, str) and value:
+            obj[key] = b64encode(bytes.fromhex(value)).decode()
+
+
+def parse_otlp_json(otlp_json: bytes) -> List[OTelSpanDTO]:
+    """Parse an OTLP/HTTP JSON body (an ExportTraceServiceRequest).
+
+    OTLP JSON differs from the canonical protobuf JSON mapping in one way that
+    matters here: trace and span ids are hex strings, not base64. They are
+    re-encoded before handing the document to `json_format`. Unknown fields
+    are ignored, as the spec requires of receivers.
+    """
+    document: Any = loads(otlp_json)
+
+    for resource_span in document.get("resourceSpans") or []:
+        for scope_span in resource_span.get("scopeSpans") or []:
+            for span in scope_span.get("spans") or []:
+                _hex_ids_to_base64(span)
+                for link in span.get("links") or []:
+                    _hex_ids_to_base64(link)
+
+    export_request = TraceService_Proto.ExportTraceServiceRequest()
+    json_format.ParseDict(document, export_request, ignore_unknown_fields=True)
+
+    return _parse_resource_spans(export_request.resource_spans)
+
+
+def parse_otlp_stream(otlp_stream: bytes) -> List[OTelSpanDTO]:
+    """Parse an OTLP/HTTP protobuf body, already decompressed."""
     # According to OTLP spec, the HTTP payload is an ExportTraceServiceRequest.
     # We first try to parse using that message. If that fails (e.g. legacy
     # clients sending raw TracesData) we fall back to the older TracesData
@@ -124,6 +134,10 @@ def parse_otlp_stream(otlp_stream: bytes) -> List[OTelSpanDTO]:
         legacy_msg.ParseFromString(otlp_stream)
         resource_spans_iterable = legacy_msg.resource_spans
 
+    return _parse_resource_spans(resource_spans_iterable)
+
+
+def _parse_resource_spans(resource_spans_iterable) -> List[OTelSpanDTO]:
     otel_span_dtos = []
 
     for resource_span in resource_spans_iterable:
@@ -1,9 +1,11 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Dict, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Request, status
 from fastapi.responses import Response
 
+from google.protobuf import json_format
+from google.protobuf.message import Message
 from google.rpc.status_pb2 import Status as ProtoStatus
 from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import (
     ExportTraceServiceResponse,
@@ -15,8 +17,19 @@ from oss.src.utils.exceptions import intercept_exceptions
 from oss.src.utils.common import is_ee
 
 from oss.src.apis.fastapi.otlp.models import CollectStatusResponse
-from oss.src.apis.fastapi.otlp.opentelemetry.otlp import parse_otlp_stream
-from oss.src.apis.fastapi.otlp.utils.processing import parse_from_otel_span_dto
+from oss.src.apis.fastapi.otlp.utils.decoding import (
+    OTLPDecoder,
+    OTLPDecoderSaturated,
+    OTLPPayloadInvalid,
+)
+from oss.src.apis.fastapi.otlp.utils.reading import (
+    OTLP_JSON_MEDIA_TYPE,
+    OTLP_PROTOBUF_MEDIA_TYPE,
+    OTLPBodyTooLarge,
+    OTLPUnsupportedEncoding,
+    is_otlp_json,
+    read_otlp_body,
+)
 
 from oss.src.core.access.permissions.types import Permission
 from oss.src.core.access.permissions.service import check_action_access
@@ -31,18 +44,64 @@ if TYPE_CHECKING:
 
 MAX_OTLP_BATCH_SIZE = env.agenta.otlp.max_batch_bytes
 MAX_OTLP_BATCH_SIZE_MB = MAX_OTLP_BATCH_SIZE // (1024 * 1024)
+OTLP_RETRY_AFTER_SECONDS = env.agenta.otlp.retry_after_seconds
 
 
 log = get_module_logger(__name__)
 
 
+def _otlp_response(
+    message: Message,
+    *,
+    status_code: int,
+    is_json: bool,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    # Per the OTLP/HTTP spec, responses use the encoding of the request.
+    if is_json:
+        return Response(
+            content=json_format.MessageToJson(message, indent=None),
+            media_type=OTLP_JSON_MEDIA_TYPE,
+            status_code=status_code,
+            headers=headers,
+        )
+
+    return Response(
+        content=message.SerializeToString(),
+        media_type=OTLP_PROTOBUF_MEDIA_TYPE,
+        status_code=status_code,
+        headers=headers,
+    )
+
+
+def _error_response(
+    message: str,
+    *,
+    status_code: int,
+    is_json: bool,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    return _otlp_response(
+        ProtoStatus(message=message),
+        status_code=status_code,
+        is_json=is_json,
+        headers=headers,
+    )
+
+
 class OTLPRouter:
     def __init__(
         self,
         tracing_service: "TracingService",
+        decoder: Optional[OTLPDecoder] = None,
     ):
         self.tracing_service = tracing_service
 
+        self.decoder = decoder or OTLPDecoder(
+            processes=env.agenta.otlp.decode_processes,
+            max_pending=env.agenta.otlp.decode_max_pending,
+        )
+
         self.sdk_router = APIRouter()
         self.router = APIRouter()
 
@@ -76,15 +135,34 @@ class OTLPRouter:
         """
         return CollectStatusResponse(status="ready")
 
+    def close(self) -> None:
+        self.decoder.close()
+
+    def _overloaded_response(self, project_id: str, is_json: bool) -> Response:
+        log.warning(
+            "[OTLP] Decoder saturated; shedding request",
+            project_id=project_id,
+            pending=self.decoder.pending,
+            rejected=self.decoder.rejected,
+        )
+        # 503 + Retry-After is retryable per the OTLP/HTTP spec; exporters
+        # back off for at least the advertised delay.
+        return _error_response(
+            "OTLP ingest is overloaded. Retry later.",
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            is_json=is_json,
+            headers={"Retry-After": str(OTLP_RETRY_AFTER_SECONDS)},
+        )
+
     @intercept_exceptions()
     async def otlp_ingest(
         self,
         request: Request,
     ):
-        """Ingest traces via the OTLP/HTTP protobuf protocol.
+        """Ingest traces via the OTLP/HTTP protocol.
 
-        This endpoint accepts a serialized
-        `ExportTraceServiceRequest` protobuf. Point any OTLP/HTTP
+        This endpoint accepts an `ExportTraceServiceRequest`, as binary
+        protobuf or as OTLP JSON. Point any OTLP/HTTP
         collector or SDK at `POST /otlp/v1/traces` and spans will flow
         into the same ingest stream as the Agenta-native endpoints.
 
@@ -93,17 +171,28 @@ class OTLPRouter:
         `POST /tracing/spans/ingest` — it takes JSON, accepts Agenta's
         nested shape directly, and surfaces parse failures immediately.
 
-        ## Content-Type and size limit
+        ## Content-Type, Content-Encoding and size limit
+
+        `Content-Type: application/x-protobuf` (the default) or
+        `application/json` for the OTLP JSON encoding; responses use the
+        same encoding as the request. Bodies may be compressed with
+        `Content-Encoding: gzip` or `deflate`; other encodings return
+        `415 Unsupported Media Type`. Requests larger than the configured
+        batch limit (default 10 MB, see `AGENTA_OTLP_MAX_BATCH_BYTES`),
+        compressed or inflated, return `413 Request Entity Too Large`.
+        The body is inflated while it streams in, so an oversized payload
+        is rejected as soon as it crosses the limit.
 
-        Binary protobuf only (`Content-Type: application/x-protobuf`).
-        JSON OTLP is not accepted. Requests larger than the configured
-        batch limit (default 4 MB, see `OTLP_MAX_BATCH_BYTES`) return
-        `413 Request Entity Too Large`.
+        Decoding runs off the event loop with a bounded number of requests
+        being read or decoded per API process (see
+        `AGENTA_OTLP_DECODE_MAX_PENDING`).
+        Past that the endpoint returns `503 Service Unavailable` with a
+        `Retry-After` header, which OTLP exporters retry.
 
         ## Response
 
         Successful ingest returns `200 OK` with a serialized
-        `ExportTraceServiceResponse` protobuf. Parse failures on the
+        `ExportTraceServiceResponse`. Parse failures on the
         request body return `400`; malformed spans return `500`; quota
         exhaustion returns `403`. Like the native ingest paths, spans
         are queued on a Redis stream and persisted asynchronously — see
@@ -120,95 +209,108 @@ class OTLPRouter:
         ):
             raise FORBIDDEN_EXCEPTION  # type: ignore
 
-        # -------------------------------------------------------------------- #
-        # Parse request into OTLP stream
-        # -------------------------------------------------------------------- #
-        otlp_stream = None
-        try:
-            otlp_stream = await request.body()
-        except Exception:
-            log.error(
-                "Failed to process OTLP stream from project %s with error:",
-                request.state.project_id,
-                exc_info=True,
-            )
-            err_status = ProtoStatus(
-                message="Invalid request body: not a valid OTLP stream."
-            )
-            return Response(
-                content=err_status.SerializeToString(),
-                media_type="application/x-protobuf",
-                status_code=status.HTTP_400_BAD_REQUEST,
-            )
+        is_json = is_otlp_json(request.headers.get("content-type"))
 
         # -------------------------------------------------------------------- #
-        # Enforce OTLP stream size limit
+        # Shed load before buffering the body when the decoder is full: the
+        # slot is taken here, so bodies being read count toward the limit too
         # -------------------------------------------------------------------- #
-        if len(otlp_stream) > MAX_OTLP_BATCH_SIZE:
-            log.error(
-                "OTLP batch too large (%s bytes > %s bytes) from project %s",
-                len(otlp_stream),
-                MAX_OTLP_BATCH_SIZE,
-                request.state.project_id,
-            )
-            err_status = ProtoStatus(
-                message=f"OTLP batch size exceeds {MAX_OTLP_BATCH_SIZE_MB}MB limit."
-            )
-            return Response(
-                content=err_status.SerializeToString(),
-                media_type="application/x-protobuf",
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            )
+        if not self.decoder.admit():
+            return self._overloaded_response(request.state.project_id, is_json)
 
-        # -------------------------------------------------------------------- #
-        # Parse OTLP stream into OTel spans
-        # -------------------------------------------------------------------- #
-        otel_spans = None
         try:
-            otel_spans = parse_otlp_stream(otlp_stream)
-        except Exception:
-            log.error(
-                "Failed to parse OTLP stream from project %s with error:",
-                request.state.project_id,
-                exc_info=True,
-            )
-            log.error("OTLP stream: %s", otlp_stream)
-            err_status = ProtoStatus(message="Failed to parse OTLP stream.")
-            return Response(
-                content=err_status.SerializeToString(),
-                media_type="application/x-protobuf",
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            )
+            # ---------------------------------------------------------------- #
+            # Read (and inflate) request into OTLP stream, enforcing size limit
+            # ---------------------------------------------------------------- #
+            otlp_stream = None
+            try:
+                otlp_stream = await read_otlp_body(
+                    request.stream(),
+                    content_encoding=request.headers.get("content-encoding"),
+                    max_bytes=MAX_OTLP_BATCH_SIZE,
+                )
+            except OTLPBodyTooLarge:
+                log.error(
+                    "OTLP batch too large (> %s bytes) from project %s",
+                    MAX_OTLP_BATCH_SIZE,
+                    request.state.project_id,
+                )
+                return _error_response(
+                    f"OTLP batch size exceeds {MAX_OTLP_BATCH_SIZE_MB}MB limit.",
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    is_json=is_json,
+                )
+            except OTLPUnsupportedEncoding as e:
+                return _error_response(
+                    f"Unsupported Content-Encoding: {e}.",
+                    status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                    is_json=is_json,
+                )
+            except Exception:  # OTLPBodyInvalid, client disconnects
+                log.error(
+                    "Failed to process OTLP stream from project %s with error:",
+                    request.state.project_id,
+                    exc_info=True,
+                )
+                return _error_response(
+                    "Invalid request body: not a valid OTLP stream.",
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    is_json=is_json,
+                )
 
-        # -------------------------------------------------------------------- #
-        # Parse OTel spans into internal spans
-        # -------------------------------------------------------------------- #
-        spans = []
-        for idx, otel_span in enumerate(otel_spans):
+            # ---------------------------------------------------------------- #
+            # Decode OTLP stream into internal spans, off the event loop
+            # ---------------------------------------------------------------- #
+            decoded = None
             try:
-                span = parse_from_otel_span_dto(otel_span)
-                if span is not None:
-                    spans.append(span)
-                else:
-                    log.warning(
-                        "Skipping OTEL span from project %s: parser returned None (index=%s)",
-                        request.state.project_id,
-                        idx,
-                    )
+                decoded = await self.decoder.decode(
+                    otlp_stream,
+                    is_json,
+                    admitted=True,
+                )
+            except OTLPDecoderSaturated:
+                return self._overloaded_response(request.state.project_id, is_json)
+            except OTLPPayloadInvalid as e:
+                log.error(
+                    "Invalid OTLP/JSON body from project %s: %s",
+                    request.state.project_id,
+                    e,
+                )
+                return _error_response(
+                    "Invalid request body: not a valid OTLP/JSON document.",
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    is_json=is_json,
+                )
             except Exception:
-                log.warning(
-                    "Skipping malformed OTEL span from project %s (index=%s)",
+                log.error(
+                    "Failed to parse OTLP stream from project %s with error:",
                     request.state.project_id,
-                    idx,
                     exc_info=True,
                 )
+                log.error("OTLP stream: %s", otlp_stream)
+                return _error_response(
+                    "Failed to parse OTLP stream.",
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    is_json=is_json,
+                )
+        finally:
+            self.decoder.release()
 
-        if otel_spans and not spans:
-            err_status = ProtoStatus(message="Failed to parse OTEL span.")
-            return Response(
-                content=err_status.SerializeToString(),
-                media_type="application/x-protobuf",
+        for idx, reason in decoded.skipped:
+            log.warning(
+                "Skipping malformed OTEL span from project %s (index=%s): %s",
+                request.state.project_id,
+                idx,
+                reason,
+            )
+
+        spans = decoded.spans
+
+        if decoded.otel_span_count and not spans:
+            return _error_response(
+                "Failed to parse OTEL span.",
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                is_json=is_json,
             )
 
         # -------------------------------------------------------------------- #
@@ -231,13 +333,10 @@ class OTLPRouter:
                             org_id=str(request.state.organization_id),
                             delta=delta,
                         )
-                        err_status = ProtoStatus(
-                            message="You have reached your monthly quota limit. Please upgrade your plan to continue."
-                        )
-                        return Response(
-                            content=err_status.SerializeToString(),
-                            media_type="application/x-protobuf",
+                        return _error_response(
+                            "You have reached your monthly quota limit. Please upgrade your plan to continue.",
                             status_code=status.HTTP_403_FORBIDDEN,
+                            is_json=is_json,
                         )
 
             except Exception as e:
@@ -248,7 +347,7 @@ class OTLPRouter:
                 )
 
         # -------------------------------------------------------------------- #
-        # Preprocess and publish spans to Redis Streams for async processing
+        # Publish spans (decoded off the event loop) to Redis Streams
         # Layer 2 Hard Check and database storage deferred to worker
         # -------------------------------------------------------------------- #
         if spans:
@@ -264,24 +363,19 @@ class OTLPRouter:
                     f"[OTLP] Failed to preprocess and queue spans: {e}",
                     exc_info=True,
                 )
-                err_status = ProtoStatus(
-                    message="Failed to queue spans for processing."
-                )
-                return Response(
-                    content=err_status.SerializeToString(),
-                    media_type="application/x-protobuf",
+                return _error_response(
+                    "Failed to queue spans for processing.",
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    is_json=is_json,
                 )
 
         # -------------------------------------------------------------------- #
         # According to the OTLP/HTTP spec a full-success response must be an
-        # HTTP 200 with a serialized ExportTraceServiceResponse protobuf and
-        # the same Content-Type that the client used.
-        # We only support binary protobuf at the moment.
+        # HTTP 200 with a serialized ExportTraceServiceResponse and the same
+        # Content-Type that the client used.
         # -------------------------------------------------------------------- #
-        export_response = ExportTraceServiceResponse()
-        return Response(
-            content=export_response.SerializeToString(),
-            media_type="application/x-protobuf",
+        return _otlp_response(
+            ExportTraceServiceResponse(),
             status_code=status.HTTP_200_OK,
+            is_json=is_json,
         )
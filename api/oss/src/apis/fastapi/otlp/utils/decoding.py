@@ -0,0 +1,176 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, NamedTuple, Optional, Tuple
+
+from google.protobuf import json_format
+
+from oss.src.utils.logging import get_module_logger
+
+from oss.src.apis.fastapi.otlp.opentelemetry.otlp import (
+    parse_otlp_json,
+    parse_otlp_stream,
+)
+from oss.src.apis.fastapi.otlp.utils.processing import parse_from_otel_span_dto
+
+from oss.src.core.tracing.dtos import OTelFlatSpan
+
+
+log = get_module_logger(__name__)
+
+
+class OTLPDecoderSaturated(Exception):
+    """Raised when the decoder already holds `max_pending` requests."""
+
+
+class OTLPPayloadInvalid(Exception):
+    """Raised when an OTLP/JSON body is not a valid ExportTraceServiceRequest."""
+
+
+class DecodedOTLP(NamedTuple):
+    # Number of OTel spans found in the stream, before mapping.
+    otel_span_count: int
+    # Mapped spans, in stream order.
+    spans: List[OTelFlatSpan]
+    # (index, reason) of the OTel spans that could not be mapped.
+    skipped: List[Tuple[int, str]]
+
+
+def decode_otlp_stream(otlp_stream: bytes, is_json: bool = False) -> DecodedOTLP:
+    """Decode an inflated OTLP/HTTP body into spans.
+
+    Everything between the request body and `publish_spans` that is CPU-bound:
+    protobuf (or OTLP JSON) parsing and span mapping. The per-trace ingest
+    passes run in the tracing worker, once the trace is whole. Module-level and
+    free of request state so it can run on a worker process. Errors parsing the
+    stream itself propagate, as `OTLPPayloadInvalid` for malformed JSON; a span
+    that fails to map is skipped and reported in `skipped`.
+    """
+    if is_json:
+        try:
+            otel_spans = parse_otlp_json(otlp_stream)
+        except (
+            ValueError,  # malformed JSON, bad hex ids
+            TypeError,
+            AttributeError,  # not an object where one is expected
+            json_format.ParseError,
+        ) as e:
+            raise OTLPPayloadInvalid(f"{type(e).__name__}: {e}") from e
+    else:
+        otel_spans = parse_otlp_stream(otlp_stream)
+
+    spans = []
+    skipped = []
+    for idx, otel_span in enumerate(otel_spans):
+        try:
+            span = parse_from_otel_span_dto(otel_span)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            skipped.append((idx, f"{type(e).__name__}: {e}"))
+            continue
+
+        if span is None:
+            skipped.append((idx, "parser returned None"))
+            continue
+
+        spans.append(span)
+
+    return DecodedOTLP(
+        otel_span_count=len(otel_spans),
+        spans=spans,
+        skipped=skipped,
+    )
+
+
+class OTLPDecoder:
+    """Runs `decode_otlp_stream` off the event loop, with bounded admission.
+
+    With `processes=0` decoding runs on the loop's default thread pool, which
+    keeps the loop responsive between bytecodes without extra memory. With
+    `processes>0` it runs on a dedicated process pool (spawned, never forked
+    from the running loop), which takes the CPU off the API process entirely.
+
+    At most `max_pending` requests are admitted at once (queued + running);
+    past that `decode` raises `OTLPDecoderSaturated` so the caller can shed
+    load instead of buffering request bodies without bound. A caller that
+    buffers the body first takes its slot with `admit` before reading it, and
+    gives it back with `release` once decoded.
+    """
+
+    def __init__(
+        self,
+        *,
+        processes: int = 0,
+        max_pending: int = 16,
+    ):
+        self.processes = max(0, processes)
+        self.max_pending = max(1, max_pending)
+
+        self.pending = 0
+        self.rejected = 0
+
+        self._executor: Optional[Executor] = None
+
+    @property
+    def saturated(self) -> bool:
+        return self.pending >= self.max_pending
+
+    def _get_executor(self) -> Optional[Executor]:
+        if self.processes and self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+        return self._executor
+
+    def admit(self) -> bool:
+        """Take an admission slot; False (and counted as rejected) when full."""
+        # Checked and taken without awaiting, so it is exact on a single event
+        # loop.
+        if self.saturated:
+            self.rejected += 1
+            return False
+
+        self.pending += 1
+        return True
+
+    def release(self) -> None:
+        """Give back a slot taken with `admit`."""
+        self.pending -= 1
+
+    async def decode(
+        self,
+        otlp_stream: bytes,
+        is_json: bool = False,
+        *,
+        admitted: bool = False,
+    ) -> DecodedOTLP:
+        """Decode `otlp_stream`, in a slot of its own unless `admitted`."""
+        if not admitted and not self.admit():
+            raise OTLPDecoderSaturated()
+
+        try:
+            executor = self._get_executor()
+            try:
+                return await asyncio.get_running_loop().run_in_executor(
+                    executor,
+                    decode_otlp_stream,
+                    otlp_stream,
+                    is_json,
+                )
+            except BrokenProcessPool as e:
+                # A worker died (OOM, signal). Drop the pool so the next
+                # request starts a fresh one, and shed this request.
+                log.error("[OTLP] Decoder process pool broke; restarting it")
+                self.close()
+                self.rejected += 1
+                raise OTLPDecoderSaturated() from e
+        finally:
+            if not admitted:
+                self.release()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,116 @@
+import zlib
+from typing import AsyncIterator, Optional
+
+
+OTLP_PROTOBUF_MEDIA_TYPE = "application/x-protobuf"
+OTLP_JSON_MEDIA_TYPE = "application/json"
+
+# zlib wbits per Content-Encoding. `None` (no header) auto-detects gzip/zlib
+# framing from the magic bytes, as older exporters compress without saying so.
+_WBITS = {
+    "gzip": 16 + zlib.MAX_WBITS,
+    "x-gzip": 16 + zlib.MAX_WBITS,
+    "deflate": zlib.MAX_WBITS,
+}
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZLIB_MAGICS = (b"\x78\x01", b"\x78\x9c", b"\x78\xda")
+
+
+class OTLPBodyTooLarge(Exception):
+    """The body, compressed or inflated, exceeds the configured limit."""
+
+
+class OTLPBodyInvalid(Exception):
+    """The body is not valid for its Content-Encoding."""
+
+
+class OTLPUnsupportedEncoding(Exception):
+    """The Content-Encoding is not one the endpoint can inflate."""
+
+
+def is_otlp_json(content_type: Optional[str]) -> bool:
+    """OTLP/HTTP JSON is `application/json`; everything else is read as protobuf."""
+    media_type = (content_type or "").split(";", 1)[0].strip().lower()
+
+    return media_type == OTLP_JSON_MEDIA_TYPE
+
+
+def _sniff_wbits(head: bytes) -> Optional[int]:
+    if head[:2] == _GZIP_MAGIC:
+        return 16 + zlib.MAX_WBITS
+    if head[:2] in _ZLIB_MAGICS:
+        return zlib.MAX_WBITS
+    return None
+
+
+async def read_otlp_body(
+    chunks: AsyncIterator[bytes],
+    *,
+    content_encoding: Optional[str],
+    max_bytes: int,
+) -> bytes:
+    """Read a request body chunk by chunk, inflating as it arrives.
+
+    Both the bytes received and the bytes inflated are capped at `max_bytes`,
+    and the cap is enforced per chunk: inflation is bounded with `max_length`,
+    so a small compressed payload that expands to gigabytes is rejected after
+    at most `max_bytes + 1` inflated bytes rather than after inflating it all.
+    The compressed body is never held whole; chunks are inflated and dropped.
+    """
+    encoding = (content_encoding or "").strip().lower() or None
+    if encoding == "identity":
+        encoding = None
+    if encoding is not None and encoding not in _WBITS:
+        raise OTLPUnsupportedEncoding(encoding)
+
+    decompressor = None
+    sniffed = encoding is not None
+    if encoding is not None:
+        decompressor = zlib.decompressobj(_WBITS[encoding])
+
+    body = bytearray()
+    received = 0
+
+    def _append(data: bytes) -> None:
+        body.extend(data)
+        if len(body) > max_bytes:
+            raise OTLPBodyTooLarge()
+
+    async for chunk in chunks:
+        if not chunk:
+            continue
+
+        received += len(chunk)
+        if received > max_bytes:
+            raise OTLPBodyTooLarge()
+
+        if not sniffed:
+            sniffed = True
+            wbits = _sniff_wbits(chunk)
+            if wbits is not None:
+                decompressor = zlib.decompressobj(wbits)
+
+        if decompressor is None:
+            _append(chunk)
+            continue
+
+        try:
+            data = chunk
+            while data:
+                # Never inflate more than one byte past what the cap allows.
+                _append(decompressor.decompress(data, max_bytes - len(body) + 1))
+                data = decompressor.unconsumed_tail
+        except zlib.error as e:
+            raise OTLPBodyInvalid(str(e)) from e
+
+    if decompressor is not None:
+        try:
+            _append(decompressor.flush())
+        except zlib.error as e:
+            raise OTLPBodyInvalid(str(e)) from e
+
+        if not decompressor.eof:
+            raise OTLPBodyInvalid("truncated compressed body")
+
+    return bytes(body)
@@ -13,7 +13,7 @@ from oss.src.core.sessions.streams.dtos import (
     SessionStream,
     SessionStreamQueryFlags,
 )
-from oss.src.core.sessions.records.dtos import SessionRecord
+from oss.src.core.sessions.records.dtos import SessionRecord, SessionRecordCursor
 from oss.src.core.sessions.interactions.dtos import (
     SessionInteraction,
     SessionInteractionData,
@@ -148,11 +148,18 @@ class SessionStreamsResponse(BaseModel):
 
 class SessionRecordQueryRequest(BaseModel):
     session_id: str
+    # Records at or after this timestamp, as carried by `records-changed` watch events.
+    since: Optional[datetime] = None
+    # Records after this one, as returned by the previous read.
+    cursor: Optional[SessionRecordCursor] = None
+    limit: Optional[int] = Field(default=None, gt=0)
 
 
 class SessionRecordsQueryResponse(BaseModel):
     count: int
     records: List[SessionRecord]
+    # After the last record returned; pass it back as `cursor` to read on.
+    cursor: Optional[SessionRecordCursor] = None
 
 
 class SessionRecordResponse(BaseModel):
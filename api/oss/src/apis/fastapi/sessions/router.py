@@ -69,6 +69,7 @@ from oss.src.core.sessions.streams.service import SessionStreamsService
 from oss.src.core.sessions.records.service import RecordsService
 from oss.src.core.sessions.records.dtos import SessionRecordEvent
 from oss.src.core.sessions.records.streaming import publish_record
+from oss.src.core.sessions.records.utils import last_cursor
 from oss.src.core.sessions.interactions.dtos import (
     SessionInteractionCreate,
     SessionInteractionKind,
@@ -567,8 +568,10 @@ class SessionStreamsRouter:
         Emits change notifications only — never record payloads; clients
         revalidate through the regular query endpoints on each event:
 
-        - ``event: records-changed`` — ``{"session_id"}``; new/updated rows
-          landed in the record log (published post-DB-commit).
+        - ``event: records-changed`` — ``{"session_id", "since"?}``; new/updated
+          rows landed in the record log (published post-DB-commit), all at or
+          after ``since`` when it is set: query the records with that ``since``
+          to fetch only them.
         - ``event: lifecycle`` — ``{"session_id", "state": "running"|"ended"}``.
         - ``event: interaction`` — ``{"session_id", "status": "pending"|"resolved"}``.
         - ``: heartbeat`` comment frames while idle (keep-alive).
@@ -715,10 +718,14 @@ class RecordsRouter:
         records = await self.records_service.get_records(
             project_id=UUID(request.state.project_id),
             session_id=query_request.session_id,
+            since=query_request.since,
+            cursor=query_request.cursor,
+            limit=query_request.limit,
         )
         return SessionRecordsQueryResponse(
             count=len(records),
             records=records,
+            cursor=last_cursor(records) or query_request.cursor,
         )
 
     @intercept_exceptions()
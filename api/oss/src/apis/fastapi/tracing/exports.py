@@ -0,0 +1,117 @@
+"""NDJSON exports for ``POST /spans/export`` and ``POST /traces/export``.
+
+Queries build their whole response before sending it, which bounds them by API
+memory and the statement timeout. An export sends the batches of
+`TracingService.export` as they come, one JSON object per line, and reads the
+next batch only once the previous one is sent: the ASGI server holds `send`
+while the client's socket is full, so a slow reader slows the database cursor
+down instead of spans piling up in the API.
+"""
+
+from typing import AsyncGenerator, Awaitable, Callable, List, Optional, Set
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from orjson import dumps
+from pydantic import BaseModel
+
+from oss.src.utils.logging import get_module_logger
+
+log = get_module_logger(__name__)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+NDJSON_RESPONSE = {
+    200: {
+        "content": {
+            NDJSON_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}}
+        }
+    }
+}
+
+
+QUOTA_EXCEEDED_ERROR = "quota_exceeded"
+
+
+def _count_traces(batch: List[BaseModel], seen: Set[str]) -> int:
+    """Add the trace ids of `batch` to `seen`; return how many were not in it yet.
+
+    A trace can span batches (span exports, or a trace cut by the batch size),
+    so traces are counted once per export rather than once per batch.
+    """
+    before = len(seen)
+    seen.update(str(item.trace_id) for item in batch if getattr(item, "trace_id", None))
+    return len(seen) - before
+
+
+async def _next_batch(
+    batches: AsyncGenerator[List[BaseModel], None],
+) -> Optional[List[BaseModel]]:
+    try:
+        return await batches.__anext__()
+    except StopAsyncIteration:
+        return None
+
+
+def _to_ndjson(batch: List[BaseModel]) -> bytes:
+    return b"".join(
+        dumps(item.model_dump(mode="json", exclude_none=True)) + b"\n" for item in batch
+    )
+
+
+async def stream_ndjson(
+    *,
+    batches: AsyncGenerator[List[BaseModel], None],
+    allow: Callable[[int], Awaitable[bool]],
+    done: Callable[[int], Awaitable[None]],
+) -> StreamingResponse:
+    """Stream `batches` as NDJSON, metering the new traces of each batch with `allow`.
+
+    The first batch is read before the response starts, so that a bad filter
+    or an exhausted quota still gets its status code; past that, a batch over
+    the quota ends the export with a last `{"error": "quota_exceeded",
+    "count": n}` line, so the client can tell it was cut short. `done` gets
+    the number of traces sent, however the export ends.
+    """
+    seen: Set[str] = set()
+    first = await _next_batch(batches)
+
+    if first and not await allow(_count_traces(first, seen)):
+        await batches.aclose()
+        raise HTTPException(
+            status_code=429,
+            detail="You have reached your trace retrieval quota for this period.",
+        )
+
+    async def lines():
+        count = 0
+        batch = first
+
+        try:
+            while batch:
+                yield _to_ndjson(batch)
+                count = len(seen)
+
+                batch = await _next_batch(batches)
+
+                if batch and not await allow(_count_traces(batch, seen)):
+                    log.warning(
+                        "[tracing] export stopped at the trace retrieval quota",
+                        count=count,
+                    )
+                    yield dumps({"error": QUOTA_EXCEEDED_ERROR, "count": count}) + b"\n"
+                    return
+        finally:
+            try:
+                await batches.aclose()
+            finally:
+                await done(count)
+
+    return StreamingResponse(
+        lines(),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={
+            "Cache-Control": "no-cache",
+            # Disable proxy buffering so batches flow at the client's pace.
+            "X-Accel-Buffering": "no",
+        },
+    )
@@ -291,6 +291,24 @@ class TracesQueryRequest(BaseModel):
             "Pattern](/reference/api-guide/query-pattern#windowing))."
         ),
     )
+    fields: Optional[List[str]] = Field(
+        default=None,
+        description=(
+            "JSON fields to return: `attributes`, `events`, `links`, "
+            "`references`, `hashes`, or parts of attributes by path "
+            "(`attributes.ag.data.outputs`). Others are returned as null. "
+            "All by default."
+        ),
+    )
+    truncate: Optional[int] = Field(
+        default=None,
+        gt=0,
+        description=(
+            "Cap the returned parts of attributes, and `ag.data.inputs` / "
+            "`ag.data.outputs` within whole attributes, at this many "
+            "characters of JSON text."
+        ),
+    )
     #
     query_ref: Optional[Reference] = Field(
         default=None,
@@ -323,6 +341,24 @@ class SpansQueryRequest(BaseModel):
         default=None,
         description="Cursor pagination and time range.",
     )
+    fields: Optional[List[str]] = Field(
+        default=None,
+        description=(
+            "JSON fields to return: `attributes`, `events`, `links`, "
+            "`references`, `hashes`, or parts of attributes by path "
+            "(`attributes.ag.data.outputs`). Others are returned as null. "
+            "All by default."
+        ),
+    )
+    truncate: Optional[int] = Field(
+        default=None,
+        gt=0,
+        description=(
+            "Cap the returned parts of attributes, and `ag.data.inputs` / "
+            "`ag.data.outputs` within whole attributes, at this many "
+            "characters of JSON text."
+        ),
+    )
     #
     query_ref: Optional[Reference] = Field(
         default=None,
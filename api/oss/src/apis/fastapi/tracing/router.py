@@ -2,6 +2,7 @@ from typing import Optional, List, Tuple
 from uuid import UUID
 
 from fastapi import APIRouter, Query, Request, Depends, status, HTTPException, Body
+from fastapi.responses import StreamingResponse
 
 from oss.src.utils.common import is_ee
 from oss.src.utils.logging import get_module_logger
@@ -41,6 +42,14 @@ from oss.src.core.events.utils import (
 from oss.src.core.tracing.service import TracingService
 from oss.src.core.tracing.utils.parsing import parse_trace_id_to_uuid
 from oss.src.core.tracing.utils.trees import traces_to_trace_map
+from oss.src.dbs.redis.shared.engine import get_streams_engine
+from oss.src.dbs.redis.tracing.watch import TRACE_WAIT_MAX_SECONDS, trace_watch_channel
+from oss.src.apis.fastapi.tracing.watch import wait_for_trace
+from oss.src.apis.fastapi.tracing.exports import (
+    NDJSON_MEDIA_TYPE,
+    NDJSON_RESPONSE,
+    stream_ndjson,
+)
 
 # TYPE_CHECKING to avoid circular import at runtime
 from typing import TYPE_CHECKING
@@ -71,6 +80,48 @@ if is_ee():
     from ee.src.core.access.entitlements.service import check_entitlements, Counter
 
 
+async def _allow_retrieval(count: int) -> bool:
+    if not is_ee() or not count:
+        return True
+
+    allowed, _, _ = await check_entitlements(  # type: ignore
+        key=Counter.TRACES_RETRIEVED,  # type: ignore
+        delta=count,
+    )
+
+    return allowed
+
+
+async def _fetch_trace(
+    service: TracingService,
+    *,
+    project_id: UUID,
+    trace_id: str,
+    wait: Optional[float] = None,
+):
+    """Fetch a trace; with `wait`, long-poll up to that many seconds for its commit."""
+    trace = await service.fetch_trace(
+        project_id=project_id,
+        #
+        trace_id=trace_id,
+    )
+
+    if trace or not wait:
+        return trace
+
+    # The first fetch has validated `trace_id`, so the channel can be derived from it.
+    return await wait_for_trace(
+        channel=trace_watch_channel(str(project_id), trace_id),
+        pubsub_factory=lambda: get_streams_engine().get_redis().pubsub(),
+        fetch=lambda: service.fetch_trace(
+            project_id=project_id,
+            #
+            trace_id=trace_id,
+        ),
+        timeout=wait,
+    )
+
+
 class TracingRouter:
     def __init__(
         self,
@@ -632,6 +683,7 @@ class TracingRouter:
         self,
         request: Request,
         trace_id: str,
+        wait: Optional[float] = Query(default=None, ge=0, le=TRACE_WAIT_MAX_SECONDS),
     ) -> OTelTracingResponse:
         """Fetch a single trace by `trace_id`.
 
@@ -640,6 +692,10 @@ class TracingRouter:
         project. `trace_id` must be a 32-char hex UUID; any other format
         returns `400`.
 
+        With `wait` (seconds, at most 30), a trace that is not stored yet is
+        waited for until the ingestion worker commits it, instead of
+        returning empty right away.
+
         For flat-list retrieval across many traces, use
         `POST /tracing/spans/query` with `focus="span"`.
         """
@@ -651,10 +707,11 @@ class TracingRouter:
             raise FORBIDDEN_EXCEPTION  # type: ignore
 
         try:
-            trace = await self.service.fetch_trace(
+            trace = await _fetch_trace(
+                self.service,
                 project_id=UUID(request.state.project_id),
-                #
                 trace_id=trace_id,
+                wait=wait,
             )
         except TypeError as e:
             raise HTTPException(status_code=400, detail="Invalid trace_id.") from e
@@ -952,6 +1009,17 @@ class SpansRouter:
             response_model_exclude_none=True,
         )
 
+        self.router.add_api_route(
+            "/export",
+            self.export_spans,
+            methods=["POST"],
+            operation_id="export_spans",
+            status_code=status.HTTP_200_OK,
+            response_model=None,
+            response_class=StreamingResponse,
+            responses=NDJSON_RESPONSE,
+        )
+
         self.router.add_api_route(
             "/analytics/query",
             self.query_analytics,
@@ -1094,6 +1162,8 @@ class SpansRouter:
                 query_revision_ref=spans_query_request.query_revision_ref,
                 filtering=spans_query_request.filtering,
                 windowing=spans_query_request.windowing,
+                fields=spans_query_request.fields,
+                truncate=spans_query_request.truncate,
                 default_focus=Focus.SPAN,
                 conflict_focus=Focus.TRACE,
                 conflict_detail=(
@@ -1144,6 +1214,85 @@ class SpansRouter:
             spans=spans,
         )
 
+    @intercept_exceptions()
+    async def export_spans(
+        self,
+        request: Request,
+        spans_query_request: SpansQueryRequest = Body(
+            default_factory=SpansQueryRequest
+        ),
+    ) -> StreamingResponse:
+        """Export spans as NDJSON, one span per line.
+
+        Takes the body of `POST /spans/query` and streams every span it
+        matches, newest first, in one response: no cursor to follow, and
+        memory bounded by a batch rather than by the export.
+        `windowing.limit` caps the export when set.
+
+        Spans are read from the database as the client reads the response.
+        Errors before the first span get their status codes; an export cut
+        short by the trace retrieval quota just ends.
+        """
+        if not await check_action_access(  # type: ignore
+            user_uid=request.state.user_id,
+            project_id=request.state.project_id,
+            permission=Permission.VIEW_SPANS,  # type: ignore
+        ):
+            raise FORBIDDEN_EXCEPTION  # type: ignore
+
+        project_id = UUID(request.state.project_id)
+        if (
+            spans_query_request.query_ref
+            or spans_query_request.query_variant_ref
+            or spans_query_request.query_revision_ref
+        ):
+            if not await check_action_access(  # type: ignore
+                user_uid=request.state.user_id,
+                project_id=request.state.project_id,
+                permission=Permission.VIEW_QUERIES,  # type: ignore
+            ):
+                raise FORBIDDEN_EXCEPTION  # type: ignore
+
+        try:
+            query = await self.service.resolve_query_request(
+                project_id=project_id,
+                queries_service=self.queries_service,
+                query_ref=spans_query_request.query_ref,
+                query_variant_ref=spans_query_request.query_variant_ref,
+                query_revision_ref=spans_query_request.query_revision_ref,
+                filtering=spans_query_request.filtering,
+                windowing=spans_query_request.windowing,
+                fields=spans_query_request.fields,
+                truncate=spans_query_request.truncate,
+                default_focus=Focus.SPAN,
+                conflict_focus=Focus.TRACE,
+                conflict_detail=(
+                    "Query revision formatting.focus=trace. "
+                    "Use /traces/export for this query revision."
+                ),
+            )
+        except QueryFocusConflictError as e:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=e.detail,
+            ) from e
+
+        if query is None:
+            return StreamingResponse(iter(()), media_type=NDJSON_MEDIA_TYPE)
+
+        try:
+            return await stream_ndjson(
+                batches=self.service.export(
+                    project_id=project_id,
+                    #
+                    query=query,
+                ),
+                allow=_allow_retrieval,
+                done=lambda count: publish_trace_queried(request=request, count=count),
+            )
+        except FilteringException as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+
     @intercept_exceptions()
     @suppress_exceptions(default=SpansResponse(), exclude=[HTTPException])
     async def fetch_spans(
@@ -1413,6 +1562,17 @@ class TracesRouter:
             response_model_exclude_none=True,
         )
 
+        self.router.add_api_route(
+            "/export",
+            self.export_traces,
+            methods=["POST"],
+            operation_id="export_traces",
+            status_code=status.HTTP_200_OK,
+            response_model=None,
+            response_class=StreamingResponse,
+            responses=NDJSON_RESPONSE,
+        )
+
         self.deprecated_router.add_api_route(
             "/ingest",
             self.ingest_traces,
@@ -1554,6 +1714,8 @@ class TracesRouter:
                 query_revision_ref=traces_query_request.query_revision_ref,
                 filtering=traces_query_request.filtering,
                 windowing=traces_query_request.windowing,
+                fields=traces_query_request.fields,
+                truncate=traces_query_request.truncate,
                 default_focus=Focus.TRACE,
                 conflict_focus=Focus.SPAN,
                 conflict_detail=(
@@ -1667,6 +1829,85 @@ class TracesRouter:
             trace_id=trace_id,
         )
 
+    @intercept_exceptions()
+    async def export_traces(
+        self,
+        request: Request,
+        traces_query_request: TracesQueryRequest = Body(
+            default_factory=TracesQueryRequest
+        ),
+    ) -> StreamingResponse:
+        """Export traces as NDJSON, one trace (with its span tree) per line.
+
+        Takes the body of `POST /traces/query` and streams every trace it
+        matches, by latest span, newest first, in one response: no cursor to
+        follow, and memory bounded by a batch rather than by the export.
+        `windowing.limit` caps the number of traces when set.
+
+        Spans are read from the database as the client reads the response.
+        Errors before the first trace get their status codes; an export cut
+        short by the trace retrieval quota just ends.
+        """
+        if not await check_action_access(  # type: ignore
+            user_uid=request.state.user_id,
+            project_id=request.state.project_id,
+            permission=Permission.VIEW_SPANS,  # type: ignore
+        ):
+            raise FORBIDDEN_EXCEPTION  # type: ignore
+
+        project_id = UUID(request.state.project_id)
+        if (
+            traces_query_request.query_ref
+            or traces_query_request.query_variant_ref
+            or traces_query_request.query_revision_ref
+        ):
+            if not await check_action_access(  # type: ignore
+                user_uid=request.state.user_id,
+                project_id=request.state.project_id,
+                permission=Permission.VIEW_QUERIES,  # type: ignore
+            ):
+                raise FORBIDDEN_EXCEPTION  # type: ignore
+
+        try:
+            query = await self.service.resolve_query_request(
+                project_id=project_id,
+                queries_service=self.queries_service,
+                query_ref=traces_query_request.query_ref,
+                query_variant_ref=traces_query_request.query_variant_ref,
+                query_revision_ref=traces_query_request.query_revision_ref,
+                filtering=traces_query_request.filtering,
+                windowing=traces_query_request.windowing,
+                fields=traces_query_request.fields,
+                truncate=traces_query_request.truncate,
+                default_focus=Focus.TRACE,
+                conflict_focus=Focus.SPAN,
+                conflict_detail=(
+                    "Query revision formatting.focus=span. "
+                    "Use /spans/export for this query revision."
+                ),
+            )
+        except QueryFocusConflictError as e:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=e.detail,
+            ) from e
+
+        if query is None:
+            return StreamingResponse(iter(()), media_type=NDJSON_MEDIA_TYPE)
+
+        try:
+            return await stream_ndjson(
+                batches=self.service.export(
+                    project_id=project_id,
+                    #
+                    query=query,
+                ),
+                allow=_allow_retrieval,
+                done=lambda count: publish_trace_queried(request=request, count=count),
+            )
+        except FilteringException as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+
     @intercept_exceptions()
     async def ingest_traces(  # MUTATION
         self,
@@ -1889,6 +2130,7 @@ class TracesRouter:
         request: Request,
         *,
         trace_id: str,
+        wait: Optional[float] = Query(default=None, ge=0, le=TRACE_WAIT_MAX_SECONDS),
     ) -> TraceResponse:
         """Fetch a single trace by `trace_id` in the canonical `Trace` shape.
 
@@ -1896,6 +2138,8 @@ class TracesRouter:
         `trace_id` must be a 32-char hex UUID; any other format returns
         `400`. The reserved path segments `query` and `ingest` return
         `405` to disambiguate from the sibling query/ingest endpoints.
+        With `wait` (seconds, at most 30), a trace not stored yet is waited
+        for until the ingestion worker commits it.
         """
         if trace_id.lower() in {"query", "ingest"}:
             raise HTTPException(
@@ -1911,10 +2155,11 @@ class TracesRouter:
             raise FORBIDDEN_EXCEPTION  # type: ignore
 
         try:
-            trace = await self.service.fetch_trace(
+            trace = await _fetch_trace(
+                self.service,
                 project_id=UUID(request.state.project_id),
-                #
                 trace_id=trace_id,
+                wait=wait,
             )
         except TypeError as e:
             raise HTTPException(status_code=400, detail="Invalid trace_id.") from e
@@ -81,13 +81,32 @@ def _parse_filtering(
     return _filtering
 
 
+def _parse_fields(
+    fields: Optional[Union[List[str], str]] = None,
+) -> Optional[List[str]]:
+    # Accepts either a list or a comma-separated string
+    if fields is None:
+        return None
+
+    if isinstance(fields, str):
+        fields = [fields]
+
+    return [
+        field.strip() for value in fields for field in value.split(",") if field.strip()
+    ]
+
+
 def _parse_formatting(
     focus: Focus = Focus.TRACE,
     format: Format = Format.AGENTA,  # pylint: disable=redefined-builtin
+    fields: Optional[Union[List[str], str]] = None,
+    truncate: Optional[int] = None,
 ) -> Optional[Formatting]:
     _formatting = Formatting(
         focus=focus or Focus.TRACE,
         format=format or Format.AGENTA,
+        fields=_parse_fields(fields),
+        truncate=truncate,
     )
 
     return _formatting
@@ -97,6 +116,9 @@ def parse_query_from_params_request(
     # GROUPING
     focus: Optional[Focus] = Query(None),
     format: Optional[Format] = Query(None),  # pylint: disable=redefined-builtin
+    # PROJECTION
+    fields: Optional[List[str]] = Query(None),
+    truncate: Optional[int] = Query(None),
     # WINDOWING
     oldest: Optional[Union[str, int]] = Query(None),
     newest: Optional[Union[str, int]] = Query(None),
@@ -110,6 +132,9 @@ def parse_query_from_params_request(
         focus=focus,
         format=format,
         #
+        fields=fields,
+        truncate=truncate,
+        #
         oldest=oldest,
         newest=newest,
         limit=limit,
@@ -124,6 +149,9 @@ def parse_query_from_body_request(
     # GROUPING
     focus: Optional[Focus] = None,
     format: Optional[Format] = None,  # pylint: disable=redefined-builtin
+    # PROJECTION
+    fields: Optional[Union[List[str], str]] = None,
+    truncate: Optional[int] = None,
     # WINDOWING
     oldest: Optional[Union[str, int]] = None,
     newest: Optional[Union[str, int]] = None,
@@ -138,6 +166,8 @@ def parse_query_from_body_request(
             formatting=_parse_formatting(
                 focus=focus,
                 format=format,
+                fields=fields,
+                truncate=truncate,
             ),
             windowing=_parse_windowing(
                 oldest=oldest,
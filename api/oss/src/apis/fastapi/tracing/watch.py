@@ -0,0 +1,82 @@
+"""Long-poll for ``GET /tracing/traces/{trace_id}?wait=...``.
+
+A trace written through OTLP becomes readable only once the ingestion worker has
+committed it, a few hundred milliseconds after the export returns. Rather than
+have clients sleep-poll the fetch endpoint, a waiter subscribes to the trace's
+commit channel (published by `TracingWorker`) and re-reads once it fires, bounded
+by the caller's `wait`.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from oss.src.utils.logging import get_module_logger
+
+log = get_module_logger(__name__)
+
+T = TypeVar("T")
+
+
+async def wait_for_trace(
+    *,
+    channel: str,
+    pubsub_factory: Callable[[], Any],
+    fetch: Callable[[], Awaitable[Optional[T]]],
+    timeout: float,
+) -> Optional[T]:
+    """Return `fetch()` once it finds the trace, or its last miss after `timeout`.
+
+    The read after ``subscribe`` closes the gap between the caller's first miss and
+    the subscription going live: a commit published in between is seen by that read.
+    Any message on the channel triggers a re-read; the loop continues on a miss (the
+    spans of one trace may land across several worker batches) until the deadline.
+    A broken subscription degrades to the plain fetch, never to an error.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+
+    pubsub = pubsub_factory()
+    try:
+        await pubsub.subscribe(channel)
+
+        trace = await fetch()
+        while not trace:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+
+            message = await pubsub.get_message(
+                ignore_subscribe_messages=True,
+                timeout=remaining,
+            )
+            if message is None or message.get("type") != "message":
+                continue
+
+            trace = await fetch()
+
+        return trace
+    except Exception as exc:
+        log.warning(
+            "[WATCH] trace wait failed",
+            channel=channel,
+            error=repr(exc),
+        )
+        return await fetch()
+    finally:
+        # Two independent attempts: a failing unsubscribe must not skip the close.
+        try:
+            await pubsub.unsubscribe(channel)
+        except Exception as exc:  # pragma: no cover — teardown is best-effort
+            log.warning(
+                "[WATCH] pubsub unsubscribe failed",
+                channel=channel,
+                error=repr(exc),
+            )
+        try:
+            await pubsub.aclose()
+        except Exception as exc:  # pragma: no cover — teardown is best-effort
+            log.warning(
+                "[WATCH] pubsub close failed",
+                channel=channel,
+                error=repr(exc),
+            )
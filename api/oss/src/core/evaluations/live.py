@@ -0,0 +1,355 @@
+"""Push side of live evaluations: hand freshly ingested traces to live runs.
+
+The spans worker calls `LiveEvaluationsDispatcher.spans_ingested` after every
+committed project batch. Traces whose root span is in the batch are matched
+against an in-memory index of the live runs, keyed by project and by the
+trace type their query selects, and narrowed by the references it requires.
+Each matching run gets one task per temporal bucket with its trace ids,
+instead of waiting for the scheduler to scan the run's window.
+
+The index is a prefilter: the task still matches the traces against the run's
+full query (`resolve_live_query_traces(trace_ids=...)`), so a false positive
+costs one indexed lookup and never mints a scenario.
+"""
+
+from asyncio import Lock
+from datetime import datetime, timedelta, timezone
+from time import monotonic
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Set, Tuple
+from uuid import UUID
+
+from oss.src.core.evaluations.types import EvaluationRun
+from oss.src.core.shared.dtos import Reference
+from oss.src.core.tracing.dtos import Filtering, OTelFlatSpan
+from oss.src.utils.logging import get_module_logger
+
+log = get_module_logger(__name__)
+
+DEFAULT_INDEX_TTL = 15  # second(s)
+DEFAULT_BUCKET_INTERVAL = 1  # minute(s), the scheduler's refresh interval
+
+
+class LiveRunKeys(NamedTuple):
+    """What a trace must carry to possibly match one query step of a live run.
+
+    None means "anything": the query does not constrain it at its top level.
+    """
+
+    trace_types: Optional[FrozenSet[str]]
+    reference_ids: Optional[FrozenSet[str]]
+
+
+class LiveRunEntry(NamedTuple):
+    run_id: UUID
+    user_id: UUID
+    keys: LiveRunKeys
+
+
+def _value(value: Any) -> Any:
+    return getattr(value, "value", value)
+
+
+def compile_live_keys(filtering: Optional[Filtering]) -> LiveRunKeys:
+    """Read the index keys off the top-level AND conditions of a query filter.
+
+    Only `trace_type is/in` and `references in` narrow the keys; anything else
+    (nested filters, OR, other fields) is left to the exact match in the task.
+    """
+    trace_types: Optional[Set[str]] = None
+    reference_ids: Optional[Set[str]] = None
+
+    if filtering is None or _value(filtering.operator) not in (None, "and"):
+        return LiveRunKeys(trace_types=None, reference_ids=None)
+
+    for condition in filtering.conditions or []:
+        if isinstance(condition, Filtering):
+            continue
+
+        operator = _value(condition.operator)
+
+        if condition.field == "trace_type" and operator in ("is", "in"):
+            values = condition.value if operator == "in" else [condition.value]
+            if not isinstance(values, list):
+                continue
+            types = {str(_value(value)) for value in values if value is not None}
+            # A union keeps the prefilter loose: the exact match narrows it.
+            trace_types = types if trace_types is None else trace_types | types
+
+        elif condition.field == "references" and operator == "in":
+            if not isinstance(condition.value, list):
+                continue
+            ids = set()
+            for reference in condition.value:
+                reference_id = (
+                    reference.get("id")
+                    if isinstance(reference, dict)
+                    else getattr(reference, "id", None)
+                )
+                if not reference_id:
+                    # A slug-only reference cannot be matched by id.
+                    ids = None
+                    break
+                ids.add(str(reference_id))
+            if ids is not None:
+                reference_ids = ids if reference_ids is None else reference_ids | ids
+
+    return LiveRunKeys(
+        trace_types=frozenset(trace_types) if trace_types is not None else None,
+        reference_ids=frozenset(reference_ids) if reference_ids is not None else None,
+    )
+
+
+def _matches(
+    keys: LiveRunKeys,
+    *,
+    trace_types: Set[str],
+    reference_ids: Set[str],
+) -> bool:
+    if keys.trace_types is not None and not keys.trace_types & trace_types:
+        return False
+    if keys.reference_ids is not None and not keys.reference_ids & reference_ids:
+        return False
+    return True
+
+
+class LiveRunsIndex:
+    """Live runs by project and trace type, reloaded at most every `ttl` seconds.
+
+    Query revisions are immutable, so the ones loaded by id are kept across
+    reloads for as long as a live run still uses them.
+    """
+
+    def __init__(
+        self,
+        *,
+        evaluations_service: Any,
+        queries_service: Any,
+        #
+        ttl: float = DEFAULT_INDEX_TTL,
+    ):
+        self.evaluations_service = evaluations_service
+        self.queries_service = queries_service
+        self.ttl = ttl
+
+        self._entries: Dict[UUID, Dict[Optional[str], List[LiveRunEntry]]] = {}
+        self._revisions: Dict[UUID, Any] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = Lock()
+
+    async def entries(
+        self,
+        *,
+        project_id: UUID,
+    ) -> Dict[Optional[str], List[LiveRunEntry]]:
+        if self._loaded_at is None or monotonic() - self._loaded_at >= self.ttl:
+            async with self._lock:
+                # Another lane may have reloaded while this one waited.
+                if self._loaded_at is None or monotonic() - self._loaded_at >= self.ttl:
+                    await self.reload()
+
+        return self._entries.get(project_id, {})
+
+    async def reload(self) -> None:
+        entries: Dict[UUID, Dict[Optional[str], List[LiveRunEntry]]] = {}
+        revisions: Dict[UUID, Any] = {}
+
+        try:
+            live_runs = await self.evaluations_service.fetch_live_runs()
+        except Exception:  # pylint: disable=broad-exception-caught
+            # Keep serving the previous index; retry once the ttl expires.
+            log.warning("[LIVE] Failed to load live runs", exc_info=True)
+            self._loaded_at = monotonic()
+            return
+
+        for project_id, run in live_runs:
+            try:
+                run_keys = await self._run_keys(
+                    project_id=project_id,
+                    run=run,
+                    revisions=revisions,
+                )
+            except Exception:  # pylint: disable=broad-exception-caught
+                log.warning(
+                    "[LIVE] Failed to index live run",
+                    project_id=str(project_id),
+                    run_id=str(run.id),
+                    exc_info=True,
+                )
+                continue
+
+            by_type = entries.setdefault(project_id, {})
+            for keys in run_keys:
+                entry = LiveRunEntry(
+                    run_id=run.id,
+                    user_id=run.created_by_id,
+                    keys=keys,
+                )
+                for trace_type in keys.trace_types or [None]:
+                    by_type.setdefault(trace_type, []).append(entry)
+
+        self._entries = entries
+        self._revisions = revisions
+        self._loaded_at = monotonic()
+
+    async def _run_keys(
+        self,
+        *,
+        project_id: UUID,
+        run: EvaluationRun,
+        revisions: Dict[UUID, Any],
+    ) -> List[LiveRunKeys]:
+        run_keys: List[LiveRunKeys] = []
+
+        for step in run.data.steps if run.data and run.data.steps else []:
+            if step.type != "input":
+                continue
+
+            query_revision_ref = (step.references or {}).get("query_revision")
+            if not isinstance(query_revision_ref, Reference):
+                continue
+
+            query_revision = (
+                self._revisions.get(query_revision_ref.id)
+                if query_revision_ref.id
+                else None
+            )
+            if query_revision is None:
+                query_revision = await self.queries_service.fetch_query_revision(
+                    project_id=project_id,
+                    #
+                    query_revision_ref=query_revision_ref,
+                )
+            if not query_revision or not getattr(query_revision, "data", None):
+                # Invalid live runs are closed by the scheduler's refresh.
+                continue
+
+            if query_revision_ref.id:
+                revisions[query_revision_ref.id] = query_revision
+
+            run_keys.append(compile_live_keys(query_revision.data.filtering))
+
+        return run_keys
+
+    async def match(
+        self,
+        *,
+        project_id: UUID,
+        span_dtos: List[OTelFlatSpan],
+    ) -> Dict[UUID, Tuple[LiveRunEntry, List[OTelFlatSpan]]]:
+        """The root spans of the batch, grouped by the live runs they may match."""
+        by_type = await self.entries(project_id=project_id)
+        if not by_type:
+            return {}
+
+        trace_types: Dict[str, Set[str]] = {}
+        reference_ids: Dict[str, Set[str]] = {}
+        roots: Dict[str, OTelFlatSpan] = {}
+
+        for span in span_dtos:
+            trace_id = str(span.trace_id)
+            if span.parent_id is None:
+                roots[trace_id] = span
+            if span.trace_type is not None:
+                trace_types.setdefault(trace_id, set()).add(
+                    str(_value(span.trace_type))
+                )
+            for reference in span.references or []:
+                if reference.id:
+                    reference_ids.setdefault(trace_id, set()).add(str(reference.id))
+
+        matches: Dict[UUID, Tuple[LiveRunEntry, List[OTelFlatSpan]]] = {}
+
+        for trace_id, root in roots.items():
+            types = trace_types.get(trace_id, set())
+            ids = reference_ids.get(trace_id, set())
+
+            candidates = [
+                entry
+                for trace_type in [None, *types]
+                for entry in by_type.get(trace_type, [])
+            ]
+            for entry in candidates:
+                # A run is listed once per query step: count the trace once.
+                if entry.run_id in matches and matches[entry.run_id][1][-1] is root:
+                    continue
+                if not _matches(entry.keys, trace_types=types, reference_ids=ids):
+                    continue
+                matches.setdefault(entry.run_id, (entry, []))[1].append(root)
+
+        return matches
+
+
+def bucket_of(
+    start_time: Any,
+    *,
+    interval: int = DEFAULT_BUCKET_INTERVAL,
+) -> datetime:
+    """The start of the `interval`-minute bucket a root span starts in."""
+    if not isinstance(start_time, datetime):
+        start_time = datetime.now(timezone.utc)
+    if start_time.tzinfo is None:
+        start_time = start_time.replace(tzinfo=timezone.utc)
+
+    epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    minutes = int((start_time - epoch).total_seconds() // 60)
+
+    return epoch + timedelta(minutes=minutes - minutes % max(interval, 1))
+
+
+class LiveEvaluationsDispatcher:
+    """Tracing ingest listener that pushes matching traces into live runs.
+
+    Satisfies `TracingIngestListenerInterface`; construction and wiring stay in
+    `api/entrypoints/*`.
+    """
+
+    def __init__(
+        self,
+        *,
+        index: LiveRunsIndex,
+        evaluations_task_runner: Any,
+        #
+        interval: int = DEFAULT_BUCKET_INTERVAL,
+    ):
+        self.index = index
+        self.evaluations_task_runner = evaluations_task_runner
+        self.interval = interval
+
+    async def spans_ingested(
+        self,
+        *,
+        project_id: UUID,
+        span_dtos: List[OTelFlatSpan],
+    ) -> None:
+        matches = await self.index.match(
+            project_id=project_id,
+            span_dtos=span_dtos,
+        )
+
+        for entry, roots in matches.values():
+            buckets: Dict[datetime, List[str]] = {}
+            for root in roots:
+                oldest = bucket_of(root.start_time, interval=self.interval)
+                buckets.setdefault(oldest, []).append(str(root.trace_id))
+
+            for oldest, trace_ids in buckets.items():
+                try:
+                    await self.evaluations_task_runner.process_run_from_traces(
+                        project_id=project_id,
+                        user_id=entry.user_id,
+                        #
+                        run_id=entry.run_id,
+                        #
+                        trace_ids=trace_ids,
+                        #
+                        newest=oldest + timedelta(minutes=self.interval),
+                        oldest=oldest,
+                    )
+                except Exception:  # pylint: disable=broad-exception-caught
+                    log.warning(
+                        "[LIVE] Failed to dispatch pushed traces",
+                        project_id=str(project_id),
+                        run_id=str(entry.run_id),
+                        count=len(trace_ids),
+                        exc_info=True,
+                    )
@@ -191,7 +191,10 @@ class APIScenarioCreator:
 class APIResultSetter:
     """Stateless: only the service is held. The request context
     (project_id/user_id/timestamp/interval) is passed per `set` call — bound at
-    the slice boundary where it is known, not at construction."""
+    the slice boundary where it is known, not at construction.
+
+    `build` + `set_many` split the single `set` so a per-slice binder can buffer
+    the built cells and write them in bulk."""
 
     def __init__(
         self,
@@ -200,6 +203,52 @@ class APIResultSetter:
     ):
         self.evaluations_service = evaluations_service
 
+    def build(
+        self,
+        *,
+        cell,
+        trace_id=None,
+        hash_id=None,
+        testcase_id=None,
+        error=None,
+        #
+        timestamp: Any = None,
+        interval: Optional[int] = None,
+    ) -> EvaluationResultCreate:
+        return EvaluationResultCreate(
+            run_id=cell.run_id,
+            #
+            scenario_id=cell.scenario_id,
+            step_key=cell.step_key,
+            repeat_idx=cell.repeat_idx,
+            #
+            status=_status(cell.status),
+            trace_id=(trace_id if trace_id is not None else cell.trace_id),
+            hash_id=(
+                hash_id if hash_id is not None else getattr(cell, "hash_id", None)
+            ),
+            testcase_id=(testcase_id if testcase_id is not None else cell.testcase_id),
+            error=error if error is not None else cell.error,
+            #
+            timestamp=timestamp,
+            interval=interval,
+        )
+
+    async def set_many(
+        self,
+        *,
+        project_id: UUID,
+        user_id: UUID,
+        #
+        results: List[EvaluationResultCreate],
+    ) -> List[Any]:
+        return await self.evaluations_service.set_results(
+            project_id=project_id,
+            user_id=user_id,
+            #
+            results=results,
+        )
+
     async def set(
         self,
         *,
@@ -216,29 +265,17 @@ class APIResultSetter:
         timestamp: Any = None,
         interval: Optional[int] = None,
     ) -> Any:
-        results = await self.evaluations_service.set_results(
+        results = await self.set_many(
             project_id=project_id,
             user_id=user_id,
             #
             results=[
-                EvaluationResultCreate(
-                    run_id=cell.run_id,
-                    #
-                    scenario_id=cell.scenario_id,
-                    step_key=cell.step_key,
-                    repeat_idx=cell.repeat_idx,
-                    #
-                    status=_status(cell.status),
-                    trace_id=(trace_id if trace_id is not None else cell.trace_id),
-                    hash_id=(
-                        hash_id
-                        if hash_id is not None
-                        else getattr(cell, "hash_id", None)
-                    ),
-                    testcase_id=(
-                        testcase_id if testcase_id is not None else cell.testcase_id
-                    ),
-                    error=error if error is not None else cell.error,
+                self.build(
+                    cell=cell,
+                    trace_id=trace_id,
+                    hash_id=hash_id,
+                    testcase_id=testcase_id,
+                    error=error,
                     #
                     timestamp=timestamp,
                     interval=interval,
@@ -255,6 +292,9 @@ class APIScenarioEditor:
     a property of `process` itself (shared by ingest + re-execute) rather than a
     separate post-process. Tolerates a mid-flight run close: closing is a lock,
     not a failure, so a write that loses the race is skipped, not raised.
+
+    `build` + `edit_many` split the single write so a per-slice binder can
+    buffer the edits and write them in bulk.
     """
 
     def __init__(
@@ -264,6 +304,49 @@ class APIScenarioEditor:
     ):
         self.evaluations_service = evaluations_service
 
+    def build(
+        self,
+        *,
+        scenario: Any,
+        status: Any,
+    ) -> EvaluationScenarioEdit:
+        # The edit is a full PUT: carry EVERY persisted scenario field, not
+        # just status, or the omitted ones are wiped on write (dropped flags
+        # leave the scenario grey; dropped interval/timestamp break temporal
+        # metrics). Only `status` is the value being changed here.
+        return EvaluationScenarioEdit(
+            id=scenario.id,
+            #
+            flags=getattr(scenario, "flags", None),
+            tags=getattr(scenario, "tags", None),
+            meta=getattr(scenario, "meta", None),
+            #
+            interval=getattr(scenario, "interval", None),
+            timestamp=getattr(scenario, "timestamp", None),
+            #
+            status=_status(status),
+        )
+
+    async def edit_many(
+        self,
+        *,
+        project_id: UUID,
+        user_id: UUID,
+        #
+        scenarios: List[EvaluationScenarioEdit],
+    ) -> List[Any]:
+        # A scenario edited twice in one batch keeps its last status.
+        latest = {scenario.id: scenario for scenario in scenarios}
+        try:
+            return await self.evaluations_service.edit_scenarios(
+                project_id=project_id,
+                user_id=user_id,
+                #
+                scenarios=list(latest.values()),
+            )
+        except EvaluationClosedConflict:
+            return []
+
     async def __call__(
         self,
         *,
@@ -274,26 +357,11 @@ class APIScenarioEditor:
         status: Any,
     ) -> Any:
         try:
-            # The edit is a full PUT: carry EVERY persisted scenario field, not
-            # just status, or the omitted ones are wiped on write (dropped flags
-            # leave the scenario grey; dropped interval/timestamp break temporal
-            # metrics). Only `status` is the value being changed here.
             return await self.evaluations_service.edit_scenario(
                 project_id=project_id,
                 user_id=user_id,
                 #
-                scenario=EvaluationScenarioEdit(
-                    id=scenario.id,
-                    #
-                    flags=getattr(scenario, "flags", None),
-                    tags=getattr(scenario, "tags", None),
-                    meta=getattr(scenario, "meta", None),
-                    #
-                    interval=getattr(scenario, "interval", None),
-                    timestamp=getattr(scenario, "timestamp", None),
-                    #
-                    status=_status(status),
-                ),
+                scenario=self.build(scenario=scenario, status=status),
             )
         except EvaluationClosedConflict:
             return None
@@ -40,6 +40,37 @@ class TaskiqEvaluationTaskRunner(EvaluationTaskRunner):
         result = await self.worker.process_run_from_source.kiq(**kwargs)
         return result
 
+    async def process_run_from_traces(
+        self,
+        *,
+        project_id: UUID,
+        user_id: UUID,
+        #
+        run_id: UUID,
+        #
+        trace_ids: List[str],
+        #
+        newest: Optional[datetime] = None,
+        oldest: Optional[datetime] = None,
+    ) -> Any:
+        # Push path of live runs: the ingestion worker hands over fresh traces
+        # instead of the scheduler scanning the run's window for them.
+        kwargs = dict(
+            project_id=project_id,
+            user_id=user_id,
+            #
+            run_id=run_id,
+            #
+            trace_ids=trace_ids,
+        )
+        if newest is not None:
+            kwargs["newest"] = newest
+        if oldest is not None:
+            kwargs["oldest"] = oldest
+
+        result = await self.worker.process_run_from_traces.kiq(**kwargs)
+        return result
+
     async def process_run_from_batch(
         self,
         *,
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 from uuid import UUID
 
@@ -15,6 +15,7 @@ from oss.src.core.testsets.service import TestsetsService
 from oss.src.core.tracing.service import TracingService
 from oss.src.core.shared.dtos import Reference
 from oss.src.core.tracing.dtos import (
+    Condition,
     Filtering,
     Windowing,
     Formatting,
@@ -22,6 +23,7 @@ from oss.src.core.tracing.dtos import (
     Focus,
     TracingQuery,
     LogicalOperator,
+    ListOperator,
 )
 
 
@@ -428,7 +430,16 @@ class SourceResolution:
         oldest: Optional[datetime] = None,
         #
         use_windowing: bool = False,
+        #
+        trace_ids: Optional[List[str]] = None,
     ) -> Dict[str, List[Any]]:
+        """Fetch the traces each query revision selects.
+
+        With `trace_ids`, only those traces are considered: the query's
+        filtering is ANDed with them and the time window is dropped, so a trace
+        handed over by the ingestion path matches exactly as it would in a
+        window scan (sampling `rate` included).
+        """
         query_traces: Dict[str, List[Any]] = {}
 
         for query_step_key, query_revision in query_revisions.items():
@@ -469,6 +480,28 @@ class SourceResolution:
                 elif query_windowing:
                     windowing.rate = query_windowing.rate
 
+            if trace_ids is not None:
+                filtering = Filtering(
+                    operator=LogicalOperator.AND,
+                    conditions=[
+                        Condition(
+                            field="trace_id",
+                            operator=ListOperator.IN,
+                            value=list(dict.fromkeys(trace_ids)),
+                        ),
+                        filtering,
+                    ],
+                )
+                windowing = Windowing(
+                    oldest=datetime(1970, 1, 1, tzinfo=timezone.utc),
+                    newest=None,
+                    next=None,
+                    limit=None,
+                    order="ascending",
+                    interval=None,
+                    rate=windowing.rate,
+                )
+
             query_traces[query_step_key] = (
                 await self.tracing_service.query_traces(
                     project_id=project_id,
@@ -495,6 +528,8 @@ class SourceResolution:
         oldest: Optional[datetime] = None,
         #
         use_windowing: bool = False,
+        #
+        trace_ids: Optional[List[str]] = None,
     ) -> Dict[str, List[ResolvedSourceItem]]:
         if not run.data or not run.data.steps:
             return {}
@@ -531,6 +566,8 @@ class SourceResolution:
             oldest=oldest,
             #
             use_windowing=use_windowing,
+            #
+            trace_ids=trace_ids,
         )
 
         return {
@@ -1,4 +1,4 @@
-from typing import List, Optional, Tuple, Dict, Any, TYPE_CHECKING
+from typing import List, Optional, Set, Tuple, Dict, Any, TYPE_CHECKING
 from uuid import UUID
 from asyncio import sleep
 from copy import deepcopy
@@ -6,6 +6,7 @@ from datetime import datetime, timedelta, timezone
 
 from genson import SchemaBuilder
 
+from oss.src.utils.env import env
 from oss.src.utils.logging import get_module_logger
 
 from oss.src.core.shared.dtos import Reference, Windowing, Tags, Meta
@@ -83,6 +84,7 @@ from oss.src.core.tracing.dtos import (
     Filtering,
     Condition,
     ListOperator,
+    ComparisonOperator,
     MetricSpec,
     MetricType,
 )
@@ -108,6 +110,12 @@ from oss.src.core.evaluations.utils import (
 )
 
 from oss.src.core.evaluations.utils import get_metrics_keys_from_schema
+from oss.src.core.evaluations.sketches import (
+    build_partial,
+    extract_value,
+    finalize_partial,
+    merge_partials,
+)
 from oss.src.core.evaluations.runtime.topology import classify_run_topology
 from oss.src.core.evaluations.runtime.sources import SourceResolution
 from oss.src.core.evaluations.runtime.runner import TaskiqEvaluationTaskRunner
@@ -159,8 +167,19 @@ DEFAULT_METRICS = [
 
 METRICS_STEP_TYPES = {"invocation", "annotation"}
 
+# Scenario metrics keep the partials they were finalized from under this `meta`
+# key, as {step_key: {path: partial}}; run-level and temporal metrics merge them.
+METRICS_PARTIALS_KEY = "partials"
+
 DEFAULT_REFRESH_INTERVAL = 1  # minute(s)
 
+# With push enabled, every LIVE_RECONCILE_INTERVAL minutes the scheduler still
+# scans the window that closed LIVE_RECONCILE_LAG minutes ago, catching traces
+# the push path dropped (listener or enqueue failures, runs not yet indexed,
+# late roots). Already-covered traces are skipped when minting.
+LIVE_RECONCILE_INTERVAL = 10  # minute(s)
+LIVE_RECONCILE_LAG = 5  # minute(s)
+
 
 def _first_reference_id(
     references: dict[str, Reference],
@@ -174,6 +193,32 @@ def _first_reference_id(
     return None
 
 
+def _trace_key(trace_id: Any) -> str:
+    try:
+        return UUID(str(trace_id)).hex
+    except ValueError:
+        return str(trace_id)
+
+
+def _finalize_steps_partials(
+    partials: Dict[str, Dict[str, Optional[Dict[str, Any]]]],
+) -> Dict[str, Dict[str, Any]]:
+    metrics_data: Dict[str, Dict[str, Any]] = dict()
+
+    for step_key, step_partials in partials.items():
+        step_metrics = dict()
+
+        for path, partial in step_partials.items():
+            value = finalize_partial(partial)
+            if value:
+                step_metrics[path] = value
+
+        if step_metrics:
+            metrics_data[step_key] = step_metrics
+
+    return metrics_data
+
+
 def _is_invocation_query(data: Any) -> bool:
     """Live evaluations require the query filter to target invocation traces.
 
@@ -268,6 +313,14 @@ class EvaluationsService:
         newest = timestamp + timedelta(minutes=interval or 0)
         oldest = timestamp
 
+        push_enabled = env.agenta.api.evaluations.live_push_enabled
+        reconcile = False
+        if push_enabled:
+            minute = timestamp.replace(second=0, microsecond=0)
+            reconcile = int(minute.timestamp() // 60) % LIVE_RECONCILE_INTERVAL == 0
+            newest = minute - timedelta(minutes=LIVE_RECONCILE_LAG)
+            oldest = newest - timedelta(minutes=LIVE_RECONCILE_INTERVAL)
+
         try:
             ext_runs = await self.fetch_live_runs()
         except Exception as e:
@@ -301,6 +354,18 @@ class EvaluationsService:
                     )
                     continue
 
+                await self._ensure_human_annotation_queue(
+                    project_id=project_id,
+                    user_id=user_id,
+                    run=run,
+                )
+
+                if push_enabled and not reconcile:
+                    # The spans worker pushes matching traces as they are
+                    # ingested (see `core.evaluations.live`); only the
+                    # reconciliation ticks scan a window.
+                    continue
+
                 log.info(
                     "[LIVE] Dispatching...",
                     project_id=project_id,
@@ -310,12 +375,6 @@ class EvaluationsService:
                     oldest=oldest,
                 )
 
-                await self._ensure_human_annotation_queue(
-                    project_id=project_id,
-                    user_id=user_id,
-                    run=run,
-                )
-
                 await self.evaluations_task_runner.process_run_from_source(
                     project_id=project_id,
                     user_id=user_id,
@@ -1280,7 +1339,7 @@ class EvaluationsService:
 
         if run_ids:
             for _run_id in run_ids:
-                result = await self._refresh_metrics(
+                result = await self._refresh_merged_metrics(
                     project_id=project_id,
                     user_id=user_id,
                     run_id=_run_id,
@@ -1293,31 +1352,25 @@ class EvaluationsService:
             return list()
 
         # !run_ids & run_id
-        elif scenario_ids:
-            for _scenario_id in scenario_ids:
-                result = await self._refresh_metrics(
-                    project_id=project_id,
-                    user_id=user_id,
-                    run_id=run_id,
-                    scenario_id=_scenario_id,
-                )
-                all_metrics.extend(result)
-            return all_metrics
+        elif scenario_ids or (scenario_id and not timestamp):
+            return await self._refresh_scenarios_metrics(
+                project_id=project_id,
+                user_id=user_id,
+                run_id=run_id,
+                scenario_ids=scenario_ids or [scenario_id],
+            )
 
         # !run_ids & run_id & !scenario_ids
-        elif timestamps:
-            for _timestamp in timestamps:
-                result = await self._refresh_metrics(
-                    project_id=project_id,
-                    user_id=user_id,
-                    run_id=run_id,
-                    timestamp=_timestamp,
-                    interval=interval,
-                )
-                all_metrics.extend(result)
-            return all_metrics
+        elif not scenario_id:
+            return await self._refresh_merged_metrics(
+                project_id=project_id,
+                user_id=user_id,
+                run_id=run_id,
+                timestamps=timestamps or ([timestamp] if timestamp else None),
+                interval=interval,
+            )
 
-        # !run_ids & run_id & !scenario_ids & !timestamps
+        # !run_ids & run_id & scenario_id & timestamp
         else:
             return await self._refresh_metrics(
                 project_id=project_id,
@@ -1426,6 +1479,479 @@ class EvaluationsService:
                 log.warning("[METRICS] No trace_ids found! Cannot extract metrics.")
             return []
 
+        steps_specs = await self._resolve_steps_specs(
+            project_id=project_id,
+            user_id=user_id,
+            #
+            run=run,
+            refreshable_steps=refreshable_steps,
+            steps_trace_ids=steps_trace_ids,
+        )
+
+        for step_key, specs in steps_specs.items():
+            step_trace_ids = steps_trace_ids[step_key]
+
+            try:
+                query = TracingQuery(
+                    windowing=Windowing(
+                        oldest=datetime(1970, 1, 1, tzinfo=timezone.utc),
+                        newest=None,
+                    ),
+                    filtering=Filtering(
+                        conditions=[
+                            Condition(
+                                field="trace_id",
+                                operator=ListOperator.IN,
+                                value=step_trace_ids,
+                            )
+                        ]
+                    ),
+                )
+
+                buckets = await self.tracing_service.analytics(
+                    project_id=project_id,
+                    #
+                    query=query,
+                    specs=specs,
+                )
+
+                # log.info(
+                #     f"[METRICS] Step '{step_key}': analytics returned {len(buckets)} buckets"
+                # )
+
+                if len(buckets) == 0:
+                    log.warning(
+                        f"Step '{step_key}': No metrics from analytics (0 buckets)"
+                    )
+                    continue
+
+                if len(buckets) != 1:
+                    log.warning("There should be one and only one bucket")
+                    log.warning("Buckets:", buckets)
+                    continue
+
+                bucket = buckets[0]
+
+                if not bucket.metrics:
+                    log.warning("Bucket metrics should not be empty")
+                    log.warning("Bucket:", bucket)
+                    continue
+
+                metrics_data |= {step_key: bucket.metrics}
+                # log.info(f"[METRICS] Step '{step_key}': added to metrics_data")
+
+            except Exception:
+                log.error(
+                    f"[METRICS] Step '{step_key}': Exception during analytics",
+                    exc_info=True,
+                )
+
+        if not metrics_data:
+            # log.warning("No metrics data: no metrics will be stored")
+            return []
+
+        metrics_create = [
+            EvaluationMetricsCreate(
+                run_id=run_id,
+                scenario_id=scenario_id,
+                timestamp=timestamp,
+                interval=interval,
+                #
+                status=EvaluationStatus.SUCCESS,
+                #
+                data=metrics_data,
+            )
+        ]
+
+        metrics = await self.set_metrics(
+            project_id=project_id,
+            user_id=user_id,
+            #
+            metrics=metrics_create,
+        )
+
+        return metrics
+
+    async def _refresh_scenarios_metrics(
+        self,
+        *,
+        project_id: UUID,
+        user_id: UUID,
+        #
+        run_id: UUID,
+        scenario_ids: List[UUID],
+    ) -> List[EvaluationMetrics]:
+        """Refresh the variational metrics of many scenarios in one pass.
+
+        One read of the run, of the scenarios' results and of their root spans,
+        instead of one analytics query per scenario and step. Next to its
+        metrics, each scenario row keeps the mergeable partials they were
+        finalized from (`meta.partials`, see `sketches`), which the run-level
+        and temporal metrics merge instead of rescanning every trace.
+        """
+        run = await self.fetch_run(
+            project_id=project_id,
+            #
+            run_id=run_id,
+        )
+
+        if not run or not run.data or not run.data.steps:
+            log.warning("run or run.data or run.data.steps not found")
+            return []
+
+        refreshable_steps: List[EvaluationRunDataStep] = [
+            step for step in run.data.steps if step.type in METRICS_STEP_TYPES
+        ]
+
+        if not refreshable_steps:
+            log.warning("No steps metrics keys found")
+            return []
+
+        results = await self.query_results(
+            project_id=project_id,
+            result=EvaluationResultQuery(
+                run_id=run_id,
+                scenario_ids=scenario_ids,
+                step_keys=[step.key for step in refreshable_steps],
+            ),
+        )
+
+        # Trace ids per scenario and step, each counted once per scenario.
+        scenarios_trace_ids: Dict[UUID, Dict[str, List[str]]] = dict()
+        steps_trace_ids: Dict[str, List[str]] = dict()
+
+        for result in results:
+            if not result.trace_id or not result.scenario_id:
+                continue
+
+            trace_ids = scenarios_trace_ids.setdefault(
+                result.scenario_id, dict()
+            ).setdefault(result.step_key, [])
+
+            if result.trace_id not in trace_ids:
+                trace_ids.append(result.trace_id)
+                steps_trace_ids.setdefault(result.step_key, []).append(result.trace_id)
+
+        if not steps_trace_ids:
+            expected_traces = any(
+                step.type != "annotation" or step.origin not in {"human", "custom"}
+                for step in refreshable_steps
+            )
+            if expected_traces:
+                log.warning("[METRICS] No trace_ids found! Cannot extract metrics.")
+            return []
+
+        steps_specs = await self._resolve_steps_specs(
+            project_id=project_id,
+            user_id=user_id,
+            #
+            run=run,
+            refreshable_steps=refreshable_steps,
+            steps_trace_ids=steps_trace_ids,
+        )
+
+        if not steps_specs:
+            return []
+
+        root_attributes = await self._fetch_root_attributes(
+            project_id=project_id,
+            trace_ids=[
+                trace_id
+                for step_key in steps_specs
+                for trace_id in steps_trace_ids[step_key]
+            ],
+        )
+
+        metrics_create: List[EvaluationMetricsCreate] = []
+
+        for scenario_id in dict.fromkeys(scenario_ids):
+            scenario_trace_ids = scenarios_trace_ids.get(scenario_id)
+
+            if not scenario_trace_ids:
+                continue
+
+            partials: Dict[str, Dict[str, Dict[str, Any]]] = dict()
+
+            for step_key, specs in steps_specs.items():
+                attributes = [
+                    root_attributes[_trace_key(trace_id)]
+                    for trace_id in scenario_trace_ids.get(step_key, [])
+                    if _trace_key(trace_id) in root_attributes
+                ]
+
+                if not attributes:
+                    continue
+
+                step_partials: Dict[str, Dict[str, Any]] = dict()
+
+                for spec in specs:
+                    partial = build_partial(
+                        metric_type=spec.type.value,
+                        values=[extract_value(item, spec.path) for item in attributes],
+                    )
+
+                    if partial:
+                        # Keyed like the analytics key their metrics.
+                        path = "attributes." + spec.path.removeprefix("attributes.")
+                        step_partials[path] = partial
+
+                if step_partials:
+                    partials[step_key] = step_partials
+
+            metrics_data = _finalize_steps_partials(partials)
+
+            if not metrics_data:
+                continue
+
+            metrics_create.append(
+                EvaluationMetricsCreate(
+                    run_id=run_id,
+                    scenario_id=scenario_id,
+                    #
+                    status=EvaluationStatus.SUCCESS,
+                    #
+                    data=metrics_data,
+                    meta={METRICS_PARTIALS_KEY: partials},
+                )
+            )
+
+        if not metrics_create:
+            return []
+
+        return await self.set_metrics(
+            project_id=project_id,
+            user_id=user_id,
+            #
+            metrics=metrics_create,
+        )
+
+    async def _refresh_merged_metrics(
+        self,
+        *,
+        project_id: UUID,
+        user_id: UUID,
+        #
+        run_id: UUID,
+        timestamps: Optional[List[datetime]] = None,
+        interval: Optional[int] = None,
+    ) -> List[EvaluationMetrics]:
+        """Refresh the run-level (no timestamps) or temporal metrics of a run.
+
+        Merges the partials of the variational metrics of the run, or of the
+        bucket's scenarios, so the cost grows with the scenarios involved, not
+        with their results and traces. Falls back to recomputing from the
+        traces when a scenario has no partials to merge (metrics refreshed
+        before partials were kept, or never refreshed per scenario).
+        """
+        if not timestamps:
+            metrics = await self._merge_metrics(
+                project_id=project_id,
+                user_id=user_id,
+                #
+                run_id=run_id,
+            )
+
+            if metrics is None:
+                metrics = await self._refresh_metrics(
+                    project_id=project_id,
+                    user_id=user_id,
+                    #
+                    run_id=run_id,
+                )
+
+            return metrics
+
+        scenarios = await self.query_scenarios(
+            project_id=project_id,
+            #
+            scenario=EvaluationScenarioQuery(
+                run_id=run_id,
+                timestamps=timestamps,
+                interval=interval,
+            ),
+        )
+
+        all_metrics: List[EvaluationMetrics] = []
+
+        for _timestamp in timestamps:
+            scenario_ids = [
+                scenario.id
+                for scenario in scenarios
+                if scenario.id and scenario.timestamp == _timestamp
+            ]
+
+            metrics = (
+                await self._merge_metrics(
+                    project_id=project_id,
+                    user_id=user_id,
+                    #
+                    run_id=run_id,
+                    scenario_ids=scenario_ids,
+                    timestamp=_timestamp,
+                    interval=interval,
+                )
+                if scenario_ids
+                else None
+            )
+
+            if metrics is None:
+                metrics = await self._refresh_metrics(
+                    project_id=project_id,
+                    user_id=user_id,
+                    #
+                    run_id=run_id,
+                    timestamp=_timestamp,
+                    interval=interval,
+                )
+
+            all_metrics.extend(metrics)
+
+        return all_metrics
+
+    async def _merge_metrics(
+        self,
+        *,
+        project_id: UUID,
+        user_id: UUID,
+        #
+        run_id: UUID,
+        scenario_ids: Optional[List[UUID]] = None,
+        timestamp: Optional[datetime] = None,
+        interval: Optional[int] = None,
+    ) -> Optional[List[EvaluationMetrics]]:
+        """Merge the variational partials of `scenario_ids` (all when None).
+
+        Returns None when there is nothing to merge, some scenario metrics
+        carry no partials, or some scenario with traced results has no
+        scenario metrics (its refresh failed or never ran): only a recompute
+        gives the right answer then.
+        """
+        scenarios_metrics = await self.query_metrics(
+            project_id=project_id,
+            #
+            metric=EvaluationMetricsQuery(
+                run_id=run_id,
+                scenario_ids=scenario_ids if scenario_ids is not None else True,
+                timestamps=False,
+            ),
+        )
+
+        if not scenarios_metrics:
+            return None
+
+        traced_scenario_ids = await self._traced_scenario_ids(
+            project_id=project_id,
+            #
+            run_id=run_id,
+            scenario_ids=scenario_ids,
+        )
+
+        if not traced_scenario_ids <= {
+            scenario_metrics.scenario_id for scenario_metrics in scenarios_metrics
+        }:
+            return None
+
+        steps_paths_partials: Dict[str, Dict[str, List[Dict[str, Any]]]] = dict()
+
+        for scenario_metrics in scenarios_metrics:
+            partials = (scenario_metrics.meta or {}).get(METRICS_PARTIALS_KEY)
+
+            if not isinstance(partials, dict):
+                return None
+
+            for step_key, step_partials in partials.items():
+                for path, partial in step_partials.items():
+                    steps_paths_partials.setdefault(step_key, dict()).setdefault(
+                        path, []
+                    ).append(partial)
+
+        metrics_data = _finalize_steps_partials(
+            {
+                step_key: {
+                    path: merge_partials(partials)
+                    for path, partials in paths_partials.items()
+                }
+                for step_key, paths_partials in steps_paths_partials.items()
+            }
+        )
+
+        if not metrics_data:
+            return []
+
+        return await self.set_metrics(
+            project_id=project_id,
+            user_id=user_id,
+            #
+            metrics=[
+                EvaluationMetricsCreate(
+                    run_id=run_id,
+                    timestamp=timestamp,
+                    interval=interval,
+                    #
+                    status=EvaluationStatus.SUCCESS,
+                    #
+                    data=metrics_data,
+                )
+            ],
+        )
+
+    async def _traced_scenario_ids(
+        self,
+        *,
+        project_id: UUID,
+        #
+        run_id: UUID,
+        scenario_ids: Optional[List[UUID]] = None,
+    ) -> Set[UUID]:
+        """Scenarios of `scenario_ids` (all when None) with a traced result in a
+        step that has metrics: those a recompute would cover."""
+        run = await self.fetch_run(
+            project_id=project_id,
+            #
+            run_id=run_id,
+        )
+
+        if not run or not run.data or not run.data.steps:
+            return set()
+
+        step_keys = [
+            step.key for step in run.data.steps if step.type in METRICS_STEP_TYPES
+        ]
+
+        if not step_keys:
+            return set()
+
+        results = await self.query_results(
+            project_id=project_id,
+            result=EvaluationResultQuery(
+                run_id=run_id,
+                scenario_ids=scenario_ids,
+                step_keys=step_keys,
+            ),
+        )
+
+        return {
+            result.scenario_id
+            for result in results
+            if result.trace_id and result.scenario_id
+        }
+
+    async def _resolve_steps_specs(
+        self,
+        *,
+        project_id: UUID,
+        user_id: UUID,
+        #
+        run: EvaluationRun,
+        refreshable_steps: List[EvaluationRunDataStep],
+        steps_trace_ids: Dict[str, List[str]],
+    ) -> Dict[str, List[MetricSpec]]:
+        """Metric specs of every step with traces: the defaults, plus the
+        evaluator's outputs (declared schema, else inferred from the traces)."""
+        steps_metrics_keys: Dict[str, List[Dict[str, str]]] = {
+            step.key: [] for step in refreshable_steps
+        }
+
         # Resolved metric keys per step (declared schema, else trace-inferred);
         # become the run's `mappings`. Rewrite only when something was inferred.
         metrics_keys_by_step: Dict[str, List[Dict[str, str]]] = {}
@@ -1526,116 +2052,74 @@ class EvaluationsService:
                     run_id=run.id,
                 )
 
-        steps_specs: Dict[str, List[MetricSpec]] = dict()
-
         intersection = steps_metrics_keys.keys() & steps_trace_ids.keys()
-        # log.info(f"[METRICS] Intersection of keys: {intersection}")
 
         if not intersection:
             log.warning(
                 "[METRICS] Empty intersection! No steps match between metrics_keys and trace_ids"
             )
-            return []
-
-        for step_key in intersection:
-            step_metrics_keys = steps_metrics_keys[step_key]
-            step_trace_ids = steps_trace_ids[step_key]
+            return {}
 
-            # log.info(
-            #     f"[METRICS] Processing step '{step_key}' with {len(step_trace_ids)} trace_ids"
-            # )
+        steps_specs: Dict[str, List[MetricSpec]] = dict()
 
+        for step_key in intersection:
             try:
-                query = TracingQuery(
-                    windowing=Windowing(
-                        oldest=datetime(1970, 1, 1, tzinfo=timezone.utc),
-                        newest=None,
-                    ),
-                    filtering=Filtering(
-                        conditions=[
-                            Condition(
-                                field="trace_id",
-                                operator=ListOperator.IN,
-                                value=step_trace_ids,
-                            )
-                        ]
-                    ),
-                )
-
-                specs = [
+                steps_specs[step_key] = [
                     MetricSpec(
                         type=MetricType(metric.get("type")),
                         path=metric.get("path") or "*",
                     )
-                    for metric in step_metrics_keys
+                    for metric in steps_metrics_keys[step_key]
                 ]
-
-                # log.info(f"[METRICS] Step '{step_key}': {len(specs)} metric specs")
-                steps_specs[step_key] = specs
-
-                buckets = await self.tracing_service.analytics(
-                    project_id=project_id,
-                    #
-                    query=query,
-                    specs=specs,
-                )
-
-                # log.info(
-                #     f"[METRICS] Step '{step_key}': analytics returned {len(buckets)} buckets"
-                # )
-
-                if len(buckets) == 0:
-                    log.warning(
-                        f"Step '{step_key}': No metrics from analytics (0 buckets)"
-                    )
-                    continue
-
-                if len(buckets) != 1:
-                    log.warning("There should be one and only one bucket")
-                    log.warning("Buckets:", buckets)
-                    continue
-
-                bucket = buckets[0]
-
-                if not bucket.metrics:
-                    log.warning("Bucket metrics should not be empty")
-                    log.warning("Bucket:", bucket)
-                    continue
-
-                metrics_data |= {step_key: bucket.metrics}
-                # log.info(f"[METRICS] Step '{step_key}': added to metrics_data")
-
             except Exception:
                 log.error(
-                    f"[METRICS] Step '{step_key}': Exception during analytics",
+                    f"[METRICS] Step '{step_key}': Exception during specs resolution",
                     exc_info=True,
                 )
 
-        if not metrics_data:
-            # log.warning("No metrics data: no metrics will be stored")
-            return []
+        return steps_specs
 
-        metrics_create = [
-            EvaluationMetricsCreate(
-                run_id=run_id,
-                scenario_id=scenario_id,
-                timestamp=timestamp,
-                interval=interval,
-                #
-                status=EvaluationStatus.SUCCESS,
-                #
-                data=metrics_data,
-            )
-        ]
+    async def _fetch_root_attributes(
+        self,
+        *,
+        project_id: UUID,
+        trace_ids: List[str],
+    ) -> Dict[str, Dict[str, Any]]:
+        """Root span attributes by trace id: the spans the analytics read."""
+        if not trace_ids:
+            return {}
 
-        metrics = await self.set_metrics(
+        query = TracingQuery(
+            windowing=Windowing(
+                oldest=datetime(1970, 1, 1, tzinfo=timezone.utc),
+                newest=None,
+            ),
+            filtering=Filtering(
+                conditions=[
+                    Condition(
+                        field="trace_id",
+                        operator=ListOperator.IN,
+                        value=list(dict.fromkeys(trace_ids)),
+                    ),
+                    Condition(
+                        field="parent_id",
+                        operator=ComparisonOperator.IS,
+                        value=None,
+                    ),
+                ]
+            ),
+        )
+
+        spans = await self.tracing_service.query(
             project_id=project_id,
-            user_id=user_id,
-            #
-            metrics=metrics_create,
+            query=query,
         )
 
-        return metrics
+        return {
+            _trace_key(span.trace_id): span.attributes
+            for span in spans
+            if isinstance(span.attributes, dict)
+        }
 
     async def _infer_evaluator_schema_from_traces(
         self,
@@ -0,0 +1,401 @@
+"""Mergeable partial aggregates for evaluation metrics.
+
+A partial is the JSON-serializable summary of the values one metric path took
+in one scenario. Partials of many scenarios merge into the partial of all of
+them, and `finalize_partial` turns any partial into the same statistics the
+tracing analytics compute from the spans themselves:
+
+- count / sum / min / max are merged exactly;
+- frequencies (discrete numbers, categories, labels, booleans) are exact
+  `[value, count]` tables, which also give the unique values;
+- percentiles and histograms of continuous numbers come from a merging
+  t-digest: a list of `[mean, weight]` centroids. Up to `DIGEST_COMPRESSION`
+  distinct values the digest holds every value and is exact; past it, it is
+  compressed to about `DIGEST_COMPRESSION / 2` centroids, finer at the tails.
+"""
+
+from math import asin, ceil, isfinite, pi, sqrt
+from typing import Any, Dict, List, Optional, Tuple
+
+from oss.src.core.tracing.dtos import MetricSpec, MetricType
+from oss.src.dbs.postgres.tracing.utils import (
+    PERCENTILES_VALUES,
+    compute_cqvs,
+    compute_iqrs,
+    compute_pscs,
+    compute_range,
+    compute_uniq,
+    normalize_freq,
+    normalize_hist,
+    parse_bin_freq,
+    parse_pcts,
+)
+
+DIGEST_COMPRESSION = 100
+
+# Same nudge the analytics apply to the upper bound of a single-value range.
+_ABS_EPS = 1e-9
+
+_NUMERIC_TYPES = {
+    MetricType.NUMERIC_CONTINUOUS.value,
+    MetricType.NUMERIC_DISCRETE.value,
+}
+_FREQ_TYPES = {
+    MetricType.NUMERIC_DISCRETE.value,
+    MetricType.CATEGORICAL_SINGLE.value,
+    MetricType.CATEGORICAL_MULTIPLE.value,
+    MetricType.BINARY.value,
+}
+
+
+# -- values ------------------------------------------------------------------
+
+
+def extract_value(
+    attributes: Optional[Dict[str, Any]],
+    path: str,
+) -> Any:
+    """Resolve `path` (with or without its `attributes.` prefix) in `attributes`."""
+    if path.startswith("attributes."):
+        path = path[len("attributes.") :]
+
+    value: Any = attributes
+    for key in path.split("."):
+        if isinstance(value, dict):
+            value = value.get(key)
+        elif isinstance(value, list) and key.isdigit() and int(key) < len(value):
+            value = value[int(key)]
+        else:
+            return None
+
+    return value
+
+
+def _is_number(value: Any) -> bool:
+    return (
+        isinstance(value, (int, float))
+        and not isinstance(value, bool)
+        and isfinite(value)
+    )
+
+
+def _accepted(
+    metric_type: str,
+    value: Any,
+) -> List[Any]:
+    """The values a JSON value contributes to a metric of `metric_type`."""
+    if metric_type in _NUMERIC_TYPES:
+        return [value] if _is_number(value) else []
+    if metric_type in {
+        MetricType.CATEGORICAL_SINGLE.value,
+        MetricType.STRING.value,
+    }:
+        return [value] if isinstance(value, str) else []
+    if metric_type == MetricType.CATEGORICAL_MULTIPLE.value:
+        if not isinstance(value, list):
+            return []
+        return [element for element in value if isinstance(element, str)]
+    if metric_type == MetricType.BINARY.value:
+        return [value] if isinstance(value, bool) else []
+    if metric_type == MetricType.JSON.value:
+        return [value] if isinstance(value, dict) else []
+    return []
+
+
+# -- digest ------------------------------------------------------------------
+
+
+def _compress(
+    centroids: List[List[float]],
+    compression: int = DIGEST_COMPRESSION,
+) -> Tuple[List[List[float]], bool]:
+    """Sort centroids, fold equal means, and bound their number when too many.
+
+    Also tells whether every centroid is still a single value (no two
+    different values were merged)."""
+    centroids = sorted(centroids, key=lambda centroid: centroid[0])
+
+    folded: List[List[float]] = []
+    for mean, weight in centroids:
+        if folded and folded[-1][0] == mean:
+            folded[-1][1] += weight
+        else:
+            folded.append([mean, weight])
+
+    if len(folded) <= compression:
+        return folded, True
+
+    total = sum(weight for _, weight in folded)
+
+    # A centroid spans at most one unit of the k1 scale, which bounds their
+    # number by about `compression / 2` and keeps them small at the tails.
+    def _scale(q: float) -> float:
+        return compression / (2 * pi) * asin(max(-1.0, min(1.0, 2 * q - 1)))
+
+    merged: List[List[float]] = [list(folded[0])]
+    cumulative = 0.0
+    lower = _scale(0.0)
+    for mean, weight in folded[1:]:
+        last = merged[-1]
+        if _scale((cumulative + last[1] + weight) / total) - lower <= 1:
+            last[0] += (mean - last[0]) * weight / (last[1] + weight)
+            last[1] += weight
+        else:
+            cumulative += last[1]
+            lower = _scale(cumulative / total)
+            merged.append([mean, weight])
+
+    return merged, False
+
+
+def _quantile(
+    centroids: List[List[float]],
+    fraction: float,
+    *,
+    exact: bool,
+    lowest: float,
+    highest: float,
+) -> float:
+    """Quantile like `percentile_cont`, exact while the centroids are exact."""
+    total = sum(weight for _, weight in centroids)
+    rank = fraction * (total - 1)
+
+    if not exact:
+        # Merged centroids spread around their mean: interpolate between
+        # their centre ranks, and out to the lowest / highest value.
+        points = [(0.0, lowest)]
+        first = 0.0
+        for mean, weight in centroids:
+            points.append((first + (weight - 1) / 2, mean))
+            first += weight
+        points.append((total - 1, highest))
+
+        for (rank_0, value_0), (rank_1, value_1) in zip(points, points[1:]):
+            if rank <= rank_1:
+                if rank_1 == rank_0:
+                    return float(value_1)
+                return float(
+                    value_0 + (value_1 - value_0) * (rank - rank_0) / (rank_1 - rank_0)
+                )
+
+        return float(highest)
+
+    # Every centroid is one value, repeated `weight` times.
+    first = 0.0
+    for index, (mean, weight) in enumerate(centroids):
+        last = first + weight - 1
+        if rank <= last or index == len(centroids) - 1:
+            return float(mean)
+
+        following = centroids[index + 1]
+        if rank < last + 1:
+            return float(mean + (following[0] - mean) * (rank - last))
+
+        first += weight
+
+    return float(centroids[-1][0])
+
+
+# -- partials ----------------------------------------------------------------
+
+
+def build_partial(
+    *,
+    metric_type: str,
+    values: List[Any],
+) -> Optional[Dict[str, Any]]:
+    """Summarize the JSON values one path took; None when none of them counts."""
+    accepted = [
+        element for value in values for element in _accepted(metric_type, value)
+    ]
+    if not accepted:
+        return None
+
+    partial: Dict[str, Any] = {"type": metric_type, "count": len(accepted)}
+
+    if metric_type in _NUMERIC_TYPES:
+        partial["sum"] = sum(accepted)
+        partial["min"] = min(accepted)
+        partial["max"] = max(accepted)
+
+    if metric_type == MetricType.NUMERIC_CONTINUOUS.value:
+        partial["digest"], partial["exact"] = _compress(
+            [[value, 1] for value in accepted]
+        )
+
+    if metric_type in _FREQ_TYPES:
+        freq: Dict[Any, int] = {}
+        for value in accepted:
+            freq[value] = freq.get(value, 0) + 1
+        partial["freq"] = [[value, count] for value, count in freq.items()]
+
+    return partial
+
+
+def merge_partials(
+    partials: List[Dict[str, Any]],
+) -> Optional[Dict[str, Any]]:
+    """Merge partials of one path; the first partial's type wins."""
+    partials = [partial for partial in partials if partial and partial.get("count")]
+    if not partials:
+        return None
+
+    metric_type = partials[0]["type"]
+    partials = [partial for partial in partials if partial["type"] == metric_type]
+
+    merged: Dict[str, Any] = {
+        "type": metric_type,
+        "count": sum(partial["count"] for partial in partials),
+    }
+
+    if metric_type in _NUMERIC_TYPES:
+        merged["sum"] = sum(partial["sum"] for partial in partials)
+        merged["min"] = min(partial["min"] for partial in partials)
+        merged["max"] = max(partial["max"] for partial in partials)
+
+    if metric_type == MetricType.NUMERIC_CONTINUOUS.value:
+        merged["digest"], exact = _compress(
+            [list(centroid) for partial in partials for centroid in partial["digest"]]
+        )
+        merged["exact"] = exact and all(partial["exact"] for partial in partials)
+
+    if metric_type in _FREQ_TYPES:
+        freq: Dict[Tuple[bool, Any], List[Any]] = {}
+        for partial in partials:
+            for value, count in partial["freq"]:
+                # bool is an int: key on it too, so True and 1 stay apart.
+                key = (isinstance(value, bool), value)
+                if key in freq:
+                    freq[key][1] += count
+                else:
+                    freq[key] = [value, count]
+        merged["freq"] = list(freq.values())
+
+    return merged
+
+
+def finalize_partial(
+    partial: Optional[Dict[str, Any]],
+    spec: Optional[MetricSpec] = None,
+) -> Optional[Dict[str, Any]]:
+    """The analytics output of a partial, in the shape `TracingDAO.analytics` returns."""
+    if not partial or not partial.get("count"):
+        return None
+
+    metric_type = partial["type"]
+    count = partial["count"]
+
+    value: Dict[str, Any] = {"type": metric_type, "count": count}
+
+    if metric_type in _NUMERIC_TYPES:
+        value |= compute_range(
+            {
+                "sum": partial["sum"],
+                "mean": partial["sum"] / count,
+                "min": partial["min"],
+                "max": partial["max"],
+            }
+        )
+
+        if metric_type == MetricType.NUMERIC_CONTINUOUS.value:
+            centroids, exact = partial["digest"], partial["exact"]
+        else:
+            centroids, exact = _compress(
+                [list(row) for row in partial["freq"]],
+                compression=len(partial["freq"]),
+            )
+        pcts = parse_pcts(
+            [
+                _quantile(
+                    centroids,
+                    fraction,
+                    exact=exact,
+                    lowest=partial["min"],
+                    highest=partial["max"],
+                )
+                for fraction in PERCENTILES_VALUES
+            ]
+        )
+        value |= compute_pscs(compute_cqvs(compute_iqrs(pcts)))
+
+    if metric_type == MetricType.NUMERIC_CONTINUOUS.value:
+        value |= normalize_hist(_histogram(partial, spec))
+
+    elif metric_type == MetricType.BINARY.value:
+        freq = {str(bool(row[0])).lower(): row[1] for row in partial["freq"]}
+        value |= compute_uniq(normalize_freq(parse_bin_freq(freq)))
+
+    elif metric_type in _FREQ_TYPES:
+        rows = sorted(partial["freq"], key=lambda row: (-row[1], row[0]))
+        value |= compute_uniq(
+            normalize_freq([{"value": row[0], "count": row[1]} for row in rows])
+        )
+
+    return value
+
+
+def _histogram(
+    partial: Dict[str, Any],
+    spec: Optional[MetricSpec],
+) -> List[Dict[str, Any]]:
+    """Bin the digest centroids the way the analytics bin the values."""
+    count = partial["count"]
+
+    vmin = spec.vmin if spec and spec.vmin is not None else partial["min"]
+    vmax = spec.vmax if spec and spec.vmax is not None else partial["max"]
+    edge = spec.edge if spec and spec.edge is not None else True
+
+    if count <= 1 or vmin == vmax:
+        bins = 1
+    else:
+        bins = spec.bins if spec and spec.bins is not None else ceil(sqrt(count))
+        bins = max(bins, 1)
+
+    edge_width = (vmax - vmin) / bins
+    center_width = (vmax - vmin) / (bins - 1) if bins > 1 else 0
+    degenerate = vmin == vmax
+
+    lo = vmin if edge else vmin - center_width / 2
+    if degenerate:
+        hi = vmax + _ABS_EPS
+    else:
+        hi = vmax if edge else vmax + center_width / 2
+
+    counts = [0] * (bins + 1)
+    for mean, weight in partial["digest"]:
+        if mean < lo:
+            # width_bucket's underflow bucket 0 is not part of the histogram.
+            continue
+        if mean >= hi:
+            index = bins
+        else:
+            index = min(int((mean - lo) / (hi - lo) * bins) + 1, bins)
+        counts[index] += weight
+
+    width = edge_width if edge else center_width
+
+    hist = []
+    for index in range(1, bins + 1):
+        if index == 1:
+            start = vmin
+        elif edge:
+            start = vmin + (index - 1) * width
+        else:
+            start = vmin + (index - 1) * width - width / 2
+
+        if index == bins:
+            end = vmax
+        elif edge:
+            end = vmin + index * width
+        else:
+            end = vmin + (index - 1) * width + width / 2
+
+        hist.append(
+            {
+                "bin": index,
+                "count": counts[index],
+                "interval": [start, end],
+            }
+        )
+
+    return hist
@@ -18,6 +18,7 @@ from agenta.sdk.evaluations.runtime.status import (
     run_status as compute_run_status,
     ProcessedScenario,
 )
+from agenta.sdk.evaluations.runtime.buffers import WriteBuffer, flush_each
 
 from oss.src.utils.logging import get_module_logger
 
@@ -170,8 +171,10 @@ class _BoundResultSetter:
 
     The engine writes cells context-free; this binds the stateless
     `APIResultSetter` to one slice's request context (project_id/user_id +
-    temporal coordinates). It holds no service — only the context and a
-    reference to the shared, stateless setter.
+    temporal coordinates). It holds no service — only the context, a reference
+    to the shared, stateless setter, and the slice's write-behind buffer: cells
+    are written in bulk `set_results` calls, flushed by size, by delay, before
+    every metric refresh (`_FlushingRefresher`) and when the slice is done.
     """
 
     def __init__(
@@ -188,6 +191,7 @@ class _BoundResultSetter:
         self._user_id = user_id
         self._timestamp = timestamp
         self._interval = interval
+        self._buffer = WriteBuffer(write=self._write)
 
     async def set(
         self,
@@ -198,17 +202,82 @@ class _BoundResultSetter:
         testcase_id=None,
         error=None,
     ) -> Any:
-        return await self._setter.set(
+        result = self._setter.build(
             cell=cell,
             trace_id=trace_id,
             hash_id=hash_id,
             testcase_id=testcase_id,
             error=error,
-            project_id=self._project_id,
-            user_id=self._user_id,
             timestamp=self._timestamp,
             interval=self._interval,
         )
+        await self._buffer.add(result)
+        return result
+
+    async def flush(self) -> None:
+        await self._buffer.flush()
+
+    async def _write(self, results: List[Any]) -> None:
+        await self._setter.set_many(
+            project_id=self._project_id,
+            user_id=self._user_id,
+            results=results,
+        )
+
+
+class _BoundScenarioEditor:
+    """Per-slice binder presenting the engine's `edit_scenario` seam.
+
+    Binds the stateless `APIScenarioEditor` to one slice's request context and
+    writes the statuses behind, in bulk `edit_scenarios` calls, like
+    `_BoundResultSetter` does for cells.
+    """
+
+    def __init__(
+        self,
+        editor: APIScenarioEditor,
+        *,
+        project_id: UUID,
+        user_id: UUID,
+    ):
+        self._editor = editor
+        self._project_id = project_id
+        self._user_id = user_id
+        self._buffer = WriteBuffer(write=self._write)
+
+    async def __call__(self, *, scenario: Any, status: Any) -> None:
+        await self._buffer.add(self._editor.build(scenario=scenario, status=status))
+
+    async def flush(self) -> None:
+        await self._buffer.flush()
+
+    async def _write(self, scenarios: List[Any]) -> None:
+        await self._editor.edit_many(
+            project_id=self._project_id,
+            user_id=self._user_id,
+            scenarios=scenarios,
+        )
+
+
+class _FlushingRefresher:
+    """`refresh_metrics` seam that writes the buffered cells first.
+
+    Metrics are computed from stored result cells, so the ones still held by
+    the slice's `_BoundResultSetter` are flushed before every refresh.
+    """
+
+    def __init__(
+        self,
+        refresh_metrics: RefreshMetrics,
+        *,
+        result_setter: _BoundResultSetter,
+    ):
+        self._refresh_metrics = refresh_metrics
+        self._result_setter = result_setter
+
+    async def __call__(self, **kwargs: Any) -> Any:
+        await self._result_setter.flush()
+        return await self._refresh_metrics(**kwargs)
 
 
 class _BoundRunner:
@@ -618,63 +687,86 @@ class APISliceProcessor:
 
         The data-seam adapters are built once on the processor (`self._*`); only the
         per-slice request context is bound here via the cheap `_Bound*` / partial
-        wrappers so the engine can drive them through its context-free seams.
+        wrappers so the engine can drive them through its context-free seams. The
+        bound setter and editor write behind in bulk; they are flushed before every
+        metric refresh and on the way out, whether the slice succeeded or not.
         """
-        return await sdk_process_evaluation_source_slice(
-            run_id=run.id,
-            #
-            steps=steps,
-            repeats=run.data.repeats if run.data and run.data.repeats else 1,
-            #
-            source_items=source_items,
-            #
-            revisions=revisions,
-            #
-            runners=runners,
-            #
-            create_scenario=create_scenario,
-            edit_scenario=partial(
-                self._scenario_editor,
-                project_id=project_id,
-                user_id=user_id,
-            ),
-            set_results=_BoundResultSetter(
-                self._result_setter,
-                project_id=project_id,
-                user_id=user_id,
-                timestamp=timestamp,
-                interval=interval,
-            ),
-            refresh_metrics=refresh_metrics,
-            fetch_trace=(
-                partial(self._trace_fetcher, project_id=project_id)
-                if self._trace_fetcher is not None
-                else None
-            ),
-            #
-            is_split=effective_is_split(
-                is_split=bool(run.flags and run.flags.is_split),
-                #
-                has_application_steps=any(step.type == "invocation" for step in steps),
-                has_evaluator_steps=any(step.type == "annotation" for step in steps),
-            ),
-            should_set_pending=should_set_pending,
-            should_refresh_metrics=should_refresh_metrics,
-            #
-            concurrency=(
-                Concurrency(
-                    batch_size=run.data.concurrency.batch_size,
-                    max_retries=run.data.concurrency.max_retries,
-                    retry_delay=run.data.concurrency.retry_delay,
-                )
-                if run.data and run.data.concurrency
-                else None
-            ),
-            #
-            plan_cell_filter=plan_cell_filter,
-            initial_context_seed=initial_context_seed,
+        result_setter = _BoundResultSetter(
+            self._result_setter,
+            project_id=project_id,
+            user_id=user_id,
+            timestamp=timestamp,
+            interval=interval,
+        )
+        scenario_editor = _BoundScenarioEditor(
+            self._scenario_editor,
+            project_id=project_id,
+            user_id=user_id,
         )
 
+        try:
+            processed = await sdk_process_evaluation_source_slice(
+                run_id=run.id,
+                #
+                steps=steps,
+                repeats=run.data.repeats if run.data and run.data.repeats else 1,
+                #
+                source_items=source_items,
+                #
+                revisions=revisions,
+                #
+                runners=runners,
+                #
+                create_scenario=create_scenario,
+                edit_scenario=scenario_editor,
+                set_results=result_setter,
+                refresh_metrics=_FlushingRefresher(
+                    refresh_metrics,
+                    result_setter=result_setter,
+                ),
+                fetch_trace=(
+                    partial(self._trace_fetcher, project_id=project_id)
+                    if self._trace_fetcher is not None
+                    else None
+                ),
+                #
+                is_split=effective_is_split(
+                    is_split=bool(run.flags and run.flags.is_split),
+                    #
+                    has_application_steps=any(
+                        step.type == "invocation" for step in steps
+                    ),
+                    has_evaluator_steps=any(
+                        step.type == "annotation" for step in steps
+                    ),
+                ),
+                should_set_pending=should_set_pending,
+                should_refresh_metrics=should_refresh_metrics,
+                #
+                concurrency=(
+                    Concurrency(
+                        batch_size=run.data.concurrency.batch_size,
+                        max_retries=run.data.concurrency.max_retries,
+                        retry_delay=run.data.concurrency.retry_delay,
+                    )
+                    if run.data and run.data.concurrency
+                    else None
+                ),
+                #
+                plan_cell_filter=plan_cell_filter,
+                initial_context_seed=initial_context_seed,
+            )
+        except BaseException:
+            # Whatever is still buffered is written before the caller reads the
+            # slice back, also when it failed, whose error is the one raised:
+            # cells before statuses.
+            await flush_each(result_setter, scenario_editor, raise_errors=False)
+            raise
+
+        await flush_each(result_setter, scenario_editor)
+
+        return processed
+
     async def process(
         self,
         *,
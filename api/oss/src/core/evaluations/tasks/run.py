@@ -1,5 +1,5 @@
 from datetime import datetime, timezone
-from typing import Any, List, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional, Set, Tuple
 from uuid import UUID
 
 from oss.src.core.evaluations.runtime.types import (
@@ -15,8 +15,10 @@ from oss.src.core.evaluations.runtime.sources import (
 from oss.src.core.evaluations.runtime.adapters import (
     APIScenarioCreator,
 )
+from oss.src.core.evaluations.live import DEFAULT_BUCKET_INTERVAL, bucket_of
 from oss.src.core.evaluations.service import EvaluationsService
 from oss.src.core.evaluations.types import (
+    EvaluationResultQuery,
     EvaluationRun,
     EvaluationRunEdit,
     EvaluationRunFlags,
@@ -56,6 +58,45 @@ def _initial_scenario_status(run: EvaluationRun) -> EvaluationStatus:
     return EvaluationStatus.RUNNING
 
 
+def _trace_uuid(trace_id: Optional[str]) -> Optional[UUID]:
+    try:
+        return UUID(str(trace_id)) if trace_id else None
+    except ValueError:
+        return None
+
+
+def _trace_start_time(trace: Any) -> Optional[datetime]:
+    for span in (getattr(trace, "spans", None) or {}).values():
+        if not isinstance(span, list):
+            return getattr(span, "start_time", None)
+    return None
+
+
+def _bucket_source_items(
+    source_items: List[ResolvedSourceItem],
+    *,
+    timestamp: Optional[datetime],
+    interval: Optional[int],
+) -> List[Tuple[Optional[datetime], Optional[int], List[ResolvedSourceItem]]]:
+    """Split a live window wider than one bucket into the buckets its traces start in.
+
+    Pushed traces and per-minute scans fill one bucket each; a reconciliation
+    scan covers several, and its scenarios land in the same buckets as if they
+    had been pushed.
+    """
+    if timestamp is None or interval is None or interval <= DEFAULT_BUCKET_INTERVAL:
+        return [(timestamp, interval, source_items)]
+
+    buckets: Dict[datetime, List[ResolvedSourceItem]] = {}
+    for source_item in source_items:
+        start_time = _trace_start_time(source_item.trace) or timestamp
+        buckets.setdefault(bucket_of(start_time), []).append(source_item)
+
+    return [
+        (bucket, DEFAULT_BUCKET_INTERVAL, items) for bucket, items in buckets.items()
+    ]
+
+
 # =============================================================================
 # RunProcessor — the worker-side orchestrator for a run's source flows.
 #
@@ -201,6 +242,64 @@ class RunProcessor:
             )
         return bindings
 
+    async def _unbound_source_items(
+        self,
+        *,
+        project_id: UUID,
+        #
+        run: EvaluationRun,
+        #
+        source_items_by_step: Dict[str, List[ResolvedSourceItem]],
+    ) -> Dict[str, List[ResolvedSourceItem]]:
+        """Drop the traces a live run already has scenarios for.
+
+        The same root can reach a live run more than once: re-sent after the
+        late window, redelivered off the ingest stream, or picked up again by
+        the reconciliation scan. Each input step records the trace it was fed,
+        so a (step, trace) pair with a result is already covered.
+        """
+        step_keys: Set[str] = set()
+        trace_ids: Set[UUID] = set()
+        for step_key, source_items in source_items_by_step.items():
+            for source_item in source_items:
+                trace_id = _trace_uuid(source_item.trace_id)
+                if trace_id:
+                    step_keys.add(source_item.step_key or step_key)
+                    trace_ids.add(trace_id)
+
+        if not trace_ids:
+            return source_items_by_step
+
+        results = await self.evaluations_service.query_results(
+            project_id=project_id,
+            #
+            result=EvaluationResultQuery(
+                run_id=run.id,
+                step_keys=sorted(step_keys),
+                trace_ids=list(trace_ids),
+            ),
+        )
+        bound = {
+            (result.step_key, _trace_uuid(result.trace_id))
+            for result in results
+            if _trace_uuid(result.trace_id)
+        }
+        if not bound:
+            return source_items_by_step
+
+        return {
+            step_key: [
+                source_item
+                for source_item in source_items
+                if (
+                    source_item.step_key or step_key,
+                    _trace_uuid(source_item.trace_id),
+                )
+                not in bound
+            ]
+            for step_key, source_items in source_items_by_step.items()
+        }
+
     async def _execute_bindings(
         self,
         *,
@@ -489,6 +588,8 @@ class RunProcessor:
         oldest: Optional[datetime],
         #
         use_windowing: bool,
+        #
+        trace_ids: Optional[List[str]] = None,
     ) -> None:
         """Resolve query traces -> mint -> populate -> re-execute, per query step.
 
@@ -499,6 +600,9 @@ class RunProcessor:
         Batch query runs finalize (empty -> SUCCESS, error -> FAILURE). Live runs
         intentionally never finalize — the scheduler keeps polling — so an empty
         tick or an error leaves the run untouched.
+
+        `trace_ids` narrows a live run to traces handed over by the ingestion
+        path; newest/oldest then only name their temporal bucket.
         """
         timestamp: Optional[datetime] = None
         interval: Optional[int] = None
@@ -519,7 +623,17 @@ class RunProcessor:
                 oldest=oldest,
                 #
                 use_windowing=use_windowing,
+                #
+                trace_ids=trace_ids,
             )
+            if not use_windowing:
+                source_items_by_step = await self._unbound_source_items(
+                    project_id=project_id,
+                    #
+                    run=run,
+                    #
+                    source_items_by_step=source_items_by_step,
+                )
             total = sum(len(items) for items in source_items_by_step.values())
 
             if total == 0:
@@ -537,21 +651,33 @@ class RunProcessor:
                 return
 
             tick_scenario_ids: List[UUID] = []
-            for step_key, source_items in source_items_by_step.items():
-                if not source_items:
+            for step_key, step_source_items in source_items_by_step.items():
+                if not step_source_items:
                     continue
-                bindings = await self._mint_and_bind(
-                    project_id=project_id,
-                    user_id=user_id,
-                    #
-                    run=run,
-                    #
-                    source_items=source_items,
-                    default_step_key=step_key,
-                    #
+                bindings: List[ScenarioBinding] = []
+                for (
+                    bucket_timestamp,
+                    bucket_interval,
+                    source_items,
+                ) in _bucket_source_items(
+                    step_source_items,
                     timestamp=timestamp,
                     interval=interval,
-                )
+                ):
+                    bindings.extend(
+                        await self._mint_and_bind(
+                            project_id=project_id,
+                            user_id=user_id,
+                            #
+                            run=run,
+                            #
+                            source_items=source_items,
+                            default_step_key=step_key,
+                            #
+                            timestamp=bucket_timestamp,
+                            interval=bucket_interval,
+                        )
+                    )
                 tick_scenario_ids.extend(binding.scenario_id for binding in bindings)
                 await self._execute_bindings(
                     project_id=project_id,
@@ -604,6 +730,61 @@ class RunProcessor:
                     status=EvaluationStatus.FAILURE,
                 )
 
+    # --- entry point 1b: run_from_traces — push traces into a live run -----
+    #
+    # The ingestion path matches fresh traces against live runs and hands them
+    # over here instead of waiting for the scheduler's window scan. Same flow
+    # as a live tick; the window is replaced by the trace ids, which are still
+    # matched against the run's query.
+
+    async def run_from_traces(
+        self,
+        *,
+        project_id: UUID,
+        user_id: UUID,
+        #
+        run_id: UUID,
+        #
+        trace_ids: List[str],
+        #
+        newest: Optional[datetime] = None,
+        oldest: Optional[datetime] = None,
+    ) -> bool:
+        if not trace_ids:
+            return True
+
+        run = await self._fetch_validated_run(
+            project_id=project_id,
+            #
+            run_id=run_id,
+        )
+        if not run:
+            log.warning("[EVAL] [process-traces] run not found or empty", run_id=run_id)
+            return False
+
+        dispatch = classify_run_topology(run).dispatch
+        if not dispatch or dispatch.source != "query" or dispatch.mode != "live":
+            log.warning(
+                "[EVAL] [process-traces] run is not a live query run",
+                run_id=run_id,
+            )
+            return False
+
+        await self._run_query_source(
+            project_id=project_id,
+            user_id=user_id,
+            #
+            run=run,
+            #
+            newest=newest,
+            oldest=oldest,
+            #
+            use_windowing=False,
+            #
+            trace_ids=trace_ids,
+        )
+        return True
+
     # --- entry point 2: run_from_batch — ingest a DIRECT id batch -----------
     #
     # Ingest a batch of explicit trace_ids / testcase_ids into an open queue
@@ -460,6 +460,8 @@ class EvaluationResultQuery(Metadata):
     scenario_id: Optional[UUID] = None
     scenario_ids: Optional[List[UUID]] = None
 
+    trace_ids: Optional[List[UUID]] = None
+
     run_id: Optional[UUID] = None
     run_ids: Optional[List[UUID]] = None
 
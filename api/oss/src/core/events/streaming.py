@@ -85,7 +85,7 @@ async def publish_event(
 
         await redis.xadd(
             name="streams:events",
-            fields={"data": event_bytes},
+            fields={"data": event_bytes, "key": project_id.hex},
             maxlen=MAXLEN_STREAMS_EVENTS,
             approximate=True,
         )
@@ -43,6 +43,16 @@ class SessionRecord(Lifecycle):
     span_id: Optional[OTelSpanId] = None
 
 
+class SessionRecordCursor(BaseModel):
+    """Where a record sits in a session's (timestamp, record_id) order.
+
+    Records without a timestamp (written before it existed) sort last.
+    """
+
+    timestamp: Optional[datetime] = None
+    record_id: UUID
+
+
 class SessionMessagePreview(BaseModel):
     """The last thing said in a session, for a list row.
 
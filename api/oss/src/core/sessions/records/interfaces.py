@@ -1,9 +1,11 @@
+from datetime import datetime
 from typing import Any, Dict, List, Optional
 from uuid import UUID
 
 from oss.src.core.sessions.records.dtos import (
     SessionMessagePreview,
     SessionRecord,
+    SessionRecordCursor,
     SessionRecordEvent,
 )
 
@@ -29,6 +31,9 @@ class RecordsDAOInterface:
         *,
         project_id: UUID,
         session_id: str,
+        since: Optional[datetime] = None,
+        cursor: Optional[SessionRecordCursor] = None,
+        limit: Optional[int] = None,
     ) -> List[SessionRecord]:
         raise NotImplementedError
 
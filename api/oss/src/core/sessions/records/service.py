@@ -1,9 +1,11 @@
+from datetime import datetime
 from typing import Any, Dict, List, Optional
 from uuid import UUID
 
 from oss.src.core.sessions.records.dtos import (
     SessionMessagePreview,
     SessionRecord,
+    SessionRecordCursor,
     SessionRecordEvent,
 )
 from oss.src.core.sessions.records.interfaces import RecordsDAOInterface
@@ -33,10 +35,16 @@ class RecordsService:
         *,
         project_id: UUID,
         session_id: str,
+        since: Optional[datetime] = None,
+        cursor: Optional[SessionRecordCursor] = None,
+        limit: Optional[int] = None,
     ) -> List[SessionRecord]:
         return await self.records_dao.get_records(
             project_id=project_id,
             session_id=session_id,
+            since=since,
+            cursor=cursor,
+            limit=limit,
         )
 
     async def get_event(
@@ -147,7 +147,7 @@ async def publish_record(
 
         await redis.xadd(
             name="streams:records",
-            fields={"data": event_bytes},
+            fields={"data": event_bytes, "key": project_id.hex},
             maxlen=MAXLEN_STREAMS_RECORDS,
             approximate=True,
         )
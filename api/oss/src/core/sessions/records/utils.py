@@ -11,12 +11,19 @@ coalesce_events: folds a run's event list so that:
   - standalone empty agent_message events are dropped (they would shadow
     the real assembled message)
 
-Both functions are pure (no I/O) so they are easy to unit-test and to call
+last_cursor / earliest_timestamp: where a batch of records ends and starts in
+  a session's (timestamp, record_id) order, for clients that fetch only what
+  changed since their last read.
+
+All functions are pure (no I/O) so they are easy to unit-test and to call
 from any ingest path.
 """
 
+from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+from oss.src.core.sessions.records.dtos import SessionRecord, SessionRecordCursor
+
 REPLAY_PREFIX = "__replay__:"
 
 
@@ -141,3 +148,33 @@ def coalesce_events(
 
     _flush_chunks()
     return result
+
+
+def last_cursor(records: List[SessionRecord]) -> Optional[SessionRecordCursor]:
+    """The cursor after the last of `records` in (timestamp, record_id) order.
+
+    Records without a timestamp sort last, as they do in `get_records`.
+    """
+    if not records:
+        return None
+
+    last = max(
+        records,
+        key=lambda record: (
+            record.timestamp is None,
+            record.timestamp or datetime.min,
+            record.record_id,
+        ),
+    )
+    return SessionRecordCursor(timestamp=last.timestamp, record_id=last.record_id)
+
+
+def earliest_timestamp(records: List[SessionRecord]) -> Optional[datetime]:
+    """The earliest timestamp of `records`, or None if one of them has none.
+
+    Fetching from it returns every one of them, updated in place or not.
+    """
+    if not records or any(record.timestamp is None for record in records):
+        return None
+
+    return min(record.timestamp for record in records)
@@ -1,4 +1,5 @@
-from typing import Protocol, runtime_checkable
+from datetime import datetime
+from typing import Optional, Protocol, runtime_checkable
 
 
 @runtime_checkable
@@ -13,8 +14,14 @@ class SessionsWatchPublisherInterface(Protocol):
     Construction stays in `api/entrypoints/*`, as it already did.
     """
 
-    async def records_changed(self, *, project_id: str, session_id: str) -> None:
-        """New or updated rows landed in a session's record log."""
+    async def records_changed(
+        self,
+        *,
+        project_id: str,
+        session_id: str,
+        since: Optional[datetime] = None,
+    ) -> None:
+        """New or updated rows landed in a session's record log, all at or after `since`."""
         ...
 
     async def lifecycle(self, *, project_id: str, session_id: str, state: str) -> None:
@@ -0,0 +1,260 @@
+"""Assembly of traces whose spans arrive across several ingest batches.
+
+OTel exporters send spans as they end, batched on a timer, so one trace can
+reach the API in several OTLP requests and the tracing worker in several
+stream messages. The ingest passes (trace type, metrics, identity) need the
+whole tree: run per request, a root's cumulative costs and tokens only cover
+the children that came with it.
+
+`TraceAssembler` holds the spans of open traces in the worker until the trace
+is connected (a root, and every span's parent present) or `max_wait_s` has
+passed, then runs the passes once on the whole tree. Released traces are
+remembered for `late_window_s`: when more of their spans arrive, the passes
+run again on the remembered tree plus the new spans, and only the new spans
+and the ones whose values changed (their ancestors) are written again. Those
+ancestors are reported apart, so that they are not announced as new spans.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+from oss.src.core.tracing.dtos import OTelFlatSpan
+from oss.src.core.tracing.utils.trees import prepare_span_dtos
+
+
+# (project_id, trace_id)
+TraceKey = Tuple[UUID, Any]
+# (project_id, user_id) -> spans to write
+AssembledSpans = Dict[Tuple[UUID, UUID], List[OTelFlatSpan]]
+# (project_id, trace_id, span_id)
+SpanKey = Tuple[UUID, Any, Any]
+
+
+class _OpenTrace:
+    __slots__ = ("project_id", "user_id", "spans", "message_ids", "opened_at")
+
+    def __init__(self, *, project_id: UUID, user_id: UUID, opened_at: float):
+        self.project_id = project_id
+        self.user_id = user_id
+        self.spans: Dict[Any, OTelFlatSpan] = {}
+        self.message_ids: Set[bytes] = set()
+        self.opened_at = opened_at
+
+
+class _ClosedTrace:
+    __slots__ = ("spans", "closed_at")
+
+    def __init__(self, *, spans: Dict[Any, OTelFlatSpan], closed_at: float):
+        self.spans = spans
+        self.closed_at = closed_at
+
+
+class TraceAssembler:
+    """Holds the spans of open traces until their tree is whole, then prepares it.
+
+    Not thread-safe, and not meant to be: it lives on the worker's event loop,
+    and none of its methods await.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_wait_s: float = 5.0,
+        late_window_s: float = 60.0,
+        max_spans: int = 100_000,
+    ):
+        self.max_wait_s = max_wait_s
+        self.late_window_s = late_window_s
+        # Bounds the open spans, and separately the remembered ones.
+        self.max_spans = max_spans
+
+        self._open: "OrderedDict[TraceKey, _OpenTrace]" = OrderedDict()
+        self._open_spans = 0
+        self._closed: "OrderedDict[TraceKey, _ClosedTrace]" = OrderedDict()
+        self._closed_spans = 0
+        # Stream messages -> open traces still holding some of their spans.
+        self._holds: Dict[bytes, int] = {}
+
+    def add(
+        self,
+        *,
+        project_id: UUID,
+        user_id: UUID,
+        span_dtos: List[OTelFlatSpan],
+        message_id: Optional[bytes] = None,
+        now: Optional[float] = None,
+    ) -> None:
+        """Hold spans until their trace is released by `pop_ready`.
+
+        A span seen again replaces the one held; the trace is written for the
+        user of its latest spans.
+        """
+        now = time.monotonic() if now is None else now
+
+        for span_dto in span_dtos:
+            key = (project_id, span_dto.trace_id)
+
+            trace = self._open.get(key)
+            if trace is None:
+                trace = _OpenTrace(
+                    project_id=project_id,
+                    user_id=user_id,
+                    opened_at=now,
+                )
+                self._open[key] = trace
+
+            trace.user_id = user_id
+
+            if span_dto.span_id not in trace.spans:
+                self._open_spans += 1
+            trace.spans[span_dto.span_id] = span_dto
+
+            if message_id is not None and message_id not in trace.message_ids:
+                trace.message_ids.add(message_id)
+                self._holds[message_id] = self._holds.get(message_id, 0) + 1
+
+    def is_held(self, message_id: bytes) -> bool:
+        """Whether spans of this message are still waiting for their trace."""
+        return message_id in self._holds
+
+    def open_project_ids(self) -> Set[UUID]:
+        """Projects with spans waiting for their trace."""
+        return {project_id for project_id, _ in self._open}
+
+    def pop_ready(
+        self,
+        *,
+        project_ids: Optional[Set[UUID]] = None,
+        now: Optional[float] = None,
+        flush: bool = False,
+    ) -> Tuple[AssembledSpans, List[bytes], Set[SpanKey]]:
+        """Release the traces that are whole, waited long enough, or overflow.
+
+        Returns the prepared spans to write, per (project_id, user_id), the
+        stream messages none of whose spans are held anymore, and which of the
+        spans to write were written before (the ancestors of late spans,
+        re-aggregated). `project_ids` limits the release to those projects, so
+        that callers can serialize the writes of each project. `flush` releases
+        everything, e.g. on shutdown.
+        """
+        now = time.monotonic() if now is None else now
+
+        self._expire_closed(now=now)
+
+        candidates = [
+            key for key in self._open if project_ids is None or key[0] in project_ids
+        ]
+
+        ready = [
+            key
+            for key in candidates
+            if flush
+            or now - self._open[key].opened_at >= self.max_wait_s
+            or self._is_whole(self._open[key], self._closed.get(key))
+        ]
+
+        # Past the bound, the oldest traces go as they are.
+        released_keys = set(ready)
+        held = self._open_spans - sum(len(self._open[key].spans) for key in ready)
+        for key in candidates:
+            trace = self._open[key]
+            if held <= self.max_spans:
+                break
+            if key not in released_keys:
+                released_keys.add(key)
+                ready.append(key)
+                held -= len(trace.spans)
+
+        assembled: AssembledSpans = {}
+        released: List[bytes] = []
+        rewritten: Set[SpanKey] = set()
+
+        for key in ready:
+            trace = self._open.pop(key)
+            self._open_spans -= len(trace.spans)
+
+            closed = self._closed.pop(key, None)
+            if closed is not None:
+                self._closed_spans -= len(closed.spans)
+
+            spans, tree = self._assemble(trace, closed)
+
+            assembled.setdefault((trace.project_id, trace.user_id), []).extend(spans)
+            rewritten.update(
+                (trace.project_id, span.trace_id, span.span_id)
+                for span in spans
+                if span.span_id not in trace.spans
+            )
+
+            self._remember(key, tree, now=now)
+
+            for message_id in trace.message_ids:
+                self._holds[message_id] -= 1
+                if self._holds[message_id] == 0:
+                    del self._holds[message_id]
+                    released.append(message_id)
+
+        return assembled, released, rewritten
+
+    @staticmethod
+    def _is_whole(trace: _OpenTrace, closed: Optional[_ClosedTrace]) -> bool:
+        has_root = closed is not None
+
+        for span in trace.spans.values():
+            if span.parent_id is None:
+                has_root = True
+            elif span.parent_id not in trace.spans and (
+                closed is None or span.parent_id not in closed.spans
+            ):
+                return False
+
+        return has_root
+
+    @staticmethod
+    def _assemble(
+        trace: _OpenTrace,
+        closed: Optional[_ClosedTrace],
+    ) -> Tuple[List[OTelFlatSpan], Dict[Any, OTelFlatSpan]]:
+        if closed is None:
+            spans = prepare_span_dtos(list(trace.spans.values()))
+            return spans, {span.span_id: span for span in spans}
+
+        # Late spans: prepare the remembered tree with them, on copies, and
+        # write only what is new or changed (their ancestors' cumulatives).
+        merged = {
+            span_id: span.model_copy(deep=True)
+            for span_id, span in closed.spans.items()
+        }
+        merged.update(trace.spans)
+
+        spans = prepare_span_dtos(list(merged.values()))
+
+        changed = [
+            span
+            for span in spans
+            if span.span_id in trace.spans or span != closed.spans.get(span.span_id)
+        ]
+
+        return changed, {span.span_id: span for span in spans}
+
+    def _remember(self, key: TraceKey, tree: Dict[Any, OTelFlatSpan], *, now: float):
+        if self.late_window_s <= 0:
+            return
+
+        self._closed[key] = _ClosedTrace(spans=tree, closed_at=now)
+        self._closed_spans += len(tree)
+
+        while self._closed_spans > self.max_spans and self._closed:
+            _, evicted = self._closed.popitem(last=False)
+            self._closed_spans -= len(evicted.spans)
+
+    def _expire_closed(self, *, now: float):
+        # Released in order, so the oldest are first.
+        while self._closed:
+            key, closed = next(iter(self._closed.items()))
+            if now - closed.closed_at < self.late_window_s:
+                break
+            del self._closed[key]
+            self._closed_spans -= len(closed.spans)
@@ -1,9 +1,9 @@
-from typing import List, Dict, Union, Optional, Any
+from typing import List, Dict, Tuple, Union, Optional, Any
 
 from datetime import datetime
 from enum import Enum
 
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 
 from oss.src.core.shared.dtos import (
     Lifecycle,
@@ -189,6 +189,16 @@ class Format(str, Enum):
 class Formatting(BaseModel):
     focus: Optional[Focus] = None
     format: Optional[Format] = None
+    # PROJECTION
+    fields: Optional[List[str]] = None
+    # TRUNCATION
+    truncate: Optional[int] = None
+
+    @field_validator("truncate")
+    def check_truncate(cls, v):
+        if v is not None and v <= 0:
+            raise ValueError("Truncation length must be a positive integer.")
+        return v
 
 
 class TracingQuery(BaseModel):
@@ -265,6 +275,18 @@ class MetricsBucket(BaseModel):
     metrics: Optional[Dict[str, FullJson]] = None
 
 
+# What analytics compute when a request names no specs; also what the tracing
+# rollups are maintained for.
+DEFAULT_ANALYTICS_SPECS: Tuple[Tuple[MetricType, str], ...] = (
+    (MetricType.NUMERIC_CONTINUOUS, "attributes.ag.metrics.duration.cumulative"),
+    (MetricType.NUMERIC_CONTINUOUS, "attributes.ag.metrics.errors.cumulative"),
+    (MetricType.NUMERIC_CONTINUOUS, "attributes.ag.metrics.costs.cumulative.total"),
+    (MetricType.NUMERIC_CONTINUOUS, "attributes.ag.metrics.tokens.cumulative.total"),
+    (MetricType.CATEGORICAL_SINGLE, "attributes.ag.type.trace"),
+    (MetricType.CATEGORICAL_SINGLE, "attributes.ag.type.span"),
+)
+
+
 # SIMPLE TRACE: INVOCATIONS & ANNOTATIONS --------------------------------------
 
 
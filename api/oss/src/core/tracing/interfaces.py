@@ -1,4 +1,12 @@
-from typing import List, Optional, Tuple
+from typing import (
+    AsyncIterator,
+    Iterable,
+    List,
+    Optional,
+    Protocol,
+    Tuple,
+    runtime_checkable,
+)
 from uuid import UUID
 from abc import ABC, abstractmethod
 from datetime import datetime
@@ -14,6 +22,36 @@ from oss.src.core.tracing.dtos import (
 )
 
 
+@runtime_checkable
+class TracingWatchPublisherInterface(Protocol):
+    """What the ingestion worker needs from the trace-commit relay, and nothing more.
+
+    Mirrors `SessionsWatchPublisherInterface`: core and the workers publish, the
+    Redis transport lives in `dbs.redis`, and construction stays in `api/entrypoints/*`.
+    """
+
+    async def traces_committed(
+        self, *, project_id: str, trace_ids: Iterable[str]
+    ) -> None:
+        """Spans of these traces are now readable through the tracing service."""
+        ...
+
+
+@runtime_checkable
+class TracingIngestListenerInterface(Protocol):
+    """What the ingestion worker hands freshly committed spans to, besides the relay.
+
+    Called once per project batch, strictly after `ingest`; like the watch
+    publisher it is best-effort, and a failure never re-drives the ingest.
+    """
+
+    async def spans_ingested(
+        self, *, project_id: UUID, span_dtos: List[OTelFlatSpan]
+    ) -> None:
+        """These spans are now readable through the tracing service."""
+        ...
+
+
 class TracingDAOInterface(ABC):
     def __init__(self):
         raise NotImplementedError
@@ -41,6 +79,16 @@ class TracingDAOInterface(ABC):
     ) -> List[OTelFlatSpan]:
         raise NotImplementedError
 
+    @abstractmethod
+    def stream(
+        self,
+        *,
+        project_id: UUID,
+        #
+        query: TracingQuery,
+    ) -> AsyncIterator[List[OTelFlatSpan]]:
+        raise NotImplementedError
+
     @abstractmethod
     async def analytics(
         self,
@@ -62,6 +110,10 @@ class TracingDAOInterface(ABC):
     ) -> List[Bucket]:
         raise NotImplementedError
 
+    @abstractmethod
+    async def ensure_partitions(self) -> List[str]:
+        raise NotImplementedError
+
     ### TRACES
 
     @abstractmethod
@@ -1,4 +1,13 @@
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 from uuid import UUID, uuid4
 from datetime import datetime
 
@@ -21,9 +30,6 @@ from oss.src.core.tracing.utils.parsing import (
     parse_trace_id_to_uuid,
 )
 from oss.src.core.tracing.utils.trees import (
-    calculate_and_propagate_metrics_by_trace,
-    infer_and_propagate_trace_type_by_trace,
-    promote_identity_by_trace,
     trace_map_to_traces,
 )
 from oss.src.core.tracing.streaming import publish_spans
@@ -56,7 +62,7 @@ from oss.src.core.tracing.dtos import (
     TracingQuery,
     Bucket,
     Filtering,
-    MetricType,
+    DEFAULT_ANALYTICS_SPECS,
     MetricSpec,
     MetricsBucket,
     QueryFocusConflictError,
@@ -88,16 +94,6 @@ if TYPE_CHECKING:
 log = get_module_logger(__name__)
 
 
-DEFAULT_ANALYTICS_SPECS: Tuple[Tuple[MetricType, str], ...] = (
-    (MetricType.NUMERIC_CONTINUOUS, "attributes.ag.metrics.duration.cumulative"),
-    (MetricType.NUMERIC_CONTINUOUS, "attributes.ag.metrics.errors.cumulative"),
-    (MetricType.NUMERIC_CONTINUOUS, "attributes.ag.metrics.costs.cumulative.total"),
-    (MetricType.NUMERIC_CONTINUOUS, "attributes.ag.metrics.tokens.cumulative.total"),
-    (MetricType.CATEGORICAL_SINGLE, "attributes.ag.type.trace"),
-    (MetricType.CATEGORICAL_SINGLE, "attributes.ag.type.span"),
-)
-
-
 class TracingService:
     """
     Tracing service for managing spans and traces.
@@ -127,6 +123,10 @@ class TracingService:
             span_dtos=span_dtos,
         )
 
+    async def ensure_partitions(self) -> List[str]:
+        """Create the upcoming daily partitions of the spans table, if missing."""
+        return await self.tracing_dao.ensure_partitions()
+
     async def ingest_span_dtos(
         self,
         *,
@@ -135,30 +135,8 @@ class TracingService:
         user_id: UUID,
         span_dtos: List[OTelFlatSpan],
     ) -> OTelLinks:
-        try:
-            span_dtos = infer_and_propagate_trace_type_by_trace(span_dtos)
-        except Exception:  # pylint: disable=broad-exception-caught
-            log.error(
-                "Failed to infer trace types; continuing without trace-type propagation",
-                exc_info=True,
-            )
-
-        try:
-            span_dtos = calculate_and_propagate_metrics_by_trace(span_dtos)
-        except Exception:  # pylint: disable=broad-exception-caught
-            log.error(
-                "Failed to calculate metrics; continuing without metrics",
-                exc_info=True,
-            )
-
-        try:
-            span_dtos = promote_identity_by_trace(span_dtos)
-        except Exception:  # pylint: disable=broad-exception-caught
-            log.error(
-                "Failed to promote session/user/agent identity; continuing without it",
-                exc_info=True,
-            )
-
+        # The ingest passes need whole traces, so they run in the tracing
+        # worker (see `TraceAssembler`) rather than per request here.
         await publish_spans(
             organization_id=organization_id,
             project_id=project_id,
@@ -412,9 +390,16 @@ class TracingService:
         filtering: Optional[Filtering],
         windowing: Optional[Windowing],
         focus: Focus,
+        fields: Optional[List[str]] = None,
+        truncate: Optional[int] = None,
     ) -> TracingQuery:
         return TracingQuery(
-            formatting={"focus": focus, "format": Format.AGENTA},
+            formatting={
+                "focus": focus,
+                "format": Format.AGENTA,
+                "fields": fields,
+                "truncate": truncate,
+            },
             filtering=filtering,
             windowing=windowing,
         )
@@ -429,6 +414,8 @@ class TracingService:
         default_focus: Focus,
         conflict_focus: Focus,
         conflict_detail: str,
+        request_fields: Optional[List[str]] = None,
+        request_truncate: Optional[int] = None,
     ) -> TracingQuery:
         formatting = (
             revision_formatting.model_copy(
@@ -444,6 +431,12 @@ class TracingService:
         if formatting.focus == conflict_focus:
             raise QueryFocusConflictError(conflict_detail)
 
+        # The request's projection wins over the stored one.
+        if request_fields is not None:
+            formatting.fields = request_fields
+        if request_truncate is not None:
+            formatting.truncate = request_truncate
+
         merged_windowing = self._merge_windowing(
             stored_windowing=revision_windowing,
             request_windowing=request_windowing,
@@ -525,12 +518,16 @@ class TracingService:
         default_focus: Focus,
         conflict_focus: Focus,
         conflict_detail: str,
+        fields: Optional[List[str]] = None,
+        truncate: Optional[int] = None,
     ) -> Optional[TracingQuery]:
         if not (query_ref or query_variant_ref or query_revision_ref):
             return self._query_from_request(
                 filtering=filtering,
                 windowing=windowing,
                 focus=default_focus,
+                fields=fields,
+                truncate=truncate,
             )
 
         if not queries_service:
@@ -553,6 +550,8 @@ class TracingService:
             default_focus=default_focus,
             conflict_focus=conflict_focus,
             conflict_detail=conflict_detail,
+            request_fields=fields,
+            request_truncate=truncate,
         )
 
     async def query(
@@ -578,8 +577,12 @@ class TracingService:
         project_id: UUID,
         query: TracingQuery,
     ) -> OTelFlatSpans:
+        formatting = query.formatting or Formatting()
+        projected = formatting.fields is not None or formatting.truncate is not None
+
+        # Fetching loads whole spans; projections are queried.
         trace_ids = self._extract_trace_ids_from_query(query)
-        if trace_ids is not None:
+        if trace_ids is not None and not projected:
             return await self.fetch(
                 project_id=project_id,
                 trace_ids=trace_ids,
@@ -704,6 +707,58 @@ class TracingService:
             return trace_map_to_traces(spans_or_traces)
         return []
 
+    async def export(
+        self,
+        *,
+        project_id: UUID,
+        #
+        query: TracingQuery,
+    ) -> AsyncIterator[Union[Spans, Traces]]:
+        """The spans or traces of `query` (by its focus), batch by batch.
+
+        With focus=trace, the spans of a trace come in a row, and the last
+        trace of a batch is held back until the next batch shows it ended.
+        """
+        parse_query(query)
+
+        formatting = query.formatting or Formatting()
+        focus = formatting.focus or Focus.TRACE
+        query = query.model_copy(
+            update={
+                "formatting": formatting.model_copy(
+                    update={"focus": focus, "format": Format.AGENTA}
+                )
+            }
+        )
+
+        held: OTelFlatSpans = []
+
+        async for span_dtos in self.tracing_dao.stream(
+            project_id=project_id,
+            query=query,
+        ):
+            if focus == Focus.SPAN:
+                yield parse_spans_into_response(span_dtos, focus=Focus.SPAN) or []
+                continue
+
+            span_dtos = held + span_dtos
+
+            cut = len(span_dtos)
+            while cut > 0 and span_dtos[cut - 1].trace_id == span_dtos[-1].trace_id:
+                cut -= 1
+
+            held = span_dtos[cut:]
+
+            if cut:
+                yield trace_map_to_traces(
+                    parse_spans_into_response(span_dtos[:cut], focus=Focus.TRACE) or {}
+                )
+
+        if held:
+            yield trace_map_to_traces(
+                parse_spans_into_response(held, focus=Focus.TRACE) or {}
+            )
+
     async def analytics(
         self,
         *,
@@ -3,7 +3,7 @@ from typing import List
 from uuid import UUID
 
 from orjson import dumps, loads
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
 from oss.src.dbs.redis.shared.engine import get_streams_engine
 from oss.src.utils.logging import get_module_logger
@@ -12,62 +12,117 @@ from oss.src.core.tracing.dtos import OTelFlatSpan
 
 log = get_module_logger(__name__)
 
+# Entries are ingest requests (batches of spans), not spans.
 MAXLEN_STREAMS_SPANS = 100_000
 
+# Larger requests are split so one stream entry (and the worker batch holding
+# it) stays bounded; each chunk carries the same header.
+MAX_SPANS_PER_MESSAGE = 1_000
+
+_SPANS_ADAPTER = TypeAdapter(List[OTelFlatSpan])
+
 
 def _get_redis():
     return get_streams_engine().get_redis()
 
 
-class SpanMessage(BaseModel):
+class SpansMessage(BaseModel):
     organization_id: UUID
     project_id: UUID
     user_id: UUID
     #
-    span_dto: OTelFlatSpan
+    span_dtos: List[OTelFlatSpan]
 
 
-def serialize_span(
+def serialize_spans(
     *,
     organization_id: UUID,
     project_id: UUID,
     user_id: UUID,
     #
-    span_dto: OTelFlatSpan,
+    span_dtos: List[OTelFlatSpan],
 ) -> bytes:
+    """One header plus the span array, dumped in one pass and compressed once."""
     data = dict(
         organization_id=organization_id.hex,
         project_id=project_id.hex,
         user_id=user_id.hex,
-        span_dto=span_dto.model_dump(mode="json", exclude_unset=True),
+        span_dtos=_SPANS_ADAPTER.dump_python(
+            span_dtos,
+            mode="json",
+            exclude_unset=True,
+        ),
     )
 
-    span_bytes = dumps(data)
+    spans_bytes = dumps(data)
 
     # Strip null bytes from serialized data
-    if b"\x00" in span_bytes:
-        span_bytes = (
-            span_bytes.decode("utf-8", "replace").replace("\x00", "").encode("utf-8")
+    if b"\x00" in spans_bytes:
+        spans_bytes = (
+            spans_bytes.decode("utf-8", "replace").replace("\x00", "").encode("utf-8")
         )
 
     # Compress with zlib for efficient storage
-    return zlib.compress(span_bytes)
+    return zlib.compress(spans_bytes)
 
 
-def deserialize_span(
+def _validate_spans(
     *,
-    span_bytes: bytes,
-) -> SpanMessage:
-    span_bytes = zlib.decompress(span_bytes)
-    data = loads(span_bytes)
+    project_id: UUID,
+    span_payloads: List[dict],
+) -> List[OTelFlatSpan]:
+    # The whole batch in one pass; span by span only when it fails, so one
+    # invalid span is skipped instead of dropping the rest of the message.
+    try:
+        return _SPANS_ADAPTER.validate_python(span_payloads)
+    except ValidationError:
+        pass
+
+    span_dtos = []
+    for idx, span_payload in enumerate(span_payloads):
+        try:
+            span_dtos.append(OTelFlatSpan.model_validate(span_payload))
+        except ValidationError as e:
+            log.warning(
+                "[INGEST] Skipping invalid span",
+                project_id=str(project_id),
+                index=idx,
+                errors=e.error_count(),
+                error=str(e),
+            )
 
-    span_payload = data.get("span_dto", data.get("span", {}))
+    return span_dtos
 
-    return SpanMessage(
+
+def deserialize_spans(
+    *,
+    spans_bytes: bytes,
+) -> SpansMessage:
+    """Decode a span message in one pass.
+
+    Accepts both the batch format (`span_dtos`) and the legacy one-span-per-entry
+    format (`span_dto`/`span`) still pending in the stream across a deploy.
+    Spans that fail validation are logged and left out; a message whose
+    envelope is unreadable still raises.
+    """
+    spans_bytes = zlib.decompress(spans_bytes)
+    data = loads(spans_bytes)
+
+    if "span_dtos" in data:
+        span_payloads = data["span_dtos"]
+    else:
+        span_payloads = [data.get("span_dto", data.get("span", {}))]
+
+    project_id = UUID(hex=data["project_id"])
+
+    return SpansMessage(
         organization_id=UUID(hex=data["organization_id"]),
-        project_id=UUID(hex=data["project_id"]),
+        project_id=project_id,
         user_id=UUID(hex=data["user_id"]),
-        span_dto=OTelFlatSpan(**span_payload),
+        span_dtos=_validate_spans(
+            project_id=project_id,
+            span_payloads=span_payloads,
+        ),
     )
 
 
@@ -79,34 +134,36 @@ async def publish_spans(
     #
     span_dtos: List[OTelFlatSpan],
 ) -> int:
+    """Publish spans as one stream entry per request (per chunk for large ones)."""
+    if not span_dtos:
+        return 0
+
     redis = _get_redis()
 
     count = 0
-    total_bytes = 0
 
-    # Full span_dtos list is already in hand, so pipeline all XADDs into one
-    # round-trip instead of one XADD per span on the firehose.
     async with redis.pipeline(transaction=False) as pipe:
-        for span_dto in span_dtos:
-            span_bytes = serialize_span(
+        for offset in range(0, len(span_dtos), MAX_SPANS_PER_MESSAGE):
+            chunk = span_dtos[offset : offset + MAX_SPANS_PER_MESSAGE]
+
+            spans_bytes = serialize_spans(
                 organization_id=organization_id,
                 project_id=project_id,
                 user_id=user_id,
                 #
-                span_dto=span_dto,
+                span_dtos=chunk,
             )
 
+            # `key` shards the worker's ordered lanes (see StreamConsumer).
             pipe.xadd(
                 name="streams:spans",
-                fields={"data": span_bytes},
+                fields={"data": spans_bytes, "key": project_id.hex},
                 maxlen=MAXLEN_STREAMS_SPANS,
                 approximate=True,
             )
 
-            count += 1
-            total_bytes += len(span_bytes)
+            count += len(chunk)
 
-        if count:
-            await pipe.execute()
+        await pipe.execute()
 
     return count
@@ -9,6 +9,7 @@ from oss.src.core.tracing.dtos import (
     Fields,
     Filtering,
     FilteringException,
+    Formatting,
     OTelFlatSpans,
     OTelSpanKind,
     OTelStatusCode,
@@ -553,5 +554,31 @@ def parse_ingest(span_dtos: OTelFlatSpans) -> None:
     pass
 
 
+def parse_formatting(
+    formatting: Optional[Formatting] = None,
+) -> None:
+    if formatting is None or formatting.fields is None:
+        return
+
+    for field in formatting.fields:
+        name, _, path = field.partition(".")
+
+        if name not in list(Fields) or name == Fields.CONTENT:
+            raise FilteringException(
+                f"Unsupported projection field '{field}'.",
+            )
+
+        if path and name != Fields.ATTRIBUTES:
+            raise FilteringException(
+                f"'{name}' does not support projection paths.",
+            )
+
+        if path and not all(path.split(".")):
+            raise FilteringException(
+                f"Invalid projection path '{field}'.",
+            )
+
+
 def parse_query(query: TracingQuery) -> None:
+    parse_formatting(query.formatting)
     parse_filtering(query.filtering)
@@ -6,7 +6,6 @@ from uuid import UUID
 from oss.src.utils.logging import get_module_logger
 from oss.src.core.tracing.dtos import (
     FilteringException,
-    OTelAttributes,
     OTelFlatSpans,
     OTelHash,
     OTelLink,
@@ -400,7 +399,7 @@ def _parse_span_into_response(
     marshall: Optional[bool] = False,
 ) -> Optional[OTelSpan]:
     if not span_dto.attributes:
-        span_dto.attributes = OTelAttributes()
+        span_dto.attributes = {}
 
     span_dto.trace_id = parse_trace_id_from_uuid(span_dto.trace_id)
     span_dto.span_id = parse_span_id_from_uuid(span_dto.span_id)
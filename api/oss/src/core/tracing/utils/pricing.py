@@ -0,0 +1,248 @@
+"""Per-token model prices for span costs, resolved once per model.
+
+`cost_calculator.cost_per_token` resolves the model (aliases, provider
+prefixes, provider-specific cache rules) on every call, which on the ingest
+path is once per LLM span. For a model that litellm prices linearly, three
+rates say it all: fresh prompt, completion and cache-read tokens. They are
+read off litellm itself, so they agree with its provider rules, then kept per
+model name, as litellm was given it, and applied with plain arithmetic.
+
+Models priced otherwise (tiers above N tokens, per second, per character) are
+detected when their rates are read and keep going through litellm per span.
+Models litellm fails to price are retried after `_UNPRICED_TTL`. Prices can be
+set outright for models litellm does not know (custom or self-hosted ones)
+with AGENTA_TRACING_MODEL_PRICES.
+"""
+
+import math
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from litellm import cost_calculator
+
+from oss.src.utils.env import env
+from oss.src.utils.logging import get_module_logger
+
+log = get_module_logger(__name__)
+
+
+# Tokens the rates are read at: large enough that a tiered model shows a
+# different rate than at `_CHECK_TOKENS`.
+_PROBE_TOKENS = 1_000_000
+_CHECK_TOKENS = 1_000
+
+# Model names come from span attributes, so bound what is kept per name.
+_MAX_MODELS = 4096
+
+# A failure to read rates may be transient (litellm's model map, a provider
+# rule): the model is left unpriced for that long, then read again.
+_UNPRICED_TTL = 5 * 60  # second(s)
+
+
+class ModelPrice(NamedTuple):
+    """USD per token; `cache_read` None when unknown (billed through litellm)."""
+
+    prompt: float
+    completion: float
+    cache_read: Optional[float] = None
+
+    @classmethod
+    def parse(cls, data: dict) -> "ModelPrice":
+        """Read litellm's model-map fields (`input_cost_per_token`, ...).
+
+        Without a cache-read rate, cached tokens are billed as fresh input.
+        """
+        prompt = float(data["input_cost_per_token"])
+        cache_read = data.get("cache_read_input_token_cost")
+
+        return cls(
+            prompt=prompt,
+            completion=float(data["output_cost_per_token"]),
+            cache_read=float(cache_read) if cache_read is not None else prompt,
+        )
+
+
+# Marks models whose rates cannot be used: priced through litellm per span.
+_NOT_LINEAR = object()
+
+
+def normalize_model(model: str) -> str:
+    return model.strip().lower()
+
+
+def _isclose(a: float, b: float) -> bool:
+    return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-15)
+
+
+def _read_rates(model: str):
+    prompt_cost, _ = cost_calculator.cost_per_token(
+        model=model,
+        prompt_tokens=_PROBE_TOKENS,
+        completion_tokens=0,
+    )
+    _, completion_cost = cost_calculator.cost_per_token(
+        model=model,
+        prompt_tokens=0,
+        completion_tokens=_PROBE_TOKENS,
+    )
+
+    prompt = prompt_cost / _PROBE_TOKENS
+    completion = completion_cost / _PROBE_TOKENS
+
+    check = cost_calculator.cost_per_token(
+        model=model,
+        prompt_tokens=_CHECK_TOKENS,
+        completion_tokens=_CHECK_TOKENS,
+    )
+    if not (
+        _isclose(check[0], prompt * _CHECK_TOKENS)
+        and _isclose(check[1], completion * _CHECK_TOKENS)
+    ):
+        return _NOT_LINEAR
+
+    try:
+        cached_cost, _ = cost_calculator.cost_per_token(
+            model=model,
+            prompt_tokens=_PROBE_TOKENS,
+            completion_tokens=0,
+            cache_read_input_tokens=_PROBE_TOKENS,
+        )
+        cache_read = cached_cost / _PROBE_TOKENS
+    except TypeError:
+        # A litellm without cache-read pricing: cached spans go through it.
+        cache_read = None
+
+    price = ModelPrice(prompt=prompt, completion=completion, cache_read=cache_read)
+
+    return price
+
+
+class ModelPricing:
+    """Prices spans by model, from overrides, then rates read off litellm."""
+
+    def __init__(
+        self,
+        *,
+        overrides: Optional[Dict[str, ModelPrice]] = None,
+    ):
+        self.overrides = {
+            normalize_model(model): price for model, price in (overrides or {}).items()
+        }
+        # Keyed by the model name as given: litellm's lookup depends on it.
+        self._rates: dict = {}
+        # Model name -> when to read its rates again.
+        self._unpriced: Dict[str, float] = {}
+
+    def costs(
+        self,
+        *,
+        model: str,
+        prompt_tokens: float,
+        completion_tokens: float,
+        cache_read_tokens: float = 0,
+    ) -> Optional[Tuple[float, float]]:
+        """(prompt, completion) cost in USD, or None if the model has no price.
+
+        `prompt_tokens` includes the `cache_read_tokens`, as in litellm. Errors
+        of litellm propagate, once per `_UNPRICED_TTL` for a model without a
+        price.
+        """
+        if not model:
+            return None
+
+        price = self.overrides.get(normalize_model(model))
+        if price is None:
+            price = self._rates.get(model)
+        if price is None:
+            if time.monotonic() < self._unpriced.get(model, 0):
+                return None
+
+            try:
+                price = _read_rates(model)
+            except Exception:
+                if len(self._unpriced) >= _MAX_MODELS:
+                    self._unpriced.clear()
+                self._unpriced[model] = time.monotonic() + _UNPRICED_TTL
+                raise
+
+            self._unpriced.pop(model, None)
+            if len(self._rates) < _MAX_MODELS:
+                self._rates[model] = price
+
+        if (
+            price is _NOT_LINEAR
+            or (cache_read_tokens and price.cache_read is None)
+            or cache_read_tokens > prompt_tokens
+        ):
+            return _litellm_costs(
+                model=model,
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                cache_read_tokens=cache_read_tokens,
+            )
+
+        prompt_cost = (prompt_tokens - cache_read_tokens) * price.prompt
+        if cache_read_tokens:
+            prompt_cost += cache_read_tokens * price.cache_read
+
+        return prompt_cost, completion_tokens * price.completion
+
+
+def _litellm_costs(
+    *,
+    model: str,
+    prompt_tokens: float,
+    completion_tokens: float,
+    cache_read_tokens: float,
+) -> Tuple[float, float]:
+    # litellm's convention is that `prompt_tokens` INCLUDES the cached tokens and
+    # that it prices the cached slice separately (it normalizes Anthropic-style
+    # usage, where the input count excludes them, on the way in). So the cached
+    # count is passed ALONGSIDE the prompt total and must not be subtracted from
+    # it first -- doing that would understate cost instead of overstating it.
+    #
+    # Passed only when non-zero so a span with no caching calls exactly the
+    # signature it always did: the SDK pins `litellm>=1,<2`, and on a 1.x old
+    # enough to lack the parameter an unconditional kwarg would raise TypeError,
+    # which the caller would swallow into "no costs at all" for EVERY span.
+    #
+    # int(), and not incidentally: litellm reads the cached slice back off
+    # `Usage.prompt_tokens_details.cached_tokens`, and its `Usage` model only
+    # derives that wrapper from an int. Hand it the float this metric is stored
+    # as and `prompt_tokens_details` comes back None, so the cached tokens are
+    # billed at the full input rate again -- silently, with no error to catch.
+    cache_kwargs = (
+        {"cache_read_input_tokens": int(cache_read_tokens)} if cache_read_tokens else {}
+    )
+
+    return cost_calculator.cost_per_token(
+        model=model,
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        **cache_kwargs,
+    )
+
+
+def _load_model_pricing() -> ModelPricing:
+    overrides = {}
+
+    for model, data in (env.agenta.api.tracing.model_prices or {}).items():
+        try:
+            overrides[model] = ModelPrice.parse(data)
+        except Exception:
+            log.warning("Ignoring invalid model price", model=model)
+
+    return ModelPricing(overrides=overrides)
+
+
+_model_pricing: Optional[ModelPricing] = None
+
+
+def get_model_pricing() -> ModelPricing:
+    """The process-wide pricing, loaded on first use."""
+    global _model_pricing
+
+    if _model_pricing is None:
+        _model_pricing = _load_model_pricing()
+
+    return _model_pricing
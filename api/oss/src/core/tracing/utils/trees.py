@@ -1,8 +1,6 @@
 from collections import OrderedDict
 from typing import Dict, List, Optional
 
-from litellm import cost_calculator
-
 from oss.src.utils.logging import get_module_logger
 from oss.src.core.shared.dtos import Trace, Traces
 from oss.src.core.tracing.dtos import (
@@ -13,6 +11,7 @@ from oss.src.core.tracing.dtos import (
     Span,
     TraceType,
 )
+from oss.src.core.tracing.utils.pricing import ModelPricing, get_model_pricing
 
 log = get_module_logger(__name__)
 
@@ -27,6 +26,7 @@ def parse_span_dtos_to_span_idx(
 
 def calculate_and_propagate_metrics(
     span_dtos: List[OTelFlatSpan],
+    pricing: Optional[ModelPricing] = None,
 ) -> List[OTelFlatSpan]:
     """
     Calculate and propagate costs/tokens/errors for a list of span DTOs.
@@ -36,6 +36,7 @@ def calculate_and_propagate_metrics(
 
     Args:
         span_dtos: List of span DTOs (should be from a complete trace)
+        pricing: Model prices, e.g. with a project's overrides (default: global)
 
     Returns:
         List of span DTOs with calculated and propagated costs/tokens/errors
@@ -48,7 +49,7 @@ def calculate_and_propagate_metrics(
     span_id_tree = parse_span_idx_to_span_id_tree(span_idx)
 
     # Calculate incremental costs from token counts
-    calculate_costs(span_idx)
+    calculate_costs(span_idx, pricing)
 
     # Propagate costs up the tree (children to parents)
     cumulate_costs(span_id_tree, span_idx)
@@ -65,6 +66,7 @@ def calculate_and_propagate_metrics(
 
 def calculate_and_propagate_metrics_by_trace(
     span_dtos: List[OTelFlatSpan],
+    pricing: Optional[ModelPricing] = None,
 ) -> List[OTelFlatSpan]:
     """
     Calculate metrics for each trace independently within a mixed batch.
@@ -82,9 +84,12 @@ def calculate_and_propagate_metrics_by_trace(
         trace_key = str(span_dto.trace_id)
         spans_by_trace.setdefault(trace_key, []).append(span_dto)
 
+    # Resolved once for the whole batch.
+    pricing = pricing or get_model_pricing()
+
     processed: List[OTelFlatSpan] = []
     for trace_spans in spans_by_trace.values():
-        processed.extend(calculate_and_propagate_metrics(trace_spans))
+        processed.extend(calculate_and_propagate_metrics(trace_spans, pricing))
 
     return processed
 
@@ -172,6 +177,45 @@ def promote_identity_by_trace(
     return span_dtos
 
 
+def prepare_span_dtos(
+    span_dtos: List[OTelFlatSpan],
+    pricing: Optional[ModelPricing] = None,
+) -> List[OTelFlatSpan]:
+    """
+    Run the per-trace ingest passes (trace type, metrics, identity) over a
+    request's spans. Each pass is best-effort: a failure is logged and the
+    spans continue without it.
+
+    Pure CPU work on its inputs, so it can run off the event loop (see the
+    OTLP decoder).
+    """
+    try:
+        span_dtos = infer_and_propagate_trace_type_by_trace(span_dtos)
+    except Exception:  # pylint: disable=broad-exception-caught
+        log.error(
+            "Failed to infer trace types; continuing without trace-type propagation",
+            exc_info=True,
+        )
+
+    try:
+        span_dtos = calculate_and_propagate_metrics_by_trace(span_dtos, pricing)
+    except Exception:  # pylint: disable=broad-exception-caught
+        log.error(
+            "Failed to calculate metrics; continuing without metrics",
+            exc_info=True,
+        )
+
+    try:
+        span_dtos = promote_identity_by_trace(span_dtos)
+    except Exception:  # pylint: disable=broad-exception-caught
+        log.error(
+            "Failed to promote session/user/agent identity; continuing without it",
+            exc_info=True,
+        )
+
+    return span_dtos
+
+
 def parse_span_idx_to_span_id_tree(
     span_idx: Dict[str, OTelFlatSpan],
 ) -> OrderedDict:
@@ -583,7 +627,12 @@ TYPES_WITH_COSTS = [
 CACHE_READ_TOKEN_KEYS = ("cache_read", "cached")
 
 
-def calculate_costs(span_idx: Dict[str, OTelFlatSpan]):
+def calculate_costs(
+    span_idx: Dict[str, OTelFlatSpan],
+    pricing: Optional[ModelPricing] = None,
+):
+    pricing = pricing or get_model_pricing()
+
     for span in span_idx.values():
         if (
             span.span_type
@@ -607,7 +656,7 @@ def calculate_costs(span_idx: Dict[str, OTelFlatSpan]):
             completion_tokens = tokens.get("completion", 0.0)
 
             # Only a real positive number qualifies. Non-numeric or negative garbage from a
-            # foreign OTLP source must degrade to "no cache kwarg", not reach the int() below
+            # foreign OTLP source must degrade to "no cache kwarg", not reach the int() there
             # and turn into a swallowed exception that drops the span's ENTIRE cost.
             cache_read_tokens = next(
                 (
@@ -621,33 +670,11 @@ def calculate_costs(span_idx: Dict[str, OTelFlatSpan]):
             )
 
             try:
-                # litellm's convention is that `prompt_tokens` INCLUDES the cached tokens and
-                # that it prices the cached slice separately (it normalizes Anthropic-style
-                # usage, where the input count excludes them, on the way in). So the cached
-                # count is passed ALONGSIDE the prompt total and must not be subtracted from
-                # it first -- doing that would understate cost instead of overstating it.
-                #
-                # Passed only when non-zero so a span with no caching calls exactly the
-                # signature it always did: the SDK pins `litellm>=1,<2`, and on a 1.x old
-                # enough to lack the parameter an unconditional kwarg would raise TypeError,
-                # which the `except` below would swallow into "no costs at all" for EVERY span.
-                #
-                # int(), and not incidentally: litellm reads the cached slice back off
-                # `Usage.prompt_tokens_details.cached_tokens`, and its `Usage` model only
-                # derives that wrapper from an int. Hand it the float this metric is stored
-                # as and `prompt_tokens_details` comes back None, so the cached tokens are
-                # billed at the full input rate again -- silently, with no error to catch.
-                cache_kwargs = (
-                    {"cache_read_input_tokens": int(cache_read_tokens)}
-                    if cache_read_tokens
-                    else {}
-                )
-
-                costs = cost_calculator.cost_per_token(
+                costs = pricing.costs(
                     model=model,
                     prompt_tokens=prompt_tokens,
                     completion_tokens=completion_tokens,
-                    **cache_kwargs,
+                    cache_read_tokens=cache_read_tokens,
                 )
 
                 if not costs:
@@ -1770,6 +1770,11 @@ class EvaluationsDAO(EvaluationsDAOInterface):
                         EvaluationResultDBE.scenario_id.in_(result.scenario_ids),
                     )
 
+                if result.trace_ids is not None:
+                    stmt = stmt.filter(
+                        EvaluationResultDBE.trace_id.in_(result.trace_ids),
+                    )
+
                 if result.step_key is not None:
                     stmt = stmt.filter(
                         EvaluationResultDBE.step_key == result.step_key,
@@ -1892,6 +1897,11 @@ class EvaluationsDAO(EvaluationsDAOInterface):
                         EvaluationResultDBE.scenario_id.in_(result.scenario_ids)
                     )
 
+                if result.trace_ids is not None:
+                    stmt = stmt.filter(
+                        EvaluationResultDBE.trace_id.in_(result.trace_ids)
+                    )
+
                 if result.step_key is not None:
                     stmt = stmt.filter(EvaluationResultDBE.step_key == result.step_key)
 
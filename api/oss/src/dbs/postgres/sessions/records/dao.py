@@ -1,7 +1,8 @@
+from datetime import datetime
 from typing import Dict, List, Optional
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import and_, func, or_, select
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -9,6 +10,7 @@ from oss.src.core.sessions.records.dtos import (
     SESSION_MESSAGE_PREVIEW_TEXT_LIMIT,
     SessionMessagePreview,
     SessionRecord,
+    SessionRecordCursor,
     SessionRecordEvent,
 )
 from oss.src.core.sessions.records.interfaces import RecordsDAOInterface
@@ -140,30 +142,71 @@ class RecordsDAO(RecordsDAOInterface):
         *,
         project_id: UUID,
         session_id: str,
+        since: Optional[datetime] = None,
+        cursor: Optional[SessionRecordCursor] = None,
+        limit: Optional[int] = None,
     ) -> List[SessionRecord]:
+        """The records of a session, all of them or from `since` / after `cursor` on.
+
+        `since` keeps the records whose timestamp is at or after it, and `cursor` those
+        after a record returned already, so a client fetches only what changed. Either,
+        or a `limit`, reads in (timestamp, record_id) order, on the index of that name.
+        """
         async with self.engine.session() as session:
-            stmt = (
-                select(RecordDBE)
-                .where(
-                    RecordDBE.project_id == project_id,
-                    RecordDBE.session_id == session_id,
-                )
+            stmt = select(RecordDBE).where(
+                RecordDBE.project_id == project_id,
+                RecordDBE.session_id == session_id,
+            )
+
+            if since is None and cursor is None and limit is None:
                 # Producer event time first: it is the only key that is monotonic across
                 # turns. `record_index` restarts at 0 every turn, and the worker can batch
                 # records from two turns into one write so they share `created_at` — the old
                 # (created_at, record_index) order then sorted the NEXT turn's first record
                 # ahead of the PREVIOUS turn's later ones, interleaving the conversation.
                 # Rows written before `timestamp` existed sort last within their ingest batch.
-                .order_by(
+                stmt = stmt.order_by(
                     RecordDBE.timestamp.asc().nullslast(),
                     RecordDBE.created_at.asc(),
                     RecordDBE.record_index.asc(),
                 )
-            )
+            else:
+                if since is not None:
+                    stmt = stmt.where(RecordDBE.timestamp >= since)
+
+                if cursor is not None:
+                    stmt = stmt.where(self._after_cursor(cursor=cursor))
+
+                # A total order, so pages neither skip nor repeat records that share a
+                # timestamp. Records written before `timestamp` existed come last.
+                stmt = stmt.order_by(
+                    RecordDBE.timestamp.asc().nullslast(),
+                    RecordDBE.record_id.asc(),
+                )
+
+                if limit is not None:
+                    stmt = stmt.limit(limit)
 
             dbes = (await session.execute(stmt)).scalars().all()
             return [map_record_dbe_to_dto(dbe=dbe) for dbe in dbes]
 
+    @staticmethod
+    def _after_cursor(*, cursor: SessionRecordCursor):
+        if cursor.timestamp is None:
+            return and_(
+                RecordDBE.timestamp.is_(None),
+                RecordDBE.record_id > cursor.record_id,
+            )
+
+        return or_(
+            RecordDBE.timestamp > cursor.timestamp,
+            and_(
+                RecordDBE.timestamp == cursor.timestamp,
+                RecordDBE.record_id > cursor.record_id,
+            ),
+            RecordDBE.timestamp.is_(None),
+        )
+
     async def latest_message_per_session(
         self,
         *,
@@ -22,6 +22,13 @@ class RecordDBE(
             "session_id",
             "record_id",
         ),
+        Index(
+            "ix_records_project_id_session_id_timestamp_record_id",
+            "project_id",
+            "session_id",
+            "timestamp",
+            "record_id",
+        ),
         Index(
             "ix_records_attributes_gin",
             "attributes",
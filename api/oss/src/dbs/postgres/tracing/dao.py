@@ -1,9 +1,18 @@
-from typing import Tuple, Any, Dict, Optional, List, Literal, cast as type_cast
+from typing import (
+    Tuple,
+    Any,
+    AsyncIterator,
+    Dict,
+    Optional,
+    List,
+    cast as type_cast,
+)
 from uuid import UUID
 from traceback import format_exc
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from math import ceil
 
-from sqlalchemy import cast, func, select, text
+from sqlalchemy import cast, delete, func, select, text, tuple_
 from sqlalchemy.types import Numeric, BigInteger
 from sqlalchemy.sql import Select, and_, or_
 from sqlalchemy.exc import DBAPIError
@@ -11,6 +20,7 @@ from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.sql.elements import ColumnElement
 from sqlalchemy.dialects.postgresql import BIT
 
+from oss.src.utils.env import env
 from oss.src.utils.logging import get_module_logger
 from oss.src.utils.exceptions import suppress_exceptions
 
@@ -31,7 +41,43 @@ from oss.src.core.tracing.dtos import (
 
 from oss.src.dbs.postgres.shared.utils import apply_windowing
 from oss.src.dbs.postgres.shared.engine import AnalyticsEngine, get_analytics_engine
-from oss.src.dbs.postgres.tracing.dbes import SpanDBE
+from oss.src.dbs.postgres.tracing.dbes import (
+    DirectoryCoverageDBE,
+    SpanDBE,
+    SpanRollupCoverageDBE,
+    TraceCoverageDBE,
+    TraceDBE,
+)
+from oss.src.dbs.postgres.tracing.directories import (
+    Group,
+    directory_page_stmt,
+    ensure_directories_coverage_stmt,
+    listed_in_directory,
+    remove_from_directories,
+    write_directories,
+)
+from oss.src.dbs.postgres.tracing.partitions import SpansPartitionsDAO
+from oss.src.dbs.postgres.tracing.rollups import (
+    ROLLUP_HOUR,
+    ROLLUP_MINUTE,
+    ROLLUPS_QUERY_SQL,
+    assemble_rollup_buckets,
+    ensure_coverage_stmt,
+    match_rollup_scope,
+    write_rollups,
+)
+from oss.src.dbs.postgres.tracing.projections import (
+    is_projected,
+    map_span_row_to_span_dbe,
+    select_span_columns,
+)
+from oss.src.dbs.postgres.tracing.summaries import (
+    adapt_to_traces,
+    as_utc,
+    ensure_traces_coverage_stmt,
+    match_trace_filtering,
+    write_trace_summaries,
+)
 from oss.src.dbs.postgres.tracing.mappings import (
     map_span_dbe_to_link_dto,
     map_span_dto_to_span_dbe,
@@ -41,6 +87,7 @@ from oss.src.dbs.postgres.tracing.mappings import (
 )
 from oss.src.dbs.postgres.tracing.utils import (
     TIMEOUT_STMT,
+    EXPORT_TIMEOUT_STMT,
     #
     combine,
     filter,
@@ -67,11 +114,101 @@ from oss.src.dbs.postgres.tracing.utils import (
 log = get_module_logger(__name__)
 
 
+# asyncpg caps a single statement at 32767 bind parameters; a multi-row upsert
+# binds one parameter per column per row, so batches are split to stay under it.
+POSTGRES_MAX_BIND_PARAMS = 32767
+INGEST_CHUNK_SIZE = POSTGRES_MAX_BIND_PARAMS // len(SpanDBE.__table__.columns)
+
+# Columns kept from the first write of a span; every other column is
+# overwritten on conflict (updated_* are set explicitly below).
+_UPSERT_PRESERVED_COLUMNS = (
+    "project_id",
+    "trace_id",
+    "span_id",
+    "start_time",
+    "created_at",
+    "created_by_id",
+)
+
+
+def _dedupe_span_values(*, values_list: List[dict]) -> List[dict]:
+    # Postgres rejects one INSERT ... ON CONFLICT DO UPDATE that touches the same
+    # (project_id, trace_id, span_id) twice ("cannot affect row a second time").
+    # Exporters do re-send a span within one batch, so collapse duplicates into the
+    # end state that sequential per-span upserts would have produced: last one wins.
+    # Keyed without start_time, so a re-sent span is still written once per batch.
+    deduped: Dict[Tuple[Any, Any, Any], dict] = {}
+    for values in values_list:
+        key = (values["project_id"], values["trace_id"], values["span_id"])
+        prev = deduped.get(key)
+        if prev is None:
+            deduped[key] = values
+        else:
+            deduped[key] = {
+                **values,
+                **{column: prev[column] for column in _UPSERT_PRESERVED_COLUMNS},
+            }
+    return list(deduped.values())
+
+
+def _upsert_spans_stmt(*, values_list: List[dict], user_id: UUID):
+    stmt = insert(SpanDBE).values(values_list)
+
+    # On conflict on primary key (project_id, trace_id, span_id, start_time),
+    # update all fields
+    update_fields = {
+        c.name: stmt.excluded[c.name]
+        for c in SpanDBE.__table__.columns
+        if c.name not in _UPSERT_PRESERVED_COLUMNS
+    }
+    update_fields["updated_at"] = datetime.now(timezone.utc)
+    update_fields["updated_by_id"] = user_id
+
+    return stmt.on_conflict_do_update(
+        index_elements=["project_id", "trace_id", "span_id", "start_time"],
+        set_=update_fields,
+    )
+
+
+def _lacks_client_start_time(values: dict) -> bool:
+    # A span sent without start or end time gets both set to the time it was
+    # parsed (see `OTelFlatSpan`); spans from OTLP exporters carry their own.
+    return values["start_time"] == values["end_time"]
+
+
+def _stored_start_times_stmt(*, project_id: UUID, values_list: List[dict]):
+    # start_time is part of the primary key (it partitions the table), but edits
+    # do not always carry the one a span was first written with: an annotation
+    # edit sends none and gets the time of the edit. Such spans keep their
+    # stored start_time, so they update in place instead of being written twice.
+    # The lookup cannot be pruned to a partition, so it only covers those spans.
+    return (
+        select(
+            SpanDBE.trace_id,
+            SpanDBE.span_id,
+            func.min(SpanDBE.start_time).label("start_time"),
+        )
+        .where(
+            SpanDBE.project_id == project_id,
+            tuple_(SpanDBE.trace_id, SpanDBE.span_id).in_(
+                [(values["trace_id"], values["span_id"]) for values in values_list]
+            ),
+        )
+        .group_by(SpanDBE.trace_id, SpanDBE.span_id)
+    )
+
+
 class TracingDAO(TracingDAOInterface):
     def __init__(self, engine: AnalyticsEngine = None):
         if engine is None:
             engine = get_analytics_engine()
         self.engine = engine
+        # Projects whose rollup coverage is known to be recorded.
+        self._covered_project_ids: set = set()
+        # Projects whose trace summaries coverage is known to be recorded.
+        self._summarized_project_ids: set = set()
+        # Projects whose directories coverage is known to be recorded.
+        self._listed_project_ids: set = set()
 
     ### SPANS
 
@@ -84,56 +221,152 @@ class TracingDAO(TracingDAOInterface):
         #
         span_dtos: List[OTelFlatSpan],
     ) -> List[OTelLink]:
-        """Ingest spans using PostgreSQL INSERT ... ON CONFLICT ... DO UPDATE."""
+        """Ingest spans using multi-row PostgreSQL INSERT ... ON CONFLICT ... DO UPDATE.
+
+        The whole batch is written in one transaction, in as few statements as the
+        bind-parameter limit allows (see INGEST_CHUNK_SIZE). One link is returned per
+        input span, in input order, duplicates included. Spans sent without a
+        start_time, when already stored, keep the one they were first written
+        with. Root spans inserted (not
+        updated) by the batch are added to the analytics rollups and to the session
+        and user directories in that transaction, and the traces of all its spans
+        are upserted into the trace summaries.
+        """
         if not span_dtos:
             return []
 
+        span_dbes = [
+            map_span_dto_to_span_dbe(
+                project_id=project_id,
+                user_id=user_id,
+                span_dto=span_dto,
+            )
+            for span_dto in span_dtos
+        ]
+
+        link_dtos: List[OTelLink] = [
+            map_span_dbe_to_link_dto(span_dbe=span_dbe) for span_dbe in span_dbes
+        ]
+
+        values_list = _dedupe_span_values(
+            values_list=[
+                {c.name: getattr(span_dbe, c.name) for c in SpanDBE.__table__.columns}
+                for span_dbe in span_dbes
+            ]
+        )
+
+        rollups_enabled = env.agenta.api.tracing.rollups_enabled
+        inserted_roots: List[dict] = []
+
         async with self.engine.session() as session:
-            link_dtos: List[OTelLink] = []
+            for offset in range(0, len(values_list), INGEST_CHUNK_SIZE):
+                chunk = values_list[offset : offset + INGEST_CHUNK_SIZE]
 
-            for span_dto in span_dtos:
-                span_dbe = map_span_dto_to_span_dbe(
-                    project_id=project_id,
+                chunk_by_key = {
+                    (values["trace_id"], values["span_id"]): values for values in chunk
+                }
+
+                undated = [
+                    values for values in chunk if _lacks_client_start_time(values)
+                ]
+
+                if undated:
+                    stored = await session.execute(
+                        _stored_start_times_stmt(
+                            project_id=project_id,
+                            values_list=undated,
+                        )
+                    )
+
+                    for row in stored.fetchall():
+                        chunk_by_key[(row.trace_id, row.span_id)]["start_time"] = (
+                            row.start_time
+                        )
+
+                roots = {
+                    (values["trace_id"], values["span_id"]): values
+                    for values in chunk
+                    if values.get("parent_id") is None
+                }
+
+                stmt = _upsert_spans_stmt(
+                    values_list=chunk,
                     user_id=user_id,
-                    span_dto=span_dto,
                 )
 
-                # PostgreSQL upsert: INSERT ... ON CONFLICT ... DO UPDATE
-                values = {
-                    c.name: getattr(span_dbe, c.name) for c in SpanDBE.__table__.columns
-                }
+                if roots:
+                    stmt = stmt.returning(
+                        SpanDBE.trace_id,
+                        SpanDBE.span_id,
+                        SpanDBE.updated_at,
+                    )
 
-                stmt = insert(SpanDBE).values(**values)
-
-                # On conflict on primary key (project_id, trace_id, span_id), update all fields
-                update_fields = {
-                    c.name: stmt.excluded[c.name]
-                    for c in SpanDBE.__table__.columns
-                    if c.name
-                    not in [
-                        "project_id",
-                        "trace_id",
-                        "span_id",
-                        "created_at",
-                        "created_by_id",
-                    ]
-                }
-                update_fields["updated_at"] = datetime.now(timezone.utc)
-                update_fields["updated_by_id"] = user_id
+                result = await session.execute(stmt)
+
+                if roots:
+                    # updated_at is only set by the conflict branch: NULL means
+                    # inserted, so a re-sent span is not counted twice.
+                    inserted_roots.extend(
+                        roots[(row.trace_id, row.span_id)]
+                        for row in result.fetchall()
+                        if row.updated_at is None
+                        and (row.trace_id, row.span_id) in roots
+                    )
 
-                stmt = stmt.on_conflict_do_update(
-                    index_elements=["project_id", "trace_id", "span_id"],
-                    set_=update_fields,
+            summarized = await write_trace_summaries(
+                session,
+                project_id=project_id,
+                values_list=values_list,
+            )
+
+            if summarized and project_id not in self._summarized_project_ids:
+                await session.execute(
+                    ensure_traces_coverage_stmt(
+                        project_id=project_id,
+                        now=datetime.now(timezone.utc),
+                    )
                 )
 
-                await session.execute(stmt)
+            listed = await write_directories(
+                session,
+                project_id=project_id,
+                values_list=inserted_roots,
+            )
+
+            if listed and project_id not in self._listed_project_ids:
+                await session.execute(
+                    ensure_directories_coverage_stmt(
+                        project_id=project_id,
+                        now=datetime.now(timezone.utc),
+                    )
+                )
 
-                link_dto = map_span_dbe_to_link_dto(span_dbe=span_dbe)
-                link_dtos.append(link_dto)
+            if inserted_roots and rollups_enabled:
+                written = await write_rollups(
+                    session,
+                    project_id=project_id,
+                    values_list=inserted_roots,
+                )
+
+                if written and project_id not in self._covered_project_ids:
+                    await session.execute(
+                        ensure_coverage_stmt(
+                            project_id=project_id,
+                            now=datetime.now(timezone.utc),
+                        )
+                    )
 
             await session.commit()
 
-            return link_dtos
+        if inserted_roots and rollups_enabled:
+            self._covered_project_ids.add(project_id)
+
+        if listed:
+            self._listed_project_ids.add(project_id)
+
+        self._summarized_project_ids.add(project_id)
+
+        return link_dtos
 
     @suppress_exceptions(default=[])
     async def query(
@@ -145,6 +378,129 @@ class TracingDAO(TracingDAOInterface):
     ) -> List[OTelFlatSpan]:
         # DE-STRUCTURING
         focus = query.formatting.focus if query.formatting else None
+        columns = select_span_columns(query.formatting)
+        # --------------
+
+        # DEBUGGING
+        # log.trace(query.model_dump(mode="json", exclude_none=True))
+        # ---------
+
+        if focus == Focus.TRACE:
+            span_dtos = await self._query_from_trace_summaries(
+                project_id=project_id,
+                query=query,
+            )
+
+            if span_dtos is not None:
+                return span_dtos
+
+        try:
+            async with self.engine.session() as session:
+                # TIMEOUT
+                await session.execute(TIMEOUT_STMT)
+                # -------
+
+                stmt = self._query_stmt(project_id=project_id, query=query)
+
+                if stmt is None:
+                    return []
+
+                # DEBUGGING
+                # log.trace(str(stmt.compile(**DEBUG_ARGS)).replace("\n", " "))
+                # ---------
+
+                # EXECUTION
+                result = await session.execute(stmt)
+                dbes = result.all() if columns else result.scalars().all()
+                # ---------
+
+                if not dbes:
+                    return []
+
+                return self._map_span_dtos(dbes=dbes, query=query)
+
+        except DBAPIError as e:
+            log.error(f"{type(e).__name__}: {e}")
+            log.error(format_exc())
+
+            if "QueryCanceledError" in str(e.orig):
+                raise Exception(  # pylint: disable=broad-exception-raised
+                    "TracingQuery execution was cancelled due to timeout. "
+                    "Please try again with a smaller time interval."
+                ) from e
+
+            raise e
+
+        except Exception as e:
+            log.error(f"{type(e).__name__}: {e}")
+            log.error(format_exc())
+            raise e
+
+    async def stream(
+        self,
+        *,
+        project_id: UUID,
+        #
+        query: TracingQuery,
+    ) -> AsyncIterator[List[OTelFlatSpan]]:
+        """The spans of `query`, in batches off a server-side cursor.
+
+        The next batch is fetched when the consumer asks for it, so a slow
+        reader holds the cursor instead of the spans piling up in memory.
+        """
+        columns = select_span_columns(query.formatting)
+        batch_size = env.agenta.api.tracing.export_batch_size
+
+        try:
+            async with self.engine.session() as session:
+                # TIMEOUT
+                await session.execute(EXPORT_TIMEOUT_STMT)
+                # -------
+
+                stmt = self._query_stmt(project_id=project_id, query=query)
+
+                if stmt is None:
+                    return
+
+                # EXECUTION
+                result = await session.stream(
+                    stmt.execution_options(yield_per=batch_size)
+                )
+                batches = (
+                    result.partitions() if columns else result.scalars().partitions()
+                )
+                # ---------
+
+                async for dbes in batches:
+                    yield self._map_span_dtos(dbes=dbes, query=query)
+
+        except DBAPIError as e:
+            log.error(f"{type(e).__name__}: {e}")
+            log.error(format_exc())
+
+            if "QueryCanceledError" in str(e.orig):
+                raise Exception(  # pylint: disable=broad-exception-raised
+                    "TracingQuery export was cancelled due to timeout. "
+                    "Please try again with a smaller time interval."
+                ) from e
+
+            raise e
+
+    def _query_stmt(
+        self,
+        *,
+        project_id: UUID,
+        #
+        query: TracingQuery,
+    ) -> Optional[Select]:
+        """The spans of `query`, in the order of its focus; None when none can match.
+
+        With focus=trace, the spans of each trace come in a row: traces by their
+        latest span, newest first, and spans by start time.
+        """
+        # DE-STRUCTURING
+        focus = query.formatting.focus if query.formatting else None
+        columns = select_span_columns(query.formatting)
 
         oldest = query.windowing.oldest if query.windowing else None
         newest = query.windowing.newest if query.windowing else None
@@ -156,46 +512,192 @@ class TracingDAO(TracingDAOInterface):
         conditions = query.filtering.conditions if query.filtering else None
         # --------------
 
-        # DEBUGGING
-        # log.trace(query.model_dump(mode="json", exclude_none=True))
+        # BASE (SUB-)STMT
+        base: Select = select(*columns) if columns else select(SpanDBE)
+        # ---------------
+
+        # GROUPING
+        if focus == Focus.TRACE:
+            base = select(
+                SpanDBE.trace_id,
+                SpanDBE.start_time,
+            ).distinct(SpanDBE.trace_id)
+        # --------
+
+        # SCOPING
+        base = base.filter(SpanDBE.project_id == project_id)
+        # -------
+
+        # FILTERING
+        if operator and conditions:
+            base = base.filter(
+                type_cast(
+                    ColumnElement[bool],
+                    combine(
+                        operator=operator,
+                        clauses=filter(conditions),
+                    ),
+                )
+            )
+        # ---------
+
+        # WINDOWING
+        if rate is not None:
+            percent = max(0, min(int(rate * 100.0), 100))
+
+            if percent == 0:
+                return None
+
+            if percent < 100:
+                base = base.where(
+                    cast(
+                        text("concat('x', left(cast(trace_id as varchar), 8))"),
+                        BIT(32),
+                    ).cast(BigInteger)
+                    % 100
+                    < percent
+                )
         # ---------
 
+        # GROUPING
+        if focus == Focus.TRACE:
+            # WINDOWING
+            if newest:
+                if next:
+                    base = base.filter(SpanDBE.start_time <= newest)
+                else:
+                    base = base.filter(SpanDBE.start_time < newest)
+            if oldest:
+                base = base.filter(SpanDBE.start_time >= oldest)
+            # ---------
+
+            base = base.order_by(SpanDBE.trace_id, SpanDBE.start_time.desc())
+
+            inner = base.subquery("latest_per_trace")
+
+            uniq = select(inner.c.trace_id)
+
+            uniq = uniq.order_by(inner.c.start_time.desc())
+
+            if next and newest:
+                uniq = uniq.filter(
+                    or_(
+                        inner.c.start_time < newest,
+                        and_(
+                            inner.c.start_time == newest,
+                            inner.c.trace_id < next,
+                        ),
+                    )
+                )
+
+            if limit:
+                uniq = uniq.limit(limit)
+
+            stmt = (
+                (select(*columns) if columns else select(SpanDBE))
+                .filter(SpanDBE.trace_id.in_(uniq))
+                .order_by(
+                    func.max(SpanDBE.start_time)
+                    .over(partition_by=SpanDBE.trace_id)
+                    .desc(),
+                    SpanDBE.trace_id.desc(),
+                    SpanDBE.start_time.asc(),
+                )
+            )
+        else:
+            if query.windowing:
+                stmt = apply_windowing(
+                    stmt=base,
+                    DBE=SpanDBE,
+                    attribute="start_time",
+                    order="descending",
+                    windowing=query.windowing,
+                )
+            else:
+                stmt = base
+        # --------
+
+        return stmt
+
+    @staticmethod
+    def _map_span_dtos(
+        *,
+        dbes: List[Any],
+        query: TracingQuery,
+    ) -> List[OTelFlatSpan]:
+        # Span entities, or rows of the columns of a projection.
+        if not is_projected(query.formatting):
+            return [map_span_dbe_to_span_dto(span_dbe=dbe) for dbe in dbes]
+
+        return [
+            map_span_dbe_to_span_dto(
+                span_dbe=map_span_row_to_span_dbe(dbe, query.formatting),
+            )
+            for dbe in dbes
+        ]
+
+    async def _query_from_trace_summaries(
+        self,
+        *,
+        project_id: UUID,
+        #
+        query: TracingQuery,
+    ) -> Optional[List[OTelFlatSpan]]:
+        """Serve a page of traces from the trace summaries, or None when they cannot.
+
+        Traces are ordered and windowed by the time they started, where the
+        spans path uses each trace's latest span and lists a trace when any of
+        its spans starts in the window. So a trace that started before `oldest`
+        is not listed, even with spans after it, and a long trace is paged by
+        its start rather than its last activity.
+
+        Traces started before the project's summaries coverage are listed from
+        the spans, as before, once the newer ones fall short of the limit.
+        """
+        if not match_trace_filtering(query.filtering):
+            return None
+
+        windowing = query.windowing or Windowing()
+
+        oldest = as_utc(windowing.oldest)
+        newest = as_utc(windowing.newest)
+        next = windowing.next
+        limit = windowing.limit
+        rate = windowing.rate
+
+        operator = query.filtering.operator if query.filtering else None
+        conditions = query.filtering.conditions if query.filtering else None
+
         try:
             async with self.engine.session() as session:
-                # TIMEOUT
-                await session.execute(TIMEOUT_STMT)
-                # -------
+                since = (
+                    await session.execute(
+                        select(TraceCoverageDBE.since).where(
+                            TraceCoverageDBE.project_id == project_id
+                        )
+                    )
+                ).scalar()
 
-                # BASE (SUB-)STMT
-                base: Select = select(SpanDBE)
-                # ---------------
+                if since is None or (newest is not None and newest <= since):
+                    return None
 
-                # GROUPING
-                if focus == Focus.TRACE:
-                    base = select(
-                        SpanDBE.trace_id,
-                        SpanDBE.start_time,
-                    ).distinct(SpanDBE.trace_id)
-                # --------
+                await session.execute(TIMEOUT_STMT)
 
-                # SCOPING
-                base = base.filter(SpanDBE.project_id == project_id)
-                # -------
+                stmt = select(TraceDBE.trace_id, TraceDBE.start_time).filter(
+                    TraceDBE.project_id == project_id,
+                    TraceDBE.start_time >= max(oldest or since, since),
+                )
 
-                # FILTERING
                 if operator and conditions:
-                    base = base.filter(
-                        type_cast(
-                            ColumnElement[bool],
+                    stmt = stmt.filter(
+                        adapt_to_traces(
                             combine(
                                 operator=operator,
                                 clauses=filter(conditions),
-                            ),
+                            )
                         )
                     )
-                # ---------
 
-                # WINDOWING
                 if rate is not None:
                     percent = max(0, min(int(rate * 100.0), 100))
 
@@ -203,7 +705,7 @@ class TracingDAO(TracingDAOInterface):
                         return []
 
                     if percent < 100:
-                        base = base.where(
+                        stmt = stmt.where(
                             cast(
                                 text("concat('x', left(cast(trace_id as varchar), 8))"),
                                 BIT(32),
@@ -211,79 +713,49 @@ class TracingDAO(TracingDAOInterface):
                             % 100
                             < percent
                         )
-                # ---------
-
-                # GROUPING
-                if focus == Focus.TRACE:
-                    # WINDOWING
-                    if newest:
-                        if next:
-                            base = base.filter(SpanDBE.start_time <= newest)
-                        else:
-                            base = base.filter(SpanDBE.start_time < newest)
-                    if oldest:
-                        base = base.filter(SpanDBE.start_time >= oldest)
-                    # ---------
-
-                    base = base.order_by(SpanDBE.trace_id, SpanDBE.start_time.desc())
-
-                    inner = base.subquery("latest_per_trace")
 
-                    uniq = select(inner.c.trace_id)
-
-                    uniq = uniq.order_by(inner.c.start_time.desc())
-
-                    if next and newest:
-                        uniq = uniq.filter(
+                if newest:
+                    if next:
+                        stmt = stmt.filter(
                             or_(
-                                inner.c.start_time < newest,
+                                TraceDBE.start_time < newest,
                                 and_(
-                                    inner.c.start_time == newest,
-                                    inner.c.trace_id < next,
+                                    TraceDBE.start_time == newest,
+                                    TraceDBE.trace_id < next,
                                 ),
                             )
                         )
-
-                    if limit:
-                        uniq = uniq.limit(limit)
-
-                    stmt = (
-                        select(SpanDBE)
-                        .filter(SpanDBE.trace_id.in_(uniq))
-                        .order_by(
-                            func.max(SpanDBE.start_time)
-                            .over(partition_by=SpanDBE.trace_id)
-                            .desc(),
-                            SpanDBE.start_time.asc(),
-                        )
-                    )
-                else:
-                    if query.windowing:
-                        stmt = apply_windowing(
-                            stmt=base,
-                            DBE=SpanDBE,
-                            attribute="start_time",
-                            order="descending",
-                            windowing=query.windowing,
-                        )
                     else:
-                        stmt = base
-                # --------
+                        stmt = stmt.filter(TraceDBE.start_time < newest)
 
-                # DEBUGGING
-                # log.trace(str(stmt.compile(**DEBUG_ARGS)).replace("\n", " "))
-                # ---------
+                stmt = stmt.order_by(
+                    TraceDBE.start_time.desc(),
+                    TraceDBE.trace_id.desc(),
+                )
 
-                # EXECUTION
-                dbes = (await session.execute(stmt)).scalars().all()
-                # ---------
+                if limit:
+                    stmt = stmt.limit(limit)
 
-                if not dbes:
-                    return []
+                traces = (await session.execute(stmt)).all()
 
-                span_dtos = [map_span_dbe_to_span_dto(span_dbe=dbe) for dbe in dbes]
+                span_dbes = []
 
-                return span_dtos
+                if traces:
+                    columns = select_span_columns(query.formatting)
+
+                    # Spans start with their trace: bounding start_time prunes
+                    # the partitions older than the page.
+                    result = await session.execute(
+                        (select(*columns) if columns else select(SpanDBE))
+                        .filter(
+                            SpanDBE.project_id == project_id,
+                            SpanDBE.trace_id.in_([trace.trace_id for trace in traces]),
+                            SpanDBE.start_time
+                            >= min(trace.start_time for trace in traces),
+                        )
+                        .order_by(SpanDBE.start_time.asc())
+                    )
+                    span_dbes = result.all() if columns else result.scalars().all()
 
         except DBAPIError as e:
             log.error(f"{type(e).__name__}: {e}")
@@ -297,10 +769,34 @@ class TracingDAO(TracingDAOInterface):
 
             raise e
 
-        except Exception as e:
-            log.error(f"{type(e).__name__}: {e}")
-            log.error(format_exc())
-            raise e
+        spans_by_trace: Dict[UUID, List[Any]] = {trace.trace_id: [] for trace in traces}
+        for span_dbe in span_dbes:
+            spans_by_trace[span_dbe.trace_id].append(span_dbe)
+
+        span_dtos = self._map_span_dtos(
+            dbes=[
+                span_dbe
+                for trace_spans in spans_by_trace.values()
+                for span_dbe in trace_spans
+            ],
+            query=query,
+        )
+
+        remaining = limit - len(traces) if limit else None
+
+        if (remaining is None or remaining > 0) and (oldest is None or oldest < since):
+            span_dtos += await self.query(
+                project_id=project_id,
+                query=query.model_copy(
+                    update={
+                        "windowing": windowing.model_copy(
+                            update={"newest": since, "next": None, "limit": remaining}
+                        )
+                    }
+                ),
+            )
+
+        return span_dtos
 
     @suppress_exceptions(default=[])
     async def analytics(
@@ -322,6 +818,130 @@ class TracingDAO(TracingDAOInterface):
         if not query.filtering:
             query.filtering = Filtering()
 
+        if env.agenta.api.tracing.rollups_enabled:
+            buckets = await self._analytics_from_rollups(
+                project_id=project_id,
+                query=query,
+                specs=specs,
+            )
+
+            if buckets is not None:
+                return buckets
+
+        return await self._analytics_from_spans(
+            project_id=project_id,
+            query=query,
+            specs=specs,
+        )
+
+    async def _analytics_from_rollups(
+        self,
+        *,
+        project_id: UUID,
+        #
+        query: TracingQuery,
+        specs: List[MetricSpec],
+    ) -> Optional[List[MetricsBucket]]:
+        """Serve analytics from the rollups, or None when they cannot answer exactly.
+
+        Buckets older than the project's rollup coverage are computed from the
+        spans, with the same stride, and merged in.
+        """
+        (
+            oldest,
+            newest,
+            _,
+            interval,
+            _,
+        ) = parse_windowing(
+            windowing=query.windowing,
+        )
+
+        scope = match_rollup_scope(
+            filtering=query.filtering,
+            specs=specs,
+            rate=query.windowing.rate,
+            oldest=oldest,
+            newest=newest,
+        )
+
+        if scope is None:
+            return None
+
+        async with self.engine.session() as session:
+            since = (
+                await session.execute(
+                    select(SpanRollupCoverageDBE.since).where(
+                        SpanRollupCoverageDBE.project_id == project_id
+                    )
+                )
+            ).scalar()
+
+        if since is None or since >= newest:
+            return None
+
+        split = oldest
+        if since > oldest:
+            step = timedelta(minutes=interval)
+            split = oldest + ceil((since - oldest) / step) * step
+
+        if split >= newest:
+            return None
+
+        buckets: List[MetricsBucket] = []
+
+        if split > oldest:
+            buckets = await self._analytics_from_spans(
+                project_id=project_id,
+                query=query.model_copy(
+                    update={
+                        "windowing": query.windowing.model_copy(
+                            update={"newest": split, "interval": interval}
+                        )
+                    }
+                ),
+                specs=specs,
+            )
+
+        async with self.engine.session() as session:
+            await session.execute(TIMEOUT_STMT)
+
+            rows = (
+                (
+                    await session.execute(
+                        ROLLUPS_QUERY_SQL,
+                        {
+                            "project_id": project_id,
+                            "scope": scope,
+                            "minute": ROLLUP_MINUTE,
+                            "hour": ROLLUP_HOUR,
+                            "paths": [spec.path for spec in specs],
+                            "oldest": split,
+                            "newest": newest,
+                            "stride": timedelta(minutes=interval),
+                        },
+                    )
+                )
+                .mappings()
+                .all()
+            )
+
+        buckets += assemble_rollup_buckets(
+            rows=[{**row} for row in rows],
+            specs=specs,
+            interval=interval,
+        )
+
+        return sort_buckets_by_timestamp(buckets)
+
+    async def _analytics_from_spans(
+        self,
+        *,
+        project_id: UUID,
+        #
+        query: TracingQuery,
+        specs: List[MetricSpec],
+    ) -> List[MetricsBucket]:
         (
             oldest,
             newest,
@@ -735,6 +1355,10 @@ class TracingDAO(TracingDAOInterface):
             log.error(format_exc())
             raise e
 
+    @suppress_exceptions(default=[])
+    async def ensure_partitions(self) -> List[str]:
+        return await SpansPartitionsDAO(engine=self.engine).ensure_partitions()
+
     ### TRACES
 
     @suppress_exceptions(default=[])
@@ -808,9 +1432,35 @@ class TracingDAO(TracingDAOInterface):
                 for span_dbe in span_dbes
             ]
 
+            values_list = [
+                {c.name: getattr(span_dbe, c.name) for c in SpanDBE.__table__.columns}
+                for span_dbe in span_dbes
+            ]
+
+            if env.agenta.api.tracing.rollups_enabled:
+                await write_rollups(
+                    session,
+                    project_id=project_id,
+                    values_list=values_list,
+                    sign=-1,
+                )
+
+            await remove_from_directories(
+                session,
+                project_id=project_id,
+                values_list=values_list,
+            )
+
             for span_dbe in span_dbes:
                 await session.delete(span_dbe)
 
+            await session.execute(
+                delete(TraceDBE).where(
+                    TraceDBE.project_id == project_id,
+                    TraceDBE.trace_id.in_(trace_ids),
+                )
+            )
+
             await session.commit()
 
             return link_dtos
@@ -864,7 +1514,7 @@ class TracingDAO(TracingDAOInterface):
         *,
         project_id: UUID,
         #
-        group: Literal["session", "user"],
+        group: Group,
         #
         realtime: Optional[bool] = None,
         #
@@ -872,11 +1522,139 @@ class TracingDAO(TracingDAOInterface):
     ) -> Tuple[List[str], Optional[datetime]]:
         """Query unique session or user IDs with windowing support.
 
+        Activity since the project's directories coverage is read off the
+        directory of `group`, and older activity off the spans, in the order
+        of the page.
+
         Args:
             group: Either "session" or "user"
             realtime: If True, use last_active (mutable, shows recent activity but unstable cursors).
                      If False/None, use first_active (immutable, stable cursors but doesn't reflect new activity).
         """
+        windowing = windowing or Windowing()
+
+        async with self.engine.session() as session:
+            since = (
+                await session.execute(
+                    select(DirectoryCoverageDBE.since).where(
+                        DirectoryCoverageDBE.project_id == project_id
+                    )
+                )
+            ).scalar()
+
+        if since is None:
+            return await self._query_by_group_from_spans(
+                project_id=project_id,
+                group=group,
+                realtime=realtime,
+                windowing=windowing,
+            )
+
+        oldest = as_utc(windowing.oldest)
+        newest = as_utc(windowing.newest)
+        windowing = windowing.model_copy(update={"oldest": oldest, "newest": newest})
+
+        listed = None if newest is not None and newest <= since else windowing
+        unlisted = None
+        if oldest is None or oldest < since:
+            unlisted = (
+                windowing
+                if listed is None
+                else windowing.model_copy(update={"newest": since, "next": None})
+            )
+
+        parts = [(True, listed), (False, unlisted)]
+        if (windowing.order or "descending").lower() == "ascending":
+            parts.reverse()
+
+        ids: List[str] = []
+        activity_cursor = None
+
+        for from_directory, part in parts:
+            if part is None:
+                continue
+
+            remaining = windowing.limit - len(ids) if windowing.limit else None
+            if remaining == 0:
+                break
+
+            part = part.model_copy(update={"limit": remaining})
+
+            if from_directory:
+                part_ids, part_cursor = await self._query_by_group_from_directory(
+                    project_id=project_id,
+                    group=group,
+                    since=since,
+                    realtime=realtime,
+                    windowing=part,
+                )
+            else:
+                part_ids, part_cursor = await self._query_by_group_from_spans(
+                    project_id=project_id,
+                    group=group,
+                    realtime=realtime,
+                    windowing=part,
+                    unlisted_since=since,
+                )
+
+            ids += part_ids
+            activity_cursor = part_cursor or activity_cursor
+
+        return ids, activity_cursor
+
+    async def _query_by_group_from_directory(
+        self,
+        *,
+        project_id: UUID,
+        #
+        group: Group,
+        since: datetime,
+        #
+        realtime: Optional[bool] = None,
+        #
+        windowing: Optional[Windowing] = None,
+    ) -> Tuple[List[str], Optional[datetime]]:
+        async with self.engine.session() as session:
+            # TIMEOUT
+            await session.execute(TIMEOUT_STMT)
+
+            result = await session.execute(
+                directory_page_stmt(
+                    project_id=project_id,
+                    group=group,
+                    since=since,
+                    realtime=realtime,
+                    windowing=windowing,
+                )
+            )
+            rows = result.all()
+
+        activity_label = "last_active" if realtime else "first_active"
+
+        ids = [str(getattr(row, f"{group}_id")) for row in rows]
+        activity_cursor = getattr(rows[-1], activity_label) if rows else None
+
+        return ids, activity_cursor
+
+    async def _query_by_group_from_spans(
+        self,
+        *,
+        project_id: UUID,
+        #
+        group: Group,
+        #
+        realtime: Optional[bool] = None,
+        #
+        windowing: Optional[Windowing] = None,
+        #
+        unlisted_since: Optional[datetime] = None,
+    ) -> Tuple[List[str], Optional[datetime]]:
+        """Query unique session or user IDs off the spans.
+
+        Args:
+            unlisted_since: If set, skip the IDs the directory of `group` lists
+                with an activity since then (see `directory_page_stmt`).
+        """
         async with self.engine.session() as session:
             # TIMEOUT
             await session.execute(TIMEOUT_STMT)
@@ -889,9 +1667,8 @@ class TracingDAO(TracingDAOInterface):
 
             # BASE QUERY: Use DISTINCT ON pattern (like query() does for traces)
             # DISTINCT ON picks one row per identifier based on ORDER BY
-            # TODO(WP0.7, deferred): SpanDBE.session_id/user_id are now indexed
-            # root-only columns (see migration oss000000003) — this JSONB path
-            # scan can become a column scan. Left as-is; not blocking.
+            # Only activity from before the directories is scanned here, on the
+            # JSONB path: spans that old may predate the root-only columns.
             id_column = SpanDBE.attributes["ag"][group]["id"].as_string()
             base = (
                 select(
@@ -903,6 +1680,17 @@ class TracingDAO(TracingDAOInterface):
                 .filter(SpanDBE.attributes["ag"][group].has_key("id"))
             )
 
+            if unlisted_since is not None:
+                base = base.filter(
+                    ~listed_in_directory(
+                        project_id=project_id,
+                        group=group,
+                        id_column=id_column,
+                        since=unlisted_since,
+                        realtime=realtime,
+                    )
+                )
+
             # Apply time-range filters on base query (before deduplication)
             # Follows apply_windowing() logic for oldest/newest based on order direction
             if windowing:
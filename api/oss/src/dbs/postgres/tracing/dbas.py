@@ -1,5 +1,6 @@
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy import Column, UUID, TIMESTAMP, Enum as ENUM, VARCHAR
+from sqlalchemy import BigInteger, Integer, Numeric
 
 from oss.src.core.tracing.dtos import TraceType, SpanType
 from oss.src.core.tracing.dtos import OTelStatusCode as StatusCode
@@ -95,3 +96,149 @@ class SpanDBA:
         JSONB(none_as_null=True),
         nullable=True,
     )
+
+
+class SpanRollupDBA:
+    __abstract__ = True
+
+    # "" for all the project's root spans, else one reference id they carry.
+    scope = Column(
+        VARCHAR,
+        nullable=False,
+    )
+    granularity = Column(
+        Integer,
+        nullable=False,
+    )  # minutes
+    bucket = Column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+    )
+    path = Column(
+        VARCHAR,
+        nullable=False,
+    )
+    # "" for the summary of `path`, else one sketch bin or category value.
+    key = Column(
+        VARCHAR,
+        nullable=False,
+    )
+
+    count = Column(
+        BigInteger,
+        nullable=False,
+    )
+    sum = Column(
+        Numeric,
+        nullable=True,
+    )
+    min = Column(
+        Numeric,
+        nullable=True,
+    )
+    max = Column(
+        Numeric,
+        nullable=True,
+    )
+
+
+class TraceDBA:
+    __abstract__ = True
+
+    trace_id = Column(
+        UUID,
+        nullable=False,
+    )
+    # The root span's; NULL until the root is written, as are the columns
+    # below that are read off it.
+    span_id = Column(
+        UUID,
+        nullable=True,
+    )
+
+    trace_type = Column(
+        ENUM(TraceType),
+        nullable=True,
+    )
+    span_name = Column(
+        VARCHAR,
+        nullable=True,
+    )
+
+    # Over all the spans of the trace written so far.
+    start_time = Column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+    )
+    end_time = Column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+    )
+
+    status_code = Column(
+        ENUM(StatusCode),
+        nullable=True,
+    )
+
+    session_id = Column(
+        VARCHAR,
+        nullable=True,
+    )
+    user_id = Column(
+        VARCHAR,
+        nullable=True,
+    )
+    agent_id = Column(
+        VARCHAR,
+        nullable=True,
+    )
+
+    # The root span's cumulative totals.
+    costs = Column(
+        Numeric,
+        nullable=True,
+    )
+    tokens = Column(
+        Numeric,
+        nullable=True,
+    )
+
+    # The references of all the spans of the trace, each once.
+    references = Column(
+        JSONB(none_as_null=True),
+        nullable=True,
+    )
+
+
+class DirectoryDBA:
+    __abstract__ = True
+
+    # Over the root spans written so far.
+    first_active = Column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+    )
+    last_active = Column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+    )
+
+    traces = Column(
+        BigInteger,
+        nullable=False,
+    )
+    # Of the traces whose root ended in error.
+    errors = Column(
+        BigInteger,
+        nullable=False,
+    )
+
+    # Sums of the roots' cumulative totals.
+    costs = Column(
+        Numeric,
+        nullable=True,
+    )
+    tokens = Column(
+        Numeric,
+        nullable=True,
+    )
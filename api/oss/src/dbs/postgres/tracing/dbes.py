@@ -1,7 +1,20 @@
-from sqlalchemy import PrimaryKeyConstraint, Index, desc, text
+from sqlalchemy import (
+    Column,
+    PrimaryKeyConstraint,
+    Index,
+    TIMESTAMP,
+    VARCHAR,
+    desc,
+    text,
+)
 
 from oss.src.dbs.postgres.shared.base import Base
-from oss.src.dbs.postgres.tracing.dbas import SpanDBA
+from oss.src.dbs.postgres.tracing.dbas import (
+    DirectoryDBA,
+    SpanDBA,
+    SpanRollupDBA,
+    TraceDBA,
+)
 from oss.src.dbs.postgres.shared.dbas import ProjectScopeDBA, LifecycleDBA
 
 # TODO: Add OrganizationScopeDBA, WorkspaceScopeDBA, and UserScopeDBA
@@ -20,7 +33,8 @@ class SpanDBE(
             "project_id",
             "trace_id",
             "span_id",
-        ),  # for uniqueness
+            "start_time",
+        ),  # for uniqueness (a partitioned table's keys include its partition key)
         Index(
             "ix_project_id",
             "project_id",
@@ -100,4 +114,180 @@ class SpanDBE(
             text("to_tsvector('simple', events)"),
             postgresql_using="gin",
         ),  # for full-text search on events
+        {
+            # Daily partitions, see oss.src.dbs.postgres.tracing.partitions
+            "postgresql_partition_by": "RANGE (start_time)",
+        },
+    )
+
+
+class SpanRollupDBE(
+    Base,
+    ProjectScopeDBA,
+    SpanRollupDBA,
+):
+    __tablename__ = "span_rollups"
+
+    __table_args__ = (
+        PrimaryKeyConstraint(
+            "project_id",
+            "scope",
+            "granularity",
+            "bucket",
+            "path",
+            "key",
+        ),  # for uniqueness and for windowed reads
+        Index(
+            "ix_span_rollups_bucket",
+            "bucket",
+        ),  # for retention
+    )
+
+
+class SpanRollupCoverageDBE(
+    Base,
+    ProjectScopeDBA,
+):
+    __tablename__ = "span_rollups_coverage"
+
+    __table_args__ = (
+        PrimaryKeyConstraint(
+            "project_id",
+        ),  # for uniqueness
+    )
+
+    # Root spans created from here on are all in the project's rollups.
+    since = Column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+    )
+
+
+class TraceDBE(
+    Base,
+    ProjectScopeDBA,
+    TraceDBA,
+):
+    __tablename__ = "traces"
+
+    __table_args__ = (
+        PrimaryKeyConstraint(
+            "project_id",
+            "trace_id",
+        ),  # for uniqueness
+        Index(
+            "ix_traces_project_id_start_time_trace_id",
+            "project_id",
+            "start_time",
+            "trace_id",
+        ),  # for sorting and scrolling, and for retention
+        Index(
+            "ix_traces_project_id_session_id",
+            "project_id",
+            "session_id",
+        ),  # for session filtering
+        Index(
+            "ix_traces_references_gin",
+            "references",
+            postgresql_using="gin",
+            postgresql_ops={"references": "jsonb_path_ops"},
+        ),  # for filtering
+    )
+
+
+class TraceCoverageDBE(
+    Base,
+    ProjectScopeDBA,
+):
+    __tablename__ = "traces_coverage"
+
+    __table_args__ = (
+        PrimaryKeyConstraint(
+            "project_id",
+        ),  # for uniqueness
+    )
+
+    # Traces started from here on are all in the project's summaries.
+    since = Column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+    )
+
+
+class SessionDirectoryDBE(
+    Base,
+    ProjectScopeDBA,
+    DirectoryDBA,
+):
+    __tablename__ = "session_directory"
+
+    __table_args__ = (
+        PrimaryKeyConstraint(
+            "project_id",
+            "session_id",
+        ),  # for uniqueness
+        Index(
+            "ix_session_directory_project_id_first_active",
+            "project_id",
+            "first_active",
+        ),  # for sorting and scrolling
+        Index(
+            "ix_session_directory_project_id_last_active",
+            "project_id",
+            "last_active",
+        ),  # for sorting and scrolling, realtime
+    )
+
+    session_id = Column(
+        VARCHAR,
+        nullable=False,
+    )
+
+
+class UserDirectoryDBE(
+    Base,
+    ProjectScopeDBA,
+    DirectoryDBA,
+):
+    __tablename__ = "user_directory"
+
+    __table_args__ = (
+        PrimaryKeyConstraint(
+            "project_id",
+            "user_id",
+        ),  # for uniqueness
+        Index(
+            "ix_user_directory_project_id_first_active",
+            "project_id",
+            "first_active",
+        ),  # for sorting and scrolling
+        Index(
+            "ix_user_directory_project_id_last_active",
+            "project_id",
+            "last_active",
+        ),  # for sorting and scrolling, realtime
+    )
+
+    user_id = Column(
+        VARCHAR,
+        nullable=False,
+    )
+
+
+class DirectoryCoverageDBE(
+    Base,
+    ProjectScopeDBA,
+):
+    __tablename__ = "directories_coverage"
+
+    __table_args__ = (
+        PrimaryKeyConstraint(
+            "project_id",
+        ),  # for uniqueness
+    )
+
+    # Sessions and users active from here on are all in the project's directories.
+    since = Column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
     )
@@ -0,0 +1,300 @@
+"""Directories of sessions and users, one row per project and session or user.
+
+`TracingDAO.sessions` and `TracingDAO.users` used to find the ids of a page
+with DISTINCT ON over `ag.session.id` / `ag.user.id` in the attributes of
+every span of the window, which grows with the spans of the project. The same
+pages are read off `session_directory` and `user_directory`, ordered by their
+first or last activity on an index of their own:
+
+- first_active and last_active, over the start of their root spans;
+- the number of their traces, and of those whose root ended in error;
+- the sums of the cumulative costs and tokens of their roots.
+
+`TracingDAO.ingest` adds the root spans it inserts (not those it updates) in
+the same transaction, and `TracingDAO.delete` subtracts them, dropping rows
+left without traces. Costs and tokens are the roots' totals when they were
+first written.
+
+Spans are never backfilled: `directories_coverage` records, per project, from
+when on its sessions and users are all listed, and older activity is still
+listed from the spans, without the ids the directories list already.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Literal, Optional
+from uuid import UUID
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from oss.src.core.shared.dtos import Windowing
+from oss.src.core.tracing.dtos import OTelStatusCode
+from oss.src.dbs.postgres.tracing.dbes import (
+    DirectoryCoverageDBE,
+    SessionDirectoryDBE,
+    UserDirectoryDBE,
+)
+from oss.src.dbs.postgres.tracing.summaries import cumulative_total
+
+Group = Literal["session", "user"]
+
+# Directory and id column of each group.
+DIRECTORIES: Dict[str, Any] = {
+    "session": (SessionDirectoryDBE, "session_id"),
+    "user": (UserDirectoryDBE, "user_id"),
+}
+
+# asyncpg caps a statement at 32767 bind parameters, one per column per row.
+DIRECTORY_CHUNK_SIZE = 32767 // len(SessionDirectoryDBE.__table__.columns)
+
+# Like the trace summaries: trusted from an hour after a project's first listed
+# session or user, for the workers of the previous release to drain.
+DIRECTORIES_COVERAGE_DELAY = timedelta(hours=1)
+
+
+# WRITE -----------------------------------------------------------------------
+
+
+def _add(total: Any, value: Any) -> Any:
+    if value is None:
+        return total
+    return value if total is None else total + value
+
+
+def build_directory_rows(
+    *,
+    project_id: UUID,
+    group: Group,
+    values_list: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """What the root spans in `values_list` (column -> value) add to a directory.
+
+    Rows come out sorted by id, so concurrent upserts lock them in one order.
+    """
+    _, column = DIRECTORIES[group]
+    rows: Dict[str, Dict[str, Any]] = {}
+
+    for values in values_list:
+        if values.get("parent_id") is not None or not values.get(column):
+            continue
+
+        row = rows.get(values[column])
+        if row is None:
+            row = rows[values[column]] = {
+                "project_id": project_id,
+                column: values[column],
+                "first_active": values["start_time"],
+                "last_active": values["start_time"],
+                "traces": 0,
+                "errors": 0,
+                "costs": None,
+                "tokens": None,
+            }
+
+        row["first_active"] = min(row["first_active"], values["start_time"])
+        row["last_active"] = max(row["last_active"], values["start_time"])
+        row["traces"] += 1
+        if values.get("status_code") == OTelStatusCode.STATUS_CODE_ERROR:
+            row["errors"] += 1
+
+        attributes = values.get("attributes")
+        row["costs"] = _add(row["costs"], cumulative_total(attributes, "costs"))
+        row["tokens"] = _add(row["tokens"], cumulative_total(attributes, "tokens"))
+
+    return [rows[key] for key in sorted(rows)]
+
+
+def _sum(current: Any, added: Any) -> Any:
+    # NULL only while neither side has a value.
+    return func.coalesce(current + added, current, added)
+
+
+def upsert_directory_stmt(*, group: Group, rows: List[Dict[str, Any]]):
+    directory, column = DIRECTORIES[group]
+    stmt = insert(directory).values(rows)
+    table = directory.__table__
+
+    return stmt.on_conflict_do_update(
+        index_elements=["project_id", column],
+        set_={
+            "first_active": func.least(
+                table.c.first_active, stmt.excluded.first_active
+            ),
+            "last_active": func.greatest(
+                table.c.last_active, stmt.excluded.last_active
+            ),
+            "traces": table.c.traces + stmt.excluded.traces,
+            "errors": table.c.errors + stmt.excluded.errors,
+            "costs": _sum(table.c.costs, stmt.excluded.costs),
+            "tokens": _sum(table.c.tokens, stmt.excluded.tokens),
+        },
+    )
+
+
+async def write_directories(
+    session: Any,
+    *,
+    project_id: UUID,
+    values_list: List[Dict[str, Any]],
+) -> int:
+    """Add the root spans in `values_list` to the directories, within the caller's transaction."""
+    written = 0
+
+    for group in DIRECTORIES:
+        rows = build_directory_rows(
+            project_id=project_id,
+            group=group,
+            values_list=values_list,
+        )
+
+        for offset in range(0, len(rows), DIRECTORY_CHUNK_SIZE):
+            await session.execute(
+                upsert_directory_stmt(
+                    group=group,
+                    rows=rows[offset : offset + DIRECTORY_CHUNK_SIZE],
+                )
+            )
+
+        written += len(rows)
+
+    return written
+
+
+async def remove_from_directories(
+    session: Any,
+    *,
+    project_id: UUID,
+    values_list: List[Dict[str, Any]],
+) -> None:
+    """Subtract the root spans in `values_list` from the directories, within the caller's transaction.
+
+    Activity is left as is; rows left without traces are deleted.
+    """
+    for group, (directory, column) in DIRECTORIES.items():
+        rows = build_directory_rows(
+            project_id=project_id,
+            group=group,
+            values_list=values_list,
+        )
+
+        if not rows:
+            continue
+
+        id_column = getattr(directory, column)
+
+        for row in rows:
+            await session.execute(
+                update(directory)
+                .where(
+                    directory.project_id == project_id,
+                    id_column == row[column],
+                )
+                .values(
+                    traces=directory.traces - row["traces"],
+                    errors=directory.errors - row["errors"],
+                    costs=directory.costs - (row["costs"] or 0),
+                    tokens=directory.tokens - (row["tokens"] or 0),
+                )
+            )
+
+        await session.execute(
+            delete(directory).where(
+                directory.project_id == project_id,
+                id_column.in_([row[column] for row in rows]),
+                directory.traces <= 0,
+            )
+        )
+
+
+def ensure_directories_coverage_stmt(*, project_id: UUID, now: datetime):
+    return (
+        insert(DirectoryCoverageDBE)
+        .values(
+            project_id=project_id,
+            since=now + DIRECTORIES_COVERAGE_DELAY,
+        )
+        .on_conflict_do_nothing(index_elements=["project_id"])
+    )
+
+
+# READ ------------------------------------------------------------------------
+
+
+def directory_page_stmt(
+    *,
+    project_id: UUID,
+    group: Group,
+    since: datetime,
+    realtime: Optional[bool] = None,
+    windowing: Optional[Windowing] = None,
+):
+    """A page of ids and their activity, off the directory of `group`.
+
+    Windowing follows the span scan: oldest and newest bound the activity
+    (first_active, or last_active when realtime), and `next` makes the bound
+    the page starts from inclusive.
+    """
+    directory, column = DIRECTORIES[group]
+    activity = directory.last_active if realtime else directory.first_active
+    activity_label = "last_active" if realtime else "first_active"
+
+    windowing = windowing or Windowing()
+    descending = (windowing.order or "descending").lower() != "ascending"
+
+    oldest = max(windowing.oldest, since) if windowing.oldest else since
+
+    stmt = select(
+        getattr(directory, column).label(f"{group}_id"),
+        activity.label(activity_label),
+    ).filter(
+        directory.project_id == project_id,
+    )
+
+    if descending:
+        stmt = stmt.filter(activity >= oldest)
+        if windowing.newest:
+            if windowing.next:
+                stmt = stmt.filter(activity <= windowing.newest)
+            else:
+                stmt = stmt.filter(activity < windowing.newest)
+        stmt = stmt.order_by(activity.desc())
+    else:
+        if windowing.oldest and windowing.oldest >= since and not windowing.next:
+            stmt = stmt.filter(activity > oldest)
+        else:
+            stmt = stmt.filter(activity >= oldest)
+        if windowing.newest:
+            stmt = stmt.filter(activity <= windowing.newest)
+        stmt = stmt.order_by(activity.asc())
+
+    if windowing.limit:
+        stmt = stmt.limit(windowing.limit)
+
+    return stmt
+
+
+def listed_in_directory(
+    *,
+    project_id: UUID,
+    group: Group,
+    id_column: Any,
+    since: datetime,
+    realtime: Optional[bool] = None,
+):
+    """Whether a page off the directory of `group` lists the id in `id_column`.
+
+    That is, whether the directory has it with an activity (first_active, or
+    last_active when realtime) since `since`, as `directory_page_stmt` reads it.
+    """
+    directory, column = DIRECTORIES[group]
+    activity = directory.last_active if realtime else directory.first_active
+
+    return (
+        select(1)
+        .where(
+            directory.project_id == project_id,
+            getattr(directory, column) == id_column,
+            activity >= since,
+        )
+        .exists()
+    )
@@ -0,0 +1,351 @@
+"""Daily range partitions of `spans` on `start_time`.
+
+`spans` is partitioned by RANGE (start_time) (see migration oss000000005):
+
+- `spans_legacy` holds every span written before the table was partitioned,
+  from MINVALUE to the migration's cutover day;
+- `spans_YYYYMMDD` holds one UTC day each, created `PARTITIONS_AHEAD` days in
+  advance by `ensure_partitions`;
+- `spans_default` catches anything outside those ranges (clock skew, backfills
+  older than the legacy cutover once it is gone). Creating a day moves its rows
+  out of the default partition first, so it stays small.
+
+Windowed queries prune to the partitions their `start_time` range overlaps, and
+retention removes whole partitions (`drop_partition`) or rewrites them with
+only the spans that are kept (`compact_partition`) instead of deleting rows;
+the legacy partition is only ever dropped, or trimmed by row deletes.
+"""
+
+import re
+from datetime import date, datetime, time, timedelta, timezone
+from typing import List, NamedTuple, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+
+from oss.src.dbs.postgres.shared.engine import AnalyticsEngine, get_analytics_engine
+from oss.src.utils.logging import get_module_logger
+
+log = get_module_logger(__name__)
+
+
+SPANS_TABLE = "spans"
+SPANS_DEFAULT_PARTITION = "spans_default"
+SPANS_LEGACY_PARTITION = "spans_legacy"
+
+PARTITIONS_AHEAD = 7  # day(s)
+
+# Same tuning the unpartitioned table had; a partitioned parent stores no
+# storage parameters, so every partition is created with them.
+SPANS_STORAGE_PARAMETERS = (
+    "autovacuum_vacuum_scale_factor = 0.02, "
+    "autovacuum_analyze_scale_factor = 0.01, "
+    "autovacuum_vacuum_cost_delay = 5, "
+    "autovacuum_vacuum_cost_limit = 4000"
+)
+
+_PARTITION_NAME = re.compile(r"^spans_(\d{8}|default|legacy)$")
+_PARTITION_BOUND = re.compile(r"FROM \((?P<lower>[^)]*)\) TO \((?P<upper>[^)]*)\)")
+
+# Serializes partition DDL across replicas (any int64 works; it only has to be
+# the same everywhere).
+_PARTITIONS_LOCK_KEY = 7_265_421_001
+
+
+class SpanPartition(NamedTuple):
+    name: str
+    # None on an open side (MINVALUE / MAXVALUE), both None for the default.
+    lower: Optional[datetime]
+    upper: Optional[datetime]
+
+
+def partition_name(day: date) -> str:
+    return f"spans_{day:%Y%m%d}"
+
+
+def partition_bounds(day: date) -> Tuple[datetime, datetime]:
+    lower = datetime.combine(day, time.min, tzinfo=timezone.utc)
+    return lower, lower + timedelta(days=1)
+
+
+def _parse_bound_value(value: str) -> Optional[datetime]:
+    value = value.strip().strip("'")
+    if value in ("MINVALUE", "MAXVALUE"):
+        return None
+
+    # Postgres renders timestamptz bounds as '2025-01-01 00:00:00+00'.
+    if re.search(r"[+-]\d{2}$", value):
+        value = f"{value}:00"
+
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+
+    return parsed.astimezone(timezone.utc)
+
+
+def parse_partition_bound(bound: str) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """Read `pg_get_expr(relpartbound)` into (lower, upper)."""
+    match = _PARTITION_BOUND.search(bound or "")
+    if not match:  # DEFAULT
+        return None, None
+
+    return (
+        _parse_bound_value(match.group("lower")),
+        _parse_bound_value(match.group("upper")),
+    )
+
+
+def _quote_partition(name: str) -> str:
+    # Partition names end up in DDL, which takes no bind parameters.
+    if not _PARTITION_NAME.match(name):
+        raise ValueError(f"Not a spans partition: {name!r}")
+    return f'public."{name}"'
+
+
+FETCH_PARTITIONS_SQL = text(
+    """
+        SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        JOIN pg_class p ON p.oid = i.inhparent
+        WHERE p.relname = :table
+          AND p.relnamespace = 'public'::regnamespace
+        ORDER BY c.relname;
+        """
+)
+
+IS_PARTITIONED_SQL = text(
+    """
+        SELECT relkind = 'p'
+        FROM pg_class
+        WHERE relname = :table
+          AND relnamespace = 'public'::regnamespace;
+        """
+)
+
+
+class SpansPartitionsDAO:
+    def __init__(self, engine: AnalyticsEngine = None):
+        if engine is None:
+            engine = get_analytics_engine()
+        self.engine = engine
+
+    async def fetch_partitions(self) -> List[SpanPartition]:
+        async with self.engine.session() as session:
+            result = await session.execute(FETCH_PARTITIONS_SQL, {"table": SPANS_TABLE})
+
+            return [
+                SpanPartition(name, *parse_partition_bound(bound))
+                for name, bound in result.fetchall()
+            ]
+
+    async def ensure_partitions(
+        self,
+        *,
+        now: Optional[datetime] = None,
+        ahead: int = PARTITIONS_AHEAD,
+    ) -> List[str]:
+        """Create the daily partitions from today to `ahead` days out; return the new ones."""
+        today = (now or datetime.now(timezone.utc)).astimezone(timezone.utc).date()
+        days = [today + timedelta(days=offset) for offset in range(ahead + 1)]
+
+        created: List[str] = []
+
+        async with self.engine.session() as session:
+            is_partitioned = (
+                await session.execute(IS_PARTITIONED_SQL, {"table": SPANS_TABLE})
+            ).scalar()
+            if not is_partitioned:
+                return created
+
+            await session.execute(
+                text("SELECT pg_advisory_xact_lock(:key);"),
+                {"key": _PARTITIONS_LOCK_KEY},
+            )
+
+            existing = [
+                SpanPartition(name, *parse_partition_bound(bound))
+                for name, bound in (
+                    await session.execute(FETCH_PARTITIONS_SQL, {"table": SPANS_TABLE})
+                ).fetchall()
+                if name != SPANS_DEFAULT_PARTITION
+            ]
+
+            for day in days:
+                name = partition_name(day)
+                lower, upper = partition_bounds(day)
+
+                # Already there, or still covered by the legacy partition.
+                if any(
+                    partition.name == name
+                    or (
+                        (partition.lower is None or partition.lower < upper)
+                        and (partition.upper is None or partition.upper > lower)
+                    )
+                    for partition in existing
+                ):
+                    continue
+
+                partition = _quote_partition(name)
+
+                await session.execute(
+                    text(
+                        f"CREATE TABLE {partition} "
+                        f"(LIKE public.{SPANS_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+                        f"WITH ({SPANS_STORAGE_PARAMETERS});"
+                    )
+                )
+                # Rows of this day that landed in the default partition would
+                # make the ATTACH fail: move them over first.
+                await session.execute(
+                    text(
+                        f"WITH moved AS ("
+                        f"DELETE FROM {_quote_partition(SPANS_DEFAULT_PARTITION)} "
+                        f"WHERE start_time >= :lower AND start_time < :upper "
+                        f"RETURNING *) "
+                        f"INSERT INTO {partition} SELECT * FROM moved;"
+                    ),
+                    {"lower": lower, "upper": upper},
+                )
+                await session.execute(
+                    text(
+                        f"ALTER TABLE public.{SPANS_TABLE} ATTACH PARTITION {partition} "
+                        f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}');"
+                    )
+                )
+
+                created.append(name)
+
+            await session.commit()
+
+        if created:
+            log.info("[PARTITIONS] Created spans partitions", partitions=created)
+
+        return created
+
+    async def fetch_partition_projects(
+        self,
+        *,
+        partition: str,
+    ) -> List[UUID]:
+        """Distinct projects with spans in `partition`, one index probe per project."""
+        table = _quote_partition(partition)
+
+        async with self.engine.session() as session:
+            result = await session.execute(
+                text(
+                    f"""
+                    WITH RECURSIVE projects AS (
+                      (SELECT project_id FROM {table} ORDER BY project_id LIMIT 1)
+                      UNION ALL
+                      SELECT (
+                        SELECT s.project_id FROM {table} s
+                        WHERE s.project_id > projects.project_id
+                        ORDER BY s.project_id
+                        LIMIT 1
+                      )
+                      FROM projects
+                      WHERE projects.project_id IS NOT NULL
+                    )
+                    SELECT project_id FROM projects WHERE project_id IS NOT NULL;
+                    """
+                )
+            )
+
+            return [row[0] for row in result.fetchall()]
+
+    async def count_partition_spans(
+        self,
+        *,
+        partition: str,
+        project_ids: Optional[List[UUID]] = None,
+    ) -> int:
+        """Spans of `project_ids` in `partition`; the planner's estimate of all of them otherwise."""
+        table = _quote_partition(partition)
+
+        async with self.engine.session() as session:
+            if project_ids is None:
+                result = await session.execute(
+                    text(
+                        "SELECT greatest(reltuples, 0)::bigint FROM pg_class "
+                        "WHERE oid = CAST(:table AS regclass);"
+                    ),
+                    {"table": table},
+                )
+            else:
+                result = await session.execute(
+                    text(
+                        f"SELECT count(*) FROM {table} "
+                        f"WHERE project_id = ANY(:project_ids);"
+                    ).bindparams(
+                        bindparam("project_ids", type_=ARRAY(PG_UUID(as_uuid=True)))
+                    ),
+                    {"project_ids": project_ids},
+                )
+
+            return int(result.scalar() or 0)
+
+    async def drop_partition(
+        self,
+        *,
+        partition: str,
+    ) -> None:
+        if partition == SPANS_DEFAULT_PARTITION:
+            raise ValueError("The default spans partition is never dropped.")
+
+        table = _quote_partition(partition)
+
+        async with self.engine.session() as session:
+            await session.execute(
+                text(f"ALTER TABLE public.{SPANS_TABLE} DETACH PARTITION {table};")
+            )
+            await session.execute(text(f"DROP TABLE {table};"))
+            await session.commit()
+
+        log.info("[PARTITIONS] Dropped spans partition", partition=partition)
+
+    async def compact_partition(
+        self,
+        *,
+        partition: str,
+        project_ids: List[UUID],
+    ) -> int:
+        """Rewrite `partition` with only the spans of `project_ids`; return how many stayed.
+
+        TRUNCATE locks this partition only, and leaves it without the dead
+        tuples and index bloat a row delete of everything else would. The legacy
+        partition is too large to copy under that lock, so it is never compacted.
+        """
+        if partition == SPANS_LEGACY_PARTITION:
+            raise ValueError("The legacy spans partition is never compacted.")
+
+        table = _quote_partition(partition)
+
+        async with self.engine.session() as session:
+            await session.execute(text(f"LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE;"))
+            await session.execute(
+                text(
+                    f"CREATE TEMPORARY TABLE spans_kept ON COMMIT DROP AS "
+                    f"SELECT * FROM {table} WHERE project_id = ANY(:project_ids);"
+                ).bindparams(
+                    bindparam("project_ids", type_=ARRAY(PG_UUID(as_uuid=True)))
+                ),
+                {"project_ids": project_ids},
+            )
+            await session.execute(text(f"TRUNCATE {table};"))
+            result = await session.execute(
+                text(f"INSERT INTO {table} SELECT * FROM spans_kept;")
+            )
+            await session.commit()
+
+            kept = int(result.rowcount or 0)
+
+        log.info(
+            "[PARTITIONS] Compacted spans partition",
+            partition=partition,
+            kept=kept,
+        )
+
+        return kept
@@ -0,0 +1,179 @@
+"""Projections of spans, for queries that ask for some of their fields.
+
+`TracingDAO.query` loads every column of the spans it returns, and the JSONB
+ones (attributes, events, links, references, hashes) are most of their size:
+`ag.data.inputs` and `ag.data.outputs` alone hold whole prompts, documents and
+completions. A query's `Formatting` narrows that down in SQL:
+
+- `fields` names the JSONB columns to load, whole ("attributes") or in parts
+  ("attributes.ag.data.outputs"); the others come back as None. Scalar
+  columns are always loaded: the span DTO fills a missing trace type, span
+  name or timestamp with defaults of its own, which would read as data.
+- `truncate` caps the projected parts of attributes, and the inputs and
+  outputs within whole attributes, at that many characters of JSON text. A
+  capped value comes back as the string of its first characters.
+
+Without either, queries load and map span entities as before.
+"""
+
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import case, cast, func, literal, type_coerce
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TEXT
+from sqlalchemy.sql.elements import ColumnElement
+
+from oss.src.core.tracing.dtos import Formatting
+from oss.src.dbs.postgres.tracing.dbes import SpanDBE
+
+
+JSONB_COLUMNS = ("attributes", "events", "links", "references", "hashes")
+
+SCALAR_COLUMNS = tuple(
+    column.name
+    for column in SpanDBE.__table__.columns
+    if column.name not in JSONB_COLUMNS
+)
+
+# Truncated within whole attributes, the rest of which is small.
+PAYLOAD_PATHS = (
+    ("ag", "data", "inputs"),
+    ("ag", "data", "outputs"),
+)
+
+
+def is_projected(formatting: Optional[Formatting]) -> bool:
+    return formatting is not None and (
+        formatting.fields is not None or formatting.truncate is not None
+    )
+
+
+def project_fields(
+    fields: Optional[List[str]],
+) -> Tuple[Set[str], List[Tuple[str, ...]]]:
+    """The JSONB columns loaded whole, and the paths of attributes loaded in parts.
+
+    Paths under a column or path loaded already are dropped; scalar names
+    are accepted and ignored.
+    """
+    if fields is None:
+        return set(JSONB_COLUMNS), []
+
+    columns = {field for field in fields if field in JSONB_COLUMNS}
+
+    paths: List[Tuple[str, ...]] = []
+    if "attributes" not in columns:
+        for path in sorted(
+            {tuple(field.split(".")[1:]) for field in fields if "." in field},
+            key=lambda path: (len(path), path),
+        ):
+            if not any(path[: len(other)] == other for other in paths):
+                paths.append(path)
+
+    return columns, paths
+
+
+def _path(path: Tuple[str, ...]) -> ColumnElement:
+    return literal(list(path), ARRAY(TEXT))
+
+
+def _as_jsonb(value: ColumnElement) -> ColumnElement:
+    # For the result rows to decode it into Python values.
+    return type_coerce(value, JSONB(none_as_null=True))
+
+
+def _truncated(value: ColumnElement, length: int) -> ColumnElement:
+    text = cast(value, TEXT)
+
+    return case(
+        (func.length(text) > length, func.to_jsonb(func.left(text, length))),
+        else_=value,
+    )
+
+
+def _with_truncated_payloads(attributes: ColumnElement, length: int) -> ColumnElement:
+    truncated = attributes
+
+    for path in PAYLOAD_PATHS:
+        # The payloads do not overlap: each is read off the stored attributes.
+        text = cast(attributes.op("#>")(_path(path)), TEXT)
+
+        # jsonb_set() returns NULL for a NULL value, hence the guard.
+        truncated = case(
+            (
+                func.length(text) > length,
+                func.jsonb_set(
+                    truncated,
+                    _path(path),
+                    func.to_jsonb(func.left(text, length)),
+                    False,
+                ),
+            ),
+            else_=truncated,
+        )
+
+    return truncated
+
+
+def select_span_columns(
+    formatting: Optional[Formatting],
+) -> Optional[List[ColumnElement]]:
+    """The columns to select for `formatting`, or None to select span entities."""
+    if not is_projected(formatting):
+        return None
+
+    columns, paths = project_fields(formatting.fields)
+    length = formatting.truncate
+
+    selected: List[Any] = [getattr(SpanDBE, name) for name in SCALAR_COLUMNS]
+
+    for name in JSONB_COLUMNS:
+        if name not in columns:
+            continue
+
+        column = getattr(SpanDBE, name)
+        if name == "attributes" and length:
+            column = _as_jsonb(_with_truncated_payloads(column, length)).label(name)
+
+        selected.append(column)
+
+    for index, path in enumerate(paths):
+        value = SpanDBE.attributes.op("#>")(_path(path))
+        if length:
+            value = _truncated(value, length)
+
+        selected.append(_as_jsonb(value).label(f"attributes_{index}"))
+
+    return selected
+
+
+def map_span_row_to_span_dbe(
+    row: Any,
+    formatting: Formatting,
+) -> SimpleNamespace:
+    """A span entity look-alike off a projected row, for the span mappings."""
+    columns, paths = project_fields(formatting.fields)
+    values: Dict[str, Any] = dict(row._mapping)
+
+    attributes = values.get("attributes") if "attributes" in columns else None
+
+    for index, path in enumerate(paths):
+        value = values.get(f"attributes_{index}")
+        if value is None:
+            continue
+
+        attributes = attributes or {}
+        node = attributes
+        for part in path[:-1]:
+            node = node.setdefault(part, {})
+        node[path[-1]] = value
+
+    return SimpleNamespace(
+        **{name: values.get(name) for name in SCALAR_COLUMNS},
+        **{
+            name: values.get(name) if name in columns else None
+            for name in JSONB_COLUMNS
+            if name != "attributes"
+        },
+        attributes=attributes,
+    )
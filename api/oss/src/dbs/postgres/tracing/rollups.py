@@ -0,0 +1,551 @@
+"""Rollups of the default analytics specs, per project, scope and time bucket.
+
+`TracingDAO.analytics` computes every metric from the raw root spans of the
+window. For the default specs (`DEFAULT_ANALYTICS_SPECS`, what the overview
+dashboards ask for) the same numbers are kept up to date in `span_rollups`:
+
+- one row per (project, scope, granularity, bucket, path, key), where scope is
+  "" for all root spans or one reference id they carry, and granularity is a
+  minute or an hour of `created_at`, the column analytics bucket by;
+- key "" holds count, sum, min and max of the path; the other keys hold the
+  count of one bin of a log-scale sketch (numeric paths) or of one value
+  (categorical paths).
+
+`TracingDAO.ingest` adds the root spans it inserts (never re-sent ones) in
+the same transaction, and `TracingDAO.delete` subtracts the ones it deletes.
+Analytics read the rollups when the specs, the filter and the window allow it:
+count, sum, mean, min, max and frequencies are exact, and percentiles and
+histograms are within `ROLLUP_RELATIVE_ACCURACY` of the raw ones.
+
+Spans are never backfilled: `span_rollups_coverage` records, per project,
+from when on its root spans are all rolled up, and buckets before that are
+still computed from the spans.
+"""
+
+import math
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import bindparam, func, text
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.types import Interval, String
+
+from oss.src.core.tracing.dtos import (
+    DEFAULT_ANALYTICS_SPECS,
+    Condition,
+    Filtering,
+    ListOperator,
+    LogicalOperator,
+    MetricSpec,
+    MetricsBucket,
+    MetricType,
+)
+from oss.src.dbs.postgres.tracing.dbes import SpanRollupCoverageDBE, SpanRollupDBE
+from oss.src.dbs.postgres.tracing.utils import (
+    PERCENTILES_VALUES,
+    compute_cqvs,
+    compute_iqrs,
+    compute_pscs,
+    compute_range,
+    compute_uniq,
+    normalize_freq,
+    normalize_hist,
+    parse_pcts,
+)
+from oss.src.dbs.postgres.tracing.mappings import sort_buckets_by_timestamp
+
+
+ROLLUP_MINUTE = 1  # minute(s)
+ROLLUP_HOUR = 60  # minute(s)
+ROLLUP_GRANULARITIES = (ROLLUP_MINUTE, ROLLUP_HOUR)
+
+ROLLUP_SCOPE_ALL = ""
+ROLLUP_SUMMARY_KEY = ""
+
+# Numeric paths are sketched in log-scale bins this wide (DDSketch): any value
+# read back from a bin is within 2% of the values counted in it.
+ROLLUP_RELATIVE_ACCURACY = 0.02
+_GAMMA = (1 + ROLLUP_RELATIVE_ACCURACY) / (1 - ROLLUP_RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(_GAMMA)
+_ZERO_KEY = "0"
+_MIN_MAGNITUDE = 1e-12  # smaller magnitudes are counted as zero
+_VALUE_PREFIX = "="
+
+# A project's rollups are trusted from the next hour after its first rolled-up
+# span, plus one more for the workers of the previous release to drain.
+ROLLUP_COVERAGE_DELAY = timedelta(hours=2)
+
+ROLLUP_SPECS: Dict[str, MetricType] = {
+    path: metric_type for metric_type, path in DEFAULT_ANALYTICS_SPECS
+}
+
+# asyncpg caps a statement at 32767 bind parameters, one per column per row.
+ROLLUPS_CHUNK_SIZE = 32767 // len(SpanRollupDBE.__table__.columns)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+# SKETCH ----------------------------------------------------------------------
+
+
+def sketch_key(value: float) -> str:
+    if abs(value) < _MIN_MAGNITUDE:
+        return _ZERO_KEY
+
+    index = math.ceil(math.log(abs(value)) / _LOG_GAMMA)
+
+    return f"{'+' if value > 0 else '-'}{index}"
+
+
+def sketch_value(key: str) -> float:
+    """The value a sketch bin stands for, within the relative accuracy of all of them."""
+    if key == _ZERO_KEY:
+        return 0.0
+
+    magnitude = 2 * _GAMMA ** int(key[1:]) / (_GAMMA + 1)
+
+    return magnitude if key[0] == "+" else -magnitude
+
+
+# WRITE -----------------------------------------------------------------------
+
+
+def bucket_start(timestamp: datetime, granularity: int) -> datetime:
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+
+    minutes = int((timestamp - _EPOCH).total_seconds() // 60)
+
+    return _EPOCH + timedelta(minutes=minutes - minutes % granularity)
+
+
+def _lookup(attributes: Optional[Dict[str, Any]], path: str) -> Any:
+    value: Any = attributes
+    for part in path.split(".")[1:]:  # without the "attributes." prefix
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def _scopes(references: Optional[List[Dict[str, Any]]]) -> List[str]:
+    # References are stored flattened (`marshall`): the id is a top-level key.
+    ids = {
+        str(reference["id"])
+        for reference in references or []
+        if isinstance(reference, dict) and reference.get("id") is not None
+    }
+    return [ROLLUP_SCOPE_ALL, *sorted(ids)]
+
+
+def build_rollup_rows(
+    *,
+    project_id: UUID,
+    values_list: List[Dict[str, Any]],
+    sign: int = 1,
+) -> List[Dict[str, Any]]:
+    """What the root spans in `values_list` add to (sign=1) or take from (sign=-1) the rollups.
+
+    `values_list` holds span rows (column -> value); child spans are skipped.
+    Rows come out sorted by key, so concurrent upserts lock them in one order.
+    A removal leaves min and max as they are.
+    """
+    accumulated: Dict[Tuple[str, int, datetime, str, str], List[Any]] = {}
+
+    for values in values_list:
+        created_at = values.get("created_at")
+        if values.get("parent_id") is not None or created_at is None:
+            continue
+
+        contributions: List[Tuple[str, str, Optional[float]]] = []
+
+        for path, metric_type in ROLLUP_SPECS.items():
+            value = _lookup(values.get("attributes"), path)
+
+            if metric_type == MetricType.NUMERIC_CONTINUOUS:
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                if not math.isfinite(value):
+                    continue
+                contributions.append((path, ROLLUP_SUMMARY_KEY, value))
+                contributions.append((path, sketch_key(value), None))
+
+            elif metric_type == MetricType.CATEGORICAL_SINGLE:
+                if not isinstance(value, str):
+                    continue
+                contributions.append((path, ROLLUP_SUMMARY_KEY, None))
+                contributions.append((path, f"{_VALUE_PREFIX}{value}", None))
+
+        if not contributions:
+            continue
+
+        for scope in _scopes(values.get("references")):
+            for granularity in ROLLUP_GRANULARITIES:
+                bucket = bucket_start(created_at, granularity)
+
+                for path, key, value in contributions:
+                    row = accumulated.setdefault(
+                        (scope, granularity, bucket, path, key),
+                        [0, None, None, None],
+                    )
+                    row[0] += sign
+                    if value is None:
+                        continue
+                    row[1] = (row[1] or 0) + sign * value
+                    if sign > 0:
+                        row[2] = value if row[2] is None else min(row[2], value)
+                        row[3] = value if row[3] is None else max(row[3], value)
+
+    return [
+        dict(
+            project_id=project_id,
+            scope=scope,
+            granularity=granularity,
+            bucket=bucket,
+            path=path,
+            key=key,
+            count=count,
+            sum=total,
+            min=minimum,
+            max=maximum,
+        )
+        for (scope, granularity, bucket, path, key), (
+            count,
+            total,
+            minimum,
+            maximum,
+        ) in sorted(accumulated.items())
+    ]
+
+
+def upsert_rollups_stmt(*, rows: List[Dict[str, Any]]):
+    stmt = insert(SpanRollupDBE).values(rows)
+    table = SpanRollupDBE.__table__
+
+    return stmt.on_conflict_do_update(
+        index_elements=["project_id", "scope", "granularity", "bucket", "path", "key"],
+        set_={
+            "count": table.c.count + stmt.excluded.count,
+            # NULL on sketch and category rows, which have no sum.
+            "sum": table.c.sum + stmt.excluded.sum,
+            # LEAST/GREATEST skip NULLs, as removals carry none.
+            "min": func.least(table.c.min, stmt.excluded.min),
+            "max": func.greatest(table.c.max, stmt.excluded.max),
+        },
+    )
+
+
+async def write_rollups(
+    session: Any,
+    *,
+    project_id: UUID,
+    values_list: List[Dict[str, Any]],
+    sign: int = 1,
+) -> int:
+    """Add (sign=1) or subtract (sign=-1) root spans, within the caller's transaction."""
+    rows = build_rollup_rows(project_id=project_id, values_list=values_list, sign=sign)
+
+    for offset in range(0, len(rows), ROLLUPS_CHUNK_SIZE):
+        await session.execute(
+            upsert_rollups_stmt(rows=rows[offset : offset + ROLLUPS_CHUNK_SIZE])
+        )
+
+    return len(rows)
+
+
+def ensure_coverage_stmt(*, project_id: UUID, now: datetime):
+    return (
+        insert(SpanRollupCoverageDBE)
+        .values(
+            project_id=project_id,
+            since=bucket_start(now, ROLLUP_HOUR) + ROLLUP_COVERAGE_DELAY,
+        )
+        .on_conflict_do_nothing(index_elements=["project_id"])
+    )
+
+
+# READ ------------------------------------------------------------------------
+
+
+def match_rollup_scope(
+    *,
+    filtering: Optional[Filtering],
+    specs: List[MetricSpec],
+    rate: Optional[float],
+    oldest: datetime,
+    newest: datetime,
+) -> Optional[str]:
+    """The rollup scope that answers this analytics request exactly, if any.
+
+    That is: default specs without options, no sampling, whole-minute window
+    bounds, and no filter or a filter on one reference id.
+    """
+    if not specs or rate is not None and rate < 1:
+        return None
+
+    for spec in specs:
+        if ROLLUP_SPECS.get(spec.path) != spec.type:
+            return None
+        if spec.bins is not None or spec.vmin is not None or spec.vmax is not None:
+            return None
+        if spec.edge is False:
+            return None
+
+    for bound in (oldest, newest):
+        if bound.second or bound.microsecond:
+            return None
+
+    conditions = filtering.conditions if filtering else None
+    if not conditions:
+        return ROLLUP_SCOPE_ALL
+
+    if filtering.operator not in (LogicalOperator.AND, LogicalOperator.OR):
+        return None
+
+    if len(conditions) != 1 or not isinstance(conditions[0], Condition):
+        return None
+
+    condition = conditions[0]
+    if (
+        condition.field != "references"
+        or condition.key is not None
+        or condition.operator != ListOperator.IN
+        or (condition.options is not None and getattr(condition.options, "all", False))
+        or not isinstance(condition.value, list)
+        or len(condition.value) != 1
+    ):
+        return None
+
+    reference = condition.value[0]
+    if not isinstance(reference, dict):
+        return None
+
+    reference = {k: v for k, v in reference.items() if v is not None}
+    if set(reference) != {"id"}:
+        return None
+
+    return str(reference["id"])
+
+
+ROLLUPS_QUERY_SQL = text(
+    """
+        WITH rollups AS (
+          SELECT
+            granularity,
+            bucket,
+            path,
+            key,
+            count,
+            sum,
+            min,
+            max,
+            -- An hour row is used only when its whole hour is in the window
+            -- and in one bucket; its minute rows are used otherwise.
+            (
+              bucket >= :oldest
+              AND bucket + interval '1 hour' <= :newest
+              AND date_bin(:stride, bucket, :oldest)
+                = date_bin(:stride, bucket + interval '59 minutes', :oldest)
+            ) AS whole_hour,
+            (
+              date_bin(interval '1 hour', bucket, TIMESTAMPTZ '1970-01-01 00:00:00+00')
+                >= :oldest
+              AND date_bin(interval '1 hour', bucket, TIMESTAMPTZ '1970-01-01 00:00:00+00')
+                + interval '1 hour' <= :newest
+              AND date_bin(
+                    :stride,
+                    date_bin(interval '1 hour', bucket, TIMESTAMPTZ '1970-01-01 00:00:00+00'),
+                    :oldest
+                  )
+                = date_bin(
+                    :stride,
+                    date_bin(interval '1 hour', bucket, TIMESTAMPTZ '1970-01-01 00:00:00+00')
+                      + interval '59 minutes',
+                    :oldest
+                  )
+            ) AS in_whole_hour
+          FROM public.span_rollups
+          WHERE project_id = :project_id
+            AND scope = :scope
+            AND granularity IN (:minute, :hour)
+            AND path = ANY(:paths)
+            AND bucket >= :oldest
+            AND bucket < :newest
+        )
+        SELECT
+          date_bin(:stride, bucket, :oldest) AS timestamp,
+          path,
+          key,
+          sum(count)::bigint AS count,
+          sum(sum) AS sum,
+          min(min) AS min,
+          max(max) AS max
+        FROM rollups
+        WHERE (granularity = :hour AND whole_hour)
+           OR (granularity = :minute AND NOT in_whole_hour)
+        GROUP BY 1, path, key;
+        """
+).bindparams(
+    bindparam("paths", type_=ARRAY(String())),
+    bindparam("stride", type_=Interval()),
+)
+
+
+def _float(value: Any) -> Optional[float]:
+    return float(value) if value is not None else None
+
+
+def _percentiles(
+    *,
+    minimum: float,
+    maximum: float,
+    sketch: List[Tuple[float, int]],
+) -> List[float]:
+    # percentile_cont: interpolate between the values at the ranks around
+    # p * (n - 1), reading each rank off the sketch and the exact extremes.
+    total = sum(count for _, count in sketch)
+    cumulative: List[int] = []
+    running = 0
+    for _, count in sketch:
+        running += count
+        cumulative.append(running)
+
+    def value_at(rank: int) -> float:
+        if rank <= 0:
+            return minimum
+        if rank >= total - 1:
+            return maximum
+        value = sketch[bisect_right(cumulative, rank)][0]
+        return min(max(value, minimum), maximum)
+
+    percentiles = []
+    for level in PERCENTILES_VALUES:
+        rank = level * (total - 1)
+        lower = math.floor(rank)
+        upper = math.ceil(rank)
+        value = value_at(lower)
+        if upper != lower:
+            value += (rank - lower) * (value_at(upper) - value)
+        percentiles.append(value)
+
+    return percentiles
+
+
+def _histogram(
+    *,
+    count: int,
+    minimum: float,
+    maximum: float,
+    sketch: List[Tuple[float, int]],
+) -> List[Dict[str, Any]]:
+    # Same bins as the raw path: ceil(sqrt(n)) edge-aligned bins over [min, max].
+    bins = 1 if count <= 1 or minimum == maximum else math.ceil(math.sqrt(count))
+    width = (maximum - minimum) / bins
+
+    counts = [0] * bins
+    for value, n in sketch:
+        index = int((value - minimum) // width) if width > 0 else 0
+        counts[min(max(index, 0), bins - 1)] += n
+
+    return [
+        {
+            "bin": index + 1,
+            "count": counts[index],
+            "interval": [
+                minimum if index == 0 else minimum + index * width,
+                maximum if index == bins - 1 else minimum + (index + 1) * width,
+            ],
+        }
+        for index in range(bins)
+    ]
+
+
+def _numeric_metric(
+    summary: Dict[str, Any],
+    sketch: List[Tuple[float, int]],
+) -> Dict[str, Any]:
+    count = int(summary["count"])
+    total = _float(summary["sum"]) or 0.0
+    minimum = _float(summary["min"])
+    maximum = _float(summary["max"])
+
+    metric: Dict[str, Any] = {"count": count}
+    metric |= compute_range(
+        {"sum": total, "mean": total / count, "min": minimum, "max": maximum}
+    )
+
+    sketch = sorted((value, n) for value, n in sketch if n > 0)
+    if not sketch or minimum is None or maximum is None:
+        return metric
+
+    pcts = parse_pcts(_percentiles(minimum=minimum, maximum=maximum, sketch=sketch))
+    metric |= compute_pscs(compute_cqvs(compute_iqrs(pcts)))
+    metric |= normalize_hist(
+        _histogram(count=count, minimum=minimum, maximum=maximum, sketch=sketch)
+    )
+
+    return metric
+
+
+def _categorical_metric(
+    summary: Dict[str, Any],
+    values: List[Tuple[str, int]],
+) -> Dict[str, Any]:
+    freq = [
+        {"value": value, "count": n}
+        for value, n in sorted(values, key=lambda item: (-item[1], item[0]))
+        if n > 0
+    ]
+
+    return {"count": int(summary["count"])} | compute_uniq(normalize_freq(freq))
+
+
+def assemble_rollup_buckets(
+    *,
+    rows: List[Dict[str, Any]],
+    specs: List[MetricSpec],
+    interval: int,
+) -> List[MetricsBucket]:
+    """Turn the rows of `ROLLUPS_QUERY_SQL` into the buckets the raw path returns."""
+    types = {spec.path: spec.type for spec in specs}
+
+    summaries: Dict[Tuple[datetime, str], Dict[str, Any]] = {}
+    details: Dict[Tuple[datetime, str], List[Tuple[Any, int]]] = {}
+
+    for row in rows:
+        group = (row["timestamp"], row["path"])
+        if row["key"] == ROLLUP_SUMMARY_KEY:
+            summaries[group] = row
+        elif row["key"].startswith(_VALUE_PREFIX):
+            details.setdefault(group, []).append(
+                (row["key"][len(_VALUE_PREFIX) :], int(row["count"]))
+            )
+        else:
+            details.setdefault(group, []).append(
+                (sketch_value(row["key"]), int(row["count"]))
+            )
+
+    per_timestamp: Dict[datetime, Dict[str, Dict[str, Any]]] = {}
+
+    for (timestamp, path), summary in summaries.items():
+        metric_type = types.get(path)
+        if metric_type is None or int(summary["count"]) <= 0:
+            continue
+
+        if metric_type == MetricType.NUMERIC_CONTINUOUS:
+            metric = _numeric_metric(summary, details.get((timestamp, path), []))
+        else:
+            metric = _categorical_metric(summary, details.get((timestamp, path), []))
+
+        per_timestamp.setdefault(timestamp, {})[path] = {
+            "type": metric_type.value
+        } | metric
+
+    return sort_buckets_by_timestamp(
+        [
+            MetricsBucket(timestamp=timestamp, interval=interval, metrics=metrics)
+            for timestamp, metrics in per_timestamp.items()
+        ]
+    )
@@ -0,0 +1,344 @@
+"""Summaries of traces, one row per project and trace.
+
+`TracingDAO.query` with focus=trace used to pick its page of traces off the
+spans: DISTINCT ON over every span of the window that matches the filter,
+then the spans of the page again by trace id. The same page is read off
+`traces`, which holds what a trace list shows and filters on:
+
+- start_time and end_time over all the spans of the trace, and the
+  references of all of them, each once;
+- span name, status, trace type, session, user and agent of the root span,
+  and its cumulative costs and tokens.
+
+`TracingDAO.ingest` upserts the traces of the spans it writes in the same
+transaction, and `TracingDAO.delete` deletes them. Trace lists are ordered by
+the start of their trace, and only the spans of the page are loaded.
+
+A trace matches a filter when one of its spans does. A row answers the same
+question only for conditions whose truth its columns carry (see
+`match_trace_filtering`); other filters are answered from the spans.
+
+Spans are never backfilled: `traces_coverage` records, per project, from when
+on its traces are all summarized, and older traces are still listed from the
+spans.
+"""
+
+import math
+from datetime import datetime, timedelta, timezone
+from json import dumps
+from typing import Any, Dict, List, Optional, Union
+from uuid import UUID
+
+from sqlalchemy import Column, case, func, literal_column
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.sql.elements import ClauseElement
+from sqlalchemy.sql.visitors import replacement_traverse
+
+from oss.src.core.tracing.dtos import (
+    ComparisonOperator,
+    Condition,
+    ExistenceOperator,
+    Fields,
+    Filtering,
+    ListOperator,
+    LogicalOperator,
+    NumericOperator,
+    StringOperator,
+)
+from oss.src.dbs.postgres.tracing.dbes import SpanDBE, TraceCoverageDBE, TraceDBE
+
+
+# asyncpg caps a statement at 32767 bind parameters, one per column per row.
+TRACES_CHUNK_SIZE = 32767 // len(TraceDBE.__table__.columns)
+
+# A project's summaries are trusted from an hour after its first summarized
+# trace, for the workers of the previous release to drain.
+TRACES_COVERAGE_DELAY = timedelta(hours=1)
+
+# Read off the root span.
+_ROOT_COLUMNS = (
+    "span_id",
+    "span_name",
+    "status_code",
+    "session_id",
+    "user_id",
+    "agent_id",
+    "costs",
+    "tokens",
+)
+
+# Root-span-only columns (see SpanDBA): children never have them set.
+_ROOT_FIELDS = (
+    Fields.SESSION_ID,
+    Fields.USER_ID,
+    Fields.AGENT_ID,
+)
+# Columns every span of a trace has the same value of.
+_TRACE_FIELDS = (
+    Fields.TRACE_ID,
+    Fields.TRACE_TYPE,
+)
+
+
+# WRITE -----------------------------------------------------------------------
+
+
+def cumulative_total(attributes: Optional[Dict[str, Any]], metric: str) -> Any:
+    value: Any = attributes
+    for part in ("ag", "metrics", metric, "cumulative", "total"):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    if not math.isfinite(value):
+        return None
+
+    return value
+
+
+def build_trace_summary_rows(
+    *,
+    project_id: UUID,
+    values_list: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """What the spans in `values_list` (column -> value) tell about their traces.
+
+    One row per trace, with the root columns set only if its root is among the
+    spans. Rows come out sorted by trace id, so concurrent upserts lock them
+    in one order.
+    """
+    rows: Dict[Any, Dict[str, Any]] = {}
+    references: Dict[Any, Dict[str, Any]] = {}
+
+    for values in values_list:
+        trace_id = values["trace_id"]
+
+        row = rows.get(trace_id)
+        if row is None:
+            row = dict(
+                project_id=project_id,
+                trace_id=trace_id,
+                trace_type=values.get("trace_type"),
+                start_time=values["start_time"],
+                end_time=values["end_time"],
+                references=None,
+                **{column: None for column in _ROOT_COLUMNS},
+            )
+            rows[trace_id] = row
+            references[trace_id] = {}
+
+        row["start_time"] = min(row["start_time"], values["start_time"])
+        row["end_time"] = max(row["end_time"], values["end_time"])
+
+        for reference in values.get("references") or []:
+            references[trace_id].setdefault(
+                dumps(reference, sort_keys=True, default=str),
+                reference,
+            )
+
+        if values.get("parent_id") is None:
+            attributes = values.get("attributes")
+            row.update(
+                span_id=values["span_id"],
+                trace_type=values.get("trace_type") or row["trace_type"],
+                span_name=values.get("span_name"),
+                status_code=values.get("status_code"),
+                session_id=values.get("session_id"),
+                user_id=values.get("user_id"),
+                agent_id=values.get("agent_id"),
+                costs=cumulative_total(attributes, "costs"),
+                tokens=cumulative_total(attributes, "tokens"),
+            )
+
+    for trace_id, row in rows.items():
+        row["references"] = list(references[trace_id].values()) or None
+
+    return [rows[trace_id] for trace_id in sorted(rows, key=str)]
+
+
+# The union of the references already summarized and the new ones; a JSONB
+# array has no set semantics of its own. ("references" is a keyword.)
+_REFERENCES_UNION = literal_column(
+    """
+    CASE
+      WHEN excluded."references" IS NULL THEN traces."references"
+      WHEN traces."references" IS NULL THEN excluded."references"
+      ELSE (
+        SELECT jsonb_agg(DISTINCT reference)
+        FROM jsonb_array_elements(
+          traces."references" || excluded."references"
+        ) AS reference
+      )
+    END
+    """
+)
+
+
+def upsert_trace_summaries_stmt(*, rows: List[Dict[str, Any]]):
+    stmt = insert(TraceDBE).values(rows)
+    table = TraceDBE.__table__
+    has_root = stmt.excluded.span_id.isnot(None)
+
+    return stmt.on_conflict_do_update(
+        index_elements=["project_id", "trace_id"],
+        set_={
+            "start_time": func.least(table.c.start_time, stmt.excluded.start_time),
+            "end_time": func.greatest(table.c.end_time, stmt.excluded.end_time),
+            # The latest root wins (a late span re-aggregates it); without it,
+            # what is summarized already stays.
+            **{
+                column: case(
+                    (has_root, stmt.excluded[column]),
+                    else_=table.c[column],
+                )
+                for column in _ROOT_COLUMNS
+            },
+            "trace_type": case(
+                (has_root, stmt.excluded.trace_type),
+                else_=func.coalesce(table.c.trace_type, stmt.excluded.trace_type),
+            ),
+            "references": _REFERENCES_UNION,
+        },
+    )
+
+
+async def write_trace_summaries(
+    session: Any,
+    *,
+    project_id: UUID,
+    values_list: List[Dict[str, Any]],
+) -> int:
+    """Upsert the traces of the spans in `values_list`, within the caller's transaction."""
+    rows = build_trace_summary_rows(project_id=project_id, values_list=values_list)
+
+    for offset in range(0, len(rows), TRACES_CHUNK_SIZE):
+        await session.execute(
+            upsert_trace_summaries_stmt(rows=rows[offset : offset + TRACES_CHUNK_SIZE])
+        )
+
+    return len(rows)
+
+
+def ensure_traces_coverage_stmt(*, project_id: UUID, now: datetime):
+    return (
+        insert(TraceCoverageDBE)
+        .values(
+            project_id=project_id,
+            since=now + TRACES_COVERAGE_DELAY,
+        )
+        .on_conflict_do_nothing(index_elements=["project_id"])
+    )
+
+
+# READ ------------------------------------------------------------------------
+
+# What a condition's truth on one span says about the spans of its trace.
+_ON_TRACE = "trace"  # the same on all of them
+_ON_ROOT = "root"  # true on the root only, if at all
+_ON_SPANS = "spans"  # true on any of them
+
+
+def _holds_only_when_set(condition: Condition) -> bool:
+    operator = condition.operator
+
+    if isinstance(operator, ComparisonOperator):
+        return operator == ComparisonOperator.IS and condition.value is not None
+    if isinstance(operator, NumericOperator):
+        return operator != NumericOperator.NEQ
+    if isinstance(operator, StringOperator):
+        return True
+    if isinstance(operator, ListOperator):
+        return operator == ListOperator.IN
+    if isinstance(operator, ExistenceOperator):
+        return operator == ExistenceOperator.EXISTS
+
+    return False
+
+
+def _condition_scope(condition: Condition) -> Optional[str]:
+    field = condition.field
+
+    if field in _TRACE_FIELDS:
+        return _ON_TRACE
+
+    if field in _ROOT_FIELDS:
+        # Children have NULL there, which fails every positive condition.
+        return _ON_ROOT if _holds_only_when_set(condition) else None
+
+    if field == Fields.REFERENCES:
+        # Some span refers to one of the values iff the union of the
+        # references of the trace does. With `all`, one span must refer to
+        # all of them, which the union does not tell.
+        many = isinstance(condition.value, list) and len(condition.value) > 1
+        all_of = condition.options is not None and getattr(
+            condition.options, "all", False
+        )
+        if condition.operator == ListOperator.IN and not (many and all_of):
+            return _ON_SPANS
+
+    return None
+
+
+def _filtering_scope(filtering: Filtering) -> Optional[str]:
+    scopes = []
+    for condition in filtering.conditions or []:
+        if isinstance(condition, Filtering):
+            scope = _filtering_scope(condition)
+        elif isinstance(condition, Condition):
+            scope = _condition_scope(condition)
+        else:
+            scope = None
+
+        if scope is None:
+            return None
+        scopes.append(scope)
+
+    if all(scope == _ON_TRACE for scope in scopes):
+        return _ON_TRACE
+
+    others = [scope for scope in scopes if scope != _ON_TRACE]
+
+    if filtering.operator == LogicalOperator.OR:
+        # Some span satisfies one of them iff one of them holds on some span.
+        if others == scopes and set(others) == {_ON_ROOT}:
+            return _ON_ROOT
+        return _ON_SPANS
+
+    if filtering.operator == LogicalOperator.AND:
+        # Conditions on the root hold together on the root; a condition on
+        # any span cannot be told apart from another one on the same span.
+        if set(others) == {_ON_ROOT}:
+            return _ON_ROOT
+        if others == [_ON_SPANS]:
+            return _ON_SPANS
+
+    return None
+
+
+def match_trace_filtering(filtering: Optional[Filtering]) -> bool:
+    """Whether the trace summaries tell which traces have a span matching this filter."""
+    if not filtering or not filtering.conditions:
+        return True
+
+    return _filtering_scope(filtering) is not None
+
+
+def adapt_to_traces(clause: Union[ClauseElement, Any]) -> Any:
+    """The same filter clause, on the columns of `traces` instead of `spans`."""
+    spans = SpanDBE.__table__
+    traces = TraceDBE.__table__
+
+    def replace(element):
+        if isinstance(element, Column) and element.table is spans:
+            return traces.c[element.key]
+        return None
+
+    return replacement_traverse(clause, {}, replace)
+
+
+def as_utc(timestamp: Optional[datetime]) -> Optional[datetime]:
+    if timestamp is not None and timestamp.tzinfo is None:
+        return timestamp.replace(tzinfo=timezone.utc)
+    return timestamp
@@ -46,6 +46,8 @@ log = get_module_logger(__name__)
 
 DEBUG_ARGS = {"dialect": dialect(), "compile_kwargs": {"literal_binds": True}}
 TIMEOUT_STMT = text(f"SET LOCAL statement_timeout = '{15_000}'")  # milliseconds
+# Exports stream from a cursor: the timeout bounds each fetch, not the export.
+EXPORT_TIMEOUT_STMT = text(f"SET LOCAL statement_timeout = '{60_000}'")  # milliseconds
 
 
 # UTILS
@@ -26,6 +26,9 @@ that omits it.
 The nest: alive ⊇ running ⊇ attached. attached ⟹ running ⟹ alive.
 """
 
+from datetime import datetime
+from typing import Optional
+
 from oss.src.utils.env import env
 
 # ---------------------------------------------------------------------------
@@ -94,7 +97,7 @@ def make_displacement_payload(*, by: str) -> dict:
 # Per-session channels carry high-frequency in-session traffic; the project
 # channel carries low-frequency entity changes for list pages.
 # Payload shapes:
-#   {"type": "records-changed", "session_id": s}
+#   {"type": "records-changed", "session_id": s, "since"?: iso8601}
 #   {"type": "lifecycle",       "session_id": s, "state": "running"|"ended"}
 #   {"type": "interaction",     "session_id": s, "status": "pending"|"resolved"}
 #   {"type": "<entity>-changed", "entity": entity, "id": id}
@@ -123,8 +126,17 @@ def project_watch_channel(project_id: str) -> str:
     return f"watch:{project_id}:project"
 
 
-def make_watch_records_changed_payload(*, session_id: str) -> dict:
-    return {"type": WATCH_EVENT_RECORDS_CHANGED, "session_id": session_id}
+def make_watch_records_changed_payload(
+    *,
+    session_id: str,
+    since: Optional[datetime] = None,
+) -> dict:
+    payload = {"type": WATCH_EVENT_RECORDS_CHANGED, "session_id": session_id}
+    # The earliest timestamp of the records written: reading from it returns all of
+    # them, so a client fetches the delta instead of the whole record log.
+    if since is not None:
+        payload["since"] = since.isoformat()
+    return payload
 
 
 def make_watch_lifecycle_payload(*, session_id: str, state: str) -> dict:
@@ -11,6 +11,7 @@ Plane: durable Redis — the SSE endpoint subscribes there via
 
 import asyncio
 import json
+from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
 from oss.src.dbs.redis.sessions.contract import (
@@ -70,11 +71,20 @@ class SessionsWatchPublisher:
                 event_type=payload.get("type"),
             )
 
-    async def records_changed(self, *, project_id: str, session_id: str) -> None:
+    async def records_changed(
+        self,
+        *,
+        project_id: str,
+        session_id: str,
+        since: Optional[datetime] = None,
+    ) -> None:
         await self._publish(
             channel=watch_channel(project_id, session_id),
             project_id=project_id,
-            payload=make_watch_records_changed_payload(session_id=session_id),
+            payload=make_watch_records_changed_payload(
+                session_id=session_id,
+                since=since,
+            ),
         )
 
     async def lifecycle(
@@ -0,0 +1,76 @@
+"""Trace commit channels — a fire-and-forget publisher.
+
+Publish side of `GET /tracing/traces/{trace_id}?wait=...`: the ingestion worker
+announces each trace it has just written, so a reader long-polling for that trace
+re-reads it once instead of sleep-polling. Every publish is best-effort: a failure
+is logged and swallowed, since the spans are already committed and a waiter falls
+back to its own deadline. PUBLISH to zero subscribers is an O(1) Redis no-op.
+
+Plane: durable Redis — the endpoint subscribes there via ``get_streams_engine()``;
+publisher and subscriber must share one plane.
+"""
+
+import asyncio
+from typing import TYPE_CHECKING, Iterable, Optional
+from uuid import UUID
+
+from oss.src.dbs.redis.shared.engine import get_streams_engine
+from oss.src.utils.logging import get_module_logger
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+log = get_module_logger(__name__)
+
+# Upper bound on one `wait`: long enough to cover the worker's batching delay and a
+# busy stream, short enough that a proxy never drops the request as idle.
+TRACE_WAIT_MAX_SECONDS = 30.0
+
+
+def trace_watch_channel(project_id: str, trace_id: str) -> str:
+    # Ids are normalized to bare hex so the worker (dashed UUIDs) and the endpoint
+    # (the caller's 32-char hex) land on the same channel.
+    return f"watch:{UUID(str(project_id)).hex}:trace:{UUID(str(trace_id)).hex}"
+
+
+class TracingWatchPublisher:
+    """Publishes trace-commit notifications on the durable plane. Never raises."""
+
+    def __init__(self, *, redis_client: Optional["Redis"] = None) -> None:
+        # An injected client (e.g. the stream worker's durable connection) is
+        # reused; otherwise the shared streams engine client is opened lazily.
+        self._redis = redis_client
+
+    def _client(self) -> "Redis":
+        if self._redis is None:
+            self._redis = get_streams_engine().get_redis()
+        return self._redis
+
+    async def traces_committed(
+        self,
+        *,
+        project_id: str,
+        trace_ids: Iterable[str],
+    ) -> None:
+        try:
+            channels = sorted(
+                {trace_watch_channel(project_id, trace_id) for trace_id in trace_ids}
+            )
+            if not channels:
+                return
+
+            async def _publish() -> None:
+                async with self._client().pipeline(transaction=False) as pipe:
+                    for channel in channels:
+                        pipe.publish(channel, b"committed")
+                    await pipe.execute()
+
+            # Bounded: the streams client has no socket timeouts, and this sits on
+            # the ingestion loop — a black-holed Redis must cost at most 1s.
+            await asyncio.wait_for(_publish(), timeout=1.0)
+        except Exception:
+            # Relay only — the spans this notifies about are already committed.
+            log.warning(
+                "[WATCH] trace publish failed",
+                project_id=str(project_id),
+            )
@@ -1,4 +1,3 @@
-import asyncio
 from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
@@ -36,8 +35,8 @@ class EventsWorker(StreamConsumer):
        per-org delta. Mirrors the tracing worker's
        `Counter.TRACES_INGESTED` pattern. Over-quota orgs are dropped.
     5. Ingest events per project if the org is within quota
-    6. Dispatch to webhooks (if configured) — overridden `run()`, can skip ack
-       to force redelivery on dispatch failure
+    6. Dispatch to webhooks (if configured) — overridden `handle_batch()`, can
+       skip ack to force redelivery on dispatch failure
     7. ACK + DEL messages — StreamConsumer
     """
 
@@ -54,6 +53,10 @@ class EventsWorker(StreamConsumer):
         max_block_ms: int = 5000,  # 5 seconds
         max_delay_ms: int = 250,  # 250 milliseconds
         max_batch_mb: int = 50,  # 50 MB
+        max_in_flight: Optional[int] = None,
+        max_lanes: Optional[int] = None,
+        claim_min_idle_ms: Optional[int] = None,
+        claim_max_deliveries: Optional[int] = None,
         #
         webhooks_dispatcher: Optional["WebhooksDispatcher"] = None,
     ):
@@ -66,6 +69,10 @@ class EventsWorker(StreamConsumer):
             max_block_ms=max_block_ms,
             max_delay_ms=max_delay_ms,
             max_batch_mb=max_batch_mb,
+            max_in_flight=max_in_flight,
+            max_lanes=max_lanes,
+            claim_min_idle_ms=claim_min_idle_ms,
+            claim_max_deliveries=claim_max_deliveries,
         )
         self.service = service
         self.webhooks_dispatcher = webhooks_dispatcher
@@ -194,67 +201,46 @@ class EventsWorker(StreamConsumer):
 
         return total_ingested, processed_ids, allowed_batches
 
-    async def run(self):
+    async def handle_batch(self, batch: List[Tuple[bytes, Dict[bytes, bytes]]]):
         """
-        Main worker loop — overrides StreamConsumer.run to add the webhook-dispatch
-        stage (the one asymmetry the base loop doesn't have).
+        Process one (lane) batch — overrides StreamConsumer.handle_batch to add the
+        webhook-dispatch stage (the one asymmetry the base loop doesn't have).
 
         Flow:
-        1. Read batch via XREADGROUP
-        2. Process batch (returns ingested count, message IDs, project batches)
-        3. Dispatch to webhooks (if configured) — skip ACK/DEL on failure to allow retry
-        4. ACK + DEL processed messages
-        5. On error, messages remain pending for retry
+        1. Process batch (returns ingested count, message IDs, project batches)
+        2. Dispatch to webhooks (if configured) — skip ACK/DEL on failure to allow retry
+        3. ACK + DEL processed messages
         """
-        log.info(
-            "[EVENTS] Worker started",
-            stream=self.stream_name,
-            group=self.consumer_group,
-            consumer=self.consumer_name,
-            max_batch_size=self.max_batch_size,
-            webhooks=self.webhooks_dispatcher is not None,
-        )
-
-        while True:
+        # 1. Process batch
+        ingested, processed_ids, batches = await self.process_batch(batch)
+
+        # 2. Dispatch to webhooks (skip ACK/DEL on failure to allow retry)
+        if self.webhooks_dispatcher and batches:
+            log.info(
+                "[EVENTS] Dispatching webhooks",
+                batches=len(batches),
+                dispatcher=type(self.webhooks_dispatcher).__name__,
+            )
             try:
-                # 1. Read batch from stream
-                batch = await self.read_batch()
-                if not batch:
-                    continue
-
-                # 2. Process batch
-                ingested, processed_ids, batches = await self.process_batch(batch)
-
-                # 3. Dispatch to webhooks (skip ACK/DEL on failure to allow retry)
-                if self.webhooks_dispatcher and batches:
-                    log.info(
-                        "[EVENTS] Dispatching webhooks",
-                        batches=len(batches),
-                        dispatcher=type(self.webhooks_dispatcher).__name__,
-                    )
-                    try:
-                        await self.webhooks_dispatcher.dispatch(batches=batches)
-                    except Exception:
-                        log.error("[EVENTS] Webhook dispatch failed", exc_info=True)
-                        log.warning(
-                            "[EVENTS] Skipping ACK/DEL due to webhook dispatch failure",
-                            batch_size=len(batch),
-                        )
-                        continue
-                else:
-                    log.info(
-                        "[EVENTS] Skipping webhook dispatch",
-                        has_dispatcher=self.webhooks_dispatcher is not None,
-                        batches=len(batches),
-                    )
-
-                # 4. ACK and DELETE processed messages
-                await self.ack_and_delete(processed_ids)
-                log.info(
-                    "[EVENTS] Batch processed",
+                await self.webhooks_dispatcher.dispatch(batches=batches)
+            except Exception:
+                log.error("[EVENTS] Webhook dispatch failed", exc_info=True)
+                log.warning(
+                    "[EVENTS] Skipping ACK/DEL due to webhook dispatch failure",
                     batch_size=len(batch),
-                    ingested=ingested,
                 )
-            except Exception:
-                log.error("[EVENTS] Worker loop error", exc_info=True)
-                await asyncio.sleep(1)
+                return
+        else:
+            log.info(
+                "[EVENTS] Skipping webhook dispatch",
+                has_dispatcher=self.webhooks_dispatcher is not None,
+                batches=len(batches),
+            )
+
+        # 3. ACK and DELETE processed messages
+        await self.ack_and_delete(processed_ids)
+        log.info(
+            "[EVENTS] Batch processed",
+            batch_size=len(batch),
+            ingested=ingested,
+        )
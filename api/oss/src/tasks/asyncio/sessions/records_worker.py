@@ -6,6 +6,7 @@ from redis.asyncio import Redis
 from oss.src.core.sessions.interactions.service import SessionInteractionsService
 from oss.src.core.sessions.records.service import RecordsService
 from oss.src.core.sessions.records.streaming import deserialize_record
+from oss.src.core.sessions.records.utils import earliest_timestamp
 from oss.src.core.sessions.watch.interfaces import SessionsWatchPublisherInterface
 from oss.src.utils.common import is_ee
 from oss.src.utils.logging import get_module_logger
@@ -74,6 +75,10 @@ class RecordsWorker(StreamConsumer):
         max_block_ms: int = 5000,
         max_delay_ms: int = 250,
         max_batch_mb: int = 50,
+        max_in_flight: Optional[int] = None,
+        max_lanes: Optional[int] = None,
+        claim_min_idle_ms: Optional[int] = None,
+        claim_max_deliveries: Optional[int] = None,
         watch_publisher: Optional[SessionsWatchPublisherInterface] = None,
         interactions_service: Optional[SessionInteractionsService] = None,
     ):
@@ -86,6 +91,10 @@ class RecordsWorker(StreamConsumer):
             max_block_ms=max_block_ms,
             max_delay_ms=max_delay_ms,
             max_batch_mb=max_batch_mb,
+            max_in_flight=max_in_flight,
+            max_lanes=max_lanes,
+            claim_min_idle_ms=claim_min_idle_ms,
+            claim_max_deliveries=claim_max_deliveries,
         )
         self.service = service
         self.watch_publisher = watch_publisher
@@ -267,6 +276,13 @@ class RecordsWorker(StreamConsumer):
                         await self.watch_publisher.records_changed(
                             project_id=project_id,
                             session_id=session_id,
+                            since=earliest_timestamp(
+                                [
+                                    record
+                                    for record in results
+                                    if record.session_id == session_id
+                                ]
+                            ),
                         )
                     except Exception:
                         log.warning(
@@ -4,41 +4,98 @@ StreamConsumer - shared base for the Redis Streams consumer loops.
 Extracted from tracing/records/events workers, which were the same program
 copy-pasted three times (create_consumer_group/read_batch/ack_and_delete/run
 were byte-identical). Subclasses provide only `process_batch` (and may
-override `run` when they need an extra stage around it, e.g. events' webhook
-dispatch with skip-ack-on-failure).
+override `handle_batch` when they need an extra stage between processing and
+ACK, e.g. events' webhook dispatch with skip-ack-on-failure).
 
 Batch Configuration:
 - max_batch_size: 50 (XREADGROUP COUNT) - max messages per read
 - max_block_ms: 5000ms (XREADGROUP BLOCK) - max wait time when queue is empty
 - max_batch_mb: 50 - max batch size in megabytes
 - max_delay_ms: 250ms - max wait time for batch accumulation when small batches arrive
+
+Pipelining:
+- max_in_flight: 2 - read batches being processed at once; the next batch is
+  read while earlier ones are still writing (1 = strictly serial)
+- max_lanes: 4 - ordered lanes a batch is sharded onto by the producer's
+  `key` field (project id), so one project's messages are always processed in
+  stream order while different projects write concurrently
+
+Maintenance:
+- maintenance_interval_s: None - subclasses that own periodic upkeep of what
+  they write (e.g. the spans partitions) set it and override `maintain`; it
+  runs once at start and then on that interval, and never stops the loop
+
+Supervision:
+- the lanes, the stats reporter, the reclaim sweep and maintenance run as
+  background tasks of `run`; one that stops on an error is logged and started
+  again after `RESTART_DELAY_S`, so a failed sweep does not silently end
+  reclamation for the life of the process
+
+Reclamation:
+- claim_min_idle_ms: 10 min - entries pending longer than this in ANY
+  consumer's PEL (a crashed or redeployed replica, or messages a batch left
+  unprocessed) are XAUTOCLAIMed by this consumer and processed again
+- claim_max_deliveries: 5 - entries delivered more often than this are
+  poison: they are copied to `<stream>:dead` and ACK + DEL'd instead
 """
 
 import time
 import asyncio
-from typing import Dict, List, Optional, Tuple
+import zlib
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
 
 from redis.asyncio import Redis
 
 from oss.src.tasks.taskiq.shared.broker import stable_consumer_name
+from oss.src.utils.env import env
 from oss.src.utils.logging import get_module_logger
 
 log = get_module_logger(__name__)
 
+# Optional XADD field naming the ordering key of a message (the project id).
+# Messages without it (older producers) all share lane 0.
+LANE_KEY_FIELD = b"key"
+
+# How often the run loop samples XINFO GROUPS and logs lag/in-flight stats.
+STATS_INTERVAL_S = 60
+
+# How often the run loop sweeps the group's PEL with XAUTOCLAIM.
+CLAIM_INTERVAL_S = 60
+
+# Bound the dead-letter stream; it is for inspection, not for replay at volume.
+MAXLEN_DEAD_LETTER = 10_000
+
+# How long the run loop waits before restarting a background task that died.
+RESTART_DELAY_S = 1
+
+
+class _BatchTicket:
+    """Tracks the lanes still working on one read batch (one in-flight slot)."""
+
+    __slots__ = ("remaining",)
+
+    def __init__(self, remaining: int):
+        self.remaining = remaining
+
 
 class StreamConsumer:
     """
     Base class for a Redis Streams consumer-group loop.
 
     Flow:
-    1. Read batch from Redis Streams (XREADGROUP)
-    2. `process_batch` (subclass): deserialize, group, meter, write
-    3. ACK + DEL processed messages
+    1. Read batch from Redis Streams (XREADGROUP), up to `max_in_flight` ahead,
+       plus stale pending entries reclaimed periodically (XAUTOCLAIM)
+    2. Shard the batch onto ordered lanes by message key
+    3. `process_batch` (subclass), per lane: deserialize, group, meter, write
+    4. ACK + DEL each lane's processed messages independently
     """
 
     #: Short tag prepended to log messages by subclasses (e.g. "[INGEST]").
     log_prefix: str = "[STREAM]"
 
+    #: Seconds between `maintain` calls; None runs no maintenance.
+    maintenance_interval_s: Optional[float] = None
+
     def __init__(
         self,
         redis_client: Redis,
@@ -49,6 +106,14 @@ class StreamConsumer:
         max_block_ms: int = 5000,  # 5 seconds
         max_delay_ms: int = 250,  # 250 milliseconds
         max_batch_mb: int = 50,  # 50 MB
+        max_in_flight: Optional[int] = None,  # AGENTA_WORKER_STREAMS_MAX_IN_FLIGHT
+        max_lanes: Optional[int] = None,  # AGENTA_WORKER_STREAMS_MAX_LANES
+        claim_min_idle_ms: Optional[
+            int
+        ] = None,  # AGENTA_WORKER_STREAMS_CLAIM_MIN_IDLE_MS
+        claim_max_deliveries: Optional[
+            int
+        ] = None,  # AGENTA_WORKER_STREAMS_CLAIM_MAX_DELIVERIES
     ):
         self.redis = redis_client
         self.stream_name = stream_name
@@ -62,6 +127,23 @@ class StreamConsumer:
         self.max_block_ms = max_block_ms
         self.max_batch_mb = max_batch_mb
         self.max_delay_ms = max_delay_ms
+        self.max_in_flight = max_in_flight or env.agenta.workers.streams_max_in_flight
+        self.max_lanes = max_lanes or env.agenta.workers.streams_max_lanes
+        self.claim_min_idle_ms = (
+            claim_min_idle_ms or env.agenta.workers.streams_claim_min_idle_ms
+        )
+        self.claim_max_deliveries = (
+            claim_max_deliveries or env.agenta.workers.streams_claim_max_deliveries
+        )
+        self.dead_letter_stream = f"{stream_name}:dead"
+
+        # Metrics, sampled by `report_stats` and readable by tests/probes.
+        self.in_flight = 0
+        self.lag: Optional[int] = None
+        self.pending: Optional[int] = None
+        self.processed_batches = 0
+        self.claimed = 0
+        self.dead_lettered = 0
 
     async def create_consumer_group(self):
         """Create consumer group if it doesn't exist. Safe to call multiple times (idempotent)."""
@@ -155,7 +237,113 @@ class StreamConsumer:
             await self.redis.xdel(self.stream_name, *message_ids)
         except Exception as e:
             log.error(f"{self.log_prefix} Failed to ACK/DEL messages: {e}")
-            # Don't raise - messages will remain pending and can be claimed later
+            # Don't raise - messages will remain pending and are claimed later
+
+    async def claim_batch(
+        self, start_id: bytes = b"0-0"
+    ) -> Tuple[bytes, List[Tuple[bytes, Dict[bytes, bytes]]]]:
+        """
+        Claim one page of stale pending entries (XAUTOCLAIM) for this consumer.
+
+        Entries idle for at least `claim_min_idle_ms` in any consumer's PEL are
+        moved to this consumer. Those delivered more than `claim_max_deliveries`
+        times are dead-lettered instead of returned.
+
+        Returns:
+            (next_start_id, batch) — `next_start_id == b"0-0"` ends the sweep
+        """
+        try:
+            next_start_id, claimed, *_ = await self.redis.xautoclaim(
+                name=self.stream_name,
+                groupname=self.consumer_group,
+                consumername=self.consumer_name,
+                min_idle_time=self.claim_min_idle_ms,
+                start_id=start_id,
+                count=self.max_batch_size,
+            )
+        except Exception as e:
+            log.error(f"{self.log_prefix} Failed to claim pending messages: {e}")
+            return b"0-0", []
+
+        # Entries trimmed from the stream while pending come back without data.
+        batch = [(msg_id, data) for msg_id, data in claimed if data]
+
+        if not batch:
+            return next_start_id, []
+
+        try:
+            pending = await self.redis.xpending_range(
+                name=self.stream_name,
+                groupname=self.consumer_group,
+                min=batch[0][0],
+                max=batch[-1][0],
+                count=len(batch),
+                consumername=self.consumer_name,
+            )
+            deliveries = {p["message_id"]: p["times_delivered"] for p in pending}
+        except Exception as e:
+            log.error(f"{self.log_prefix} Failed to read delivery counts: {e}")
+            deliveries = {}
+
+        poison = [
+            (msg_id, data)
+            for msg_id, data in batch
+            if deliveries.get(msg_id, 0) > self.claim_max_deliveries
+        ]
+
+        if poison:
+            await self.dead_letter(poison, deliveries=deliveries)
+            poison_ids = {msg_id for msg_id, _ in poison}
+            batch = [(m, d) for m, d in batch if m not in poison_ids]
+
+        self.claimed += len(batch)
+
+        if batch:
+            log.warning(
+                f"{self.log_prefix} Reclaimed pending messages",
+                stream=self.stream_name,
+                count=len(batch),
+            )
+
+        return next_start_id, batch
+
+    async def dead_letter(
+        self,
+        batch: List[Tuple[bytes, Dict[bytes, bytes]]],
+        *,
+        deliveries: Dict[bytes, int],
+    ):
+        """Copy poison messages to `<stream>:dead`, then ACK + DEL the originals."""
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for msg_id, data in batch:
+                    pipe.xadd(
+                        name=self.dead_letter_stream,
+                        fields={
+                            **data,
+                            b"origin_id": msg_id,
+                            b"origin_group": self.consumer_group.encode(),
+                            b"deliveries": str(deliveries.get(msg_id, 0)).encode(),
+                        },
+                        maxlen=MAXLEN_DEAD_LETTER,
+                        approximate=True,
+                    )
+                await pipe.execute()
+        except Exception as e:
+            log.error(f"{self.log_prefix} Failed to dead-letter messages: {e}")
+            # Leave them pending; the next sweep retries the move.
+            return
+
+        self.dead_lettered += len(batch)
+
+        log.error(
+            f"{self.log_prefix} Dead-lettered poison messages",
+            stream=self.stream_name,
+            dead_letter_stream=self.dead_letter_stream,
+            message_ids=[msg_id.decode() for msg_id, _ in batch],
+        )
+
+        await self.ack_and_delete([msg_id for msg_id, _ in batch])
 
     async def process_batch(
         self, batch: List[Tuple[bytes, Dict[bytes, bytes]]]
@@ -163,15 +351,177 @@ class StreamConsumer:
         """Process one batch. Subclasses implement deserialize/group/meter/write."""
         raise NotImplementedError
 
+    async def handle_batch(self, batch: List[Tuple[bytes, Dict[bytes, bytes]]]):
+        """Process one (lane) batch and ACK + DEL what it processed.
+
+        Subclasses that need an extra stage between processing and ACK (e.g.
+        events' webhook dispatch with skip-ack-on-failure) override this.
+        """
+        _, processed_message_ids = await self.process_batch(batch)
+
+        if processed_message_ids:
+            await self.ack_and_delete(processed_message_ids)
+
+    def shard_batch(
+        self, batch: List[Tuple[bytes, Dict[bytes, bytes]]]
+    ) -> Dict[int, List[Tuple[bytes, Dict[bytes, bytes]]]]:
+        """Split a batch onto lanes by message key, keeping stream order per lane."""
+        lanes: Dict[int, List[Tuple[bytes, Dict[bytes, bytes]]]] = {}
+
+        for msg_id, data in batch:
+            key = data.get(LANE_KEY_FIELD) or b""
+            lane = zlib.crc32(key) % self.max_lanes if key else 0
+            lanes.setdefault(lane, []).append((msg_id, data))
+
+        return lanes
+
+    async def drain_lane(self, lane: asyncio.Queue, window: asyncio.Semaphore):
+        """Handle one lane's batches strictly in order, releasing window slots."""
+        while True:
+            batch, ticket = await lane.get()
+
+            try:
+                await self.handle_batch(batch)
+            except Exception:
+                log.error(
+                    f"{self.log_prefix} Error in worker lane",
+                    exc_info=True,
+                )
+                # Messages remain pending for retry; back off like the read loop.
+                await asyncio.sleep(1)
+            finally:
+                ticket.remaining -= 1
+                if ticket.remaining == 0:
+                    self.in_flight -= 1
+                    self.processed_batches += 1
+                    window.release()
+
+    async def report_stats(self):
+        """Sample consumer-group lag/pending and log them with in-flight stats."""
+        try:
+            groups = await self.redis.xinfo_groups(self.stream_name)
+        except Exception as e:
+            log.warning(f"{self.log_prefix} Failed to read stream stats: {e}")
+            return
+
+        for group in groups:
+            name = group.get("name")
+            name = name.decode() if isinstance(name, bytes) else name
+            if name != self.consumer_group:
+                continue
+            lag = group.get("lag")
+            self.lag = int(lag) if lag is not None else None
+            self.pending = int(group.get("pending") or 0)
+
+        log.info(
+            f"{self.log_prefix} Stream stats",
+            stream=self.metric_stream,
+            consumer=self.consumer_name,
+            lag=self.lag,
+            pending=self.pending,
+            in_flight=self.in_flight,
+            max_in_flight=self.max_in_flight,
+            processed_batches=self.processed_batches,
+            claimed=self.claimed,
+            dead_lettered=self.dead_lettered,
+        )
+
+    async def _report_stats_forever(self):
+        while True:
+            await asyncio.sleep(STATS_INTERVAL_S)
+            await self.report_stats()
+
+    async def maintain(self):
+        """Periodic upkeep, see `maintenance_interval_s`."""
+
+    async def _maintain_forever(self):
+        while True:
+            try:
+                await self.maintain()
+            except Exception:
+                log.warning(f"{self.log_prefix} Maintenance failed", exc_info=True)
+            await asyncio.sleep(self.maintenance_interval_s)
+
+    def dispatch(
+        self,
+        batch: List[Tuple[bytes, Dict[bytes, bytes]]],
+        lanes: List[asyncio.Queue],
+    ):
+        """Hand a read (or reclaimed) batch to its lanes; holds one window slot."""
+        sharded = self.shard_batch(batch)
+        ticket = _BatchTicket(remaining=len(sharded))
+        self.in_flight += 1
+
+        for lane, lane_batch in sharded.items():
+            lanes[lane].put_nowait((lane_batch, ticket))
+
+    async def _claim_forever(
+        self, lanes: List[asyncio.Queue], window: asyncio.Semaphore
+    ):
+        while True:
+            await asyncio.sleep(CLAIM_INTERVAL_S)
+
+            start_id = b"0-0"
+            while True:
+                await window.acquire()
+
+                start_id, batch = await self.claim_batch(start_id)
+
+                if batch:
+                    self.dispatch(batch, lanes)
+                else:
+                    window.release()
+
+                if start_id in (b"0-0", "0-0"):
+                    break
+
+    def supervise(
+        self,
+        name: str,
+        factory: Callable[[], Awaitable[None]],
+        tasks: Set[asyncio.Task],
+    ):
+        """Run `factory()` as a task in `tasks`, restarting it whenever it stops.
+
+        Cancelling it (as `run` does on exit) stops it for good.
+        """
+        task = asyncio.create_task(factory(), name=f"{self.consumer_group}:{name}")
+        tasks.add(task)
+
+        def restart(task: asyncio.Task):
+            tasks.discard(task)
+
+            if task.cancelled():
+                return
+
+            log.error(
+                f"{self.log_prefix} Background task stopped; restarting",
+                task=name,
+                exc_info=task.exception(),
+            )
+
+            async def delayed():
+                await asyncio.sleep(RESTART_DELAY_S)
+                await factory()
+
+            self.supervise(name, delayed, tasks)
+
+        task.add_done_callback(restart)
+
     async def run(self):
         """
         Main worker loop.
 
         Flow:
-        1. Read batch via XREADGROUP
-        2. Process batch
-        3. ACK + DEL on success
-        4. On error, messages remain pending for retry
+        1. Wait for an in-flight slot, then read batch via XREADGROUP
+        2. Shard the batch onto ordered lanes
+        3. Each lane processes its part, then ACK + DEL on success
+        4. On error, messages remain pending; a periodic XAUTOCLAIM sweep
+           retries them once idle, and dead-letters repeat offenders
+
+        The reader only blocks on the in-flight window, so with
+        `max_in_flight > 1` the next batch is read while earlier batches are
+        still writing; lanes keep each project's messages in stream order.
         """
         log.info(
             f"{self.log_prefix} Starting worker",
@@ -179,23 +529,47 @@ class StreamConsumer:
             consumer_group=self.consumer_group,
             consumer=self.consumer_name,
             max_batch_size=self.max_batch_size,
+            max_in_flight=self.max_in_flight,
+            max_lanes=self.max_lanes,
+            claim_min_idle_ms=self.claim_min_idle_ms,
+            claim_max_deliveries=self.claim_max_deliveries,
         )
 
-        while True:
-            try:
-                batch = await self.read_batch()
-                if not batch:
-                    continue
+        window = asyncio.Semaphore(self.max_in_flight)
+        lanes = [asyncio.Queue() for _ in range(self.max_lanes)]
+        tasks: Set[asyncio.Task] = set()
 
-                _, processed_message_ids = await self.process_batch(batch)
-
-                if processed_message_ids:
-                    await self.ack_and_delete(processed_message_ids)
+        for index, lane in enumerate(lanes):
+            self.supervise(
+                f"lane-{index}",
+                lambda lane=lane: self.drain_lane(lane, window),
+                tasks,
+            )
+        self.supervise("stats", self._report_stats_forever, tasks)
+        self.supervise("claim", lambda: self._claim_forever(lanes, window), tasks)
+        if self.maintenance_interval_s:
+            self.supervise("maintain", self._maintain_forever, tasks)
 
-            except Exception:
-                log.error(
-                    f"{self.log_prefix} Error in worker loop",
-                    exc_info=True,
-                )
-                # Sleep before retry to avoid tight error loop
-                await asyncio.sleep(1)
+        try:
+            while True:
+                await window.acquire()
+
+                try:
+                    batch = await self.read_batch()
+                    if not batch:
+                        window.release()
+                        continue
+
+                    self.dispatch(batch, lanes)
+
+                except Exception:
+                    window.release()
+                    log.error(
+                        f"{self.log_prefix} Error in worker loop",
+                        exc_info=True,
+                    )
+                    # Sleep before retry to avoid tight error loop
+                    await asyncio.sleep(1)
+        finally:
+            for task in list(tasks):
+                task.cancel()
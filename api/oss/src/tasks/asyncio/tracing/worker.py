@@ -6,15 +6,21 @@ Keeps the same batching, grouping, and entitlements logic.
 """
 
 import asyncio
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Set, Tuple, Optional
 from uuid import UUID
 from redis.asyncio import Redis
 
+from oss.src.core.tracing.assembly import AssembledSpans, SpanKey, TraceAssembler
+from oss.src.core.tracing.interfaces import (
+    TracingIngestListenerInterface,
+    TracingWatchPublisherInterface,
+)
 from oss.src.core.tracing.service import TracingService
 from oss.src.core.tracing.dtos import OTelFlatSpan
 from oss.src.utils.logging import get_module_logger
 from oss.src.utils.common import is_ee
-from oss.src.core.tracing.streaming import deserialize_span
+from oss.src.utils.env import env
+from oss.src.core.tracing.streaming import deserialize_spans
 from oss.src.tasks.asyncio.shared.consumer import StreamConsumer
 
 log = get_module_logger(__name__)
@@ -36,15 +42,23 @@ class TracingWorker(StreamConsumer):
 
     Flow:
     1. Read batch from Redis Streams (XREADGROUP) — StreamConsumer
-    2. Deserialize spans from bytes
+    2. Deserialize span batches from bytes (one entry per ingest request)
     3. Group by organization_id → (project_id, user_id)
     4. Check entitlements per org (Layer 2 - authoritative)
-    5. Bulk create spans per project/user if allowed
-    6. ACK + DEL messages — StreamConsumer
+    5. Hold the allowed spans in the trace assembler, and release the traces
+       whose tree is whole (or waited long enough) with their ingest passes run
+    6. Bulk create the released spans per project/user
+    7. Announce the committed traces on their watch channels (if wired)
+    8. Hand the committed spans to the ingest listener (if wired)
+    9. ACK + DEL messages none of whose spans are still held — StreamConsumer;
+       the rest are ACKed when a later batch or the flush loop releases them
     """
 
     log_prefix = "[INGEST]"
 
+    # Keeps the daily `spans` partitions created ahead of the spans written.
+    maintenance_interval_s = 60 * 60
+
     def __init__(
         self,
         service: TracingService,
@@ -52,10 +66,17 @@ class TracingWorker(StreamConsumer):
         stream_name: str,
         consumer_group: str,
         consumer_name: Optional[str] = None,
-        max_batch_size: int = 50,  # 50 spans
+        max_batch_size: int = 50,  # 50 requests
         max_block_ms: int = 5000,  # 5 seconds
         max_delay_ms: int = 250,  # 250 milliseconds
         max_batch_mb: int = 50,  # 50 MB
+        max_in_flight: Optional[int] = None,
+        max_lanes: Optional[int] = None,
+        claim_min_idle_ms: Optional[int] = None,
+        claim_max_deliveries: Optional[int] = None,
+        watch_publisher: Optional[TracingWatchPublisherInterface] = None,
+        ingest_listener: Optional[TracingIngestListenerInterface] = None,
+        assembler: Optional[TraceAssembler] = None,
     ):
         super().__init__(
             redis_client=redis_client,
@@ -66,8 +87,145 @@ class TracingWorker(StreamConsumer):
             max_block_ms=max_block_ms,
             max_delay_ms=max_delay_ms,
             max_batch_mb=max_batch_mb,
+            max_in_flight=max_in_flight,
+            max_lanes=max_lanes,
+            claim_min_idle_ms=claim_min_idle_ms,
+            claim_max_deliveries=claim_max_deliveries,
         )
         self.service = service
+        self.watch_publisher = watch_publisher
+        self.ingest_listener = ingest_listener
+        self.assembler = assembler or TraceAssembler(
+            max_wait_s=env.agenta.api.tracing.assembly_max_wait_ms / 1000,
+            late_window_s=env.agenta.api.tracing.assembly_late_window_ms / 1000,
+            max_spans=env.agenta.api.tracing.assembly_max_spans,
+        )
+        # Per project, so that a trace and its late spans are written in order.
+        self._assembly_locks: Dict[UUID, asyncio.Lock] = {}
+
+    async def maintain(self):
+        await self.service.ensure_partitions()
+
+    async def release(
+        self,
+        project_id: UUID,
+        *,
+        flush: bool = False,
+    ) -> List[bytes]:
+        """Write the project's ready traces; returns the messages to ACK."""
+        lock = self._assembly_locks.setdefault(project_id, asyncio.Lock())
+
+        async with lock:
+            assembled, released_message_ids, rewritten = self.assembler.pop_ready(
+                project_ids={project_id},
+                flush=flush,
+            )
+            await self.write(assembled, rewritten=rewritten)
+
+        return released_message_ids
+
+    async def _release_forever(self):
+        # Traces that never become whole (no root, missing parents) are only
+        # released by their timeout, which no new batch may come to check.
+        while True:
+            await asyncio.sleep(self.assembler.max_wait_s)
+
+            for project_id in self.assembler.open_project_ids():
+                try:
+                    await self.ack_and_delete(await self.release(project_id))
+                except Exception:
+                    log.warning(
+                        "[INGEST] Trace release failed",
+                        project_id=str(project_id),
+                        exc_info=True,
+                    )
+
+    async def run(self):
+        tasks: Set[asyncio.Task] = set()
+        self.supervise("release", self._release_forever, tasks)
+
+        try:
+            await super().run()
+        finally:
+            for task in list(tasks):
+                task.cancel()
+
+            # Best-effort: what is not written stays pending and is reclaimed.
+            for project_id in self.assembler.open_project_ids():
+                try:
+                    await self.ack_and_delete(
+                        await self.release(project_id, flush=True)
+                    )
+                except Exception:
+                    log.warning(
+                        "[INGEST] Trace release failed on shutdown",
+                        project_id=str(project_id),
+                        exc_info=True,
+                    )
+
+    async def write(
+        self,
+        assembled: AssembledSpans,
+        *,
+        rewritten: Optional[Set[SpanKey]] = None,
+    ):
+        """Create released spans per project/user, then announce them.
+
+        Spans in `rewritten` were written before: they are announced to
+        readers as changed, but not to the ingest listener as new.
+        """
+        for (project_id, user_id), span_dtos in assembled.items():
+            try:
+                await self.service.ingest(
+                    project_id=project_id,
+                    user_id=user_id,
+                    span_dtos=span_dtos,
+                )
+
+            except Exception as e:
+                log.error(
+                    "[INGEST] Failed to create spans",
+                    project_id=str(project_id),
+                    user_id=str(user_id),
+                    error=str(e),
+                    exc_info=True,
+                )
+                # Sleep briefly to avoid hammering DB on errors
+                await asyncio.sleep(0.05)
+                continue
+
+            # Strictly post-ingest, so a reader woken by the notification finds
+            # the spans. Failures never re-drive the ingest.
+            if self.watch_publisher is not None:
+                try:
+                    await self.watch_publisher.traces_committed(
+                        project_id=str(project_id),
+                        trace_ids={str(span.trace_id) for span in span_dtos},
+                    )
+                except Exception:
+                    log.warning(
+                        "[INGEST] Watch publish failed",
+                        project_id=str(project_id),
+                    )
+
+            ingested = [
+                span
+                for span in span_dtos
+                if (project_id, span.trace_id, span.span_id) not in (rewritten or ())
+            ]
+
+            if self.ingest_listener is not None and ingested:
+                try:
+                    await self.ingest_listener.spans_ingested(
+                        project_id=project_id,
+                        span_dtos=ingested,
+                    )
+                except Exception:
+                    log.warning(
+                        "[INGEST] Ingest listener failed",
+                        project_id=str(project_id),
+                        exc_info=True,
+                    )
 
     async def process_batch(
         self, batch: List[Tuple[bytes, Dict[bytes, bytes]]]
@@ -80,13 +238,16 @@ class TracingWorker(StreamConsumer):
         messages for next batch processing.
 
         Args:
-            batch: List of (message_id, {b"data": serialized_span}) tuples
+            batch: List of (message_id, {b"data": serialized_spans}) tuples
 
         Returns:
-            Tuple of (processed_count, processed_message_ids) for ACK/DEL
+            Tuple of (processed_count, processed_message_ids) for ACK/DEL,
+            without the messages whose spans are still held by the assembler
         """
-        # Group spans by org → (project, user) (same as PR #1223)
-        spans_by_org: Dict[UUID, Dict[Tuple[UUID, UUID], List[OTelFlatSpan]]] = {}
+        # Group spans by org → (project, user), keeping the message of each
+        spans_by_org: Dict[
+            UUID, Dict[Tuple[UUID, UUID], List[Tuple[bytes, List[OTelFlatSpan]]]]
+        ] = {}
         processed_message_ids: List[bytes] = []
         batch_bytes = 0
         processed_count = 0
@@ -94,11 +255,11 @@ class TracingWorker(StreamConsumer):
         # 1. Deserialize & group by org + project/user (with size enforcement)
         for msg_id, data in batch:
             try:
-                # Extract serialized span from Redis message
-                span_bytes = data[b"data"]
+                # Extract serialized span batch from Redis message
+                spans_bytes = data[b"data"]
 
                 # Track cumulative batch size (compressed size)
-                batch_bytes += len(span_bytes)
+                batch_bytes += len(spans_bytes)
 
                 # Check if we've exceeded the batch size limit
                 if batch_bytes > self.max_batch_mb * 1024 * 1024:
@@ -110,20 +271,20 @@ class TracingWorker(StreamConsumer):
                     )
                     break
 
-                # Deserialize (handles zlib decompression)
-                msg = deserialize_span(span_bytes=span_bytes)
+                # Deserialize (handles zlib decompression, one pass per message)
+                msg = deserialize_spans(spans_bytes=spans_bytes)
 
                 # Group by org → (project, user)
                 spans_by_org.setdefault(msg.organization_id, {}).setdefault(
                     (msg.project_id, msg.user_id), []
-                ).append(msg.span_dto)
+                ).append((msg_id, msg.span_dtos))
 
                 processed_message_ids.append(msg_id)
-                processed_count += 1
+                processed_count += len(msg.span_dtos)
 
             except Exception as e:
                 log.error(
-                    f"[INGEST] Failed to deserialize span: {e}",
+                    f"[INGEST] Failed to deserialize spans: {e}",
                     msg_id=msg_id,
                 )
                 # ACK unprocessable messages to prevent PEL buildup
@@ -137,7 +298,8 @@ class TracingWorker(StreamConsumer):
             # Count root spans (delta)
             delta = sum(
                 len([s for s in spans if s.parent_id is None])
-                for spans in spans_by_proj_user.values()
+                for messages in spans_by_proj_user.values()
+                for _, spans in messages
             )
 
             meter = None
@@ -169,26 +331,36 @@ class TracingWorker(StreamConsumer):
                     # On error, drop batch to be safe
                     continue
 
-            # 3. Create spans per project/user
-            for (project_id, user_id), span_dtos in spans_by_proj_user.items():
-                try:
-                    await self.service.ingest(
+            # 3. Hold the spans until their trace is whole
+            for (project_id, user_id), messages in spans_by_proj_user.items():
+                for msg_id, span_dtos in messages:
+                    self.assembler.add(
                         project_id=project_id,
                         user_id=user_id,
                         span_dtos=span_dtos,
+                        message_id=msg_id,
                     )
 
-                except Exception as e:
-                    log.error(
-                        "[INGEST] Failed to create spans",
-                        org_id=str(organization_id),
-                        project_id=str(project_id),
-                        user_id=str(user_id),
-                        error=str(e),
-                        exc_info=True,
-                    )
-                    # Sleep briefly to avoid hammering DB on errors
-                    await asyncio.sleep(0.05)
+        # 4. Create the released spans per project/user. Messages with spans
+        # still held are ACKed once released, here or by `_release_forever`;
+        # released messages of earlier batches are ACKed with this one.
+        released_message_ids: List[bytes] = []
+        for project_id in {
+            project_id
+            for spans_by_proj_user in spans_by_org.values()
+            for project_id, _ in spans_by_proj_user
+        }:
+            released_message_ids.extend(await self.release(project_id))
+
+        processed_message_ids = [
+            msg_id
+            for msg_id in processed_message_ids
+            if not self.assembler.is_held(msg_id)
+        ]
+        acked = set(processed_message_ids)
+        processed_message_ids.extend(
+            msg_id for msg_id in released_message_ids if msg_id not in acked
+        )
 
         # Return count and message IDs for ACK/DEL
         return (processed_count, processed_message_ids)
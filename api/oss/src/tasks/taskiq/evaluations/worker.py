@@ -270,6 +270,46 @@ class EvaluationsWorker:
             log.info("[TASK] Completed process_run_from_source")
             return result
 
+        @self.broker.task(
+            task_name="evaluations.run_from_traces.process",
+            retry_on_error=False,
+            max_retries=0,
+        )
+        async def process_run_from_traces(
+            *,
+            project_id: UUID,
+            user_id: UUID,
+            #
+            run_id: UUID,
+            trace_ids: list[str],
+            newest: Optional[datetime] = None,
+            oldest: Optional[datetime] = None,
+            context: Context = TaskiqDepends(),
+        ) -> Any:
+            """Process traces pushed into a live run by the ingestion path."""
+            log.info("[TASK] Starting process_run_from_traces", run_id=str(run_id))
+            # Pushed batches hold disjoint traces: they may run side by side,
+            # unlike the scheduler's window scans.
+            try:
+                result = await self._with_job_lock(
+                    run_id,
+                    job_id=context.message.task_id or str(uuid4()),
+                    job_type="api",
+                    allow_concurrency=True,
+                    runner=lambda: self.run_processor.run_from_traces(
+                        project_id=project_id,
+                        user_id=user_id,
+                        run_id=run_id,
+                        trace_ids=trace_ids,
+                        newest=newest,
+                        oldest=oldest,
+                    ),
+                )
+            except JobLockSkippedError:
+                return None
+            log.info("[TASK] Completed process_run_from_traces", run_id=str(run_id))
+            return result
+
         @self.broker.task(
             task_name="evaluations.run_from_batch.process",
             retry_on_error=False,
@@ -350,5 +390,6 @@ class EvaluationsWorker:
 
         # Store task references for external access
         self.process_run_from_source = process_run_from_source
+        self.process_run_from_traces = process_run_from_traces
         self.process_run_from_batch = process_run_from_batch
         self.process_rerun = process_rerun
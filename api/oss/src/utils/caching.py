@@ -1,10 +1,14 @@
 from typing import Any, Type, Optional, Union
 from random import random
-from asyncio import sleep
+from asyncio import CancelledError, Task, create_task, get_running_loop, sleep
+from fnmatch import fnmatchcase
+from uuid import uuid4
 
 import orjson
 
+from cachetools import TTLCache
 from pydantic import BaseModel
+from redis.exceptions import ResponseError
 
 from oss.src.utils.logging import get_module_logger
 from oss.src.utils.env import env
@@ -13,7 +17,14 @@ from oss.src.dbs.redis.shared.engine import get_cache_engine
 log = get_module_logger(__name__)
 
 AGENTA_CACHE_TTL = 5 * 60  # 5 minutes (Layer 2) [L2]
-AGENTA_CACHE_LOCAL_TTL = 15  # 15 seconds for local in-memory cache (Layer 1) [L1]
+AGENTA_CACHE_LOCAL_TTL = env.agenta.api.caching.local_ttl  # (Layer 1) [L1]
+AGENTA_CACHE_LOCAL_MAXSIZE = env.agenta.api.caching.local_maxsize
+AGENTA_CACHE_LOCAL_NAMESPACES = frozenset(env.agenta.api.caching.local_namespaces)
+
+AGENTA_CACHE_INVALIDATION_CHANNEL = "cache:invalidate"
+AGENTA_CACHE_INVALIDATION_POLL = 0.25  # below the cache engine's socket timeout
+AGENTA_CACHE_INVALIDATION_BACKOFF = 1  # seconds before resubscribing
+AGENTA_CACHE_STATS_INTERVAL = 5 * 60  # seconds between stats log lines
 
 AGENTA_CACHE_BACKOFF_BASE = 50  # Base backoff delay in milliseconds
 AGENTA_CACHE_ATTEMPTS_MAX = 4  # Maximum number of attempts to retry cache retrieval
@@ -21,25 +32,199 @@ AGENTA_CACHE_JITTER_SPREAD = 1 / 3  # Spread of jitter in backoff
 AGENTA_CACHE_LEAKAGE_PROBABILITY = 0.05  # Probability of early leak
 AGENTA_CACHE_LOCK_TTL = 1  # TTL for cache locks
 
-AGENTA_CACHE_SCAN_BATCH_SIZE = 500
 AGENTA_CACHE_DELETE_BATCH_SIZE = 1000
+AGENTA_CACHE_TAG_PRUNE_PROBABILITY = 0.01  # Chance a write sweeps its tags
+AGENTA_CACHE_TAG_PRUNE_SAMPLE = 64  # Members checked per sweep
 
 CACHE_DEBUG = False
 CACHE_DEBUG_VALUE = False
 
-# Redis is the only active cache layer.
-# L1 in-process caching is disabled because it can serve stale data across
-# gunicorn workers after mutations invalidate Redis from a different process.
-#
-# Original L1 cache:
-# local_cache: TTLCache = TTLCache(maxsize=4096, ttl=AGENTA_CACHE_LOCAL_TTL)
-
 _cache_engine = get_cache_engine()
 
 
+# LOCAL CACHE (L1) -------------------------------------------------------------
+
+
+class _LocalCache:
+    """Process-local raw values for opted-in namespaces, in front of Redis.
+
+    Every `set_cache`/`invalidate_cache` on an L1 namespace publishes the key
+    (or pattern) on a Redis channel, and each process evicts what it holds for
+    it, so gunicorn workers never keep serving a value another worker replaced.
+    L1 is only read while this process is subscribed: on a lost subscription
+    it is cleared and bypassed until the listener is back.
+
+    Raw bytes are stored, as in Redis, so callers still get a fresh object per
+    read and cannot mutate each other's cached values.
+    """
+
+    def __init__(
+        self,
+        *,
+        namespaces: frozenset,
+        maxsize: int,
+        ttl: int,
+    ):
+        self.namespaces = namespaces
+        self.entries: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+        # Messages from this process are applied synchronously, not echoed.
+        self.origin = uuid4().hex.encode()
+        # Bumped on every eviction, so a Redis read that raced an
+        # invalidation does not backfill the value it just invalidated.
+        self.generation = 0
+        self.listening = False
+
+        self.l1_hits = 0
+        self.l1_misses = 0
+        self.l2_hits = 0
+        self.l2_misses = 0
+        self.evictions = 0
+
+        self._listener: Optional[Task] = None
+
+    def covers(self, namespace: Optional[str]) -> bool:
+        return namespace in self.namespaces
+
+    def active(self, namespace: Optional[str]) -> bool:
+        if not self.covers(namespace):
+            return False
+
+        self._ensure_listener()
+
+        return self.listening
+
+    def get(self, cache_name: str) -> Optional[bytes]:
+        raw = self.entries.get(cache_name)
+
+        if raw is None:
+            self.l1_misses += 1
+        else:
+            self.l1_hits += 1
+
+        return raw
+
+    def put(self, cache_name: str, raw: bytes, generation: int) -> None:
+        if generation == self.generation and self.listening:
+            self.entries[cache_name] = raw
+
+    def evict(self, kind: bytes, target: str) -> None:
+        self.generation += 1
+
+        if kind == b"k":
+            if self.entries.pop(target, None) is not None:
+                self.evictions += 1
+            return
+
+        for cache_name in list(self.entries.keys()):
+            if fnmatchcase(cache_name, target):
+                self.entries.pop(cache_name, None)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        self.generation += 1
+        self.entries.clear()
+
+    async def publish(self, kind: bytes, target: str) -> None:
+        self.evict(kind, target)
+
+        await _cache_engine.publish(
+            AGENTA_CACHE_INVALIDATION_CHANNEL,
+            b"|".join([self.origin, kind, target.encode()]),
+        )
+
+    def on_message(self, data: bytes) -> None:
+        origin, kind, target = data.split(b"|", 2)
+
+        if origin != self.origin:
+            self.evict(kind, target.decode())
+
+    def stats(self) -> dict:
+        return {
+            "l1_size": len(self.entries),
+            "l1_hits": self.l1_hits,
+            "l1_misses": self.l1_misses,
+            "l2_hits": self.l2_hits,
+            "l2_misses": self.l2_misses,
+            "evictions": self.evictions,
+            "listening": self.listening,
+        }
+
+    def _ensure_listener(self) -> None:
+        if self._listener is not None and not self._listener.done():
+            if self._listener.get_loop() is get_running_loop():
+                return
+
+        self.listening = False
+        self._listener = create_task(self._listen())
+
+    async def _listen(self) -> None:
+        stats_at = get_running_loop().time() + AGENTA_CACHE_STATS_INTERVAL
+
+        while True:
+            pubsub = _cache_engine.pubsub()
+            try:
+                await pubsub.subscribe(AGENTA_CACHE_INVALIDATION_CHANNEL)
+
+                # Anything cached before the subscription may have missed an
+                # invalidation.
+                self.clear()
+                self.listening = True
+
+                while True:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True,
+                        timeout=AGENTA_CACHE_INVALIDATION_POLL,
+                    )
+
+                    if message is not None and message.get("type") == "message":
+                        self.on_message(message["data"])
+
+                    if get_running_loop().time() >= stats_at:
+                        stats_at += AGENTA_CACHE_STATS_INTERVAL
+                        log.info("[cache] stats", **self.stats())
+
+            except CancelledError:
+                raise
+
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                log.warn(f"[cache] L1 invalidation listener lost: {e}")
+
+            finally:
+                self.listening = False
+                self.clear()
+                try:
+                    await pubsub.aclose()
+                except Exception:  # pylint: disable=broad-exception-caught
+                    pass
+
+            await sleep(AGENTA_CACHE_INVALIDATION_BACKOFF)
+
+
+local_cache = _LocalCache(
+    namespaces=AGENTA_CACHE_LOCAL_NAMESPACES,
+    maxsize=AGENTA_CACHE_LOCAL_MAXSIZE,
+    ttl=AGENTA_CACHE_LOCAL_TTL,
+)
+
+
+def get_cache_stats() -> dict:
+    """L1/L2 hit and miss counters for this process."""
+    return local_cache.stats()
+
+
 # HELPERS ----------------------------------------------------------------------
 
 
+def _pad(id_: Optional[str]) -> str:
+    if id_:
+        id_ = id_[-12:] if len(id_) > 12 else id_
+    else:
+        id_ = ""
+
+    return id_ + "-" * (12 - len(id_))
+
+
 def _pack(
     namespace: Optional[str] = None,
     key: Optional[Union[str, dict]] = None,
@@ -47,17 +232,8 @@ def _pack(
     user_id: Optional[str] = None,
     pattern: Optional[bool] = False,
 ) -> str:
-    if project_id:
-        project_id = project_id[-12:] if len(project_id) > 12 else project_id
-    else:
-        project_id = ""
-    project_id = project_id + "-" * (12 - len(project_id))
-
-    if user_id:
-        user_id = user_id[-12:] if len(user_id) > 12 else user_id
-    else:
-        user_id = ""
-    user_id = user_id + "-" * (12 - len(user_id))
+    project_id = _pad(project_id)
+    user_id = _pad(user_id)
 
     namespace = namespace or ("" if not pattern else "*")
 
@@ -91,29 +267,83 @@ def pack(
     )
 
 
-async def _scan(pattern: str) -> list[str]:
+def _tag(
+    namespace: Optional[str] = None,
+    project_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+) -> str:
+    """Name of the set indexing the keys of one project/user scope.
+
+    Every key written for (project, user, namespace) is added both to that
+    scope's tag and to the namespace-less tag of (project, user), which are
+    exactly the two shapes of pattern `invalidate_cache` flushes.
+    """
+    tag = f"cache:tag:p:{_pad(project_id)}:u:{_pad(user_id)}"
+
+    return f"{tag}:{namespace}" if namespace else tag
+
+
+async def _flush_tag(tag: str) -> int:
+    """UNLINK every key indexed by `tag`, then the tag itself.
+
+    The tag is first renamed aside, atomically, so keys written while the
+    flush runs land in a fresh tag instead of being dropped from the index.
+    """
+    flushing = f"{tag}:flush:{uuid4().hex}"
+
     try:
-        cursor = 0
-        keys: list[str] = []
+        await _cache_engine.rename(tag, flushing)
+    except ResponseError:  # no such key: nothing cached in this scope
+        return 0
 
-        while True:  # TODO: Really ?
-            cursor, batch = await _cache_engine.scan(
+    deleted = 0
+    cursor = 0
+
+    try:
+        while True:
+            cursor, batch = await _cache_engine.sscan(
+                flushing,
                 cursor=cursor,
-                match=pattern,
-                count=AGENTA_CACHE_SCAN_BATCH_SIZE,
+                count=AGENTA_CACHE_DELETE_BATCH_SIZE,
             )
 
-            keys.extend(batch)
+            if batch:
+                deleted += await _cache_engine.unlink(*batch)
+
+                if CACHE_DEBUG:
+                    for key in batch:
+                        log.debug(f"[cache] INVALIDATE redis_key={key}")
 
             if cursor == 0:
                 break
 
-        return keys
+    finally:
+        await _cache_engine.unlink(flushing)
 
-    except Exception as e:
-        log.error(f"[cache] SCAN ERROR: pattern={pattern} error={e}", exc_info=True)
+    return deleted
+
+
+async def _prune_tag(tag: str) -> None:
+    """Drop a sample of members whose keys already expired.
+
+    Tags outlive most of their keys (every write extends them), so without
+    this a scope that is written often but rarely invalidated would keep
+    growing with dead members.
+    """
+    members = await _cache_engine.srandmember(tag, AGENTA_CACHE_TAG_PRUNE_SAMPLE)
 
-        return []
+    if not members:
+        return
+
+    async with _cache_engine.pipeline(transaction=False) as pipe:
+        for member in members:
+            pipe.exists(member)
+        exists = await pipe.execute()
+
+    dead = [member for member, alive in zip(members, exists) if not alive]
+
+    if dead:
+        await _cache_engine.srem(tag, *dead)
 
 
 def _serialize(
@@ -170,26 +400,32 @@ async def _try_get_and_maybe_renew(
     model: Optional[Type[BaseModel]],
     is_list: Optional[bool] = False,
     ttl: Optional[int] = None,
+    local: bool = False,
 ) -> Optional[Any]:
     data = None
 
-    # Layer 1 is intentionally disabled.
-    #
-    # Original L1 read path:
-    # if cache_name in local_cache:
-    #     raw = local_cache[cache_name]
-    #     if CACHE_DEBUG:
-    #         log.debug(
-    #             "[cache] L1-HIT",
-    #             name=cache_name,
-    #             value=raw if CACHE_DEBUG_VALUE else "***",
-    #         )
-    #     return _deserialize(raw, model=model, is_list=is_list)
+    # Layer 1: Check process memory (opted-in namespaces, short TTL, ~1us)
+    if local:
+        raw = local_cache.get(cache_name)
+
+        if raw is not None:
+            if CACHE_DEBUG:
+                log.debug(
+                    "[cache] L1-HIT",
+                    name=cache_name,
+                    value=raw if CACHE_DEBUG_VALUE else "***",
+                )
+
+            return _deserialize(raw, model=model, is_list=is_list)
+
+    generation = local_cache.generation
 
     # Layer 2: Check Redis (distributed, 5min TTL, ~1ms latency)
     raw = await _cache_engine.get(cache_name)
 
     if raw is not None:
+        local_cache.l2_hits += 1
+
         if CACHE_DEBUG:
             log.debug(
                 "[cache] L2-HIT",
@@ -197,8 +433,9 @@ async def _try_get_and_maybe_renew(
                 value=raw if CACHE_DEBUG_VALUE else "***",
             )
 
-        # Original L1 backfill path:
-        # local_cache[cache_name] = raw
+        if local:
+            local_cache.put(cache_name, raw, generation)
+
         data = _deserialize(raw, model=model, is_list=is_list)
 
         if ttl is not None and ttl > 0:
@@ -210,6 +447,8 @@ async def _try_get_and_maybe_renew(
 
             await _cache_engine.expire(cache_name, ttl)
     else:
+        local_cache.l2_misses += 1
+
         if CACHE_DEBUG:
             log.debug(
                 "[cache] MISS ",
@@ -343,11 +582,31 @@ async def set_cache(
         cache_value: bytes = _serialize(value)
         cache_px = int(ttl * 1000)
 
-        # Write to Redis only.
-        #
-        # Original L1 write path:
-        # local_cache[cache_name] = cache_value
-        await _cache_engine.set(cache_name, cache_value, px=cache_px)
+        lock_name = f"lock::{cache_name}"
+        tags = (
+            _tag(namespace=namespace, project_id=project_id, user_id=user_id),
+            _tag(project_id=project_id, user_id=user_id),
+        )
+
+        # One round-trip: the value, its tag memberships, tags kept alive at
+        # least as long as their longest-lived key, and the lock release.
+        async with _cache_engine.pipeline(transaction=False) as pipe:
+            pipe.set(cache_name, cache_value, px=cache_px)
+            for tag in tags:
+                pipe.sadd(tag, cache_name)
+                pipe.pexpire(tag, cache_px, nx=True)
+                pipe.pexpire(tag, cache_px, gt=True)
+            pipe.delete(lock_name)
+            results = await pipe.execute()
+
+        if random() < AGENTA_CACHE_TAG_PRUNE_PROBABILITY:
+            for tag in tags:
+                await _prune_tag(tag)
+
+        # Other workers drop their copy; this one holds the new value.
+        if local_cache.covers(namespace):
+            await local_cache.publish(b"k", cache_name)
+            local_cache.put(cache_name, cache_value, local_cache.generation)
 
         if CACHE_DEBUG:
             log.debug(
@@ -358,9 +617,7 @@ async def set_cache(
                 else "***",
             )
 
-        lock_name = f"lock::{cache_name}"
-
-        check = await _cache_engine.delete(lock_name)
+        check = results[-1]
 
         if check:
             if CACHE_DEBUG:
@@ -415,7 +672,13 @@ async def get_cache(
             user_id=user_id,
         )
 
-        data = await _try_get_and_maybe_renew(cache_name, model, is_list, ttl)
+        data = await _try_get_and_maybe_renew(
+            cache_name,
+            model,
+            is_list,
+            ttl,
+            local=local_cache.active(namespace),
+        )
 
         if data is not None:
             return data
@@ -477,12 +740,12 @@ async def invalidate_cache(
                 user_id=user_id,
             )
 
-            # Clear from Redis.
-            #
-            # Original L1 invalidation path:
-            # local_cache.pop(cache_name, None)
+            # Clear from Redis, then from every process' L1.
             await _cache_engine.delete(cache_name)
 
+            if local_cache.covers(namespace):
+                await local_cache.publish(b"k", cache_name)
+
         else:
             cache_name = _pack(
                 namespace=namespace,
@@ -491,52 +754,22 @@ async def invalidate_cache(
                 pattern=True,
             )
 
-            keys = await _scan(cache_name)
+            # The keys matching the pattern are exactly the members of the
+            # scope's tag: a set lookup instead of a keyspace SCAN.
+            redis_keys_deleted = await _flush_tag(
+                _tag(namespace=namespace, project_id=project_id, user_id=user_id)
+            )
 
             if CACHE_DEBUG:
                 log.debug(
-                    f"[cache] INVALIDATE pattern={cache_name} redis_keys_found={len(keys)}"
+                    f"[cache] INVALIDATE pattern={cache_name} redis_keys_deleted={redis_keys_deleted}"
                 )
 
-            # Original L1 pattern invalidation path:
-            # parts = cache_name.split(":")
-            # concrete_parts = []
-            # for part in parts:
-            #     if "*" in part:
-            #         break
-            #     concrete_parts.append(part)
-            # local_prefix = ":".join(concrete_parts) + ":" if concrete_parts else ""
-            # local_keys_deleted = 0
-            #
-            # if CACHE_DEBUG:
-            #     log.debug(f"[cache] INVALIDATE local_prefix={local_prefix}")
-            #     log.debug(f"[cache] INVALIDATE local_cache has {len(local_cache)} keys")
-            #     for lk in list(local_cache.keys()):
-            #         log.debug(f"[cache] INVALIDATE local_cache_key={lk}")
-            #
-            # for local_key in list(local_cache.keys()):
-            #     if local_key.startswith(local_prefix):
-            #         local_cache.pop(local_key, None)
-            #         local_keys_deleted += 1
-            #         if CACHE_DEBUG:
-            #             log.debug(f"[cache] INVALIDATE deleted local_key={local_key}")
-            #
-            # if CACHE_DEBUG:
-            #     log.debug(f"[cache] INVALIDATE local_keys_deleted={local_keys_deleted}")
-
-            # Clear from Redis
-            redis_keys_deleted = 0
-            for i in range(0, len(keys), AGENTA_CACHE_DELETE_BATCH_SIZE):
-                batch = keys[i : i + AGENTA_CACHE_DELETE_BATCH_SIZE]
-                deleted_count = await _cache_engine.delete(*batch)
-                redis_keys_deleted += deleted_count
-
-                if CACHE_DEBUG:
-                    for key in batch:
-                        log.debug(f"[cache] INVALIDATE redis_key={key}")
-
-            if CACHE_DEBUG:
-                log.debug(f"[cache] INVALIDATE redis_keys_deleted={redis_keys_deleted}")
+            # Same pattern, evicted from every process' L1.
+            if local_cache.namespaces and (
+                namespace is None or local_cache.covers(namespace)
+            ):
+                await local_cache.publish(b"p", cache_name)
 
         if CACHE_DEBUG:
             log.debug(
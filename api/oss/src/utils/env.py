@@ -109,6 +109,18 @@ def _parse_optional_positive_int_env(name: str) -> int | None:
     return value
 
 
+def _parse_non_negative_int_env(name: str, default: int) -> int:
+    value = _parse_optional_int_env(name)
+
+    if value is None:
+        return default
+
+    if value < 0:
+        raise ValueError(f"{name} must be 0 or greater, got {value}")
+
+    return value
+
+
 def _parse_bool_env(name: str, default: bool) -> bool:
     raw = os.getenv(name)
     if raw is None:
@@ -251,6 +263,23 @@ class ApiCachingConfig(BaseModel):
         or "true"
     ).lower() in _TRUTHY
 
+    # Process-local L1 in front of Redis, opt-in per cache namespace. Entries
+    # are evicted across workers by pub/sub on every set/invalidate; the TTL
+    # bounds staleness if an invalidation is ever missed.
+    local_namespaces: List[str] = [
+        namespace.strip()
+        for namespace in (
+            os.getenv("AGENTA_CACHE_LOCAL_NAMESPACES")
+            if os.getenv("AGENTA_CACHE_LOCAL_NAMESPACES") is not None
+            else "verify_bearer_token,verify_apikey_token,check_action_access"
+        ).split(",")
+        if namespace.strip()
+    ]
+    local_maxsize: int = (
+        _parse_optional_positive_int_env("AGENTA_CACHE_LOCAL_MAXSIZE") or 4096
+    )
+    local_ttl: int = _parse_optional_positive_int_env("AGENTA_CACHE_LOCAL_TTL") or 15
+
     model_config = ConfigDict(extra="ignore")
 
 
@@ -274,11 +303,71 @@ class WorkflowsConfig(BaseModel):
     model_config = ConfigDict(extra="ignore")
 
 
+class EvaluationsConfig(BaseModel):
+    """Evaluation-runtime behavior toggles."""
+
+    # Live runs are fed from the span ingestion path: the spans worker matches
+    # freshly ingested root spans against the live runs of their project and
+    # dispatches them right away. The once-a-minute refresh still validates and
+    # closes live runs, but only scans their windows when this is OFF.
+    live_push_enabled: bool = _parse_bool_env(
+        "AGENTA_EVALUATIONS_LIVE_PUSH_ENABLED", True
+    )
+    # How long the spans worker trusts its index of live runs before reloading
+    # it, i.e. how late a newly started live run may see its first traces.
+    live_index_ttl_seconds: int = (
+        _parse_optional_positive_int_env("AGENTA_EVALUATIONS_LIVE_INDEX_TTL_SECONDS")
+        or 15
+    )
+
+    model_config = ConfigDict(extra="ignore")
+
+
+class TracingConfig(BaseModel):
+    """Tracing storage behavior toggles."""
+
+    # Ingest also maintains per-minute/per-hour rollups of the default analytics
+    # specs, and analytics requests for those specs read them instead of the
+    # spans. OFF stops both; as rollups then miss what is ingested meanwhile,
+    # empty span_rollups_coverage before turning it back ON.
+    rollups_enabled: bool = _parse_bool_env("AGENTA_TRACING_ROLLUPS_ENABLED", True)
+
+    # The spans worker holds the spans of a trace split across ingest batches
+    # until its tree is whole (or this long), so cumulative metrics cover all of
+    # it; spans arriving up to the late window after re-aggregate their
+    # ancestors (0 disables the late window). Max spans bounds both the held
+    # and the remembered spans.
+    assembly_max_wait_ms: int = (
+        _parse_optional_positive_int_env("AGENTA_TRACING_ASSEMBLY_MAX_WAIT_MS")
+        or 5 * 1000
+    )
+    assembly_late_window_ms: int = _parse_non_negative_int_env(
+        "AGENTA_TRACING_ASSEMBLY_LATE_WINDOW_MS", 60 * 1000
+    )
+    assembly_max_spans: int = (
+        _parse_optional_positive_int_env("AGENTA_TRACING_ASSEMBLY_MAX_SPANS") or 100_000
+    )
+
+    # Span exports read from a server-side cursor, this many spans per fetch.
+    export_batch_size: int = (
+        _parse_optional_positive_int_env("AGENTA_TRACING_EXPORT_BATCH_SIZE") or 1_000
+    )
+
+    # Span costs for models litellm does not price (custom, self-hosted), or
+    # prices differently: {"<model>": {"input_cost_per_token": ...,
+    # "output_cost_per_token": ..., "cache_read_input_token_cost": ...}}.
+    model_prices: dict | None = _load_json_env_dict("AGENTA_TRACING_MODEL_PRICES")
+
+    model_config = ConfigDict(extra="ignore")
+
+
 class ApiConfig(BaseModel):
     """Agenta API sub-namespace."""
 
     caching: ApiCachingConfig = ApiCachingConfig()
     workflows: WorkflowsConfig = WorkflowsConfig()
+    evaluations: EvaluationsConfig = EvaluationsConfig()
+    tracing: TracingConfig = TracingConfig()
 
     model_config = ConfigDict(extra="ignore")
 
@@ -357,6 +446,18 @@ class OTLPConfig(BaseModel):
         os.getenv("AGENTA_OTLP_MAX_BATCH_BYTES") or str(10 * 1024 * 1024)
     )
 
+    # Decoding (decompress, protobuf parse, span mapping, trace passes) runs
+    # off the event loop: on a worker thread by default, or on a pool of this
+    # many processes when set. Requests beyond max_pending decodes in flight
+    # per API process are rejected with 503 + Retry-After.
+    decode_processes: int = _parse_optional_int_env("AGENTA_OTLP_DECODE_PROCESSES") or 0
+    decode_max_pending: int = (
+        _parse_optional_positive_int_env("AGENTA_OTLP_DECODE_MAX_PENDING") or 16
+    )
+    retry_after_seconds: int = (
+        _parse_optional_positive_int_env("AGENTA_OTLP_RETRY_AFTER_SECONDS") or 1
+    )
+
     model_config = ConfigDict(extra="ignore")
 
 
@@ -429,6 +530,29 @@ class WorkersConfig(BaseModel):
     streams: list[str] = _load_csv_env_list("AGENTA_WORKER_STREAMS")
     queues: list[str] = _load_csv_env_list("AGENTA_WORKER_QUEUES")
 
+    # StreamConsumer pipelining: how many read batches may be in flight at once
+    # (1 = strictly serial read/process/ack), and how many ordered lanes the
+    # per-project groups of a batch are sharded onto.
+    streams_max_in_flight: int = (
+        _parse_optional_positive_int_env("AGENTA_WORKER_STREAMS_MAX_IN_FLIGHT") or 2
+    )
+    streams_max_lanes: int = (
+        _parse_optional_positive_int_env("AGENTA_WORKER_STREAMS_MAX_LANES") or 4
+    )
+
+    # StreamConsumer reclamation: entries pending longer than this in any
+    # consumer's PEL (crashed/redeployed replica) are XAUTOCLAIMed and retried;
+    # after this many deliveries they go to the `<stream>:dead` stream instead.
+    # 10 minutes matches the taskiq brokers' idle_timeout.
+    streams_claim_min_idle_ms: int = (
+        _parse_optional_positive_int_env("AGENTA_WORKER_STREAMS_CLAIM_MIN_IDLE_MS")
+        or 10 * 60 * 1000
+    )
+    streams_claim_max_deliveries: int = (
+        _parse_optional_positive_int_env("AGENTA_WORKER_STREAMS_CLAIM_MAX_DELIVERIES")
+        or 5
+    )
+
     model_config = ConfigDict(extra="ignore")
 
 
@@ -0,0 +1,34 @@
+import os
+import socket
+from functools import lru_cache
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from oss.src.utils.env import env
+
+
+@lru_cache(maxsize=1)
+def _postgres_reachable() -> bool:
+    """Probe the configured tracing Postgres once per session.
+
+    Same contract as the sessions integration conftest, against the tracing
+    URI. A `?host=/socket/dir` URI is probed through its Unix socket instead.
+    """
+    parsed = urlparse(env.postgres.uri_tracing)
+    port = parsed.port or 5432
+    socket_dir = (parse_qs(parsed.query).get("host") or [""])[0]
+    if socket_dir.startswith("/"):
+        return os.path.exists(os.path.join(socket_dir, f".s.PGSQL.{port}"))
+    host = parsed.hostname or "postgres"
+    try:
+        with socket.create_connection((host, port), timeout=0.5):
+            return True
+    except OSError:
+        return False
+
+
+@pytest.fixture(autouse=True)
+def _skip_when_postgres_unreachable(request):
+    if request.node.get_closest_marker("integration") and not _postgres_reachable():
+        pytest.skip("Postgres not reachable — skipping tracing DAO integration tests")
@@ -0,0 +1,129 @@
+"""Database-backed coverage for session and user lists across directory coverage.
+
+A page is read off the directory for activity since the project's coverage and
+off the spans before it. These tests run both parts against a migrated tracing
+database, with sessions on both sides of the coverage start, so that an id
+dropped or listed twice where the parts meet fails here.
+"""
+
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+
+import oss.src.dbs.postgres.shared.engine as engine_module
+from oss.src.core.shared.dtos import Windowing
+from oss.src.core.tracing.dtos import OTelFlatSpan
+from oss.src.core.tracing.utils.trees import prepare_span_dtos
+from oss.src.dbs.postgres.shared.engine import get_analytics_engine
+from oss.src.dbs.postgres.tracing.dao import TracingDAO
+
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.integration]
+
+
+@pytest.fixture(autouse=True)
+async def _fresh_engine_per_test():
+    engine_module._analytics_engine = None
+    yield
+    if engine_module._analytics_engine is not None:
+        await engine_module._analytics_engine.close()
+        engine_module._analytics_engine = None
+
+
+async def _ingest_sessions(dao, *, project_id, now):
+    # s-0 is the latest, s-2 the earliest, a minute apart.
+    await dao.ingest(
+        project_id=project_id,
+        user_id=uuid4(),
+        span_dtos=prepare_span_dtos(
+            [
+                OTelFlatSpan(
+                    trace_id=str(uuid4()),
+                    span_id=str(uuid4()),
+                    span_name="root",
+                    start_time=now - timedelta(minutes=idx),
+                    end_time=now - timedelta(minutes=idx) + timedelta(seconds=1),
+                    attributes={
+                        "ag": {
+                            "type": {"trace": "invocation", "span": "workflow"},
+                            "session": {"id": f"s-{idx}"},
+                            "user": {"id": f"u-{idx}"},
+                        }
+                    },
+                )
+                for idx in range(3)
+            ]
+        ),
+    )
+
+
+async def _set_coverage(engine, *, project_id, since):
+    async with engine.session() as session:
+        await session.execute(
+            text(
+                "UPDATE directories_coverage SET since = :since "
+                "WHERE project_id = :project_id"
+            ),
+            {"since": since, "project_id": project_id},
+        )
+
+
+async def test_sessions_are_listed_before_the_coverage_starts():
+    # Right after the first ingest, the coverage starts in the future: every
+    # session is read off the spans, though the directory has them already.
+    engine = get_analytics_engine()
+    dao = TracingDAO(engine=engine)
+    project_id = uuid4()
+
+    await _ingest_sessions(dao, project_id=project_id, now=datetime.now(timezone.utc))
+
+    for realtime in (None, True):
+        ids, _ = await dao.sessions(
+            project_id=project_id,
+            realtime=realtime,
+            windowing=Windowing(limit=10),
+        )
+        assert ids == ["s-0", "s-1", "s-2"]
+
+    ids, _ = await dao.users(project_id=project_id, windowing=Windowing(limit=10))
+    assert ids == ["u-0", "u-1", "u-2"]
+
+
+@pytest.mark.parametrize("order", ["descending", "ascending"])
+async def test_sessions_straddling_the_coverage_are_listed_once(order):
+    engine = get_analytics_engine()
+    dao = TracingDAO(engine=engine)
+    project_id = uuid4()
+    now = datetime.now(timezone.utc)
+
+    await _ingest_sessions(dao, project_id=project_id, now=now)
+    # s-0 and s-1 are off the directory, s-2 off the spans.
+    await _set_coverage(
+        engine, project_id=project_id, since=now - timedelta(seconds=90)
+    )
+
+    expected = ["s-0", "s-1", "s-2"]
+    if order == "ascending":
+        expected.reverse()
+
+    ids, _ = await dao.sessions(
+        project_id=project_id,
+        windowing=Windowing(limit=10, order=order),
+    )
+    assert ids == expected
+
+    # Paged across the parts, one id at a time.
+    paged, cursor = [], None
+    for _ in range(len(expected) + 1):
+        windowing = Windowing(limit=1, order=order)
+        if cursor is not None:
+            bound = "newest" if order == "descending" else "oldest"
+            windowing = windowing.model_copy(update={bound: cursor})
+        page, cursor = await dao.sessions(project_id=project_id, windowing=windowing)
+        if not page:
+            break
+        paged += page
+
+    assert paged == expected
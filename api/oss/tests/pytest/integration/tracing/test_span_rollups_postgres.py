@@ -0,0 +1,119 @@
+"""Database-backed coverage for analytics served from the span rollups.
+
+The rollup unit tests aggregate rows in Python and stub the session, so the
+statement in `ROLLUPS_QUERY_SQL` never reaches Postgres there. These tests
+ingest root spans into a migrated tracing database and check that the rollups
+answer what the spans answer, once the project's coverage has started.
+"""
+
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+
+import oss.src.dbs.postgres.shared.engine as engine_module
+from oss.src.core.shared.dtos import Windowing
+from oss.src.core.tracing.dtos import (
+    DEFAULT_ANALYTICS_SPECS,
+    MetricSpec,
+    OTelFlatSpan,
+    TracingQuery,
+)
+from oss.src.dbs.postgres.shared.engine import get_analytics_engine
+from oss.src.dbs.postgres.tracing.dao import TracingDAO
+
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.integration]
+
+SPECS = [MetricSpec(type=t, path=p) for t, p in DEFAULT_ANALYTICS_SPECS]
+
+
+@pytest.fixture(autouse=True)
+async def _fresh_engine_per_test():
+    engine_module._analytics_engine = None
+    yield
+    if engine_module._analytics_engine is not None:
+        await engine_module._analytics_engine.close()
+        engine_module._analytics_engine = None
+
+
+def _root(*, start_time, duration, trace_type):
+    return OTelFlatSpan(
+        trace_id=str(uuid4()),
+        span_id=str(uuid4()),
+        span_name="root",
+        start_time=start_time,
+        end_time=start_time + timedelta(seconds=duration),
+        attributes={
+            "ag": {
+                "type": {"trace": trace_type, "span": "workflow"},
+                "metrics": {
+                    "duration": {"cumulative": duration},
+                    "errors": {"cumulative": 0},
+                },
+            }
+        },
+    )
+
+
+@pytest.mark.parametrize("interval", [1, 60, 24 * 60])
+async def test_rollups_answer_as_the_spans_do_once_coverage_has_started(interval):
+    engine = get_analytics_engine()
+    dao = TracingDAO(engine=engine)
+    project_id, user_id = uuid4(), uuid4()
+    now = datetime.now(timezone.utc)
+    durations = [0.5, 1.25, 2.0, 4.5]
+
+    await dao.ingest(
+        project_id=project_id,
+        user_id=user_id,
+        span_dtos=[
+            _root(
+                start_time=now,
+                duration=duration,
+                trace_type="annotation" if idx % 2 else "invocation",
+            )
+            for idx, duration in enumerate(durations)
+        ],
+    )
+
+    newest = now.replace(second=0, microsecond=0) + timedelta(minutes=2)
+    oldest = newest - timedelta(days=1)
+    # Rollups are the whole window: coverage started before it.
+    async with engine.session() as session:
+        await session.execute(
+            text(
+                "UPDATE span_rollups_coverage SET since = :since "
+                "WHERE project_id = :project_id"
+            ),
+            {"since": oldest - timedelta(days=1), "project_id": project_id},
+        )
+
+    query = TracingQuery(
+        windowing=Windowing(oldest=oldest, newest=newest, interval=interval)
+    )
+
+    from_rollups = await dao._analytics_from_rollups(
+        project_id=project_id, query=query, specs=SPECS
+    )
+    from_spans = await dao._analytics_from_spans(
+        project_id=project_id, query=query, specs=SPECS
+    )
+
+    assert from_rollups is not None
+    assert [b.timestamp for b in from_rollups if b.metrics] == [
+        b.timestamp for b in from_spans if b.metrics
+    ]
+    [rolled] = [b for b in from_rollups if b.metrics]
+    [spanned] = [b for b in from_spans if b.metrics]
+
+    path = "attributes.ag.metrics.duration.cumulative"
+    for key in ("count", "sum", "min", "max"):
+        assert rolled.metrics[path][key] == pytest.approx(spanned.metrics[path][key])
+    assert rolled.metrics[path]["count"] == len(durations)
+
+    path = "attributes.ag.type.trace"
+    assert {f["value"]: f["count"] for f in rolled.metrics[path]["freq"]} == {
+        f["value"]: f["count"] for f in spanned.metrics[path]["freq"]
+    }
@@ -0,0 +1,89 @@
+"""Database-backed coverage for span identity on the partitioned `spans` table.
+
+`start_time` is part of the primary key since spans are partitioned on it, and
+an annotation edit re-ingests its span without one (it defaults to now). These
+tests run the real DAO upsert against a migrated tracing database, so an edit
+that lands as a second row, or in another partition, fails here rather than
+passing a compiled-SQL check.
+"""
+
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+
+import oss.src.dbs.postgres.shared.engine as engine_module
+from oss.src.core.tracing.dtos import OTelFlatSpan
+from oss.src.dbs.postgres.shared.engine import get_analytics_engine
+from oss.src.dbs.postgres.tracing.dao import TracingDAO
+
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.integration]
+
+
+@pytest.fixture(autouse=True)
+async def _fresh_engine_per_test():
+    engine_module._analytics_engine = None
+    yield
+    if engine_module._analytics_engine is not None:
+        await engine_module._analytics_engine.close()
+        engine_module._analytics_engine = None
+
+
+async def _stored(engine, *, project_id, trace_id, span_id):
+    async with engine.session() as session:
+        result = await session.execute(
+            text(
+                "SELECT start_time, attributes FROM spans "
+                "WHERE project_id = :project_id "
+                "AND trace_id = :trace_id AND span_id = :span_id"
+            ),
+            {"project_id": project_id, "trace_id": trace_id, "span_id": span_id},
+        )
+        return result.all()
+
+
+async def test_editing_an_annotation_updates_its_span_in_place():
+    engine = get_analytics_engine()
+    dao = TracingDAO(engine=engine)
+    project_id, user_id = uuid4(), uuid4()
+    trace_id, span_id = uuid4(), uuid4()
+    # Days back, so the edit's default start_time falls in another partition.
+    start_time = datetime.now(timezone.utc).replace(microsecond=0) - timedelta(days=3)
+
+    await dao.ingest(
+        project_id=project_id,
+        user_id=user_id,
+        span_dtos=[
+            OTelFlatSpan(
+                trace_id=str(trace_id),
+                span_id=str(span_id),
+                start_time=start_time,
+                end_time=start_time + timedelta(seconds=1),
+                attributes={"ag": {"data": {"outputs": {"score": 1}}}},
+            )
+        ],
+    )
+
+    # As `AnnotationsService._edit_annotation` builds it: no start_time.
+    links = await dao.ingest(
+        project_id=project_id,
+        user_id=user_id,
+        span_dtos=[
+            OTelFlatSpan(
+                trace_id=str(trace_id),
+                span_id=str(span_id),
+                attributes={"ag": {"data": {"outputs": {"score": 2}}}},
+            )
+        ],
+    )
+
+    assert len(links) == 1
+    rows = await _stored(
+        engine, project_id=project_id, trace_id=trace_id, span_id=span_id
+    )
+    assert len(rows) == 1
+    stored_start_time, attributes = rows[0]
+    assert stored_start_time == start_time
+    assert attributes["ag"]["data"]["outputs"] == {"score": 2}
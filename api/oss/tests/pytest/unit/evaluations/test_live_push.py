@@ -0,0 +1,406 @@
+"""Live runs fed from the span ingestion path.
+
+The spans worker hands each committed project batch to the live-evaluations
+dispatcher, which matches the batch's root spans against an index of the live
+runs (by project, trace type and references) and enqueues one task per run and
+minute bucket. The task re-matches the trace ids against the run's full query.
+"""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+
+from oss.src.core.evaluations import service as evaluations_service_module
+from oss.src.core.evaluations.live import (
+    LiveEvaluationsDispatcher,
+    LiveRunsIndex,
+    bucket_of,
+    compile_live_keys,
+)
+from oss.src.core.evaluations.runtime.runner import TaskiqEvaluationTaskRunner
+from oss.src.core.evaluations.runtime.sources import SourceResolution
+from oss.src.core.evaluations.service import EvaluationsService
+from oss.src.core.evaluations.types import (
+    EvaluationRun,
+    EvaluationRunData,
+    EvaluationRunDataStep,
+    EvaluationRunFlags,
+)
+from oss.src.core.shared.dtos import Reference
+from oss.src.core.tracing.dtos import (
+    Condition,
+    Filtering,
+    ListOperator,
+    OTelFlatSpan,
+    Windowing,
+)
+from oss.src.core.tracing.interfaces import TracingIngestListenerInterface
+from oss.src.core.tracing.streaming import serialize_spans
+from oss.src.tasks.asyncio.tracing.worker import TracingWorker
+
+
+def _filtering(*conditions):
+    return Filtering(conditions=list(conditions))
+
+
+def _invocations(*references):
+    conditions = [Condition(field="trace_type", value="invocation")]
+    if references:
+        conditions.append(
+            Condition(
+                field="references",
+                operator=ListOperator.IN,
+                value=[{"id": str(reference)} for reference in references],
+            )
+        )
+    return _filtering(*conditions)
+
+
+def _live_run(*, query_revision_id):
+    return EvaluationRun(
+        id=uuid4(),
+        created_by_id=uuid4(),
+        flags=EvaluationRunFlags(is_live=True, is_active=True),
+        data=EvaluationRunData(
+            steps=[
+                EvaluationRunDataStep(
+                    key="query-main",
+                    type="input",
+                    origin="custom",
+                    references={"query_revision": Reference(id=query_revision_id)},
+                )
+            ]
+        ),
+    )
+
+
+def _index(*, live_runs, filterings, ttl=60):
+    evaluations_service = SimpleNamespace(
+        fetch_live_runs=AsyncMock(return_value=live_runs)
+    )
+
+    async def fetch_query_revision(*, project_id, query_revision_ref):
+        return SimpleNamespace(
+            id=query_revision_ref.id,
+            data=SimpleNamespace(filtering=filterings[query_revision_ref.id]),
+        )
+
+    queries_service = SimpleNamespace(
+        fetch_query_revision=AsyncMock(side_effect=fetch_query_revision)
+    )
+
+    index = LiveRunsIndex(
+        evaluations_service=evaluations_service,
+        queries_service=queries_service,
+        ttl=ttl,
+    )
+    return index, evaluations_service, queries_service
+
+
+def _span(
+    *,
+    trace_id=None,
+    parent_id=None,
+    trace_type="invocation",
+    references=None,
+    start_time=None,
+):
+    start_time = start_time or datetime.now(timezone.utc)
+    return OTelFlatSpan(
+        trace_id=trace_id or uuid4().hex,
+        span_id=uuid4().hex[16:],
+        parent_id=parent_id,
+        trace_type=trace_type,
+        span_name="span",
+        start_time=start_time,
+        end_time=start_time,
+        references=[{"id": str(reference)} for reference in references or []],
+    )
+
+
+def test_keys_come_from_top_level_trace_type_and_references():
+    application_id = uuid4()
+
+    keys = compile_live_keys(_invocations(application_id))
+
+    assert keys.trace_types == frozenset({"invocation"})
+    assert keys.reference_ids == frozenset({str(application_id)})
+
+    # Nested or OR filters are left to the exact match in the task.
+    assert compile_live_keys(
+        Filtering(operator="or", conditions=[Condition(field="trace_type")])
+    ) == (None, None)
+    assert compile_live_keys(_filtering(_invocations(application_id))) == (
+        None,
+        None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_index_matches_root_spans_by_project_trace_type_and_references():
+    project_id = uuid4()
+    application_a, application_b = uuid4(), uuid4()
+    revision_a, revision_b = uuid4(), uuid4()
+    run_a = _live_run(query_revision_id=revision_a)
+    run_b = _live_run(query_revision_id=revision_b)
+
+    index, _, _ = _index(
+        live_runs=[(project_id, run_a), (project_id, run_b)],
+        filterings={
+            revision_a: _invocations(application_a),
+            revision_b: _invocations(),
+        },
+    )
+
+    root_a = _span(references=[application_a])
+    root_other = _span(references=[application_b])
+    child_only = _span(parent_id=uuid4().hex[16:], references=[application_a])
+    annotation = _span(trace_type="annotation", references=[application_a])
+
+    matches = await index.match(
+        project_id=project_id,
+        span_dtos=[root_a, root_other, child_only, annotation],
+    )
+
+    assert set(matches) == {run_a.id, run_b.id}
+    assert matches[run_a.id][1] == [root_a]
+    assert matches[run_b.id][1] == [root_a, root_other]
+    assert matches[run_a.id][0].user_id == run_a.created_by_id
+
+    assert await index.match(project_id=uuid4(), span_dtos=[root_a]) == {}
+
+
+@pytest.mark.asyncio
+async def test_index_reloads_after_its_ttl_and_keeps_query_revisions():
+    project_id = uuid4()
+    revision_id = uuid4()
+    run = _live_run(query_revision_id=revision_id)
+
+    index, evaluations_service, queries_service = _index(
+        live_runs=[(project_id, run)],
+        filterings={revision_id: _invocations()},
+    )
+
+    await index.match(project_id=project_id, span_dtos=[_span()])
+    await index.match(project_id=project_id, span_dtos=[_span()])
+
+    assert evaluations_service.fetch_live_runs.await_count == 1
+
+    index.ttl = 0
+    await index.match(project_id=project_id, span_dtos=[_span()])
+
+    assert evaluations_service.fetch_live_runs.await_count == 2
+    # Revisions are immutable: the one loaded by id is not fetched again.
+    assert queries_service.fetch_query_revision.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_enqueues_one_task_per_run_and_minute_bucket():
+    project_id = uuid4()
+    revision_id = uuid4()
+    run = _live_run(query_revision_id=revision_id)
+    index, _, _ = _index(
+        live_runs=[(project_id, run)],
+        filterings={revision_id: _invocations()},
+    )
+
+    early = _span(start_time=datetime(2025, 1, 1, 12, 0, 5, tzinfo=timezone.utc))
+    early_too = _span(start_time=datetime(2025, 1, 1, 12, 0, 55, tzinfo=timezone.utc))
+    late = _span(start_time=datetime(2025, 1, 1, 12, 1, 0, tzinfo=timezone.utc))
+
+    worker = SimpleNamespace(process_run_from_traces=SimpleNamespace(kiq=AsyncMock()))
+    dispatcher = LiveEvaluationsDispatcher(
+        index=index,
+        evaluations_task_runner=TaskiqEvaluationTaskRunner(worker=worker),
+    )
+
+    assert isinstance(dispatcher, TracingIngestListenerInterface)
+
+    await dispatcher.spans_ingested(
+        project_id=project_id,
+        span_dtos=[early, early_too, late],
+    )
+
+    calls = worker.process_run_from_traces.kiq.await_args_list
+    assert [call.kwargs for call in calls] == [
+        dict(
+            project_id=project_id,
+            user_id=run.created_by_id,
+            run_id=run.id,
+            trace_ids=[str(early.trace_id), str(early_too.trace_id)],
+            newest=datetime(2025, 1, 1, 12, 1, tzinfo=timezone.utc),
+            oldest=datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc),
+        ),
+        dict(
+            project_id=project_id,
+            user_id=run.created_by_id,
+            run_id=run.id,
+            trace_ids=[str(late.trace_id)],
+            newest=datetime(2025, 1, 1, 12, 2, tzinfo=timezone.utc),
+            oldest=datetime(2025, 1, 1, 12, 1, tzinfo=timezone.utc),
+        ),
+    ]
+
+
+def test_buckets_align_to_the_interval():
+    start_time = datetime(2025, 1, 1, 12, 7, 30, tzinfo=timezone.utc)
+
+    assert bucket_of(start_time) == datetime(2025, 1, 1, 12, 7, tzinfo=timezone.utc)
+    assert bucket_of(start_time, interval=5) == datetime(
+        2025, 1, 1, 12, 5, tzinfo=timezone.utc
+    )
+
+
+@pytest.mark.asyncio
+async def test_worker_hands_committed_spans_to_the_listener_best_effort():
+    project_id = uuid4()
+    journal: list = []
+
+    service = AsyncMock()
+    service.ingest = AsyncMock(side_effect=lambda **_: journal.append("ingest"))
+
+    class _Listener:
+        def __init__(self, *, fail=False):
+            self.fail = fail
+
+        async def spans_ingested(self, *, project_id, span_dtos):
+            journal.append(("listen", project_id, len(span_dtos)))
+            if self.fail:
+                raise RuntimeError("broker down")
+
+    spans = [_span(), _span()]
+    message = serialize_spans(
+        organization_id=uuid4(),
+        project_id=project_id,
+        user_id=uuid4(),
+        span_dtos=spans,
+    )
+
+    for fail in (False, True):
+        journal.clear()
+        worker = TracingWorker(
+            service=service,
+            redis_client=None,
+            stream_name="streams:spans",
+            consumer_group="worker-spans",
+            ingest_listener=_Listener(fail=fail),
+        )
+
+        processed, ids = await worker.process_batch([(b"1-0", {b"data": message})])
+
+        assert (processed, ids) == (2, [b"1-0"])
+        assert journal == ["ingest", ("listen", project_id, 2)]
+
+
+@pytest.mark.asyncio
+async def test_pushed_trace_ids_narrow_the_query_and_drop_the_window():
+    class DummyTracingService:
+        def __init__(self):
+            self.query = None
+
+        async def query_traces(self, *, project_id, query):
+            self.query = query
+            return []
+
+    tracing_service = DummyTracingService()
+    query_filtering = _invocations()
+
+    await SourceResolution(
+        tracing_service=tracing_service,
+    ).resolve_live_query_traces(
+        project_id=uuid4(),
+        query_revisions={
+            "query-main": SimpleNamespace(
+                data=SimpleNamespace(
+                    filtering=query_filtering,
+                    windowing=Windowing(rate=0.5),
+                )
+            ),
+        },
+        newest=datetime(2025, 1, 1, 12, 1, tzinfo=timezone.utc),
+        oldest=datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc),
+        trace_ids=["trace-1", "trace-2", "trace-1"],
+    )
+
+    ids_condition, nested = tracing_service.query.filtering.conditions
+    assert ids_condition.field == "trace_id"
+    assert ids_condition.value == ["trace-1", "trace-2"]
+    assert nested is query_filtering
+
+    windowing = tracing_service.query.windowing
+    assert windowing.oldest == datetime(1970, 1, 1, tzinfo=timezone.utc)
+    assert windowing.newest is None
+    assert windowing.rate == 0.5
+
+
+@pytest.mark.asyncio
+async def test_refresh_runs_leaves_live_runs_to_the_push_path(monkeypatch):
+    project_id = uuid4()
+    run = _live_run(query_revision_id=uuid4())
+
+    service = EvaluationsService.__new__(EvaluationsService)
+    service.fetch_live_runs = AsyncMock(return_value=[(project_id, run)])
+    service._is_live_run_valid = AsyncMock(return_value=True)
+    service._ensure_human_annotation_queue = AsyncMock()
+    service.evaluations_task_runner = SimpleNamespace(
+        process_run_from_source=AsyncMock()
+    )
+
+    timestamp = datetime(2025, 1, 1, 12, 3, tzinfo=timezone.utc)
+
+    for enabled, dispatches in ((True, 0), (False, 1)):
+        monkeypatch.setattr(
+            evaluations_service_module.env.agenta.api.evaluations,
+            "live_push_enabled",
+            enabled,
+        )
+        service.evaluations_task_runner.process_run_from_source.reset_mock()
+
+        assert await service.refresh_runs(timestamp=timestamp)
+
+        # Live runs are still validated and get their annotation queue.
+        service._ensure_human_annotation_queue.assert_awaited()
+        assert (
+            service.evaluations_task_runner.process_run_from_source.await_count
+            == dispatches
+        )
+
+
+@pytest.mark.asyncio
+async def test_refresh_runs_reconciles_a_lagged_window_with_push_enabled(
+    monkeypatch,
+):
+    project_id = uuid4()
+    run = _live_run(query_revision_id=uuid4())
+
+    service = EvaluationsService.__new__(EvaluationsService)
+    service.fetch_live_runs = AsyncMock(return_value=[(project_id, run)])
+    service._is_live_run_valid = AsyncMock(return_value=True)
+    service._ensure_human_annotation_queue = AsyncMock()
+    service.evaluations_task_runner = SimpleNamespace(
+        process_run_from_source=AsyncMock()
+    )
+    monkeypatch.setattr(
+        evaluations_service_module.env.agenta.api.evaluations,
+        "live_push_enabled",
+        True,
+    )
+
+    # Every LIVE_RECONCILE_INTERVAL minutes the tick scans the window that
+    # closed LIVE_RECONCILE_LAG minutes ago.
+    assert await service.refresh_runs(
+        timestamp=datetime(2025, 1, 1, 12, 10, tzinfo=timezone.utc)
+    )
+
+    dispatch = service.evaluations_task_runner.process_run_from_source
+    dispatch.assert_awaited_once()
+    assert dispatch.await_args.kwargs["run_id"] == run.id
+    assert dispatch.await_args.kwargs["oldest"] == datetime(
+        2025, 1, 1, 11, 55, tzinfo=timezone.utc
+    )
+    assert dispatch.await_args.kwargs["newest"] == datetime(
+        2025, 1, 1, 12, 5, tzinfo=timezone.utc
+    )
@@ -0,0 +1,387 @@
+"""
+Scenario metrics keep mergeable partials (`core/evaluations/sketches.py`) next
+to their data, and run-level / temporal metrics merge them instead of running
+the trace analytics over every result again.
+
+The sketch tests check the finalized statistics against the definitions the
+analytics use (`percentile_cont`, `width_bucket` histograms, ordered frequency
+tables). The service tests build a bare `EvaluationsService` with its reads and
+writes stubbed, and assert on what it stores.
+"""
+
+import random
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+
+from oss.src.core.evaluations.service import (
+    EvaluationsService,
+    METRICS_PARTIALS_KEY,
+)
+from oss.src.core.evaluations.sketches import (
+    DIGEST_COMPRESSION,
+    build_partial,
+    extract_value,
+    finalize_partial,
+    merge_partials,
+)
+from oss.src.core.evaluations.types import (
+    EvaluationMetrics,
+    EvaluationResult,
+    EvaluationRun,
+    EvaluationRunData,
+    EvaluationRunDataStep,
+    EvaluationScenario,
+)
+from oss.src.core.tracing.dtos import MetricSpec, MetricType
+from oss.src.dbs.postgres.tracing.utils import PERCENTILES_KEYS, PERCENTILES_VALUES
+
+
+def _percentile_cont(values, fraction):
+    ordered = sorted(values)
+    rank = fraction * (len(ordered) - 1)
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+# -- sketches ----------------------------------------------------------------
+
+
+def test_continuous_partial_matches_exact_statistics():
+    values = [3, 1.5, 7, 7, 2, 10, 4.25, 0]
+
+    metrics = finalize_partial(
+        build_partial(metric_type="numeric/continuous", values=values)
+    )
+
+    assert metrics["count"] == len(values)
+    assert metrics["sum"] == sum(values)
+    assert metrics["mean"] == sum(values) / len(values)
+    assert metrics["min"] == 0 and metrics["max"] == 10 and metrics["range"] == 10
+    for key, fraction in zip(PERCENTILES_KEYS, PERCENTILES_VALUES):
+        assert metrics["pcts"][key] == pytest.approx(_percentile_cont(values, fraction))
+    assert sum(bin["count"] for bin in metrics["hist"]) == len(values)
+    assert metrics["hist"][0]["interval"][0] == 0
+    assert metrics["hist"][-1]["interval"][1] == 10
+
+
+def test_histogram_bins_like_width_bucket():
+    metrics = finalize_partial(
+        build_partial(metric_type="numeric/continuous", values=[1, 2, 3, 4])
+    )
+
+    # ceil(sqrt(4)) = 2 bins over [1, 4]; the max lands in the last bin.
+    assert [(h["count"], h["interval"]) for h in metrics["hist"]] == [
+        (2, [1, 2.5]),
+        (2, [2.5, 4]),
+    ]
+    assert [h["density"] for h in metrics["hist"]] == [0.5, 0.5]
+
+
+def test_merged_partials_finalize_like_one_partial():
+    rng = random.Random(7)
+    values = [rng.uniform(-5, 50) for _ in range(60)]
+    chunks = [values[:10], values[10:11], values[11:45], values[45:]]
+
+    merged = merge_partials(
+        [build_partial(metric_type="numeric/continuous", values=c) for c in chunks]
+    )
+    whole = build_partial(metric_type="numeric/continuous", values=values)
+
+    merged_metrics, whole_metrics = finalize_partial(merged), finalize_partial(whole)
+
+    assert merged_metrics["pcts"] == pytest.approx(whole_metrics["pcts"])
+    assert merged_metrics["hist"] == whole_metrics["hist"]
+    for key in ("count", "sum", "mean", "min", "max"):
+        assert merged_metrics[key] == pytest.approx(whole_metrics[key])
+
+
+def test_digest_stays_bounded_and_close_on_many_values():
+    rng = random.Random(11)
+    values = [rng.expovariate(1.0) for _ in range(5000)]
+    chunks = [values[i : i + 100] for i in range(0, len(values), 100)]
+
+    merged = merge_partials(
+        [build_partial(metric_type="numeric/continuous", values=c) for c in chunks]
+    )
+    metrics = finalize_partial(merged)
+
+    assert len(merged["digest"]) <= DIGEST_COMPRESSION
+    assert metrics["count"] == len(values)
+    assert metrics["min"] == min(values) and metrics["max"] == max(values)
+    assert metrics["pcts"]["p50"] == pytest.approx(
+        _percentile_cont(values, 0.5), rel=0.02
+    )
+    assert metrics["pcts"]["p99"] == pytest.approx(
+        _percentile_cont(values, 0.99), rel=0.05
+    )
+    assert sum(bin["count"] for bin in metrics["hist"]) == len(values)
+
+
+def test_frequency_types_merge_exactly():
+    categories = merge_partials(
+        [
+            build_partial(metric_type="categorical/single", values=["b", "a", 3]),
+            build_partial(metric_type="categorical/single", values=["a", "c", None]),
+        ]
+    )
+    labels = build_partial(
+        metric_type="categorical/multiple", values=[["x", "y"], ["y", 1], "z"]
+    )
+    flags = merge_partials(
+        [
+            build_partial(metric_type="binary", values=[True, 1]),
+            build_partial(metric_type="binary", values=[True, False]),
+        ]
+    )
+    scores = build_partial(metric_type="numeric/discrete", values=[1, 0, 1, 1])
+
+    assert finalize_partial(categories) == {
+        "type": "categorical/single",
+        "count": 4,
+        "freq": [
+            {"value": "a", "count": 2, "density": 0.5},
+            {"value": "b", "count": 1, "density": 0.25},
+            {"value": "c", "count": 1, "density": 0.25},
+        ],
+        "uniq": ["a", "b", "c"],
+    }
+    assert finalize_partial(labels)["count"] == 3
+    assert finalize_partial(labels)["uniq"] == ["y", "x"]
+    assert finalize_partial(flags)["freq"] == [
+        {"value": True, "count": 2, "density": 0.66667},
+        {"value": False, "count": 1, "density": 0.33333},
+    ]
+    assert finalize_partial(scores)["pcts"]["p50"] == 1.0
+    assert finalize_partial(scores)["uniq"] == [1, 0]
+
+
+def test_partial_of_unmatched_values_is_none():
+    assert build_partial(metric_type="numeric/continuous", values=["1", None]) is None
+    assert build_partial(metric_type="*", values=[1]) is None
+    assert finalize_partial(None) is None
+
+
+def test_extract_value_follows_attribute_paths():
+    attributes = {"ag": {"data": {"outputs": {"score": 0.5, "tags": ["a", "b"]}}}}
+
+    assert extract_value(attributes, "attributes.ag.data.outputs.score") == 0.5
+    assert extract_value(attributes, "ag.data.outputs.tags.1") == "b"
+    assert extract_value(attributes, "attributes.ag.data.missing.score") is None
+
+
+def test_histogram_honours_spec_options():
+    partial = build_partial(metric_type="numeric/continuous", values=[-1, 1, 2, 9])
+
+    metrics = finalize_partial(
+        partial,
+        MetricSpec(type=MetricType.NUMERIC_CONTINUOUS, vmin=0, vmax=10, bins=5),
+    )
+
+    # Below vmin is out of the histogram; above vmax folds into the last bin.
+    assert [h["count"] for h in metrics["hist"]] == [1, 1, 0, 0, 1]
+
+
+# -- service -----------------------------------------------------------------
+
+_SCORE = "attributes.ag.data.outputs.score"
+
+
+def _service():
+    service = object.__new__(EvaluationsService)
+    service.tracing_service = SimpleNamespace(query=AsyncMock())
+    service.set_metrics = AsyncMock(side_effect=lambda **kw: kw["metrics"])
+    service._refresh_metrics = AsyncMock(return_value=["recomputed"])
+    service.fetch_run = AsyncMock(return_value=_run())
+    service.query_results = AsyncMock(return_value=[])
+    return service
+
+
+def _run():
+    return EvaluationRun(
+        id=uuid4(),
+        data=EvaluationRunData(
+            steps=[
+                EvaluationRunDataStep(
+                    key="judge",
+                    type="annotation",
+                    origin="auto",
+                    references={},
+                )
+            ]
+        ),
+    )
+
+
+@pytest.mark.asyncio
+async def test_scenarios_refresh_reads_once_and_stores_partials():
+    service = _service()
+    run = _run()
+    scenario_a, scenario_b = uuid4(), uuid4()
+    traces = {uuid4().hex: score for score in (1.0, 3.0, 8.0)}
+    trace_a1, trace_a2, trace_b = list(traces)
+
+    service.fetch_run = AsyncMock(return_value=run)
+    service.query_results = AsyncMock(
+        return_value=[
+            EvaluationResult(
+                run_id=run.id, scenario_id=scenario, step_key="judge", trace_id=trace
+            )
+            for scenario, trace in (
+                (scenario_a, trace_a1),
+                (scenario_a, trace_a2),
+                (scenario_b, trace_b),
+            )
+        ]
+    )
+    service._resolve_steps_specs = AsyncMock(
+        return_value={
+            "judge": [MetricSpec(type=MetricType.NUMERIC_CONTINUOUS, path=_SCORE)]
+        }
+    )
+    service.tracing_service.query.return_value = [
+        SimpleNamespace(
+            trace_id=trace,
+            attributes={"ag": {"data": {"outputs": {"score": score}}}},
+        )
+        for trace, score in traces.items()
+    ]
+
+    stored = await service._refresh_scenarios_metrics(
+        project_id=uuid4(),
+        user_id=uuid4(),
+        run_id=run.id,
+        scenario_ids=[scenario_a, scenario_b],
+    )
+
+    assert service.query_results.await_count == 1
+    assert service.tracing_service.query.await_count == 1
+    assert service.set_metrics.await_count == 1
+    assert [metrics.scenario_id for metrics in stored] == [scenario_a, scenario_b]
+    assert stored[0].data["judge"][_SCORE]["sum"] == 4.0
+    assert stored[1].data["judge"][_SCORE]["count"] == 1
+    assert stored[0].meta[METRICS_PARTIALS_KEY]["judge"][_SCORE]["count"] == 2
+
+
+def _scenario_metrics(scenario_id, values):
+    return EvaluationMetrics(
+        run_id=uuid4(),
+        scenario_id=scenario_id,
+        data={},
+        meta={
+            METRICS_PARTIALS_KEY: {
+                "judge": {
+                    _SCORE: build_partial(
+                        metric_type="numeric/continuous", values=values
+                    )
+                }
+            }
+        },
+    )
+
+
+@pytest.mark.asyncio
+async def test_run_metrics_merge_scenario_partials():
+    service = _service()
+    service.query_metrics = AsyncMock(
+        return_value=[
+            _scenario_metrics(uuid4(), [1.0, 3.0]),
+            _scenario_metrics(uuid4(), [8.0]),
+        ]
+    )
+
+    stored = await service._refresh_merged_metrics(
+        project_id=uuid4(), user_id=uuid4(), run_id=uuid4()
+    )
+
+    assert service._refresh_metrics.await_count == 0
+    assert stored[0].scenario_id is None
+    assert stored[0].data["judge"][_SCORE]["count"] == 3
+    assert stored[0].data["judge"][_SCORE]["pcts"]["p50"] == 3.0
+
+
+@pytest.mark.asyncio
+async def test_run_metrics_recompute_without_partials():
+    service = _service()
+    legacy = EvaluationMetrics(run_id=uuid4(), scenario_id=uuid4(), data={"x": {}})
+    service.query_metrics = AsyncMock(
+        return_value=[_scenario_metrics(uuid4(), [1.0]), legacy]
+    )
+
+    stored = await service._refresh_merged_metrics(
+        project_id=uuid4(), user_id=uuid4(), run_id=uuid4()
+    )
+
+    assert stored == ["recomputed"]
+    assert service.set_metrics.await_count == 0
+
+
+@pytest.mark.asyncio
+async def test_run_metrics_recompute_when_a_traced_scenario_has_no_metrics():
+    service = _service()
+    refreshed, unrefreshed = uuid4(), uuid4()
+    service.query_metrics = AsyncMock(
+        return_value=[_scenario_metrics(refreshed, [1.0])]
+    )
+    service.query_results = AsyncMock(
+        return_value=[
+            EvaluationResult(
+                run_id=uuid4(), scenario_id=scenario, step_key="judge", trace_id=trace
+            )
+            for scenario, trace in (
+                (refreshed, uuid4().hex),
+                (unrefreshed, uuid4().hex),
+            )
+        ]
+    )
+
+    stored = await service._refresh_merged_metrics(
+        project_id=uuid4(), user_id=uuid4(), run_id=uuid4()
+    )
+
+    assert stored == ["recomputed"]
+    assert service.query_results.await_args.kwargs["result"].step_keys == ["judge"]
+    assert service.set_metrics.await_count == 0
+
+
+@pytest.mark.asyncio
+async def test_temporal_metrics_merge_each_bucket_scenarios():
+    service = _service()
+    run_id = uuid4()
+    early, late = (
+        EvaluationScenario(id=uuid4(), run_id=run_id, timestamp=ts, interval=60)
+        for ts in ("2026-01-01T00:00:00Z", "2026-01-01T01:00:00Z")
+    )
+    service.query_scenarios = AsyncMock(return_value=[early, late])
+    service.query_metrics = AsyncMock(
+        side_effect=lambda **kw: [
+            _scenario_metrics(scenario_id, [2.0])
+            for scenario_id in kw["metric"].scenario_ids
+        ]
+    )
+    empty = early.timestamp.replace(hour=2)
+
+    stored = await service._refresh_merged_metrics(
+        project_id=uuid4(),
+        user_id=uuid4(),
+        run_id=run_id,
+        timestamps=[early.timestamp, late.timestamp, empty],
+        interval=60,
+    )
+
+    assert service.query_scenarios.await_count == 1
+    assert [
+        kw.kwargs["metric"].scenario_ids for kw in service.query_metrics.await_args_list
+    ] == [
+        [early.id],
+        [late.id],
+    ]
+    assert [metrics.timestamp for metrics in stored[:2]] == [
+        early.timestamp,
+        late.timestamp,
+    ]
+    # A bucket without scenarios falls back to the trace analytics.
+    assert stored[2] == "recomputed"
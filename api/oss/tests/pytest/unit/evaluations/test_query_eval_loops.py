@@ -192,12 +192,11 @@ async def test_run_query_source_marks_human_steps_pending(monkeypatch):
         return_value=[SimpleNamespace(id=scenario_id, tags=None, meta=None)]
     )
     set_results = AsyncMock(return_value=[SimpleNamespace(id=uuid4())])
-    edit_scenario = AsyncMock(
-        side_effect=lambda **kwargs: SimpleNamespace(
-            id=kwargs["scenario"].id,
-            tags=kwargs["scenario"].tags,
-            meta=kwargs["scenario"].meta,
-        )
+    edit_scenarios = AsyncMock(
+        side_effect=lambda **kwargs: [
+            SimpleNamespace(id=scenario.id, tags=scenario.tags, meta=scenario.meta)
+            for scenario in kwargs["scenarios"]
+        ]
     )
     edit_run = AsyncMock()
     refresh_metrics = AsyncMock()
@@ -207,7 +206,7 @@ async def test_run_query_source_marks_human_steps_pending(monkeypatch):
         fetch_run=fetch_run,
         create_scenarios=create_scenarios,
         set_results=set_results,
-        edit_scenario=edit_scenario,
+        edit_scenarios=edit_scenarios,
         edit_run=edit_run,
         refresh_metrics=refresh_metrics,
         query_results=query_results,
@@ -273,14 +272,13 @@ async def test_run_query_source_marks_human_steps_pending(monkeypatch):
     assert "query-live" in logged_step_keys
 
     # The human annotation step is PENDING (the backend never executes it).
-    scenario_statuses = {
-        call_args.kwargs["scenario"].status
-        for call_args in edit_scenario.await_args_list
-    }
-    assert all(
-        isinstance(call_args.kwargs["scenario"], EvaluationScenarioEdit)
-        for call_args in edit_scenario.await_args_list
-    )
+    edited = [
+        scenario
+        for call_args in edit_scenarios.await_args_list
+        for scenario in call_args.kwargs["scenarios"]
+    ]
+    scenario_statuses = {scenario.status for scenario in edited}
+    assert all(isinstance(scenario, EvaluationScenarioEdit) for scenario in edited)
     assert EvaluationStatus.PENDING in scenario_statuses
     # Human-only live tick produced no auto results -> no metric refresh, and a
     # live run is never finalized.
@@ -462,3 +460,91 @@ async def test_run_query_source_live_run_not_finalized_on_error(monkeypatch):
 
     # live runs are never finalized on error — the scheduler keeps polling.
     edit_run.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_run_query_source_live_skips_bound_traces_and_buckets_by_minute(
+    monkeypatch,
+):
+    """A reconciliation window re-finds pushed traces and spans many minutes."""
+    from datetime import datetime, timezone
+
+    project_id, user_id = uuid4(), uuid4()
+    run = EvaluationRun(
+        id=uuid4(),
+        flags=EvaluationRunFlags(has_queries=True, is_live=True, is_active=True),
+        status=EvaluationStatus.RUNNING,
+        data=EvaluationRunData(
+            steps=[
+                EvaluationRunDataStep(
+                    key="query-live",
+                    type="input",
+                    origin="custom",
+                    references={"query_revision": Reference(id=uuid4())},
+                ),
+            ]
+        ),
+    )
+
+    def _item(trace_id, minute):
+        start_time = datetime(2025, 1, 1, 12, minute, 30, tzinfo=timezone.utc)
+        return run_module.ResolvedSourceItem(
+            kind="trace",
+            step_key="query-live",
+            trace_id=str(trace_id),
+            trace=SimpleNamespace(
+                trace_id=str(trace_id),
+                spans={"root": SimpleNamespace(start_time=start_time)},
+            ),
+        )
+
+    pushed, missed_1, missed_2 = uuid4(), uuid4(), uuid4()
+    monkeypatch.setattr(
+        SourceResolution,
+        "resolve_query_source_items",
+        AsyncMock(
+            return_value={
+                "query-live": [
+                    _item(pushed, 1),
+                    _item(missed_1, 3),
+                    _item(missed_2, 3),
+                ]
+            }
+        ),
+    )
+    query_results = AsyncMock(
+        return_value=[SimpleNamespace(step_key="query-live", trace_id=str(pushed))]
+    )
+    processor = run_module.RunProcessor(
+        evaluations_service=SimpleNamespace(query_results=query_results),
+        tracing_service=SimpleNamespace(),
+        testcases_service=SimpleNamespace(),
+        workflows_service=SimpleNamespace(),
+        testsets_service=SimpleNamespace(),
+        queries_service=SimpleNamespace(),
+    )
+    processor._mint_and_bind = AsyncMock(return_value=[])
+    processor._execute_bindings = AsyncMock()
+
+    await processor._run_query_source(
+        project_id=project_id,
+        user_id=user_id,
+        run=run,
+        newest=datetime(2025, 1, 1, 12, 10, tzinfo=timezone.utc),
+        oldest=datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc),
+        use_windowing=False,
+    )
+
+    assert set(query_results.await_args.kwargs["result"].trace_ids) == {
+        pushed,
+        missed_1,
+        missed_2,
+    }
+    processor._mint_and_bind.assert_awaited_once()
+    kwargs = processor._mint_and_bind.await_args.kwargs
+    assert [item.trace_id for item in kwargs["source_items"]] == [
+        str(missed_1),
+        str(missed_2),
+    ]
+    assert kwargs["timestamp"] == datetime(2025, 1, 1, 12, 3, tzinfo=timezone.utc)
+    assert kwargs["interval"] == 1
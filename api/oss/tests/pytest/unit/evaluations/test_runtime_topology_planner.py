@@ -2395,3 +2395,75 @@ async def test_backend_slice_processor_distinguishes_fill_missing_and_force(
     )
     assert force.created == 1
     sdk_loop.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_source_slice_writes_cells_and_statuses_behind_in_bulk(monkeypatch):
+    """Cells are written in one bulk call before the metric refresh reads them,
+    and statuses still buffered are written when the slice fails."""
+    project_id = uuid4()
+    user_id = uuid4()
+    run_id = uuid4()
+    scenario = SimpleNamespace(id=uuid4(), flags=None, tags=None, meta=None)
+    journal = []
+
+    async def set_results(*, project_id, user_id, results):
+        journal.append(("set_results", [result.repeat_idx for result in results]))
+        return results
+
+    async def edit_scenarios(*, project_id, user_id, scenarios):
+        journal.append(("edit_scenarios", [s.status for s in scenarios]))
+        return scenarios
+
+    async def refresh_metrics(**kwargs):
+        journal.append(("refresh_metrics", kwargs["scenario_id"]))
+
+    async def sdk_loop(*, set_results, edit_scenario, refresh_metrics, **kwargs):
+        for repeat_idx in (0, 1):
+            await set_results.set(
+                cell=SDKPlannedCell(
+                    run_id=run_id,
+                    scenario_id=scenario.id,
+                    step_key="evaluator-auto",
+                    step_type="annotation",
+                    step_origin="auto",
+                    repeat_idx=repeat_idx,
+                    status=SDKEvaluationStatus.SUCCESS,
+                )
+            )
+        await refresh_metrics(run_id=run_id, scenario_id=scenario.id)
+        await edit_scenario(scenario=scenario, status=SDKEvaluationStatus.SUCCESS)
+        raise RuntimeError("slice failed")
+
+    monkeypatch.setattr(
+        source_slice_tasks, "sdk_process_evaluation_source_slice", sdk_loop
+    )
+    processor = source_slice_tasks.APISliceProcessor(
+        evaluations_service=SimpleNamespace(
+            set_results=set_results,
+            edit_scenarios=edit_scenarios,
+        ),
+        tracing_service=None,
+        testcases_service=None,
+        workflows_service=None,
+    )
+
+    with pytest.raises(RuntimeError, match="slice failed"):
+        await processor._run_sdk_source_slice(
+            project_id=project_id,
+            user_id=user_id,
+            run=SimpleNamespace(id=run_id, data=None, flags=None),
+            steps=[],
+            source_items=[],
+            revisions={},
+            runners={},
+            create_scenario=AsyncMock(),
+            refresh_metrics=refresh_metrics,
+            should_set_pending=False,
+        )
+
+    assert journal == [
+        ("set_results", [0, 1]),
+        ("refresh_metrics", scenario.id),
+        ("edit_scenarios", [EvaluationStatus.SUCCESS]),
+    ]
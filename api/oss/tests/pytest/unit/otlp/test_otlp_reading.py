@@ -0,0 +1,115 @@
+"""Unit tests for the streaming OTLP body reader.
+
+Bodies are fed as async chunk iterators, the way Starlette's `request.stream()`
+yields them, so the per-chunk size cap can be asserted on inflated output
+without a server.
+"""
+
+import gzip
+import zlib
+
+import pytest
+
+from oss.src.apis.fastapi.otlp.utils.reading import (
+    OTLPBodyInvalid,
+    OTLPBodyTooLarge,
+    OTLPUnsupportedEncoding,
+    is_otlp_json,
+    read_otlp_body,
+)
+
+
+async def _chunks(data: bytes, size: int = 1024):
+    for i in range(0, len(data), size):
+        yield data[i : i + size]
+
+
+@pytest.mark.asyncio
+async def test_reads_identity_body():
+    body = await read_otlp_body(
+        _chunks(b"x" * 5000), content_encoding=None, max_bytes=10_000
+    )
+
+    assert body == b"x" * 5000
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "encoding,compress",
+    [("gzip", gzip.compress), ("deflate", zlib.compress)],
+)
+async def test_inflates_declared_encoding(encoding, compress):
+    payload = b"span" * 10_000
+
+    body = await read_otlp_body(
+        _chunks(compress(payload)), content_encoding=encoding, max_bytes=100_000
+    )
+
+    assert body == payload
+
+
+@pytest.mark.asyncio
+async def test_sniffs_undeclared_gzip():
+    payload = b"span" * 1000
+
+    body = await read_otlp_body(
+        _chunks(gzip.compress(payload)), content_encoding=None, max_bytes=100_000
+    )
+
+    assert body == payload
+
+
+@pytest.mark.asyncio
+async def test_rejects_zip_bomb_before_inflating_it():
+    # ~100 KB compressed, 100 MB inflated.
+    bomb = gzip.compress(b"\0" * (100 * 1024 * 1024))
+    inflated = []
+
+    async def _tracking_chunks():
+        async for chunk in _chunks(bomb):
+            inflated.append(len(chunk))
+            yield chunk
+
+    with pytest.raises(OTLPBodyTooLarge):
+        await read_otlp_body(
+            _tracking_chunks(), content_encoding="gzip", max_bytes=1024 * 1024
+        )
+
+    # Rejected within the first compressed chunks, not at the end of the body.
+    assert sum(inflated) < len(bomb) // 10
+
+
+@pytest.mark.asyncio
+async def test_rejects_oversized_compressed_stream():
+    with pytest.raises(OTLPBodyTooLarge):
+        await read_otlp_body(
+            _chunks(b"x" * 5000), content_encoding=None, max_bytes=4096
+        )
+
+
+@pytest.mark.asyncio
+async def test_rejects_truncated_and_corrupt_bodies():
+    compressed = gzip.compress(b"span" * 1000)
+
+    with pytest.raises(OTLPBodyInvalid):
+        await read_otlp_body(
+            _chunks(compressed[:-20]), content_encoding="gzip", max_bytes=100_000
+        )
+
+    with pytest.raises(OTLPBodyInvalid):
+        await read_otlp_body(
+            _chunks(b"not gzip at all"), content_encoding="gzip", max_bytes=100_000
+        )
+
+
+@pytest.mark.asyncio
+async def test_rejects_unsupported_encoding():
+    with pytest.raises(OTLPUnsupportedEncoding):
+        await read_otlp_body(_chunks(b"x"), content_encoding="br", max_bytes=10)
+
+
+def test_is_otlp_json():
+    assert is_otlp_json("application/json")
+    assert is_otlp_json("Application/JSON; charset=utf-8")
+    assert not is_otlp_json("application/x-protobuf")
+    assert not is_otlp_json(None)
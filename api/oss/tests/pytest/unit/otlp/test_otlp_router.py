@@ -1,22 +1,34 @@
+import asyncio
+import threading
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
-from oss.src.apis.fastapi.otlp.router import OTLPRouter
+from oss.src.apis.fastapi.otlp.router import OTLP_RETRY_AFTER_SECONDS, OTLPRouter
+from oss.src.apis.fastapi.otlp.utils.decoding import (
+    OTLPDecoder,
+    OTLPDecoderSaturated,
+)
 
 
 class _DummyRequest:
-    def __init__(self, body: bytes):
+    def __init__(self, body: bytes, headers=None):
         self._body = body
+        self.headers = headers or {}
         self.state = SimpleNamespace(
             project_id="11111111-1111-1111-1111-111111111111",
             organization_id="22222222-2222-2222-2222-222222222222",
             user_id="33333333-3333-3333-3333-333333333333",
         )
 
-    async def body(self):
-        return self._body
+    async def stream(self):
+        self.body_read = True
+        yield self._body
+
+
+async def _allow_access(*args, **kwargs):
+    return True
 
 
 @pytest.mark.asyncio
@@ -26,7 +38,7 @@ async def test_otlp_ingest_continues_when_one_span_parse_fails(monkeypatch):
     router = OTLPRouter(tracing_service=tracing_service)
 
     monkeypatch.setattr(
-        "oss.src.apis.fastapi.otlp.router.parse_otlp_stream",
+        "oss.src.apis.fastapi.otlp.utils.decoding.parse_otlp_stream",
         lambda _stream: ["good", "bad"],
     )
 
@@ -36,7 +48,7 @@ async def test_otlp_ingest_continues_when_one_span_parse_fails(monkeypatch):
         return {"span": otel_span}
 
     monkeypatch.setattr(
-        "oss.src.apis.fastapi.otlp.router.parse_from_otel_span_dto",
+        "oss.src.apis.fastapi.otlp.utils.decoding.parse_from_otel_span_dto",
         _parse_from_otel_span_dto,
     )
 
@@ -55,4 +67,179 @@ async def test_otlp_ingest_continues_when_one_span_parse_fails(monkeypatch):
     assert response.status_code == 200
     tracing_service.ingest_span_dtos.assert_awaited_once()
     call_kwargs = tracing_service.ingest_span_dtos.await_args.kwargs
+    # Published as decoded: the ingest passes run in the worker, on whole traces.
     assert call_kwargs["span_dtos"] == [{"span": "good"}]
+
+
+@pytest.mark.asyncio
+async def test_otlp_ingest_sheds_load_when_decoder_is_saturated(monkeypatch):
+    tracing_service = MagicMock()
+    tracing_service.ingest_span_dtos = AsyncMock()
+    decoder = OTLPDecoder(max_pending=1)
+    decoder.pending = 1
+    router = OTLPRouter(tracing_service=tracing_service, decoder=decoder)
+
+    monkeypatch.setattr(
+        "oss.src.apis.fastapi.otlp.router.check_action_access",
+        _allow_access,
+        raising=False,
+    )
+
+    request = _DummyRequest(body=b"otlp")
+    response = await router.otlp_ingest(request)
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == str(OTLP_RETRY_AFTER_SECONDS)
+    # Rejected before the body is buffered.
+    assert not hasattr(request, "body_read")
+    assert decoder.rejected == 1
+    tracing_service.ingest_span_dtos.assert_not_awaited()
+
+
+class _SlowRequest(_DummyRequest):
+    def __init__(self, body: bytes, sent: asyncio.Event):
+        super().__init__(body)
+        self._sent = sent
+
+    async def stream(self):
+        await self._sent.wait()
+        yield self._body
+
+
+@pytest.mark.asyncio
+async def test_otlp_ingest_counts_bodies_being_read_toward_the_limit(monkeypatch):
+    tracing_service = MagicMock()
+    tracing_service.ingest_span_dtos = AsyncMock()
+    decoder = OTLPDecoder(max_pending=1)
+    router = OTLPRouter(tracing_service=tracing_service, decoder=decoder)
+
+    monkeypatch.setattr(
+        "oss.src.apis.fastapi.otlp.router.check_action_access",
+        _allow_access,
+        raising=False,
+    )
+    monkeypatch.setattr(
+        "oss.src.apis.fastapi.otlp.utils.decoding.parse_otlp_stream",
+        lambda _stream: [],
+    )
+
+    sent = asyncio.Event()
+    slow = asyncio.create_task(router.otlp_ingest(_SlowRequest(b"otlp", sent)))
+    while not decoder.pending:
+        await asyncio.sleep(0.001)
+
+    # A slow upload holds its slot while its body is still coming in.
+    request = _DummyRequest(body=b"otlp")
+    response = await router.otlp_ingest(request)
+    assert response.status_code == 503
+    assert not hasattr(request, "body_read")
+
+    sent.set()
+    assert (await slow).status_code == 200
+    assert decoder.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_decoder_runs_off_loop_and_bounds_pending(monkeypatch):
+    release = threading.Event()
+    decode_threads = []
+
+    def _blocking_parse(_stream):
+        decode_threads.append(threading.get_ident())
+        release.wait(timeout=5)
+        return []
+
+    monkeypatch.setattr(
+        "oss.src.apis.fastapi.otlp.utils.decoding.parse_otlp_stream",
+        _blocking_parse,
+    )
+
+    decoder = OTLPDecoder(max_pending=1)
+    first = asyncio.create_task(decoder.decode(b"otlp"))
+    try:
+        # The loop keeps running while the first decode is blocked.
+        while not decode_threads:
+            await asyncio.sleep(0.001)
+        assert decode_threads[0] != threading.get_ident()
+        assert decoder.saturated
+
+        with pytest.raises(OTLPDecoderSaturated):
+            await decoder.decode(b"otlp")
+        assert decoder.rejected == 1
+    finally:
+        release.set()
+
+    decoded = await first
+    assert decoded.otel_span_count == 0
+    assert decoder.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_otlp_ingest_answers_json_requests_in_json(monkeypatch):
+    tracing_service = MagicMock()
+    tracing_service.ingest_span_dtos = AsyncMock()
+    router = OTLPRouter(tracing_service=tracing_service)
+
+    monkeypatch.setattr(
+        "oss.src.apis.fastapi.otlp.router.check_action_access",
+        _allow_access,
+        raising=False,
+    )
+
+    response = await router.otlp_ingest(
+        _DummyRequest(
+            body=b'{"resourceSpans": []}',
+            headers={"content-type": "application/json; charset=utf-8"},
+        )
+    )
+
+    assert response.status_code == 200
+    assert response.media_type == "application/json"
+    assert response.body == b"{}"
+
+
+@pytest.mark.asyncio
+async def test_otlp_ingest_rejects_unsupported_content_encoding(monkeypatch):
+    router = OTLPRouter(tracing_service=MagicMock())
+
+    monkeypatch.setattr(
+        "oss.src.apis.fastapi.otlp.router.check_action_access",
+        _allow_access,
+        raising=False,
+    )
+
+    response = await router.otlp_ingest(
+        _DummyRequest(body=b"otlp", headers={"content-encoding": "br"})
+    )
+
+    assert response.status_code == 415
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "body",
+    [
+        b'{"resourceSpans": [',
+        b"[]",
+        b'{"resourceSpans": [{"scopeSpans": [{"spans": [{"traceId": "zz"}]}]}]}',
+        b'{"resourceSpans": [{"scopeSpans": [{"spans": [{"startTimeUnixNano": "soon"}]}]}]}',
+    ],
+)
+async def test_otlp_ingest_rejects_malformed_json_as_a_bad_request(monkeypatch, body):
+    tracing_service = MagicMock()
+    tracing_service.ingest_span_dtos = AsyncMock()
+    router = OTLPRouter(tracing_service=tracing_service)
+
+    monkeypatch.setattr(
+        "oss.src.apis.fastapi.otlp.router.check_action_access",
+        _allow_access,
+        raising=False,
+    )
+
+    response = await router.otlp_ingest(
+        _DummyRequest(body=body, headers={"content-type": "application/json"})
+    )
+
+    assert response.status_code == 400
+    assert response.media_type == "application/json"
+    tracing_service.ingest_span_dtos.assert_not_awaited()
@@ -2,7 +2,10 @@ from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import (
     ExportTraceServiceRequest,
 )
 
-from oss.src.apis.fastapi.otlp.opentelemetry.otlp import parse_otlp_stream
+from oss.src.apis.fastapi.otlp.opentelemetry.otlp import (
+    parse_otlp_json,
+    parse_otlp_stream,
+)
 
 
 def _build_otlp_batch_with_one_malformed_span() -> bytes:
@@ -36,3 +39,45 @@ def test_parse_otlp_stream_skips_malformed_span_and_returns_remaining():
 
     assert len(spans) == 1
     assert spans[0].name == "good-span"
+
+
+def test_parse_otlp_json_reads_hex_ids_and_camel_case_fields():
+    otlp_json = b"""{
+      "resourceSpans": [{
+        "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": "web"}}]},
+        "scopeSpans": [{
+          "scope": {"name": "browser"},
+          "spans": [{
+            "traceId": "5b8efff798038103d269b633813fc60c",
+            "spanId": "eee19b7ec3c1b174",
+            "parentSpanId": "eee19b7ec3c1b173",
+            "name": "fetch",
+            "kind": 3,
+            "startTimeUnixNano": "1544712660000000000",
+            "endTimeUnixNano": "1544712661000000000",
+            "attributes": [
+              {"key": "http.status_code", "value": {"intValue": "200"}},
+              {"key": "ok", "value": {"boolValue": true}}
+            ],
+            "links": [{
+              "traceId": "5b8efff798038103d269b633813fc60d",
+              "spanId": "eee19b7ec3c1b175"
+            }],
+            "status": {"code": 1},
+            "someFutureField": "ignored"
+          }]
+        }]
+      }]
+    }"""
+
+    spans = parse_otlp_json(otlp_json)
+
+    assert len(spans) == 1
+    span = spans[0]
+    assert span.context.trace_id == "0x5b8efff798038103d269b633813fc60c"
+    assert span.context.span_id == "0xeee19b7ec3c1b174"
+    assert span.parent.span_id == "0xeee19b7ec3c1b173"
+    assert span.kind.value == "SPAN_KIND_CLIENT"
+    assert span.attributes == {"http.status_code": 200, "ok": True}
+    assert span.links[0].context.span_id == "0xeee19b7ec3c1b175"
+    assert span.status_code.value == "STATUS_CODE_OK"
@@ -0,0 +1,183 @@
+"""Unit tests for incremental reads of a session's records.
+
+A live session used to be refetched whole on every `records-changed` notification. Reads now
+take `since` / `cursor` / `limit`, and the notification carries where the written records
+start, so a client fetches only those.
+
+(a) DAO-level: statement compilation only (no DB), mirroring `test_session_last_message.py`.
+(b) Cursor helpers and the watch payload.
+"""
+
+from datetime import datetime, timedelta, timezone
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from oss.src.core.sessions.records.dtos import SessionRecord, SessionRecordCursor
+from oss.src.core.sessions.records.utils import earliest_timestamp, last_cursor
+from oss.src.dbs.postgres.sessions.records import dao as records_dao_module
+from oss.src.dbs.redis.sessions.contract import make_watch_records_changed_payload
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+# ---------------------------------------------------------------------------------- #
+# (a) DAO — statement compilation
+# ---------------------------------------------------------------------------------- #
+
+
+class _DummyScalars:
+    def all(self):
+        return []
+
+
+class _DummyResult:
+    def scalars(self):
+        return _DummyScalars()
+
+
+class _DummySession:
+    def __init__(self):
+        self.captured_stmt = None
+
+    async def execute(self, stmt):
+        self.captured_stmt = stmt
+        return _DummyResult()
+
+
+class _DummySessionContext:
+    def __init__(self, session):
+        self.session = session
+
+    async def __aenter__(self):
+        return self.session
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+def _dao():
+    session = _DummySession()
+    engine = type(
+        "MockEngine", (), {"session": lambda self: _DummySessionContext(session)}
+    )()
+    return records_dao_module.RecordsDAO(engine=engine), session
+
+
+def _sql(session) -> str:
+    return str(session.captured_stmt.compile(dialect=postgresql.dialect())).replace(
+        "\n", " "
+    )
+
+
+@pytest.mark.asyncio
+async def test_full_reads_keep_the_conversation_order():
+    dao, session = _dao()
+
+    await dao.get_records(project_id=uuid4(), session_id="s")
+
+    sql = _sql(session)
+    assert (
+        "ORDER BY records.timestamp ASC NULLS LAST, records.created_at ASC, "
+        "records.record_index ASC" in sql
+    )
+    assert "LIMIT" not in sql
+
+
+@pytest.mark.asyncio
+async def test_reads_from_a_cursor_are_keyset_pages_on_timestamp_and_record_id():
+    dao, session = _dao()
+
+    await dao.get_records(
+        project_id=uuid4(),
+        session_id="s",
+        cursor=SessionRecordCursor(timestamp=NOW, record_id=uuid4()),
+        limit=50,
+    )
+
+    sql = _sql(session)
+    assert "records.timestamp > " in sql
+    assert "records.timestamp = " in sql and "records.record_id > " in sql
+    # Records without a timestamp sort last, so they always follow a timestamped cursor.
+    assert "records.timestamp IS NULL" in sql
+    assert "ORDER BY records.timestamp ASC NULLS LAST, records.record_id ASC" in sql
+    assert "LIMIT" in sql
+
+
+@pytest.mark.asyncio
+async def test_reads_since_a_timestamp_include_it():
+    dao, session = _dao()
+
+    await dao.get_records(project_id=uuid4(), session_id="s", since=NOW)
+
+    sql = _sql(session)
+    assert "records.timestamp >= " in sql
+    assert "records.record_id > " not in sql
+
+
+@pytest.mark.asyncio
+async def test_a_cursor_without_timestamp_stays_among_untimestamped_records():
+    dao, session = _dao()
+
+    await dao.get_records(
+        project_id=uuid4(),
+        session_id="s",
+        cursor=SessionRecordCursor(record_id=uuid4()),
+    )
+
+    sql = _sql(session)
+    assert "records.timestamp IS NULL AND records.record_id > " in sql
+    assert "records.timestamp > " not in sql
+
+
+# ---------------------------------------------------------------------------------- #
+# (b) Cursor helpers and the watch payload
+# ---------------------------------------------------------------------------------- #
+
+
+def _record(*, timestamp=None, record_id=None) -> SessionRecord:
+    return SessionRecord(
+        record_id=record_id or uuid4(),
+        session_id="s",
+        project_id=uuid4(),
+        timestamp=timestamp,
+    )
+
+
+def test_the_cursor_follows_the_last_record_in_keyset_order():
+    first, second = UUID(int=1), UUID(int=2)
+    later = NOW + timedelta(seconds=1)
+
+    assert last_cursor([]) is None
+    assert last_cursor(
+        [_record(timestamp=later, record_id=first), _record(timestamp=NOW)]
+    ) == SessionRecordCursor(timestamp=later, record_id=first)
+    assert last_cursor(
+        [
+            _record(timestamp=NOW, record_id=second),
+            _record(record_id=first),
+            _record(timestamp=later),
+        ]
+    ) == SessionRecordCursor(timestamp=None, record_id=first)
+
+
+def test_deltas_start_at_the_earliest_written_record():
+    later = NOW + timedelta(seconds=1)
+
+    assert earliest_timestamp([_record(timestamp=later), _record(timestamp=NOW)]) == NOW
+    # Without a timestamp a record cannot be read from one: refetch everything.
+    assert earliest_timestamp([_record(timestamp=NOW), _record()]) is None
+    assert earliest_timestamp([]) is None
+
+
+def test_records_changed_carries_since_only_when_known():
+    assert make_watch_records_changed_payload(session_id="s") == {
+        "type": "records-changed",
+        "session_id": "s",
+    }
+    assert make_watch_records_changed_payload(session_id="s", since=NOW) == {
+        "type": "records-changed",
+        "session_id": "s",
+        "since": NOW.isoformat(),
+    }
@@ -50,7 +50,9 @@ class _RecordingPublisher:
         self.fail = fail
         self.journal = journal
 
-    async def records_changed(self, *, project_id: str, session_id: str) -> None:
+    async def records_changed(
+        self, *, project_id: str, session_id: str, since=None
+    ) -> None:
         if self.fail:
             raise RuntimeError("relay down")
         self.calls.append((project_id, session_id))
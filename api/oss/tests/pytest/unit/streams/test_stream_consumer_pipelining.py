@@ -0,0 +1,196 @@
+"""Pins the pipelining contract of the shared StreamConsumer run loop.
+
+No live Redis: a fake client serves pre-built XREADGROUP batches and records
+XACK calls, and `process_batch` is a stub that can be held open, so the tests
+can observe that the next batch is read while an earlier one is still writing,
+that each lane ACKs on its own, and that one key's messages never overtake each
+other.
+"""
+
+import asyncio
+from typing import Dict, List, Tuple
+
+import pytest
+
+from oss.src.tasks.asyncio.shared import consumer as consumer_module
+from oss.src.tasks.asyncio.shared.consumer import StreamConsumer
+
+
+class _FakeRedis:
+    def __init__(self, batches: List[List[Tuple[bytes, Dict[bytes, bytes]]]]):
+        self._batches = list(batches)
+        self.reads = 0
+        self.acked: List[bytes] = []
+        self.deleted: List[bytes] = []
+
+    async def xreadgroup(self, **kwargs):
+        if not self._batches:
+            await asyncio.sleep(3600)
+        self.reads += 1
+        return [(b"streams:test", self._batches.pop(0))]
+
+    async def xack(self, _stream, _group, *ids):
+        self.acked.extend(ids)
+
+    async def xdel(self, _stream, *ids):
+        self.deleted.extend(ids)
+
+    async def xinfo_groups(self, _stream):
+        return [{"name": b"worker-test", "lag": 7, "pending": 3}]
+
+
+class _Consumer(StreamConsumer):
+    def __init__(self, redis, **kwargs):
+        super().__init__(
+            redis_client=redis,
+            stream_name="streams:test",
+            consumer_group="worker-test",
+            consumer_name="worker-test@host",
+            max_batch_size=2,
+            max_delay_ms=0,
+            **kwargs,
+        )
+        self.gate = asyncio.Event()
+        self.seen: List[bytes] = []
+
+    async def process_batch(self, batch):
+        self.seen.extend(msg_id for msg_id, _ in batch)
+        await self.gate.wait()
+        return len(batch), [msg_id for msg_id, _ in batch]
+
+
+def _msg(msg_id: str, key: str) -> Tuple[bytes, Dict[bytes, bytes]]:
+    return msg_id.encode(), {b"data": b"", b"key": key.encode()}
+
+
+async def _until(predicate, timeout: float = 1.0):
+    async def _poll():
+        while not predicate():
+            await asyncio.sleep(0)
+
+    await asyncio.wait_for(_poll(), timeout)
+
+
+@pytest.mark.asyncio
+async def test_reads_next_batch_while_previous_is_writing():
+    redis = _FakeRedis([[_msg("1-0", "p1")], [_msg("2-0", "p2")]])
+    consumer = _Consumer(redis, max_in_flight=2, max_lanes=1)
+
+    task = asyncio.create_task(consumer.run())
+    try:
+        # Both batches read while the first is still held in process_batch.
+        await _until(lambda: redis.reads == 2)
+        assert consumer.in_flight == 2
+        assert redis.acked == []
+
+        consumer.gate.set()
+        await _until(lambda: redis.acked == [b"1-0", b"2-0"])
+        assert consumer.in_flight == 0
+    finally:
+        task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_serial_window_waits_for_ack_before_next_read():
+    redis = _FakeRedis([[_msg("1-0", "p1")], [_msg("2-0", "p1")]])
+    consumer = _Consumer(redis, max_in_flight=1, max_lanes=1)
+
+    task = asyncio.create_task(consumer.run())
+    try:
+        await _until(lambda: redis.reads == 1)
+        await asyncio.sleep(0.01)
+        assert redis.reads == 1
+
+        consumer.gate.set()
+        await _until(lambda: redis.acked == [b"1-0", b"2-0"])
+    finally:
+        task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_lanes_ack_independently_and_keep_key_order():
+    redis = _FakeRedis(
+        [
+            [_msg("1-0", "p1"), _msg("2-0", "p2")],
+            [_msg("3-0", "p1"), _msg("4-0", "p2")],
+        ]
+    )
+    consumer = _Consumer(redis, max_in_flight=2, max_lanes=8)
+    consumer.gate.set()
+
+    task = asyncio.create_task(consumer.run())
+    try:
+        await _until(lambda: len(redis.acked) == 4)
+    finally:
+        task.cancel()
+
+    # Per key, stream order holds across batches.
+    p1 = [m for m in consumer.seen if m in (b"1-0", b"3-0")]
+    p2 = [m for m in consumer.seen if m in (b"2-0", b"4-0")]
+    assert p1 == [b"1-0", b"3-0"]
+    assert p2 == [b"2-0", b"4-0"]
+    assert sorted(redis.deleted) == [b"1-0", b"2-0", b"3-0", b"4-0"]
+
+
+def test_shard_batch_routes_one_key_to_one_lane():
+    consumer = _Consumer(_FakeRedis([]), max_in_flight=1, max_lanes=4)
+    batch = [_msg(f"{i}-0", f"p{i % 3}") for i in range(12)] + [
+        (b"legacy-0", {b"data": b""})
+    ]
+
+    sharded = consumer.shard_batch(batch)
+
+    lanes_per_key: Dict[bytes, set] = {}
+    for lane, lane_batch in sharded.items():
+        for _, data in lane_batch:
+            lanes_per_key.setdefault(data.get(b"key", b""), set()).add(lane)
+    assert all(len(lanes) == 1 for lanes in lanes_per_key.values())
+    # Messages without a key (older producers) share lane 0.
+    assert lanes_per_key[b""] == {0}
+    # Order within a lane is stream order.
+    for lane_batch in sharded.values():
+        ids = [msg_id for msg_id, _ in lane_batch]
+        assert ids == [msg_id for msg_id, _ in batch if msg_id in ids]
+
+
+@pytest.mark.asyncio
+async def test_report_stats_samples_group_lag():
+    consumer = _Consumer(_FakeRedis([]), max_in_flight=1, max_lanes=1)
+
+    await consumer.report_stats()
+
+    assert consumer.lag == 7
+    assert consumer.pending == 3
+
+
+@pytest.mark.asyncio
+async def test_background_tasks_that_die_are_restarted_until_cancelled(
+    monkeypatch,
+):
+    monkeypatch.setattr(consumer_module, "RESTART_DELAY_S", 0)
+    consumer = _Consumer(_FakeRedis([]), max_in_flight=1, max_lanes=1)
+    starts = []
+    running = asyncio.Event()
+
+    async def sweep():
+        starts.append(len(starts))
+        if len(starts) < 3:
+            raise RuntimeError("sweep failed")
+        running.set()
+        await asyncio.sleep(3600)
+
+    tasks = set()
+    consumer.supervise("claim", sweep, tasks)
+
+    await asyncio.wait_for(running.wait(), timeout=1)
+    assert len(starts) == 3
+    assert len(tasks) == 1
+
+    cancelled = list(tasks)
+    for task in cancelled:
+        task.cancel()
+    await asyncio.gather(*cancelled, return_exceptions=True)
+    await asyncio.sleep(0)
+
+    assert tasks == set()
+    assert len(starts) == 3
@@ -0,0 +1,123 @@
+"""Pins pending-entry reclamation in the shared StreamConsumer.
+
+No live Redis: a fake client answers XAUTOCLAIM/XPENDING from a canned PEL and
+records the dead-letter XADDs and the ACK/DELs, so the min-idle/max-delivery
+split can be asserted without a server.
+"""
+
+from typing import Dict, List, Tuple
+
+import pytest
+
+from oss.src.tasks.asyncio.shared.consumer import StreamConsumer
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self._redis = redis
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def xadd(self, **kwargs):
+        self._redis.dead.append(kwargs)
+
+    async def execute(self):
+        return []
+
+
+class _FakeRedis:
+    def __init__(self, pel: List[Tuple[bytes, Dict[bytes, bytes], int]]):
+        # (message_id, data, times_delivered after this claim)
+        self._pel = pel
+        self.claims: List[dict] = []
+        self.dead: List[dict] = []
+        self.acked: List[bytes] = []
+        self.deleted: List[bytes] = []
+
+    async def xautoclaim(self, **kwargs):
+        self.claims.append(kwargs)
+        return [b"0-0", [(m, d) for m, d, _ in self._pel], []]
+
+    async def xpending_range(self, **kwargs):
+        return [
+            {"message_id": m, "consumer": b"me", "times_delivered": n}
+            for m, _, n in self._pel
+        ]
+
+    def pipeline(self, transaction=False):
+        return _FakePipeline(self)
+
+    async def xack(self, _stream, _group, *ids):
+        self.acked.extend(ids)
+
+    async def xdel(self, _stream, *ids):
+        self.deleted.extend(ids)
+
+
+def _consumer(redis) -> StreamConsumer:
+    return StreamConsumer(
+        redis_client=redis,
+        stream_name="streams:test",
+        consumer_group="worker-test",
+        consumer_name="worker-test@host",
+        claim_min_idle_ms=1000,
+        claim_max_deliveries=3,
+    )
+
+
+@pytest.mark.asyncio
+async def test_claim_batch_returns_stale_entries_for_retry():
+    redis = _FakeRedis([(b"1-0", {b"data": b"a"}, 2), (b"2-0", {b"data": b"b"}, 3)])
+    consumer = _consumer(redis)
+
+    next_id, batch = await consumer.claim_batch()
+
+    assert next_id == b"0-0"
+    assert [m for m, _ in batch] == [b"1-0", b"2-0"]
+    assert redis.claims[0]["min_idle_time"] == 1000
+    assert redis.claims[0]["consumername"] == "worker-test@host"
+    assert redis.dead == []
+    assert redis.acked == []
+
+
+@pytest.mark.asyncio
+async def test_claim_batch_dead_letters_poison_messages():
+    redis = _FakeRedis(
+        [
+            (b"1-0", {b"data": b"ok"}, 1),
+            (b"2-0", {b"data": b"poison", b"key": b"p1"}, 4),
+        ]
+    )
+    consumer = _consumer(redis)
+
+    _, batch = await consumer.claim_batch()
+
+    assert [m for m, _ in batch] == [b"1-0"]
+
+    assert len(redis.dead) == 1
+    dead = redis.dead[0]
+    assert dead["name"] == "streams:test:dead"
+    assert dead["fields"][b"data"] == b"poison"
+    assert dead["fields"][b"key"] == b"p1"
+    assert dead["fields"][b"origin_id"] == b"2-0"
+    assert dead["fields"][b"deliveries"] == b"4"
+
+    # The original leaves the PEL and the stream, so it stops being retried.
+    assert redis.acked == [b"2-0"]
+    assert redis.deleted == [b"2-0"]
+    assert consumer.dead_lettered == 1
+
+
+@pytest.mark.asyncio
+async def test_claim_batch_skips_entries_trimmed_while_pending():
+    redis = _FakeRedis([(b"1-0", None, 2)])
+    consumer = _consumer(redis)
+
+    _, batch = await consumer.claim_batch()
+
+    assert batch == []
+    assert redis.dead == []
@@ -0,0 +1,152 @@
+"""Unit tests for TracingDAO.ingest writing a batch as multi-row upserts.
+
+No live DB: a fake AsyncSession captures the statements so the number of
+round-trips, the de-duplication of repeated spans and the returned links can be
+asserted without Postgres.
+"""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+
+import pytest
+
+from oss.src.core.tracing.dtos import OTelFlatSpan
+from oss.src.dbs.postgres.tracing import dao as tracing_dao
+from oss.src.dbs.postgres.tracing.dao import TracingDAO
+
+
+class _FakeResult:
+    def fetchall(self):
+        # RETURNING rows of inserted root spans: none, so no rollups are written.
+        return []
+
+
+class _FakeSession:
+    def __init__(self, executed: list):
+        self._executed = executed
+        self.commits = 0
+
+    async def execute(self, stmt):
+        self._executed.append(stmt)
+        return _FakeResult()
+
+    async def commit(self):
+        self.commits += 1
+
+
+class _FakeEngine:
+    def __init__(self):
+        self.executed: list = []
+        self.sessions: list = []
+
+    @asynccontextmanager
+    async def session(self):
+        session = _FakeSession(self.executed)
+        self.sessions.append(session)
+        yield session
+
+
+def _flat_span(*, trace_id: str, span_id: str, span_name: str = "span"):
+    now = datetime.now(timezone.utc)
+    return OTelFlatSpan(
+        trace_id=trace_id,
+        span_id=span_id,
+        span_name=span_name,
+        start_time=now,
+        end_time=now,
+    )
+
+
+def _rows(stmt) -> list:
+    # Multi-row VALUES: one dict of column -> bind per row.
+    return stmt._multi_values[0]
+
+
+def _upserts(engine: _FakeEngine, table: str) -> list:
+    return [
+        stmt
+        for stmt in engine.executed
+        if getattr(stmt, "table", None) is not None and stmt.table.name == table
+    ]
+
+
+@pytest.mark.anyio
+async def test_ingest_writes_batch_in_one_statement(anyio_backend):
+    assert anyio_backend == "asyncio"
+    engine = _FakeEngine()
+    dao = TracingDAO(engine=engine)
+
+    trace_id = uuid4().hex
+    spans = [_flat_span(trace_id=trace_id, span_id=uuid4().hex) for _ in range(50)]
+
+    links = await dao.ingest(project_id=uuid4(), user_id=uuid4(), span_dtos=spans)
+
+    upserts = _upserts(engine, "spans")
+    assert len(upserts) == 1
+    assert len(_rows(upserts[0])) == 50
+    # Their trace is summarized in the same transaction.
+    assert [len(_rows(stmt)) for stmt in _upserts(engine, "traces")] == [1]
+    assert len(engine.sessions) == 1
+    assert engine.sessions[0].commits == 1
+
+    assert [(link.trace_id, link.span_id) for link in links] == [
+        (UUID(s.trace_id).hex, UUID(s.span_id).hex[16:]) for s in spans
+    ]
+
+
+@pytest.mark.anyio
+async def test_ingest_collapses_repeated_spans_last_one_wins(anyio_backend):
+    assert anyio_backend == "asyncio"
+    engine = _FakeEngine()
+    dao = TracingDAO(engine=engine)
+
+    trace_id = uuid4().hex
+    span_id = uuid4().hex
+    first = _flat_span(trace_id=trace_id, span_id=span_id, span_name="first")
+    second = _flat_span(trace_id=trace_id, span_id=span_id, span_name="second")
+
+    links = await dao.ingest(
+        project_id=uuid4(), user_id=uuid4(), span_dtos=[first, second]
+    )
+
+    # One link per input span, even when the row itself is written once.
+    assert len(links) == 2
+
+    upsert = _upserts(engine, "spans")[0]
+    rows = _rows(upsert)
+    assert len(rows) == 1
+
+    compiled = upsert.compile().params
+    assert compiled["span_name_m0"] == "second"
+
+
+@pytest.mark.anyio
+async def test_ingest_splits_batches_under_bind_parameter_limit(
+    anyio_backend, monkeypatch
+):
+    assert anyio_backend == "asyncio"
+    monkeypatch.setattr(tracing_dao, "INGEST_CHUNK_SIZE", 4)
+    engine = _FakeEngine()
+    dao = TracingDAO(engine=engine)
+
+    trace_id = uuid4().hex
+    spans = [_flat_span(trace_id=trace_id, span_id=uuid4().hex) for _ in range(10)]
+
+    await dao.ingest(project_id=uuid4(), user_id=uuid4(), span_dtos=spans)
+
+    assert [len(_rows(stmt)) for stmt in _upserts(engine, "spans")] == [4, 4, 2]
+    # Still one transaction for the whole batch.
+    assert len(engine.sessions) == 1
+    assert engine.sessions[0].commits == 1
+
+
+def test_ingest_chunk_size_respects_bind_parameter_limit():
+    columns = len(tracing_dao.SpanDBE.__table__.columns)
+
+    assert tracing_dao.INGEST_CHUNK_SIZE * columns <= 32767
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
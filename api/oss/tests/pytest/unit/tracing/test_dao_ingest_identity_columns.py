@@ -2,12 +2,13 @@
 identity columns.
 
 No live DB: a fake AsyncSession captures the compiled upsert statement so the
-DAO's ON CONFLICT DO UPDATE values can be asserted without Postgres. See
+DAO's ON CONFLICT DO UPDATE values can be asserted without Postgres
+(multi-row VALUES, so per-row params carry an `_m<row>` suffix). See
 docs/designs/testing/testing.boundaries.specs.md, boundary 3.
 """
 
 from contextlib import asynccontextmanager
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from uuid import uuid4
 
 import pytest
@@ -17,7 +18,8 @@ from oss.src.dbs.postgres.tracing.dao import TracingDAO
 
 
 class _FakeResult:
-    pass
+    def fetchall(self):
+        return []
 
 
 class _FakeSession:
@@ -51,7 +53,7 @@ def _flat_span(
         parent_id=parent_id,
         span_name="span",
         start_time=now,
-        end_time=now,
+        end_time=now + timedelta(seconds=1),
         session_id=session_id,
         user_id=user_id,
         agent_id=agent_id,
@@ -73,12 +75,17 @@ async def test_ingest_root_span_persists_identity_columns(anyio_backend):
 
     await dao.ingest(project_id=uuid4(), user_id=uuid4(), span_dtos=[root])
 
-    assert len(engine.executed) == 1
-    values = engine.executed[0].compile().params
+    spans, traces = engine.executed[:2]
+    assert spans.table.name == "spans"
+    assert traces.table.name == "traces"
+
+    # The trace summary reads them off the root span.
+    for stmt in (spans, traces):
+        values = stmt.compile().params
 
-    assert values["session_id"] == "sess-1"
-    assert values["user_id"] == "user-1"
-    assert values["agent_id"] == "agent-1"
+        assert values["session_id_m0"] == "sess-1"
+        assert values["user_id_m0"] == "user-1"
+        assert values["agent_id_m0"] == "agent-1"
 
 
 @pytest.mark.anyio
@@ -93,11 +100,38 @@ async def test_ingest_child_span_leaves_identity_columns_null(anyio_backend):
 
     values = engine.executed[0].compile().params
 
-    assert values["session_id"] is None
-    assert values["user_id"] is None
-    assert values["agent_id"] is None
+    assert values["session_id_m0"] is None
+    assert values["user_id_m0"] is None
+    assert values["agent_id_m0"] is None
 
 
 @pytest.fixture
 def anyio_backend():
     return "asyncio"
+
+
+@pytest.mark.anyio
+async def test_ingest_looks_up_stored_start_times_for_undated_spans_only(
+    anyio_backend,
+):
+    assert anyio_backend == "asyncio"
+    engine = _FakeEngine()
+    dao = TracingDAO(engine=engine)
+
+    # An exporter's span carries its own start time: upserted on it directly.
+    await dao.ingest(
+        project_id=uuid4(),
+        user_id=uuid4(),
+        span_dtos=[_flat_span(span_id=uuid4().hex)],
+    )
+    assert [stmt.table.name for stmt in engine.executed[:2]] == ["spans", "traces"]
+
+    # An edit sends none, so the start time it was first written with is read.
+    engine.executed.clear()
+    edited = OTelFlatSpan(trace_id=uuid4().hex, span_id=uuid4().hex)
+    await dao.ingest(project_id=uuid4(), user_id=uuid4(), span_dtos=[edited])
+
+    lookup = str(engine.executed[0])
+    assert lookup.startswith("SELECT")
+    assert "min(spans.start_time)" in lookup
+    assert engine.executed[1].table.name == "spans"
@@ -47,6 +47,8 @@ def test_query_spans_op_schema_round_trips_through_endpoint_model():
             "interval": 60,
             "rate": 1.0,
         },
+        "fields": ["status_code", "attributes.ag.data.outputs"],
+        "truncate": 1000,
         "query_ref": {"slug": "recent-agent-runs"},
         "query_variant_ref": {"slug": "recent-agent-runs", "version": "latest"},
         "query_revision_ref": {"id": "00000000-0000-0000-0000-000000000002"},
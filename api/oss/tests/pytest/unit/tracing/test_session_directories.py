@@ -0,0 +1,306 @@
+"""Unit tests for the session and user directories behind session and user lists.
+
+No live DB: directory rows are built in Python, statements are compiled, and a
+fake AsyncSession stands in for the coverage lookup, the directory page and the
+spans scan of older activity.
+"""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from oss.src.core.shared.dtos import Windowing
+from oss.src.core.tracing.dtos import OTelFlatSpan, OTelStatusCode
+from oss.src.dbs.postgres.tracing.dao import TracingDAO
+from oss.src.dbs.postgres.tracing.dbes import SessionDirectoryDBE, UserDirectoryDBE
+from oss.src.dbs.postgres.tracing.directories import (
+    build_directory_rows,
+    directory_page_stmt,
+    upsert_directory_stmt,
+)
+from oss.src.dbs.postgres.tracing.mappings import map_span_dto_to_span_dbe
+
+NOW = datetime(2025, 6, 1, tzinfo=timezone.utc)
+SINCE = NOW - timedelta(days=1)
+
+PROJECT_ID = uuid4()
+
+
+def _span(*, session_id=None, user_id=None, parent_id=None, offset_s=0, **kwargs):
+    start = NOW + timedelta(seconds=offset_s)
+    return OTelFlatSpan(
+        trace_id=uuid4().hex,
+        span_id=uuid4().hex,
+        parent_id=parent_id,
+        span_name="root" if parent_id is None else "child",
+        start_time=start,
+        end_time=start + timedelta(seconds=1),
+        session_id=session_id,
+        user_id=user_id,
+        attributes={
+            "ag": {
+                "metrics": {
+                    "costs": {"cumulative": {"total": 0.5}},
+                    "tokens": {"cumulative": {"total": 30}},
+                }
+            }
+        },
+        **kwargs,
+    )
+
+
+def _values(span: OTelFlatSpan) -> dict:
+    span_dbe = map_span_dto_to_span_dbe(
+        project_id=PROJECT_ID,
+        user_id=uuid4(),
+        span_dto=span,
+    )
+    return {c.name: getattr(span_dbe, c.name) for c in span_dbe.__table__.columns}
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_sessions_and_users_are_listed_off_their_root_spans():
+    values_list = [
+        _values(_span(session_id="b", user_id="u", offset_s=20)),
+        _values(
+            _span(
+                session_id="b",
+                offset_s=10,
+                status_code=OTelStatusCode.STATUS_CODE_ERROR,
+            )
+        ),
+        _values(_span(session_id="a", user_id="u")),
+        # Children never carry the root-only columns, nor count as traces.
+        _values(_span(session_id="a", parent_id=uuid4().hex, offset_s=30)),
+    ]
+
+    sessions = build_directory_rows(
+        project_id=PROJECT_ID, group="session", values_list=values_list
+    )
+    users = build_directory_rows(
+        project_id=PROJECT_ID, group="user", values_list=values_list
+    )
+
+    assert [row["session_id"] for row in sessions] == ["a", "b"]
+    b = sessions[1]
+    assert (b["first_active"], b["last_active"]) == (
+        NOW + timedelta(seconds=10),
+        NOW + timedelta(seconds=20),
+    )
+    assert (b["traces"], b["errors"], b["costs"], b["tokens"]) == (2, 1, 1.0, 60)
+    assert sessions[0]["traces"] == 1
+
+    [u] = users
+    assert (u["user_id"], u["traces"], u["errors"]) == ("u", 2, 0)
+
+
+def test_upserts_widen_the_activity_and_add_up_the_counts():
+    sql = _sql(
+        upsert_directory_stmt(
+            group="user",
+            rows=build_directory_rows(
+                project_id=PROJECT_ID,
+                group="user",
+                values_list=[_values(_span(user_id="u"))],
+            ),
+        )
+    )
+
+    assert "ON CONFLICT (project_id, user_id) DO UPDATE" in sql
+    assert "least(user_directory.first_active, excluded.first_active)" in sql
+    assert "greatest(user_directory.last_active, excluded.last_active)" in sql
+    assert "traces = (user_directory.traces + excluded.traces)" in sql
+    assert "coalesce(user_directory.costs + excluded.costs" in sql
+
+
+@pytest.mark.parametrize(
+    "realtime, column",
+    [(None, "first_active"), (True, "last_active")],
+)
+def test_pages_are_read_off_the_activity_index(realtime, column):
+    sql = _sql(
+        directory_page_stmt(
+            project_id=PROJECT_ID,
+            group="session",
+            since=SINCE,
+            realtime=realtime,
+            windowing=Windowing(newest=NOW, limit=10),
+        )
+    )
+
+    assert f"session_directory.{column} >= " in sql
+    assert f"session_directory.{column} < " in sql
+    assert f"ORDER BY session_directory.{column} DESC" in sql
+    assert "LIMIT" in sql
+    assert "spans" not in sql
+
+
+class _Result:
+    def __init__(self, *, rows=(), scalar=None):
+        self._rows = list(rows)
+        self._scalar = scalar
+
+    def scalar(self):
+        return self._scalar
+
+    def all(self):
+        return self._rows
+
+    def fetchall(self):
+        return self._rows
+
+
+class _FakeSession:
+    def __init__(self, engine):
+        self._engine = engine
+
+    async def execute(self, stmt, params=None):
+        self._engine.executed.append(stmt)
+        return self._engine.results.pop(0) if self._engine.results else _Result()
+
+    async def commit(self):
+        pass
+
+
+class _FakeEngine:
+    def __init__(self, results=()):
+        self.results = list(results)
+        self.executed: list = []
+
+    @asynccontextmanager
+    async def session(self):
+        yield _FakeSession(self)
+
+
+@pytest.mark.asyncio
+async def test_ingest_lists_the_inserted_roots_only():
+    spans = [_span(session_id="s"), _span(session_id="s", offset_s=1)]
+    span_dbes = [
+        map_span_dto_to_span_dbe(project_id=PROJECT_ID, span_dto=span) for span in spans
+    ]
+    returned = [
+        SimpleNamespace(
+            trace_id=span_dbe.trace_id,
+            span_id=span_dbe.span_id,
+            updated_at=updated_at,
+        )
+        for span_dbe, updated_at in zip(span_dbes, (None, NOW))
+    ]
+    engine = _FakeEngine(results=[_Result(rows=returned)])
+    dao = TracingDAO(engine=engine)
+
+    await dao.ingest(project_id=PROJECT_ID, user_id=uuid4(), span_dtos=spans)
+    await dao.ingest(project_id=PROJECT_ID, user_id=uuid4(), span_dtos=spans[:1])
+
+    upserts = [
+        stmt
+        for stmt in engine.executed
+        if getattr(stmt, "table", None) is not None
+        and stmt.table.name == SessionDirectoryDBE.__tablename__
+    ]
+    # The re-sent root is not counted twice.
+    assert len(upserts) == 1
+    [row] = upserts[0]._multi_values[0]
+    counts = {
+        getattr(column, "key", column): getattr(value, "value", value)
+        for column, value in row.items()
+    }
+    assert counts["traces"] == 1
+    assert not any(
+        getattr(stmt, "table", None) is not None
+        and stmt.table.name == UserDirectoryDBE.__tablename__
+        for stmt in engine.executed
+    )
+    # Coverage is recorded along with the first listed session.
+    assert sum("directories_coverage" in _sql(s) for s in engine.executed) == 1
+
+
+def _rows(group, *ids):
+    return [
+        SimpleNamespace(
+            **{f"{group}_id": id, "first_active": NOW - timedelta(seconds=i)}
+        )
+        for i, id in enumerate(ids)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_sessions_are_listed_off_the_directory_and_older_ones_off_the_spans():
+    older = SimpleNamespace(session_id="c", first_active=SINCE - timedelta(hours=1))
+    engine = _FakeEngine(
+        results=[
+            _Result(scalar=SINCE),
+            _Result(),  # timeout
+            _Result(rows=_rows("session", "a", "b")),
+            _Result(),  # timeout
+            _Result(rows=[older]),
+        ]
+    )
+    dao = TracingDAO(engine=engine)
+
+    ids, cursor = await dao.sessions(
+        project_id=PROJECT_ID,
+        windowing=Windowing(newest=NOW, limit=3),
+    )
+
+    assert (ids, cursor) == (["a", "b", "c"], older.first_active)
+
+    page, scan = _sql(engine.executed[2]), _sql(engine.executed[4])
+    assert "FROM session_directory" in page
+    # Older activity only, without the sessions the directory lists.
+    assert "spans.start_time < " in scan
+    assert "NOT (EXISTS (SELECT 1" in scan
+    assert "session_directory.session_id = " in scan
+
+
+@pytest.mark.asyncio
+async def test_a_full_page_off_the_directory_does_not_scan_the_spans():
+    engine = _FakeEngine(
+        results=[
+            _Result(scalar=SINCE),
+            _Result(),  # timeout
+            _Result(rows=_rows("user", "a", "b")),
+        ]
+    )
+    dao = TracingDAO(engine=engine)
+    dao._query_by_group_from_spans = AsyncMock(return_value=([], None))
+
+    ids, _ = await dao.users(
+        project_id=PROJECT_ID,
+        windowing=Windowing(limit=2),
+    )
+
+    assert ids == ["a", "b"]
+    dao._query_by_group_from_spans.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "since, windowing",
+    [
+        (None, Windowing(limit=10)),
+        (SINCE, Windowing(newest=SINCE, limit=10)),
+    ],
+)
+async def test_sessions_fall_back_to_the_spans(since, windowing):
+    engine = _FakeEngine(results=[_Result(scalar=since)])
+    dao = TracingDAO(engine=engine)
+    dao._query_by_group_from_spans = AsyncMock(return_value=(["a"], NOW))
+
+    assert await dao.sessions(project_id=PROJECT_ID, windowing=windowing) == (
+        ["a"],
+        NOW,
+    )
+
+    kwargs = dao._query_by_group_from_spans.await_args.kwargs
+    # Only what a directory page would list since the coverage is skipped.
+    assert kwargs.get("unlisted_since") == since
+    assert len(engine.executed) == 1
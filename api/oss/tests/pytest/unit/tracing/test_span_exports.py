@@ -0,0 +1,285 @@
+"""Unit tests for the NDJSON exports of spans and traces.
+
+No live DB: a fake AsyncSession streams span entities in partitions, a fake
+DAO feeds the service's batches, and the response body is read off the
+StreamingResponse.
+"""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from uuid import UUID, uuid4
+
+import orjson
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from oss.src.apis.fastapi.tracing.exports import stream_ndjson
+from oss.src.core.tracing.dtos import (
+    Focus,
+    Formatting,
+    OTelSpan,
+    TracingQuery,
+)
+from oss.src.core.tracing.service import TracingService
+from oss.src.dbs.postgres.tracing.dao import TracingDAO
+from oss.src.dbs.postgres.tracing.mappings import map_span_dto_to_span_dbe
+from oss.src.utils.env import env
+
+NOW = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+
+def _span(trace_id: str, offset_s: int = 0, parent_id=None) -> OTelSpan:
+    # As read off the spans: ids in their UUID form.
+    start = NOW + timedelta(seconds=offset_s)
+    return OTelSpan(
+        trace_id=trace_id,
+        span_id=str(uuid4()),
+        parent_id=parent_id,
+        span_name="root" if parent_id is None else "child",
+        start_time=start,
+        end_time=start,
+    )
+
+
+class _Partitions:
+    def __init__(self, batches):
+        self._batches = batches
+
+    def partitions(self, size=None):
+        async def batches():
+            for batch in self._batches:
+                yield batch
+
+        return batches()
+
+    def scalars(self):
+        return self
+
+
+class _FakeSession:
+    def __init__(self, engine):
+        self._engine = engine
+
+    async def execute(self, stmt, params=None):
+        self._engine.executed.append(stmt)
+
+    async def stream(self, stmt):
+        self._engine.streamed.append(stmt)
+        return _Partitions(self._engine.batches)
+
+
+class _FakeEngine:
+    def __init__(self, batches=()):
+        self.batches = list(batches)
+        self.executed: list = []
+        self.streamed: list = []
+
+    @asynccontextmanager
+    async def session(self):
+        yield _FakeSession(self)
+
+
+@pytest.mark.asyncio
+async def test_spans_stream_off_a_cursor_in_batches():
+    trace_id = str(uuid4())
+    span_dbes = [
+        map_span_dto_to_span_dbe(project_id=uuid4(), span_dto=_span(trace_id, i))
+        for i in range(3)
+    ]
+    engine = _FakeEngine(batches=[span_dbes[:2], span_dbes[2:]])
+    dao = TracingDAO(engine=engine)
+
+    batches = [
+        batch
+        async for batch in dao.stream(
+            project_id=uuid4(),
+            query=TracingQuery(formatting=Formatting(focus=Focus.SPAN)),
+        )
+    ]
+
+    assert [len(batch) for batch in batches] == [2, 1]
+    assert "60000" in str(engine.executed[0])
+
+    [stmt] = engine.streamed
+    assert (
+        stmt.get_execution_options()["yield_per"]
+        == env.agenta.api.tracing.export_batch_size
+    )
+
+
+def test_trace_exports_keep_the_spans_of_a_trace_in_a_row():
+    stmt = TracingDAO(engine=_FakeEngine())._query_stmt(
+        project_id=uuid4(),
+        query=TracingQuery(formatting=Formatting(focus=Focus.TRACE)),
+    )
+
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+    assert "ORDER BY max(spans.start_time) OVER (PARTITION BY spans.trace_id)" in sql
+    assert "DESC, spans.trace_id DESC, spans.start_time ASC" in sql
+
+
+class _FakeDAO:
+    def __init__(self, batches):
+        self.batches = batches
+        self.queries = []
+
+    async def stream(self, *, project_id, query):
+        self.queries.append(query)
+        for batch in self.batches:
+            yield [span.model_copy() for span in batch]
+
+
+@pytest.mark.asyncio
+async def test_traces_straddling_batches_are_exported_whole():
+    first, second = str(uuid4()), str(uuid4())
+    root = _span(first)
+    batches = [
+        [root, _span(first, 1, parent_id=root.span_id)],
+        [_span(first, 2, parent_id=root.span_id), _span(second)],
+    ]
+    dao = _FakeDAO(batches)
+    service = TracingService(tracing_dao=dao)
+
+    exported = [
+        traces
+        async for traces in service.export(project_id=uuid4(), query=TracingQuery())
+    ]
+
+    # The first trace waits for the second batch; the last one for the end.
+    assert [[trace.trace_id for trace in traces] for traces in exported] == [
+        [UUID(first).hex],
+        [UUID(second).hex],
+    ]
+    [trace] = exported[0]
+    assert len(trace.spans["root"].spans["child"]) == 2
+    assert dao.queries[0].formatting.focus == Focus.TRACE
+
+
+@pytest.mark.asyncio
+async def test_span_exports_pass_batches_through():
+    trace_id = str(uuid4())
+    service = TracingService(
+        tracing_dao=_FakeDAO([[_span(trace_id)], [_span(trace_id, 1)]])
+    )
+
+    exported = [
+        spans
+        async for spans in service.export(
+            project_id=uuid4(),
+            query=TracingQuery(formatting=Formatting(focus=Focus.SPAN)),
+        )
+    ]
+
+    assert [len(spans) for spans in exported] == [1, 1]
+
+
+async def _batches(*batches):
+    for batch in batches:
+        yield batch
+
+
+async def _body(response) -> bytes:
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+
+@pytest.mark.asyncio
+async def test_exports_are_ndjson_and_metered_per_batch():
+    metered, done = [], []
+
+    async def allow(count):
+        metered.append(count)
+        return True
+
+    async def finish(count):
+        done.append(count)
+
+    response = await stream_ndjson(
+        batches=_batches(
+            [SimpleNamespace(trace_id="a", model_dump=lambda **_: {"t": "a"})],
+            [
+                SimpleNamespace(trace_id="b", model_dump=lambda **_: {"t": "b"}),
+                SimpleNamespace(trace_id="c", model_dump=lambda **_: {"t": "c"}),
+            ],
+        ),
+        allow=allow,
+        done=finish,
+    )
+
+    lines = (await _body(response)).splitlines()
+
+    assert response.media_type == "application/x-ndjson"
+    assert [orjson.loads(line) for line in lines] == [
+        {"t": "a"},
+        {"t": "b"},
+        {"t": "c"},
+    ]
+    assert metered == [1, 2]
+    assert done == [3]
+
+
+@pytest.mark.asyncio
+async def test_exports_over_the_quota_are_refused_or_cut_short():
+    def batch(trace_id):
+        return [SimpleNamespace(trace_id=trace_id, model_dump=lambda **_: {})]
+
+    async def refuse(count):
+        return False
+
+    done = []
+
+    async def finish(count):
+        done.append(count)
+
+    with pytest.raises(HTTPException) as e:
+        await stream_ndjson(batches=_batches(batch("a")), allow=refuse, done=finish)
+    assert e.value.status_code == 429
+    assert done == []
+
+    allowed = iter([True, False])
+
+    async def allow_once(count):
+        return next(allowed)
+
+    response = await stream_ndjson(
+        batches=_batches(batch("a"), batch("b")),
+        allow=allow_once,
+        done=finish,
+    )
+
+    lines = (await _body(response)).splitlines()
+
+    # The client can tell a cut-short export from a complete one.
+    assert orjson.loads(lines[-1]) == {"error": "quota_exceeded", "count": 1}
+    assert len(lines) == 2
+    assert done == [1]
+
+
+@pytest.mark.asyncio
+async def test_exports_meter_each_trace_once_across_batches():
+    def batch(*trace_ids):
+        return [
+            SimpleNamespace(trace_id=trace_id, model_dump=lambda **_: {})
+            for trace_id in trace_ids
+        ]
+
+    metered, done = [], []
+
+    async def allow(count):
+        metered.append(count)
+        return True
+
+    async def finish(count):
+        done.append(count)
+
+    response = await stream_ndjson(
+        batches=_batches(batch("a", "a", "b"), batch("b", "c"), batch("c")),
+        allow=allow,
+        done=finish,
+    )
+    await _body(response)
+
+    assert metered == [2, 1, 0]
+    assert done == [3]
@@ -0,0 +1,240 @@
+"""Unit tests for span projections (`Formatting.fields` / `Formatting.truncate`).
+
+No live DB: projections are compiled, projected rows are mapped, and a fake
+AsyncSession stands in for the spans query.
+"""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from uuid import UUID, uuid4
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from oss.src.apis.fastapi.tracing.utils import parse_query_from_body_request
+from oss.src.core.tracing.dtos import (
+    Condition,
+    Filtering,
+    FilteringException,
+    Focus,
+    Formatting,
+    TracingQuery,
+)
+from oss.src.core.tracing.service import TracingService
+from oss.src.core.tracing.utils.filtering import parse_formatting
+from oss.src.dbs.postgres.tracing.dao import TracingDAO
+from oss.src.dbs.postgres.tracing.mappings import map_span_dbe_to_span_dto
+from oss.src.dbs.postgres.tracing.projections import (
+    SCALAR_COLUMNS,
+    map_span_row_to_span_dbe,
+    project_fields,
+    select_span_columns,
+)
+
+NOW = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+
+def _sql(formatting: Formatting) -> str:
+    columns = select_span_columns(formatting)
+    return str(
+        select(*columns).compile(
+            dialect=postgresql.dialect(),
+            compile_kwargs={"literal_binds": True},
+        )
+    )
+
+
+@pytest.mark.parametrize(
+    "fields, columns, paths",
+    [
+        (None, {"attributes", "events", "links", "references", "hashes"}, []),
+        ([], set(), []),
+        (["span_name", "events"], {"events"}, []),
+        (
+            ["attributes.ag.data", "attributes.ag.data.outputs", "attributes.x"],
+            set(),
+            [("x",), ("ag", "data")],
+        ),
+        (["attributes", "attributes.ag.data.outputs"], {"attributes"}, []),
+    ],
+)
+def test_fields_name_whole_columns_or_parts_of_attributes(fields, columns, paths):
+    assert project_fields(fields) == (columns, paths)
+
+
+def test_queries_without_a_projection_select_span_entities():
+    assert select_span_columns(None) is None
+    assert select_span_columns(Formatting(focus=Focus.SPAN)) is None
+
+
+def test_a_projection_loads_the_scalar_columns_and_the_listed_parts_only():
+    sql = _sql(Formatting(fields=["attributes.ag.data.outputs", "events"]))
+
+    for name in SCALAR_COLUMNS:
+        assert f"spans.{name}" in sql
+    assert "spans.events" in sql
+    assert "spans.attributes #> ARRAY['ag', 'data', 'outputs']" in sql
+    assert "AS attributes_0" in sql
+    for name in ("spans.links", 'spans."references"', "spans.hashes"):
+        assert name not in sql
+
+
+def test_truncation_caps_projected_parts_and_payloads_in_whole_attributes():
+    parts = _sql(Formatting(fields=["attributes.ag.data.outputs"], truncate=64))
+
+    assert "to_jsonb(left(CAST(spans.attributes #>" in parts
+    assert "> 64" in parts
+
+    whole = _sql(Formatting(truncate=64))
+
+    assert "jsonb_set(spans.attributes, ARRAY['ag', 'data', 'inputs']" in whole
+    assert "ARRAY['ag', 'data', 'outputs'], to_jsonb(left(" in whole
+    assert "END AS attributes" in whole
+
+
+def _row(**values):
+    mapping = {name: None for name in SCALAR_COLUMNS}
+    mapping.update(
+        trace_id=uuid4(),
+        span_id=uuid4(),
+        trace_type="invocation",
+        span_type="task",
+        span_kind="SPAN_KIND_INTERNAL",
+        span_name="root",
+        start_time=NOW,
+        end_time=NOW,
+        status_code="STATUS_CODE_OK",
+        **values,
+    )
+    return SimpleNamespace(_mapping=mapping, **mapping)
+
+
+def test_projected_rows_map_to_spans_with_only_the_projected_fields():
+    row = _row(
+        attributes_0=None,
+        attributes_1={"answer": "42"},
+        events=[{"name": "done", "timestamp": NOW.isoformat()}],
+    )
+    formatting = Formatting(
+        fields=["events", "attributes.ag.data.outputs", "attributes.ag.metrics"]
+    )
+
+    span = map_span_dbe_to_span_dto(
+        span_dbe=map_span_row_to_span_dbe(row, formatting),
+    )
+
+    assert span.span_name == "root"
+    # Paths are labelled in order of their depth, then of their parts.
+    assert span.attributes == {"ag": {"data": {"outputs": {"answer": "42"}}}}
+    assert span.events[0].name == "done"
+    assert (span.references, span.links, span.hashes) == (None, None, None)
+
+
+@pytest.mark.parametrize(
+    "fields",
+    [
+        ["attribute"],
+        ["content"],
+        ["events.name"],
+        ["attributes..ag"],
+    ],
+)
+def test_unknown_fields_are_rejected(fields):
+    with pytest.raises(FilteringException):
+        parse_formatting(Formatting(fields=fields))
+
+
+def test_truncation_must_be_positive():
+    with pytest.raises(ValidationError):
+        Formatting(truncate=0)
+
+
+def test_legacy_query_bodies_accept_comma_separated_fields():
+    query = parse_query_from_body_request(
+        focus="span",
+        fields="events, attributes.ag.data.outputs",
+        truncate=128,
+    )
+
+    assert query.formatting.fields == ["events", "attributes.ag.data.outputs"]
+    assert query.formatting.truncate == 128
+
+
+class _Result:
+    def __init__(self, rows=()):
+        self._rows = list(rows)
+
+    def all(self):
+        return self._rows
+
+    def scalars(self):
+        raise AssertionError("projections are read as rows")
+
+
+class _FakeSession:
+    def __init__(self, engine):
+        self._engine = engine
+
+    async def execute(self, stmt, params=None):
+        self._engine.executed.append(stmt)
+        return self._engine.results.pop(0) if self._engine.results else _Result()
+
+
+class _FakeEngine:
+    def __init__(self, results=()):
+        self.results = list(results)
+        self.executed: list = []
+
+    @asynccontextmanager
+    async def session(self):
+        yield _FakeSession(self)
+
+
+@pytest.mark.asyncio
+async def test_span_queries_select_the_projection():
+    row = _row(attributes_0='{"answer": "4')
+    engine = _FakeEngine(results=[_Result(), _Result(rows=[row])])
+    dao = TracingDAO(engine=engine)
+
+    [span] = await dao.query(
+        project_id=uuid4(),
+        query=TracingQuery(
+            formatting=Formatting(
+                focus=Focus.SPAN,
+                fields=["attributes.ag.data.outputs"],
+                truncate=13,
+            ),
+        ),
+    )
+
+    assert span.attributes == {"ag": {"data": {"outputs": '{"answer": "4'}}}
+    assert span.events is None
+
+    sql = str(engine.executed[-1].compile(dialect=postgresql.dialect()))
+    assert "AS attributes_0" in sql
+    assert "spans.events" not in sql
+
+
+@pytest.mark.asyncio
+async def test_projected_trace_lookups_are_queried_rather_than_fetched():
+    service = TracingService(tracing_dao=SimpleNamespace())
+    service.fetch = AsyncMock()
+    service.query = AsyncMock(return_value=[])
+    trace_id = UUID(int=1)
+
+    await service.query_span_dtos(
+        project_id=uuid4(),
+        query=TracingQuery(
+            formatting=Formatting(fields=["events"]),
+            filtering=Filtering(
+                conditions=[Condition(field="trace_id", value=trace_id.hex)]
+            ),
+        ),
+    )
+
+    service.fetch.assert_not_awaited()
+    service.query.assert_awaited_once()
@@ -0,0 +1,423 @@
+"""Unit tests for the analytics rollups of the default specs.
+
+No live DB: rollup rows are built and aggregated in Python the way
+`ROLLUPS_QUERY_SQL` aggregates them, and a fake AsyncSession stands in for
+ingest and the coverage lookup.
+"""
+
+import math
+import random
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+
+from oss.src.core.shared.dtos import Windowing
+from oss.src.core.tracing.dtos import (
+    DEFAULT_ANALYTICS_SPECS,
+    Condition,
+    Filtering,
+    ListOperator,
+    LogicalOperator,
+    MetricSpec,
+    MetricType,
+    OTelFlatSpan,
+    TracingQuery,
+)
+from oss.src.dbs.postgres.tracing import rollups
+from oss.src.dbs.postgres.tracing.dao import TracingDAO
+from oss.src.dbs.postgres.tracing.dbes import SpanRollupDBE
+from oss.src.dbs.postgres.tracing.mappings import map_span_dto_to_span_dbe
+from oss.src.dbs.postgres.tracing.rollups import (
+    ROLLUP_HOUR,
+    ROLLUP_MINUTE,
+    ROLLUP_RELATIVE_ACCURACY,
+    assemble_rollup_buckets,
+    build_rollup_rows,
+    match_rollup_scope,
+    sketch_key,
+    sketch_value,
+)
+from oss.src.dbs.postgres.tracing.utils import PERCENTILES_KEYS, PERCENTILES_VALUES
+
+OLDEST = datetime(2025, 6, 1, tzinfo=timezone.utc)
+NEWEST = OLDEST + timedelta(days=1)
+
+SPECS = [MetricSpec(type=t, path=p) for t, p in DEFAULT_ANALYTICS_SPECS]
+
+
+def _root(*, created_at, duration, trace_type="invocation", references=None):
+    return {
+        "parent_id": None,
+        "created_at": created_at,
+        "references": references,
+        "attributes": {
+            "ag": {
+                "type": {"trace": trace_type, "span": "workflow"},
+                "metrics": {
+                    "duration": {"cumulative": duration},
+                    "errors": {"cumulative": 0},
+                },
+            }
+        },
+    }
+
+
+def _aggregate(rows, *, oldest=OLDEST):
+    # ROLLUPS_QUERY_SQL over one whole-day bucket: every hour is whole, so
+    # only hour rows are read.
+    grouped = {}
+    for row in rows:
+        if row["granularity"] != ROLLUP_HOUR or row["scope"] != "":
+            continue
+        group = grouped.setdefault(
+            (row["path"], row["key"]),
+            {"timestamp": oldest, "path": row["path"], "key": row["key"]}
+            | {"count": 0, "sum": None, "min": None, "max": None},
+        )
+        group["count"] += row["count"]
+        if row["sum"] is not None:
+            group["sum"] = (group["sum"] or 0) + row["sum"]
+        for name, pick in (("min", min), ("max", max)):
+            if row[name] is not None:
+                group[name] = (
+                    row[name] if group[name] is None else pick(group[name], row[name])
+                )
+    return list(grouped.values())
+
+
+def _percentile_cont(values, level):
+    values = sorted(values)
+    rank = level * (len(values) - 1)
+    lower, upper = math.floor(rank), math.ceil(rank)
+    return values[lower] + (rank - lower) * (values[upper] - values[lower])
+
+
+def test_sketch_bins_are_within_the_relative_accuracy():
+    for value in (1e-6, 0.37, 1.0, 2.5, 999.0, 123456.789, -42.0):
+        assert abs(sketch_value(sketch_key(value)) - value) <= (
+            ROLLUP_RELATIVE_ACCURACY * abs(value) + 1e-12
+        )
+
+    assert sketch_key(0) == "0"
+    assert sketch_value("0") == 0.0
+
+
+def test_only_root_spans_are_rolled_up_per_scope_and_granularity():
+    project_id = uuid4()
+    created_at = OLDEST + timedelta(minutes=90, seconds=30)
+
+    rows = build_rollup_rows(
+        project_id=project_id,
+        values_list=[
+            _root(created_at=created_at, duration=2.0, references=[{"id": "app"}]),
+            _root(created_at=created_at, duration=4.0) | {"parent_id": uuid4()},
+        ],
+    )
+
+    summary = {
+        (row["scope"], row["granularity"], row["bucket"]): row
+        for row in rows
+        if row["path"] == "attributes.ag.metrics.duration.cumulative"
+        and row["key"] == ""
+    }
+    assert set(summary) == {
+        ("", ROLLUP_MINUTE, OLDEST + timedelta(minutes=90)),
+        ("", ROLLUP_HOUR, OLDEST + timedelta(hours=1)),
+        ("app", ROLLUP_MINUTE, OLDEST + timedelta(minutes=90)),
+        ("app", ROLLUP_HOUR, OLDEST + timedelta(hours=1)),
+    }
+    assert all(
+        (row["count"], row["sum"], row["min"], row["max"]) == (1, 2.0, 2.0, 2.0)
+        for row in summary.values()
+    )
+    # Specs the span has no value for are not rolled up.
+    assert not any(
+        row["path"].startswith("attributes.ag.metrics.costs") for row in rows
+    )
+    assert rows == sorted(
+        rows,
+        key=lambda r: (r["scope"], r["granularity"], r["bucket"], r["path"], r["key"]),
+    )
+
+
+def test_removals_subtract_counts_and_sums_only():
+    rows = build_rollup_rows(
+        project_id=uuid4(),
+        values_list=[_root(created_at=OLDEST, duration=3.0)],
+        sign=-1,
+    )
+
+    duration = [
+        row
+        for row in rows
+        if row["path"] == "attributes.ag.metrics.duration.cumulative"
+        and row["key"] == ""
+    ]
+    assert {(r["count"], r["sum"], r["min"], r["max"]) for r in duration} == {
+        (-1, -3.0, None, None)
+    }
+
+
+def test_rollups_match_the_raw_analytics_of_the_default_specs():
+    random.seed(7)
+    durations = [round(random.lognormvariate(0, 1), 4) for _ in range(500)]
+    trace_types = [random.choice(["invocation", "annotation"]) for _ in durations]
+
+    rows = build_rollup_rows(
+        project_id=uuid4(),
+        values_list=[
+            _root(
+                created_at=OLDEST + timedelta(minutes=idx),
+                duration=duration,
+                trace_type=trace_type,
+            )
+            for idx, (duration, trace_type) in enumerate(zip(durations, trace_types))
+        ],
+    )
+
+    [bucket] = assemble_rollup_buckets(
+        rows=_aggregate(rows),
+        specs=SPECS,
+        interval=24 * 60,
+    )
+
+    assert bucket.timestamp == OLDEST
+    assert bucket.interval == 24 * 60
+
+    duration = bucket.metrics["attributes.ag.metrics.duration.cumulative"]
+    assert duration["type"] == MetricType.NUMERIC_CONTINUOUS.value
+    assert duration["count"] == len(durations)
+    assert duration["sum"] == pytest.approx(sum(durations))
+    assert duration["mean"] == pytest.approx(sum(durations) / len(durations))
+    assert duration["min"] == min(durations)
+    assert duration["max"] == max(durations)
+    assert list(duration["pcts"]) == PERCENTILES_KEYS
+    for key, level in zip(PERCENTILES_KEYS, PERCENTILES_VALUES):
+        exact = _percentile_cont(durations, level)
+        assert duration["pcts"][key] == pytest.approx(
+            exact, rel=2 * ROLLUP_RELATIVE_ACCURACY
+        )
+    assert len(duration["hist"]) == math.ceil(math.sqrt(len(durations)))
+    assert sum(h["count"] for h in duration["hist"]) == len(durations)
+    assert duration["hist"][0]["interval"][0] == min(durations)
+    assert duration["hist"][-1]["interval"][1] == max(durations)
+
+    trace_type = bucket.metrics["attributes.ag.type.trace"]
+    assert trace_type["type"] == MetricType.CATEGORICAL_SINGLE.value
+    assert trace_type["count"] == len(trace_types)
+    assert {f["value"]: f["count"] for f in trace_type["freq"]} == {
+        value: trace_types.count(value) for value in set(trace_types)
+    }
+    assert trace_type["freq"][0]["count"] >= trace_type["freq"][-1]["count"]
+
+    # No span carries costs or tokens: no metric, as on the raw path.
+    assert "attributes.ag.metrics.costs.cumulative.total" not in bucket.metrics
+
+
+@pytest.mark.parametrize(
+    "kwargs, scope",
+    [
+        ({}, ""),
+        ({"rate": 1.0}, ""),
+        ({"rate": 0.5}, None),
+        ({"oldest": OLDEST + timedelta(seconds=1)}, None),
+        ({"specs": SPECS + [MetricSpec(type="string", path="attributes.x")]}, None),
+        ({"specs": [SPECS[0].model_copy(update={"bins": 10})]}, None),
+        (
+            {
+                "filtering": Filtering(
+                    conditions=[
+                        Condition(
+                            field="references",
+                            operator=ListOperator.IN,
+                            value=[{"id": "app"}],
+                        )
+                    ]
+                )
+            },
+            "app",
+        ),
+        (
+            {
+                "filtering": Filtering(
+                    operator=LogicalOperator.NOT,
+                    conditions=[
+                        Condition(
+                            field="references",
+                            operator=ListOperator.IN,
+                            value=[{"id": "app"}],
+                        )
+                    ],
+                )
+            },
+            None,
+        ),
+        (
+            {
+                "filtering": Filtering(
+                    conditions=[
+                        Condition(
+                            field="references",
+                            operator=ListOperator.IN,
+                            value=[{"id": "app"}, {"id": "other"}],
+                        )
+                    ]
+                )
+            },
+            None,
+        ),
+        (
+            {"filtering": Filtering(conditions=[Condition(field="trace_type")])},
+            None,
+        ),
+    ],
+)
+def test_rollups_answer_default_specs_without_sampling_or_other_filters(kwargs, scope):
+    arguments = {
+        "filtering": Filtering(),
+        "specs": SPECS,
+        "rate": None,
+        "oldest": OLDEST,
+        "newest": NEWEST,
+    } | kwargs
+
+    assert match_rollup_scope(**arguments) == scope
+
+
+class _Result:
+    def __init__(self, *, rows=(), scalar=None):
+        self._rows = list(rows)
+        self._scalar = scalar
+
+    def fetchall(self):
+        return self._rows
+
+    def scalar(self):
+        return self._scalar
+
+    def mappings(self):
+        return SimpleNamespace(all=lambda: self._rows)
+
+
+class _FakeSession:
+    def __init__(self, engine):
+        self._engine = engine
+
+    async def execute(self, stmt, params=None):
+        self._engine.executed.append(stmt)
+        return self._engine.results.pop(0) if self._engine.results else _Result()
+
+    async def commit(self):
+        pass
+
+
+class _FakeEngine:
+    def __init__(self, results=()):
+        self.results = list(results)
+        self.executed: list = []
+
+    @asynccontextmanager
+    async def session(self):
+        yield _FakeSession(self)
+
+
+@pytest.mark.asyncio
+async def test_ingest_rolls_up_inserted_root_spans_only():
+    now = datetime.now(timezone.utc)
+    spans = [
+        OTelFlatSpan(
+            trace_id=uuid4().hex,
+            span_id=uuid4().hex,
+            span_name=name,
+            start_time=now,
+            end_time=now + timedelta(seconds=1),
+            attributes={"ag": {"type": {"trace": "invocation"}}},
+        )
+        for name in ("inserted", "re-sent")
+    ]
+    project_id, user_id = uuid4(), uuid4()
+    span_dbes = [
+        map_span_dto_to_span_dbe(project_id=project_id, user_id=user_id, span_dto=span)
+        for span in spans
+    ]
+    returned = [
+        SimpleNamespace(
+            trace_id=span_dbe.trace_id,
+            span_id=span_dbe.span_id,
+            updated_at=updated_at,
+        )
+        for span_dbe, updated_at in zip(span_dbes, (None, now))
+    ]
+    engine = _FakeEngine(results=[_Result(rows=returned)])
+    dao = TracingDAO(engine=engine)
+
+    await dao.ingest(project_id=project_id, user_id=user_id, span_dtos=spans)
+
+    upserts = [
+        stmt
+        for stmt in engine.executed
+        if getattr(stmt, "table", None) is not None
+        and stmt.table.name == SpanRollupDBE.__tablename__
+    ]
+    assert len(upserts) == 1
+    # Multi-row VALUES: one dict of column -> bind per row.
+    rows = [
+        {
+            getattr(column, "key", column): getattr(value, "value", value)
+            for column, value in row.items()
+        }
+        for row in upserts[0]._multi_values[0]
+    ]
+    counted = {
+        (row["granularity"], row["key"]): row["count"]
+        for row in rows
+        if row["path"] == "attributes.ag.type.trace"
+    }
+    assert counted == {
+        (ROLLUP_MINUTE, ""): 1,
+        (ROLLUP_MINUTE, "=invocation"): 1,
+        (ROLLUP_HOUR, ""): 1,
+        (ROLLUP_HOUR, "=invocation"): 1,
+    }
+    # Coverage is recorded once per project and DAO: the spans, their trace
+    # summaries and coverage, then the rollups and their coverage.
+    assert len(engine.executed) == 5
+
+
+@pytest.mark.asyncio
+async def test_analytics_read_spans_before_the_coverage_and_rollups_after():
+    since = OLDEST + timedelta(hours=5, minutes=10)
+    engine = _FakeEngine(results=[_Result(scalar=since)])
+    dao = TracingDAO(engine=engine)
+    dao._analytics_from_spans = AsyncMock(return_value=[])
+
+    await dao.analytics(
+        project_id=uuid4(),
+        query=TracingQuery(
+            windowing=Windowing(oldest=OLDEST, newest=NEWEST, interval=60)
+        ),
+        specs=SPECS,
+    )
+
+    # Raw up to the first whole bucket after the coverage starts.
+    windowing = dao._analytics_from_spans.await_args.kwargs["query"].windowing
+    assert windowing.oldest == OLDEST
+    assert windowing.newest == OLDEST + timedelta(hours=6)
+    assert engine.executed[-1] is rollups.ROLLUPS_QUERY_SQL
+
+
+@pytest.mark.asyncio
+async def test_analytics_read_spans_without_coverage():
+    engine = _FakeEngine(results=[_Result(scalar=None)])
+    dao = TracingDAO(engine=engine)
+    dao._analytics_from_spans = AsyncMock(return_value=[])
+
+    query = TracingQuery(windowing=Windowing(oldest=OLDEST, newest=NEWEST))
+    await dao.analytics(project_id=uuid4(), query=query, specs=SPECS)
+
+    dao._analytics_from_spans.assert_awaited_once()
+    assert dao._analytics_from_spans.await_args.kwargs["query"] is query
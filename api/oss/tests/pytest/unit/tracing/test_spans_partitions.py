@@ -0,0 +1,173 @@
+"""Unit tests for the daily range partitions of the spans table.
+
+No live DB: a fake AsyncSession answers the catalog lookups and records the DDL,
+so the partitions `ensure_partitions` creates (and the ones it leaves alone)
+can be asserted without Postgres.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+
+from oss.src.dbs.postgres.tracing import partitions
+from oss.src.dbs.postgres.tracing.partitions import (
+    SpansPartitionsDAO,
+    _quote_partition,
+    parse_partition_bound,
+    partition_bounds,
+    partition_name,
+)
+from oss.src.tasks.asyncio.tracing.worker import TracingWorker
+
+
+class _Result:
+    def __init__(self, *, scalar=None, rows=()):
+        self._scalar = scalar
+        self._rows = list(rows)
+
+    def scalar(self):
+        return self._scalar
+
+    def fetchall(self):
+        return self._rows
+
+
+class _FakeSession:
+    def __init__(self, engine):
+        self._engine = engine
+
+    async def execute(self, stmt, params=None):
+        if stmt is partitions.IS_PARTITIONED_SQL:
+            return _Result(scalar=self._engine.is_partitioned)
+        if stmt is partitions.FETCH_PARTITIONS_SQL:
+            return _Result(rows=self._engine.existing)
+        self._engine.executed.append(str(stmt))
+        return _Result()
+
+    async def commit(self):
+        self._engine.commits += 1
+
+
+class _FakeEngine:
+    def __init__(self, *, is_partitioned=True, existing=()):
+        self.is_partitioned = is_partitioned
+        self.existing = list(existing)
+        self.executed: list = []
+        self.commits = 0
+
+    @asynccontextmanager
+    async def session(self):
+        yield _FakeSession(self)
+
+
+def test_partition_names_and_bounds_are_utc_days():
+    lower, upper = partition_bounds(date(2025, 1, 31))
+
+    assert partition_name(date(2025, 1, 31)) == "spans_20250131"
+    assert lower == datetime(2025, 1, 31, tzinfo=timezone.utc)
+    assert upper == datetime(2025, 2, 1, tzinfo=timezone.utc)
+
+
+def test_partition_bounds_are_read_from_the_catalog():
+    assert parse_partition_bound(
+        "FOR VALUES FROM ('2025-01-31 00:00:00+00') TO ('2025-02-01 00:00:00+00')"
+    ) == (
+        datetime(2025, 1, 31, tzinfo=timezone.utc),
+        datetime(2025, 2, 1, tzinfo=timezone.utc),
+    )
+    assert parse_partition_bound(
+        "FOR VALUES FROM (MINVALUE) TO ('2025-01-31 02:00:00+02')"
+    ) == (None, datetime(2025, 1, 31, tzinfo=timezone.utc))
+    assert parse_partition_bound("DEFAULT") == (None, None)
+
+
+def test_only_spans_partitions_reach_the_ddl():
+    assert _quote_partition("spans_20250131") == 'public."spans_20250131"'
+    assert _quote_partition("spans_legacy") == 'public."spans_legacy"'
+
+    for name in ("spans", "spans_2025", 'spans_20250131"; DROP TABLE spans; --'):
+        with pytest.raises(ValueError):
+            _quote_partition(name)
+
+
+@pytest.mark.asyncio
+async def test_ensure_partitions_creates_the_missing_days_only():
+    engine = _FakeEngine(
+        existing=[
+            ("spans_default", "DEFAULT"),
+            (
+                "spans_legacy",
+                "FOR VALUES FROM (MINVALUE) TO ('2025-01-31 00:00:00+00')",
+            ),
+            (
+                "spans_20250131",
+                "FOR VALUES FROM ('2025-01-31 00:00:00+00') "
+                "TO ('2025-02-01 00:00:00+00')",
+            ),
+        ]
+    )
+    dao = SpansPartitionsDAO(engine=engine)
+
+    created = await dao.ensure_partitions(
+        now=datetime(2025, 1, 30, 23, 0, tzinfo=timezone.utc),
+        ahead=3,
+    )
+
+    # The 30th is still the legacy partition's, the 31st exists.
+    assert created == ["spans_20250201", "spans_20250202"]
+    assert engine.commits == 1
+
+    attached = [sql for sql in engine.executed if "ATTACH PARTITION" in sql]
+    assert len(attached) == 2
+    assert (
+        "FROM ('2025-02-01T00:00:00+00:00') TO ('2025-02-02T00:00:00+00:00')"
+        in (attached[0])
+    )
+    # Rows of the new day are moved out of the default partition first.
+    moved = [sql for sql in engine.executed if "DELETE FROM" in sql]
+    assert all('public."spans_default"' in sql for sql in moved)
+
+
+@pytest.mark.asyncio
+async def test_ensure_partitions_leaves_an_unpartitioned_table_alone():
+    engine = _FakeEngine(is_partitioned=False)
+
+    assert await SpansPartitionsDAO(engine=engine).ensure_partitions() == []
+    assert engine.executed == []
+
+
+@pytest.mark.asyncio
+async def test_tracing_worker_keeps_partitions_ahead_best_effort():
+    service = AsyncMock()
+    service.ensure_partitions = AsyncMock(side_effect=[RuntimeError("db down"), []])
+
+    worker = TracingWorker(
+        service=service,
+        redis_client=None,
+        stream_name="streams:spans",
+        consumer_group="worker-spans",
+    )
+    assert worker.maintenance_interval_s
+
+    worker.maintenance_interval_s = 0
+    task = asyncio.create_task(worker._maintain_forever())
+    while service.ensure_partitions.await_count < 2:
+        await asyncio.sleep(0)
+    task.cancel()
+
+    # A failed run does not stop the next one.
+    assert service.ensure_partitions.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_the_legacy_partition_is_never_compacted():
+    engine = _FakeEngine(existing=[])
+    dao = SpansPartitionsDAO(engine=engine)
+
+    with pytest.raises(ValueError):
+        await dao.compact_partition(partition="spans_legacy", project_ids=[])
+
+    assert engine.executed == []
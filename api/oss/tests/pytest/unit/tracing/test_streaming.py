@@ -0,0 +1,164 @@
+"""Unit tests for the batch-framed span messages on streams:spans.
+
+No live Redis: `publish_spans` is pointed at a fake pipeline that records the
+XADDs, so the one-entry-per-request framing and the chunking of large requests
+can be asserted without a server.
+"""
+
+import zlib
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from orjson import dumps
+
+from oss.src.core.tracing import streaming
+from oss.src.core.tracing.dtos import OTelFlatSpan
+from oss.src.core.tracing.streaming import (
+    deserialize_spans,
+    publish_spans,
+    serialize_spans,
+)
+
+
+class _FakePipeline:
+    def __init__(self, xadds: list):
+        self._xadds = xadds
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def xadd(self, **kwargs):
+        self._xadds.append(kwargs)
+
+    async def execute(self):
+        return []
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.xadds: list = []
+
+    def pipeline(self, transaction=False):
+        return _FakePipeline(self.xadds)
+
+
+def _span(*, trace_id: str, name: str = "span") -> OTelFlatSpan:
+    now = datetime.now(timezone.utc)
+    return OTelFlatSpan(
+        trace_id=trace_id,
+        span_id=uuid4().hex,
+        span_name=name,
+        start_time=now,
+        end_time=now,
+        attributes={"ag": {"type": {"span": "task"}}},
+    )
+
+
+def test_serialize_spans_round_trips_header_and_spans():
+    organization_id, project_id, user_id = uuid4(), uuid4(), uuid4()
+    trace_id = uuid4().hex
+    spans = [_span(trace_id=trace_id, name=f"s{i}") for i in range(3)]
+
+    msg = deserialize_spans(
+        spans_bytes=serialize_spans(
+            organization_id=organization_id,
+            project_id=project_id,
+            user_id=user_id,
+            span_dtos=spans,
+        )
+    )
+
+    assert msg.organization_id == organization_id
+    assert msg.project_id == project_id
+    assert msg.user_id == user_id
+    assert [s.span_name for s in msg.span_dtos] == ["s0", "s1", "s2"]
+    assert msg.span_dtos[0].attributes == {"ag": {"type": {"span": "task"}}}
+
+
+def test_deserialize_spans_accepts_legacy_single_span_entries():
+    organization_id, project_id, user_id = uuid4(), uuid4(), uuid4()
+    span = _span(trace_id=uuid4().hex, name="legacy")
+    legacy = zlib.compress(
+        dumps(
+            dict(
+                organization_id=organization_id.hex,
+                project_id=project_id.hex,
+                user_id=user_id.hex,
+                span_dto=span.model_dump(mode="json", exclude_unset=True),
+            )
+        )
+    )
+
+    msg = deserialize_spans(spans_bytes=legacy)
+
+    assert msg.project_id == project_id
+    assert [s.span_name for s in msg.span_dtos] == ["legacy"]
+
+
+def test_deserialize_spans_skips_invalid_spans_only():
+    organization_id, project_id, user_id = uuid4(), uuid4(), uuid4()
+    trace_id = uuid4().hex
+    spans = [
+        _span(trace_id=trace_id, name=name).model_dump(mode="json", exclude_unset=True)
+        for name in ("before", "after")
+    ]
+    message = zlib.compress(
+        dumps(
+            dict(
+                organization_id=organization_id.hex,
+                project_id=project_id.hex,
+                user_id=user_id.hex,
+                span_dtos=[spans[0], {"span_name": "no ids"}, spans[1]],
+            )
+        )
+    )
+
+    msg = deserialize_spans(spans_bytes=message)
+
+    assert [s.span_name for s in msg.span_dtos] == ["before", "after"]
+
+
+@pytest.mark.asyncio
+async def test_publish_spans_writes_one_entry_per_request(monkeypatch):
+    redis = _FakeRedis()
+    monkeypatch.setattr(streaming, "_get_redis", lambda: redis)
+    project_id = uuid4()
+    trace_id = uuid4().hex
+
+    count = await publish_spans(
+        organization_id=uuid4(),
+        project_id=project_id,
+        user_id=uuid4(),
+        span_dtos=[_span(trace_id=trace_id) for _ in range(20)],
+    )
+
+    assert count == 20
+    assert len(redis.xadds) == 1
+    assert redis.xadds[0]["fields"]["key"] == project_id.hex
+    msg = deserialize_spans(spans_bytes=redis.xadds[0]["fields"]["data"])
+    assert len(msg.span_dtos) == 20
+
+
+@pytest.mark.asyncio
+async def test_publish_spans_chunks_large_requests(monkeypatch):
+    redis = _FakeRedis()
+    monkeypatch.setattr(streaming, "_get_redis", lambda: redis)
+    monkeypatch.setattr(streaming, "MAX_SPANS_PER_MESSAGE", 8)
+    trace_id = uuid4().hex
+
+    count = await publish_spans(
+        organization_id=uuid4(),
+        project_id=uuid4(),
+        user_id=uuid4(),
+        span_dtos=[_span(trace_id=trace_id) for _ in range(20)],
+    )
+
+    assert count == 20
+    assert [
+        len(deserialize_spans(spans_bytes=x["fields"]["data"]).span_dtos)
+        for x in redis.xadds
+    ] == [8, 8, 4]
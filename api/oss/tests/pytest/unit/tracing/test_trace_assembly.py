@@ -0,0 +1,354 @@
+"""Assembly of traces split across ingest batches.
+
+The tracing worker holds the spans of a trace until its tree is whole (or a
+timeout passes), runs the ingest passes once on it, and ACKs a stream message
+only once none of its spans are held. Spans arriving after the release
+re-aggregate their ancestors, which are written again.
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+
+from oss.src.core.tracing.assembly import TraceAssembler
+from oss.src.core.tracing.dtos import OTelFlatSpan
+from oss.src.core.tracing.streaming import serialize_spans
+from oss.src.tasks.asyncio.tracing.worker import TracingWorker
+from oss.src.utils import env as env_module
+
+
+def _span(*, trace_id, parent_id=None, tokens=0.0, offset_s=0) -> OTelFlatSpan:
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=offset_s)
+    return OTelFlatSpan(
+        trace_id=trace_id,
+        span_id=uuid4().hex,
+        parent_id=parent_id,
+        span_name="span",
+        start_time=start,
+        end_time=start,
+        attributes={
+            "ag": {
+                "type": {"span": "task"},
+                "metrics": {"tokens": {"incremental": {"total": tokens}}},
+            }
+        },
+    )
+
+
+def _cumulative_tokens(span: OTelFlatSpan) -> float:
+    return span.attributes["ag"]["metrics"]["tokens"]["cumulative"]["total"]
+
+
+def _by_id(assembled):
+    return {span.span_id: span for spans in assembled.values() for span in spans}
+
+
+def test_whole_trace_is_released_at_once():
+    project_id, user_id, trace_id = uuid4(), uuid4(), uuid4().hex
+    root = _span(trace_id=trace_id, tokens=1)
+    child = _span(trace_id=trace_id, parent_id=root.span_id, tokens=2, offset_s=1)
+
+    assembler = TraceAssembler()
+    assembler.add(
+        project_id=project_id,
+        user_id=user_id,
+        span_dtos=[child, root],
+        message_id=b"1-0",
+        now=0,
+    )
+
+    assembled, released, _ = assembler.pop_ready(now=0)
+
+    assert released == [b"1-0"]
+    assert list(assembled) == [(project_id, user_id)]
+    assert _cumulative_tokens(_by_id(assembled)[root.span_id]) == 3
+
+
+def test_split_trace_is_held_until_its_root_arrives():
+    project_id, user_id, trace_id = uuid4(), uuid4(), uuid4().hex
+    root = _span(trace_id=trace_id, tokens=1)
+    child = _span(trace_id=trace_id, parent_id=root.span_id, tokens=2, offset_s=1)
+
+    assembler = TraceAssembler()
+    assembler.add(
+        project_id=project_id,
+        user_id=user_id,
+        span_dtos=[child],
+        message_id=b"1-0",
+        now=0,
+    )
+
+    assert assembler.pop_ready(now=1) == ({}, [], set())
+    assert assembler.is_held(b"1-0")
+
+    assembler.add(
+        project_id=project_id,
+        user_id=user_id,
+        span_dtos=[root],
+        message_id=b"2-0",
+        now=2,
+    )
+    assembled, released, _ = assembler.pop_ready(now=2)
+
+    assert sorted(released) == [b"1-0", b"2-0"]
+    assert not assembler.is_held(b"1-0")
+    # Cumulated once, on the whole tree.
+    assert _cumulative_tokens(_by_id(assembled)[root.span_id]) == 3
+
+
+def test_trace_without_root_is_released_after_max_wait():
+    project_id, trace_id = uuid4(), uuid4().hex
+    orphan = _span(trace_id=trace_id, parent_id=uuid4().hex)
+
+    assembler = TraceAssembler(max_wait_s=5)
+    assembler.add(
+        project_id=project_id,
+        user_id=uuid4(),
+        span_dtos=[orphan],
+        message_id=b"1-0",
+        now=0,
+    )
+
+    assert assembler.pop_ready(now=4.9) == ({}, [], set())
+
+    assembled, released, _ = assembler.pop_ready(now=5)
+
+    assert released == [b"1-0"]
+    assert list(_by_id(assembled)) == [orphan.span_id]
+
+
+def test_late_span_rewrites_only_itself_and_its_ancestors():
+    project_id, user_id, trace_id = uuid4(), uuid4(), uuid4().hex
+    root = _span(trace_id=trace_id, tokens=1)
+    parent = _span(trace_id=trace_id, parent_id=root.span_id, tokens=2, offset_s=1)
+    sibling = _span(trace_id=trace_id, parent_id=root.span_id, tokens=4, offset_s=2)
+
+    assembler = TraceAssembler(late_window_s=60)
+    assembler.add(
+        project_id=project_id,
+        user_id=user_id,
+        span_dtos=[root, parent, sibling],
+        now=0,
+    )
+    first, _, rewritten = assembler.pop_ready(now=0)
+    assert _cumulative_tokens(_by_id(first)[root.span_id]) == 7
+
+    late = _span(trace_id=trace_id, parent_id=parent.span_id, tokens=8, offset_s=3)
+    assembler.add(
+        project_id=project_id,
+        user_id=user_id,
+        span_dtos=[late],
+        message_id=b"2-0",
+        now=10,
+    )
+    assert rewritten == set()
+    assembled, released, rewritten = assembler.pop_ready(now=10)
+
+    spans = _by_id(assembled)
+    assert released == [b"2-0"]
+    assert set(spans) == {root.span_id, parent.span_id, late.span_id}
+    assert rewritten == {
+        (project_id, trace_id, root.span_id),
+        (project_id, trace_id, parent.span_id),
+    }
+    assert _cumulative_tokens(spans[parent.span_id]) == 10
+    assert _cumulative_tokens(spans[root.span_id]) == 15
+    # The spans written the first time are not mutated behind the DAO's back.
+    assert _cumulative_tokens(_by_id(first)[root.span_id]) == 7
+
+
+def test_late_merges_count_each_remembered_tree_once():
+    project_id, user_id = uuid4(), uuid4()
+    roots = [_span(trace_id=uuid4().hex) for _ in range(2)]
+
+    assembler = TraceAssembler(late_window_s=60, max_spans=100)
+    assembler.add(project_id=project_id, user_id=user_id, span_dtos=roots, now=0)
+    assembler.pop_ready(now=0)
+
+    for step in range(1, 6):
+        for root in roots:
+            late = _span(trace_id=root.trace_id, parent_id=root.span_id, offset_s=step)
+            assembler.add(
+                project_id=project_id, user_id=user_id, span_dtos=[late], now=step
+            )
+        assembler.pop_ready(now=step)
+
+    # Each tree is its root and five late children, and both are remembered.
+    assert len(assembler._closed) == 2
+    assert assembler._closed_spans == sum(
+        len(closed.spans) for closed in assembler._closed.values()
+    )
+    assert assembler._closed_spans == 12
+
+
+def test_a_zero_late_window_remembers_nothing(monkeypatch):
+    monkeypatch.setenv("AGENTA_TRACING_ASSEMBLY_LATE_WINDOW_MS", "0")
+    assert (
+        env_module._parse_non_negative_int_env(
+            "AGENTA_TRACING_ASSEMBLY_LATE_WINDOW_MS", 60 * 1000
+        )
+        == 0
+    )
+
+    root = _span(trace_id=uuid4().hex)
+    assembler = TraceAssembler(late_window_s=0)
+    assembler.add(project_id=uuid4(), user_id=uuid4(), span_dtos=[root], now=0)
+    assembler.pop_ready(now=0)
+
+    assert assembler._closed_spans == 0
+    assert not assembler._closed
+
+
+def test_late_span_past_the_window_waits_for_its_parent():
+    project_id, trace_id = uuid4(), uuid4().hex
+    root = _span(trace_id=trace_id)
+
+    assembler = TraceAssembler(max_wait_s=5, late_window_s=60)
+    assembler.add(project_id=project_id, user_id=uuid4(), span_dtos=[root], now=0)
+    assembler.pop_ready(now=0)
+
+    late = _span(trace_id=trace_id, parent_id=root.span_id, offset_s=1)
+    assembler.add(project_id=project_id, user_id=uuid4(), span_dtos=[late], now=61)
+
+    assert assembler.pop_ready(now=61) == ({}, [], set())
+    assert list(_by_id(assembler.pop_ready(now=66)[0])) == [late.span_id]
+
+
+def test_overflow_releases_the_oldest_traces():
+    project_id = uuid4()
+    old, new = uuid4().hex, uuid4().hex
+
+    assembler = TraceAssembler(max_spans=2)
+    for trace_id, message_id in ((old, b"1-0"), (new, b"2-0")):
+        assembler.add(
+            project_id=project_id,
+            user_id=uuid4(),
+            span_dtos=[
+                _span(trace_id=trace_id, parent_id=uuid4().hex),
+                _span(trace_id=trace_id, parent_id=uuid4().hex),
+            ],
+            message_id=message_id,
+            now=0,
+        )
+
+    _, released, _ = assembler.pop_ready(now=0)
+
+    assert released == [b"1-0"]
+    assert assembler.is_held(b"2-0")
+
+
+def test_release_can_be_limited_to_some_projects():
+    project_a, project_b = uuid4(), uuid4()
+
+    assembler = TraceAssembler()
+    for project_id, message_id in ((project_a, b"1-0"), (project_b, b"2-0")):
+        assembler.add(
+            project_id=project_id,
+            user_id=uuid4(),
+            span_dtos=[_span(trace_id=uuid4().hex)],
+            message_id=message_id,
+            now=0,
+        )
+
+    assert assembler.pop_ready(project_ids={project_a}, now=0)[1] == [b"1-0"]
+    assert assembler.open_project_ids() == {project_b}
+
+
+def _message(*, project_id, spans):
+    return serialize_spans(
+        organization_id=uuid4(),
+        project_id=project_id,
+        user_id=uuid4(),
+        span_dtos=spans,
+    )
+
+
+@pytest.mark.asyncio
+async def test_worker_acks_a_held_message_once_its_trace_is_released():
+    project_id, trace_id = uuid4(), uuid4().hex
+    root = _span(trace_id=trace_id, tokens=1)
+    child = _span(trace_id=trace_id, parent_id=root.span_id, tokens=2, offset_s=1)
+
+    service = AsyncMock()
+    worker = TracingWorker(
+        service=service,
+        redis_client=None,
+        stream_name="streams:spans",
+        consumer_group="worker-spans",
+    )
+
+    processed, ids = await worker.process_batch(
+        [(b"1-0", {b"data": _message(project_id=project_id, spans=[child])})]
+    )
+
+    assert (processed, ids) == (1, [])
+    service.ingest.assert_not_awaited()
+
+    processed, ids = await worker.process_batch(
+        [(b"2-0", {b"data": _message(project_id=project_id, spans=[root])})]
+    )
+
+    assert processed == 1
+    assert sorted(ids) == [b"1-0", b"2-0"]
+    service.ingest.assert_awaited_once()
+    span_dtos = service.ingest.await_args.kwargs["span_dtos"]
+    assert {span.span_id for span in span_dtos} == {root.span_id, child.span_id}
+    assert max(_cumulative_tokens(span) for span in span_dtos) == 3
+
+
+@pytest.mark.asyncio
+async def test_worker_flushes_held_traces_on_release():
+    project_id = uuid4()
+    orphan = _span(trace_id=uuid4().hex, parent_id=uuid4().hex)
+
+    service = AsyncMock()
+    worker = TracingWorker(
+        service=service,
+        redis_client=None,
+        stream_name="streams:spans",
+        consumer_group="worker-spans",
+    )
+
+    _, ids = await worker.process_batch(
+        [(b"1-0", {b"data": _message(project_id=project_id, spans=[orphan])})]
+    )
+    assert ids == []
+
+    assert await worker.release(project_id, flush=True) == [b"1-0"]
+    service.ingest.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_worker_does_not_hand_rewritten_ancestors_to_the_listener():
+    project_id, trace_id = uuid4(), uuid4().hex
+    root = _span(trace_id=trace_id, tokens=1)
+    late = _span(trace_id=trace_id, parent_id=root.span_id, tokens=2, offset_s=1)
+
+    listened: list = []
+
+    class _Listener:
+        async def spans_ingested(self, *, project_id, span_dtos):
+            listened.append({span.span_id for span in span_dtos})
+
+    service = AsyncMock()
+    worker = TracingWorker(
+        service=service,
+        redis_client=None,
+        stream_name="streams:spans",
+        consumer_group="worker-spans",
+        ingest_listener=_Listener(),
+        assembler=TraceAssembler(late_window_s=60),
+    )
+
+    for message_id, span in ((b"1-0", root), (b"2-0", late)):
+        await worker.process_batch(
+            [(message_id, {b"data": _message(project_id=project_id, spans=[span])})]
+        )
+
+    # The root is written again with the late span's tokens, but it is not
+    # new: handing it over again would push its trace into live runs twice.
+    written = service.ingest.await_args.kwargs["span_dtos"]
+    assert {span.span_id for span in written} == {root.span_id, late.span_id}
+    assert listened == [{root.span_id}, {late.span_id}]
@@ -0,0 +1,345 @@
+"""Unit tests for the trace summaries behind trace lists.
+
+No live DB: summary rows are built in Python, filters are compiled, and a fake
+AsyncSession stands in for the coverage lookup, the page of traces and the
+spans of that page.
+"""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from oss.src.core.shared.dtos import Windowing
+from oss.src.core.tracing.dtos import (
+    Condition,
+    Filtering,
+    Focus,
+    Formatting,
+    LogicalOperator,
+    OTelFlatSpan,
+    SpanType,
+    TraceType,
+    TracingQuery,
+)
+from oss.src.dbs.postgres.tracing.dao import TracingDAO
+from oss.src.dbs.postgres.tracing.mappings import map_span_dto_to_span_dbe
+from oss.src.dbs.postgres.tracing.summaries import (
+    adapt_to_traces,
+    build_trace_summary_rows,
+    match_trace_filtering,
+)
+from oss.src.dbs.postgres.tracing.utils import combine, filter
+
+NOW = datetime(2025, 6, 1, tzinfo=timezone.utc)
+SINCE = NOW - timedelta(days=1)
+
+PROJECT_ID = uuid4()
+
+
+def _span(*, trace_id, parent_id=None, offset_s=0, references=None, **kwargs):
+    start = NOW + timedelta(seconds=offset_s)
+    return OTelFlatSpan(
+        trace_id=trace_id,
+        span_id=uuid4().hex,
+        parent_id=parent_id,
+        trace_type=TraceType.INVOCATION,
+        span_type=SpanType.TASK,
+        span_name="root" if parent_id is None else "child",
+        start_time=start,
+        end_time=start + timedelta(seconds=1),
+        references=references,
+        attributes={
+            "ag": {
+                "metrics": {
+                    "costs": {"cumulative": {"total": 0.5}},
+                    "tokens": {"cumulative": {"total": 30}},
+                }
+            }
+        },
+        **kwargs,
+    )
+
+
+def _values(span: OTelFlatSpan) -> dict:
+    span_dbe = map_span_dto_to_span_dbe(
+        project_id=PROJECT_ID,
+        user_id=uuid4(),
+        span_dto=span,
+    )
+    return {c.name: getattr(span_dbe, c.name) for c in span_dbe.__table__.columns}
+
+
+def _reference(slug: str) -> dict:
+    return {"id": str(uuid4()), "slug": slug, "attributes": {"key": "application"}}
+
+
+def test_a_trace_is_summarized_over_its_spans_and_off_its_root():
+    trace_id = uuid4().hex
+    shared = _reference("app")
+    root = _span(trace_id=trace_id, offset_s=1, session_id="s-1", references=[shared])
+    child = _span(
+        trace_id=trace_id,
+        parent_id=root.span_id,
+        offset_s=0,
+        references=[shared, _reference("other")],
+    )
+    later = _span(trace_id=trace_id, parent_id=root.span_id, offset_s=5)
+
+    [row] = build_trace_summary_rows(
+        project_id=PROJECT_ID,
+        values_list=[_values(span) for span in (child, root, later)],
+    )
+
+    assert row["start_time"] == NOW
+    assert row["end_time"] == NOW + timedelta(seconds=6)
+    assert row["span_name"] == "root"
+    assert row["session_id"] == "s-1"
+    assert (row["costs"], row["tokens"]) == (0.5, 30)
+    # Each reference once, wherever it was seen.
+    assert len(row["references"]) == 2
+
+
+def test_a_trace_without_its_root_has_no_root_columns():
+    trace_id = uuid4().hex
+    orphan = _span(trace_id=trace_id, parent_id=uuid4().hex)
+
+    [row] = build_trace_summary_rows(
+        project_id=PROJECT_ID,
+        values_list=[_values(orphan)],
+    )
+
+    assert row["span_id"] is None
+    assert row["span_name"] is None
+    assert row["costs"] is None
+    assert row["trace_type"] == TraceType.INVOCATION
+    assert row["references"] is None
+
+
+def _session(value="s-1", operator="is"):
+    return Condition(field="session_id", operator=operator, value=value)
+
+
+def _trace_type(value="invocation", operator="is"):
+    return Condition(field="trace_type", operator=operator, value=value)
+
+
+def _references(*ids, all=False):
+    return Condition(
+        field="references",
+        operator="in",
+        value=[{"id": str(id)} for id in ids],
+        options={"all": all},
+    )
+
+
+@pytest.mark.parametrize(
+    "filtering, matched",
+    [
+        (None, True),
+        (Filtering(), True),
+        # Every span of a trace agrees on these, so any operator goes.
+        (Filtering(conditions=[_trace_type(operator="is_not")]), True),
+        (
+            Filtering(operator=LogicalOperator.NOT, conditions=[_trace_type()]),
+            True,
+        ),
+        # Only the root has a session: some span has it iff the root has it.
+        (Filtering(conditions=[_session()]), True),
+        (Filtering(conditions=[_session(operator="startswith")]), True),
+        # ... but every child lacks one.
+        (Filtering(conditions=[_session(operator="is_not")]), False),
+        (Filtering(conditions=[_session(operator="not_exists", value=None)]), False),
+        (Filtering(conditions=[_references(uuid4(), uuid4())]), True),
+        (Filtering(conditions=[_references(uuid4(), uuid4(), all=True)]), False),
+        # Root conditions hold together on the root ...
+        (Filtering(conditions=[_session(), _trace_type()]), True),
+        (
+            Filtering(
+                conditions=[
+                    _session(),
+                    Condition(field="user_id", operator="in", value=["u-1"]),
+                ]
+            ),
+            True,
+        ),
+        # ... but a root condition and a reference may hold on two spans.
+        (Filtering(conditions=[_session(), _references(uuid4())]), False),
+        (
+            Filtering(
+                operator=LogicalOperator.OR,
+                conditions=[_session(), _references(uuid4())],
+            ),
+            True,
+        ),
+        (
+            Filtering(
+                conditions=[
+                    _trace_type(),
+                    Filtering(
+                        operator=LogicalOperator.OR,
+                        conditions=[_references(uuid4()), _references(uuid4())],
+                    ),
+                ]
+            ),
+            True,
+        ),
+        (Filtering(conditions=[Condition(field="span_name", value="x")]), False),
+        (
+            Filtering(
+                conditions=[
+                    Condition(field="attributes", key="ag.type.span", value="llm")
+                ]
+            ),
+            False,
+        ),
+    ],
+)
+def test_summaries_answer_filters_whose_truth_they_carry(filtering, matched):
+    assert match_trace_filtering(filtering) is matched
+
+
+def test_filters_are_compiled_on_the_summary_columns():
+    clause = combine(
+        operator=LogicalOperator.OR,
+        clauses=filter([_session(), _references(uuid4())]),
+    )
+
+    sql = str(adapt_to_traces(clause).compile(dialect=postgresql.dialect()))
+
+    assert "traces.session_id" in sql
+    assert 'traces."references" @>' in sql
+    assert "spans" not in sql
+
+
+class _Result:
+    def __init__(self, *, rows=(), scalar=None):
+        self._rows = list(rows)
+        self._scalar = scalar
+
+    def scalar(self):
+        return self._scalar
+
+    def all(self):
+        return self._rows
+
+    def scalars(self):
+        return SimpleNamespace(all=lambda: self._rows)
+
+
+class _FakeSession:
+    def __init__(self, engine):
+        self._engine = engine
+
+    async def execute(self, stmt, params=None):
+        self._engine.executed.append(stmt)
+        return self._engine.results.pop(0) if self._engine.results else _Result()
+
+
+class _FakeEngine:
+    def __init__(self, results=()):
+        self.results = list(results)
+        self.executed: list = []
+
+    @asynccontextmanager
+    async def session(self):
+        yield _FakeSession(self)
+
+
+def _trace_query(**windowing):
+    return TracingQuery(
+        formatting=Formatting(focus=Focus.TRACE),
+        windowing=Windowing(**windowing),
+    )
+
+
+@pytest.mark.asyncio
+async def test_a_page_of_traces_loads_the_spans_of_that_page_only():
+    newer, older = uuid4().hex, uuid4().hex
+    newer_root = _span(trace_id=newer, offset_s=10)
+    spans = [
+        _span(trace_id=older),
+        _span(trace_id=newer, parent_id=newer_root.span_id, offset_s=11),
+        newer_root,
+    ]
+    span_dbes = sorted(
+        (
+            map_span_dto_to_span_dbe(project_id=PROJECT_ID, user_id=uuid4(), span_dto=s)
+            for s in spans
+        ),
+        key=lambda span_dbe: span_dbe.start_time,
+    )
+    traces = [
+        SimpleNamespace(trace_id=span_dbes[1].trace_id, start_time=NOW),
+        SimpleNamespace(trace_id=span_dbes[0].trace_id, start_time=NOW),
+    ]
+    engine = _FakeEngine(
+        results=[
+            _Result(scalar=SINCE),
+            _Result(),  # timeout
+            _Result(rows=traces),
+            _Result(rows=span_dbes),
+        ]
+    )
+    dao = TracingDAO(engine=engine)
+    dao.query = AsyncMock(return_value=[])
+
+    span_dtos = await dao._query_from_trace_summaries(
+        project_id=PROJECT_ID,
+        query=_trace_query(oldest=SINCE, limit=2),
+    )
+
+    # In the order of the page, each trace's spans by start time.
+    assert [(UUID(span.trace_id).hex, span.span_name) for span in span_dtos] == [
+        (newer, "root"),
+        (newer, "child"),
+        (older, "root"),
+    ]
+    # The page is full and the window within the coverage: no spans scan.
+    dao.query.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_traces_before_the_coverage_are_listed_from_the_spans():
+    engine = _FakeEngine(results=[_Result(scalar=SINCE), _Result(), _Result()])
+    dao = TracingDAO(engine=engine)
+    older = [_span(trace_id=uuid4().hex)]
+    dao.query = AsyncMock(return_value=older)
+
+    span_dtos = await dao._query_from_trace_summaries(
+        project_id=PROJECT_ID,
+        query=_trace_query(newest=NOW, limit=10),
+    )
+
+    assert span_dtos == older
+    windowing = dao.query.await_args.kwargs["query"].windowing
+    assert (windowing.newest, windowing.next, windowing.limit) == (SINCE, None, 10)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "since, query",
+    [
+        (None, _trace_query()),
+        (SINCE, _trace_query(newest=SINCE)),
+        (
+            SINCE,
+            TracingQuery(
+                filtering=Filtering(conditions=[Condition(field="span_name")])
+            ),
+        ),
+    ],
+)
+async def test_trace_lists_fall_back_to_the_spans(since, query):
+    engine = _FakeEngine(results=[_Result(scalar=since)])
+    dao = TracingDAO(engine=engine)
+
+    assert (
+        await dao._query_from_trace_summaries(project_id=PROJECT_ID, query=query)
+        is None
+    )
+    assert len(engine.executed) <= 1
@@ -0,0 +1,226 @@
+"""Read-your-writes for `GET /tracing/traces/{trace_id}?wait=...`.
+
+The ingestion worker announces each trace strictly AFTER `ingest` commits it, once
+per distinct trace in a project batch; the publish is best-effort and never fails
+the loop. The endpoint's waiter re-reads on that announcement instead of sleep-
+polling, and gives up at its deadline with the last miss.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+
+from oss.src.apis.fastapi.tracing.watch import wait_for_trace
+from oss.src.core.tracing.dtos import OTelFlatSpan
+from oss.src.core.tracing.interfaces import TracingWatchPublisherInterface
+from oss.src.core.tracing.streaming import serialize_spans
+from oss.src.dbs.redis.tracing.watch import TracingWatchPublisher, trace_watch_channel
+from oss.src.tasks.asyncio.tracing.worker import TracingWorker
+
+
+def _span(*, trace_id: str) -> OTelFlatSpan:
+    now = datetime.now(timezone.utc)
+    return OTelFlatSpan(
+        trace_id=trace_id,
+        span_id=uuid4().hex,
+        span_name="span",
+        start_time=now,
+        end_time=now,
+        attributes={"ag": {"type": {"span": "task"}}},
+    )
+
+
+def _message(*, project_id, spans):
+    return serialize_spans(
+        organization_id=uuid4(),
+        project_id=project_id,
+        user_id=uuid4(),
+        span_dtos=spans,
+    )
+
+
+class _RecordingPublisher:
+    def __init__(self, *, fail: bool = False, journal=None):
+        self.calls: list = []
+        self.fail = fail
+        self.journal = journal
+
+    async def traces_committed(self, *, project_id, trace_ids) -> None:
+        if self.fail:
+            raise RuntimeError("relay down")
+        self.calls.append((project_id, sorted(trace_ids)))
+        if self.journal is not None:
+            self.journal.append("publish")
+
+
+def _worker(service, publisher):
+    return TracingWorker(
+        service=service,
+        redis_client=None,
+        stream_name="streams:spans",
+        consumer_group="worker-spans",
+        watch_publisher=publisher,
+    )
+
+
+def test_publisher_satisfies_the_core_interface():
+    assert isinstance(TracingWatchPublisher(), TracingWatchPublisherInterface)
+
+
+def test_channel_normalizes_dashed_and_bare_ids():
+    project_id, trace_id = uuid4(), uuid4()
+
+    assert trace_watch_channel(str(project_id), str(trace_id)) == trace_watch_channel(
+        project_id.hex, trace_id.hex
+    )
+
+
+@pytest.mark.asyncio
+async def test_worker_publishes_committed_traces_after_ingest():
+    project_id = uuid4()
+    trace_a, trace_b = uuid4().hex, uuid4().hex
+    journal: list = []
+
+    service = AsyncMock()
+    service.ingest = AsyncMock(side_effect=lambda **_: journal.append("ingest"))
+    publisher = _RecordingPublisher(journal=journal)
+
+    spans = [_span(trace_id=trace_a), _span(trace_id=trace_a), _span(trace_id=trace_b)]
+    batch = [(b"1-0", {b"data": _message(project_id=project_id, spans=spans)})]
+
+    processed, ids = await _worker(service, publisher).process_batch(batch)
+
+    assert processed == 3
+    assert ids == [b"1-0"]
+    assert journal == ["ingest", "publish"]
+    (published_project, published_traces), *rest = publisher.calls
+    assert not rest
+    assert published_project == str(project_id)
+    assert {trace_watch_channel(str(project_id), t) for t in published_traces} == {
+        trace_watch_channel(str(project_id), trace_a),
+        trace_watch_channel(str(project_id), trace_b),
+    }
+
+
+@pytest.mark.asyncio
+async def test_worker_skips_publish_when_ingest_fails():
+    service = AsyncMock()
+    service.ingest = AsyncMock(side_effect=RuntimeError("db down"))
+    publisher = _RecordingPublisher()
+
+    batch = [
+        (
+            b"1-0",
+            {
+                b"data": _message(
+                    project_id=uuid4(), spans=[_span(trace_id=uuid4().hex)]
+                )
+            },
+        )
+    ]
+    await _worker(service, publisher).process_batch(batch)
+
+    assert publisher.calls == []
+
+
+@pytest.mark.asyncio
+async def test_worker_survives_publisher_failure():
+    service = AsyncMock()
+    batch = [
+        (
+            b"1-0",
+            {
+                b"data": _message(
+                    project_id=uuid4(), spans=[_span(trace_id=uuid4().hex)]
+                )
+            },
+        )
+    ]
+
+    processed, ids = await _worker(
+        service, _RecordingPublisher(fail=True)
+    ).process_batch(batch)
+
+    assert processed == 1
+    assert ids == [b"1-0"]
+
+
+@pytest.mark.asyncio
+async def test_publisher_swallows_redis_failure():
+    broken = AsyncMock()
+    broken.pipeline = lambda **_: (_ for _ in ()).throw(ConnectionError("redis gone"))
+
+    # Must not raise — the relay is strictly best-effort.
+    await TracingWatchPublisher(redis_client=broken).traces_committed(
+        project_id=str(uuid4()), trace_ids=[uuid4().hex]
+    )
+
+
+@pytest.mark.asyncio
+async def test_wait_returns_once_the_commit_is_announced():
+    import fakeredis
+
+    redis = fakeredis.FakeAsyncRedis()
+    project_id, trace_id = str(uuid4()), uuid4().hex
+    stored: dict = {}
+
+    async def fetch():
+        return stored.get(trace_id)
+
+    async def commit_later():
+        await asyncio.sleep(0.1)
+        stored[trace_id] = {"trace_id": trace_id}
+        await TracingWatchPublisher(redis_client=redis).traces_committed(
+            project_id=project_id, trace_ids=[trace_id]
+        )
+
+    committer = asyncio.create_task(commit_later())
+    started = asyncio.get_running_loop().time()
+    trace = await wait_for_trace(
+        channel=trace_watch_channel(project_id, trace_id),
+        pubsub_factory=redis.pubsub,
+        fetch=fetch,
+        timeout=5.0,
+    )
+    await committer
+
+    assert trace == {"trace_id": trace_id}
+    assert asyncio.get_running_loop().time() - started < 2.0
+
+
+@pytest.mark.asyncio
+async def test_wait_reads_once_more_after_subscribing():
+    import fakeredis
+
+    # Committed between the endpoint's first miss and the subscription: no
+    # announcement will come, but the read after subscribing finds it.
+    fetch = AsyncMock(return_value={"trace_id": "t"})
+
+    trace = await wait_for_trace(
+        channel="watch:p:trace:t",
+        pubsub_factory=fakeredis.FakeAsyncRedis().pubsub,
+        fetch=fetch,
+        timeout=5.0,
+    )
+
+    assert trace == {"trace_id": "t"}
+    assert fetch.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_wait_gives_up_at_the_deadline():
+    import fakeredis
+
+    fetch = AsyncMock(return_value=None)
+
+    trace = await wait_for_trace(
+        channel="watch:p:trace:t",
+        pubsub_factory=fakeredis.FakeAsyncRedis().pubsub,
+        fetch=fetch,
+        timeout=0.2,
+    )
+
+    assert trace is None
@@ -0,0 +1,177 @@
+import pytest
+
+from oss.src.core.tracing.utils import pricing
+from oss.src.core.tracing.utils.pricing import (
+    ModelPrice,
+    ModelPricing,
+    get_model_pricing,
+)
+
+
+INPUT_RATE = 0.30 / 1_000_000
+CACHED_RATE = INPUT_RATE / 10
+OUTPUT_RATE = 2.50 / 1_000_000
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """A linear pricer, modelling litellm's contract, that counts its calls."""
+    seen = []
+
+    def _priced(model, prompt_tokens, completion_tokens, cache_read_input_tokens=0):
+        seen.append(model)
+        # Mapped names only, case included, as litellm's model map.
+        if model not in ("gpt-4o", "gpt-4o-mini"):
+            raise ValueError("model not mapped")
+        fresh = prompt_tokens - cache_read_input_tokens
+        return (
+            fresh * INPUT_RATE + cache_read_input_tokens * CACHED_RATE,
+            completion_tokens * OUTPUT_RATE,
+        )
+
+    monkeypatch.setattr(pricing.cost_calculator, "cost_per_token", _priced)
+
+    return seen
+
+
+def test_rates_are_read_once_per_model_then_applied(calls):
+    model_pricing = ModelPricing()
+
+    for _ in range(3):
+        prompt_cost, completion_cost = model_pricing.costs(
+            model="gpt-4o-mini",
+            prompt_tokens=25978,
+            completion_tokens=100,
+            cache_read_tokens=24540,
+        )
+
+        assert prompt_cost == pytest.approx(1438 * INPUT_RATE + 24540 * CACHED_RATE)
+        assert completion_cost == pytest.approx(100 * OUTPUT_RATE)
+
+    assert len(calls) == 4
+
+
+def test_a_name_litellm_cannot_price_does_not_unprice_its_mapped_spelling(calls):
+    model_pricing = ModelPricing()
+
+    with pytest.raises(ValueError):
+        model_pricing.costs(model="GPT-4o", prompt_tokens=1, completion_tokens=1)
+
+    prompt_cost, completion_cost = model_pricing.costs(
+        model="gpt-4o", prompt_tokens=1_000, completion_tokens=100
+    )
+
+    assert prompt_cost == pytest.approx(1_000 * INPUT_RATE)
+    assert completion_cost == pytest.approx(100 * OUTPUT_RATE)
+
+
+def test_non_linear_models_are_priced_by_litellm_per_call(monkeypatch):
+    calls = []
+
+    def _tiered(model, prompt_tokens, completion_tokens, cache_read_input_tokens=0):
+        calls.append(prompt_tokens)
+        rate = INPUT_RATE * (2 if prompt_tokens > 200_000 else 1)
+        return prompt_tokens * rate, completion_tokens * OUTPUT_RATE
+
+    monkeypatch.setattr(pricing.cost_calculator, "cost_per_token", _tiered)
+    model_pricing = ModelPricing()
+
+    costs = [
+        model_pricing.costs(model="tiered", prompt_tokens=tokens, completion_tokens=0)
+        for tokens in (1_000, 300_000)
+    ]
+
+    assert costs[0][0] == pytest.approx(1_000 * INPUT_RATE)
+    assert costs[1][0] == pytest.approx(300_000 * INPUT_RATE * 2)
+    assert calls[-2:] == [1_000, 300_000]
+
+
+def test_a_model_without_price_has_no_costs_until_it_is_read_again(monkeypatch, calls):
+    now = 1_000.0
+    monkeypatch.setattr(pricing.time, "monotonic", lambda: now)
+    model_pricing = ModelPricing()
+
+    with pytest.raises(ValueError):
+        model_pricing.costs(model="unknown", prompt_tokens=1, completion_tokens=1)
+
+    reads = len(calls)
+
+    assert (
+        model_pricing.costs(model="unknown", prompt_tokens=1, completion_tokens=1)
+        is None
+    )
+    assert model_pricing.costs(model=None, prompt_tokens=1, completion_tokens=1) is None
+    assert len(calls) == reads
+
+    # The failure may have been transient: the rates are read again, later.
+    now += pricing._UNPRICED_TTL
+
+    with pytest.raises(ValueError):
+        model_pricing.costs(model="unknown", prompt_tokens=1, completion_tokens=1)
+
+    assert len(calls) > reads
+
+
+def test_overrides_price_models_litellm_does_not_know(calls):
+    model_pricing = ModelPricing(
+        overrides={
+            "My-Llama": ModelPrice.parse(
+                {"input_cost_per_token": 1e-7, "output_cost_per_token": 2e-7}
+            )
+        }
+    )
+
+    prompt_cost, completion_cost = model_pricing.costs(
+        model="my-llama",
+        prompt_tokens=1_000,
+        completion_tokens=100,
+        cache_read_tokens=500,
+    )
+
+    # Without a cache-read rate, cached tokens are billed as fresh input.
+    assert prompt_cost == pytest.approx(1_000 * 1e-7)
+    assert completion_cost == pytest.approx(100 * 2e-7)
+    assert calls == []
+
+
+def test_env_prices_are_loaded_once(monkeypatch, calls):
+    monkeypatch.setattr(
+        pricing.env.agenta.api.tracing,
+        "model_prices",
+        {
+            "self-hosted": {
+                "input_cost_per_token": 1e-6,
+                "output_cost_per_token": 3e-6,
+                "cache_read_input_token_cost": 1e-7,
+            },
+            "broken": {"input_cost_per_token": 1e-6},
+        },
+    )
+
+    monkeypatch.setattr(pricing, "_model_pricing", None)
+
+    model_pricing = get_model_pricing()
+
+    assert get_model_pricing() is model_pricing
+    assert model_pricing.overrides == {
+        "self-hosted": ModelPrice(prompt=1e-6, completion=3e-6, cache_read=1e-7)
+    }
+
+
+def test_rates_agree_with_litellm():
+    """The arithmetic bills what litellm bills, cached slice included."""
+    litellm_costs = pricing.cost_calculator.cost_per_token(
+        model="gpt-4o-mini",
+        prompt_tokens=25978,
+        completion_tokens=100,
+        cache_read_input_tokens=24540,
+    )
+
+    costs = ModelPricing().costs(
+        model="gpt-4o-mini",
+        prompt_tokens=25978,
+        completion_tokens=100,
+        cache_read_tokens=24540,
+    )
+
+    assert costs == pytest.approx(litellm_costs)
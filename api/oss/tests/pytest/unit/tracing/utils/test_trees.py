@@ -7,6 +7,7 @@ import pytest
 from agenta.sdk.models.tracing import OTelLink
 from oss.src.core.shared.dtos import Trace
 from oss.src.core.tracing.dtos import OTelFlatSpan, OTelSpan, SpanType, TraceType
+from oss.src.core.tracing.utils import pricing
 from oss.src.core.tracing.utils.trees import (
     calculate_and_propagate_metrics,
     calculate_costs,
@@ -30,6 +31,13 @@ CHILD_A_UUID = "41d6cfe0-4b90-11ec-41d6-cfe04b9011ec"
 CHILD_B_UUID = "51d6cfe0-4b90-11ec-51d6-cfe04b9011ec"
 
 
+@pytest.fixture(autouse=True)
+def _fresh_model_pricing(monkeypatch):
+    # Rates are read off the (patched) pricer once per model; start each test
+    # without the ones an earlier test read.
+    monkeypatch.setattr(pricing, "_model_pricing", None)
+
+
 def _span(
     *,
     span_id: str,
@@ -225,7 +233,7 @@ def test_calculate_costs_sets_incremental_values_for_cost_supported_types(monkey
     span_idx = {span.span_id: span}
 
     monkeypatch.setattr(
-        "oss.src.core.tracing.utils.trees.cost_calculator.cost_per_token",
+        "oss.src.core.tracing.utils.pricing.cost_calculator.cost_per_token",
         lambda **_: (0.12, 0.34),
     )
 
@@ -249,7 +257,7 @@ def test_calculate_costs_swallows_calculation_errors(monkeypatch):
         raise RuntimeError("boom")
 
     monkeypatch.setattr(
-        "oss.src.core.tracing.utils.trees.cost_calculator.cost_per_token",
+        "oss.src.core.tracing.utils.pricing.cost_calculator.cost_per_token",
         _raise,
     )
 
@@ -286,7 +294,7 @@ def test_calculate_costs_passes_cached_tokens_to_the_pricer(
         return (0.005, 0.001)
 
     monkeypatch.setattr(
-        "oss.src.core.tracing.utils.trees.cost_calculator.cost_per_token",
+        "oss.src.core.tracing.utils.pricing.cost_calculator.cost_per_token",
         _capture,
     )
 
@@ -326,7 +334,7 @@ def test_calculate_costs_sends_the_cached_count_as_an_int(monkeypatch):
         return (0.001, 0.002)
 
     monkeypatch.setattr(
-        "oss.src.core.tracing.utils.trees.cost_calculator.cost_per_token",
+        "oss.src.core.tracing.utils.pricing.cost_calculator.cost_per_token",
         _capture,
     )
 
@@ -358,7 +366,7 @@ def test_calculate_costs_omits_cache_kwarg_when_nothing_was_cached(monkeypatch):
         return (0.1, 0.2)
 
     monkeypatch.setattr(
-        "oss.src.core.tracing.utils.trees.cost_calculator.cost_per_token",
+        "oss.src.core.tracing.utils.pricing.cost_calculator.cost_per_token",
         _legacy_signature,
     )
 
@@ -386,7 +394,7 @@ def test_calculate_costs_ignores_a_zero_cached_count(monkeypatch):
         return (0.1, 0.2)
 
     monkeypatch.setattr(
-        "oss.src.core.tracing.utils.trees.cost_calculator.cost_per_token",
+        "oss.src.core.tracing.utils.pricing.cost_calculator.cost_per_token",
         _legacy_signature,
     )
 
@@ -419,7 +427,7 @@ def test_calculate_costs_ignores_a_non_numeric_cached_count(monkeypatch):
         return (0.1, 0.2)
 
     monkeypatch.setattr(
-        "oss.src.core.tracing.utils.trees.cost_calculator.cost_per_token",
+        "oss.src.core.tracing.utils.pricing.cost_calculator.cost_per_token",
         _legacy_signature,
     )
 
@@ -451,7 +459,7 @@ def test_calculate_costs_ignores_a_negative_cached_count(monkeypatch):
         return (0.1, 0.2)
 
     monkeypatch.setattr(
-        "oss.src.core.tracing.utils.trees.cost_calculator.cost_per_token",
+        "oss.src.core.tracing.utils.pricing.cost_calculator.cost_per_token",
         _legacy_signature,
     )
 
@@ -485,7 +493,7 @@ def test_calculate_costs_prefers_cache_read_over_cached_when_both_present(monkey
         return (0.001, 0.002)
 
     monkeypatch.setattr(
-        "oss.src.core.tracing.utils.trees.cost_calculator.cost_per_token",
+        "oss.src.core.tracing.utils.pricing.cost_calculator.cost_per_token",
         _capture,
     )
 
@@ -513,7 +521,7 @@ def test_calculate_costs_bills_cached_tokens_below_fresh_input(monkeypatch):
         )
 
     monkeypatch.setattr(
-        "oss.src.core.tracing.utils.trees.cost_calculator.cost_per_token",
+        "oss.src.core.tracing.utils.pricing.cost_calculator.cost_per_token",
         _priced,
     )
 
@@ -570,7 +578,7 @@ def test_calculate_and_propagate_metrics_runs_full_pipeline(monkeypatch):
     )
 
     monkeypatch.setattr(
-        "oss.src.core.tracing.utils.trees.cost_calculator.cost_per_token",
+        "oss.src.core.tracing.utils.pricing.cost_calculator.cost_per_token",
         lambda model, prompt_tokens, completion_tokens: (
             prompt_tokens * 0.01,
             completion_tokens * 0.02,
@@ -0,0 +1,342 @@
+"""Unit tests for the cache layers: tag-indexed invalidation in Redis, and the
+process-local L1 tier with its pub/sub invalidation.
+
+No live Redis: a fake client keeps keys and sets in dicts, runs pipelines
+in order, and fans PUBLISH out to every fake subscription, so a second
+`_LocalCache` can stand in for another gunicorn worker and the cross-process
+eviction can be asserted in-process.
+"""
+
+import asyncio
+from fnmatch import fnmatchcase
+
+import pytest
+from redis.exceptions import ResponseError
+
+from oss.src.utils import caching
+from oss.src.utils.caching import _LocalCache
+from oss.src.utils.env import env
+
+
+class _FakePubSub:
+    def __init__(self, redis):
+        self._redis = redis
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+    async def subscribe(self, _channel):
+        self._redis.subscribers.append(self._queue)
+
+    async def get_message(self, ignore_subscribe_messages=True, timeout=None):
+        if self._redis.broken:
+            raise ConnectionError("connection lost")
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def aclose(self):
+        if self._queue in self._redis.subscribers:
+            self._redis.subscribers.remove(self._queue)
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self._redis = redis
+        self._calls: list = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        def _queue(*args, **kwargs):
+            self._calls.append((name, args, kwargs))
+
+        return _queue
+
+    async def execute(self):
+        return [
+            await getattr(self._redis, name)(*args, **kwargs)
+            for name, args, kwargs in self._calls
+        ]
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data: dict = {}
+        self.sets: dict = {}
+        self.gets = 0
+        self.scans = 0
+        self.subscribers: list = []
+        self.broken = False
+
+    async def get(self, name):
+        self.gets += 1
+        return self.data.get(name)
+
+    async def set(self, name, value, px=None, nx=False, ex=None):
+        if nx and name in self.data:
+            return None
+        self.data[name] = value
+        return True
+
+    async def delete(self, *names):
+        return sum(
+            1
+            for name in names
+            if self.data.pop(name, None) is not None
+            or self.sets.pop(name, None) is not None
+        )
+
+    unlink = delete
+
+    async def exists(self, name):
+        return int(name in self.data or name in self.sets)
+
+    async def expire(self, name, ttl):
+        return True
+
+    async def pexpire(self, name, ttl, nx=False, gt=False):
+        return True
+
+    async def scan(self, cursor=0, match=None, count=None):
+        self.scans += 1
+        return 0, [k for k in self.data if fnmatchcase(k, match)]
+
+    async def sadd(self, name, *members):
+        self.sets.setdefault(name, set()).update(members)
+
+    async def srem(self, name, *members):
+        self.sets.get(name, set()).difference_update(members)
+
+    async def srandmember(self, name, count):
+        return list(self.sets.get(name, set()))[:count]
+
+    async def sscan(self, name, cursor=0, count=None):
+        return 0, list(self.sets.get(name, set()))
+
+    async def rename(self, src, dst):
+        if src not in self.sets:
+            raise ResponseError("no such key")
+        self.sets[dst] = self.sets.pop(src)
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    async def publish(self, _channel, data):
+        for queue in self.subscribers:
+            queue.put_nowait({"type": "message", "data": data})
+
+    def pubsub(self):
+        return _FakePubSub(self)
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    fake = _FakeRedis()
+    monkeypatch.setattr(env.agenta.api.caching, "enabled", True, raising=False)
+    monkeypatch.setattr(caching, "_cache_engine", fake)
+    monkeypatch.setattr(caching, "AGENTA_CACHE_INVALIDATION_POLL", 0.01)
+    return fake
+
+
+def _local(maxsize: int = 16) -> _LocalCache:
+    return _LocalCache(
+        namespaces=frozenset({"auth"}),
+        maxsize=maxsize,
+        ttl=60,
+    )
+
+
+async def _listening(*locals_: _LocalCache):
+    for local in locals_:
+        local._ensure_listener()
+    while not all(local.listening for local in locals_):
+        await asyncio.sleep(0)
+
+
+async def _until(predicate, timeout: float = 1.0):
+    async def _poll():
+        while not predicate():
+            await asyncio.sleep(0.005)
+
+    await asyncio.wait_for(_poll(), timeout)
+
+
+@pytest.mark.asyncio
+async def test_l1_serves_repeated_reads_without_redis(redis, monkeypatch):
+    local = _local()
+    monkeypatch.setattr(caching, "local_cache", local)
+    await _listening(local)
+
+    await caching.set_cache(namespace="auth", key="token", value={"user": "u1"})
+    redis_gets = redis.gets
+
+    for _ in range(3):
+        assert await caching.get_cache(namespace="auth", key="token") == {"user": "u1"}
+
+    assert redis.gets == redis_gets
+    assert local.stats()["l1_hits"] == 3
+    local._listener.cancel()
+
+
+@pytest.mark.asyncio
+async def test_other_worker_write_evicts_local_copy(redis, monkeypatch):
+    local, peer = _local(), _local()
+    monkeypatch.setattr(caching, "local_cache", local)
+    await _listening(local, peer)
+
+    await caching.set_cache(namespace="auth", key="token", value={"user": "u1"})
+    assert await caching.get_cache(namespace="auth", key="token") == {"user": "u1"}
+
+    # Another worker replaces the value.
+    name = caching.pack(namespace="auth", key="token")
+    redis.data[name] = b'{"user":"u2"}'
+    await peer.publish(b"k", name)
+    await _until(lambda: name not in local.entries)
+
+    assert await caching.get_cache(namespace="auth", key="token") == {"user": "u2"}
+    local._listener.cancel()
+    peer._listener.cancel()
+
+
+@pytest.mark.asyncio
+async def test_pattern_invalidation_reaches_every_worker(redis, monkeypatch):
+    local, peer = _local(), _local()
+    await _listening(local, peer)
+
+    monkeypatch.setattr(caching, "local_cache", peer)
+    await caching.set_cache(namespace="auth", key="a", value=1, project_id="p1")
+    monkeypatch.setattr(caching, "local_cache", local)
+    await caching.get_cache(namespace="auth", key="a", project_id="p1")
+    assert len(local.entries) == 1
+
+    monkeypatch.setattr(caching, "local_cache", peer)
+    await caching.invalidate_cache(namespace="auth", project_id="p1")
+
+    await _until(lambda: len(local.entries) == 0)
+    assert len(peer.entries) == 0
+    local._listener.cancel()
+    peer._listener.cancel()
+
+
+@pytest.mark.asyncio
+async def test_read_racing_an_invalidation_is_not_backfilled(redis):
+    local = _local()
+    await _listening(local)
+
+    generation = local.generation
+    local.evict(b"k", "cache:other")
+
+    local.put("cache:stale", b"1", generation)
+
+    assert "cache:stale" not in local.entries
+    local._listener.cancel()
+
+
+@pytest.mark.asyncio
+async def test_namespaces_not_opted_in_always_read_redis(redis, monkeypatch):
+    local = _local()
+    monkeypatch.setattr(caching, "local_cache", local)
+
+    await caching.set_cache(namespace="webhooks", key="k", value=[1])
+    await caching.get_cache(namespace="webhooks", key="k")
+    await caching.get_cache(namespace="webhooks", key="k")
+
+    assert redis.gets == 2
+    assert len(local.entries) == 0
+    assert local._listener is None
+
+
+@pytest.mark.asyncio
+async def test_lost_subscription_clears_and_bypasses_l1(redis, monkeypatch):
+    monkeypatch.setattr(caching, "AGENTA_CACHE_INVALIDATION_BACKOFF", 3600)
+    local = _local()
+    monkeypatch.setattr(caching, "local_cache", local)
+    await _listening(local)
+
+    await caching.set_cache(namespace="auth", key="token", value=1)
+    assert len(local.entries) == 1
+
+    redis.broken = True
+    await _until(lambda: not local.listening)
+
+    assert len(local.entries) == 0
+    redis_gets = redis.gets
+    await caching.get_cache(namespace="auth", key="token")
+    assert redis.gets == redis_gets + 1
+    assert len(local.entries) == 0
+    local._listener.cancel()
+
+
+def test_l1_is_bounded():
+    local = _local(maxsize=4)
+    local.listening = True
+
+    for i in range(10):
+        local.put(f"cache:{i}", b"1", local.generation)
+
+    assert len(local.entries) == 4
+
+
+# TAG INDEX --------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_invalidate_by_scope_uses_tags_not_scan(redis, monkeypatch):
+    monkeypatch.setattr(caching, "local_cache", _local())
+
+    await caching.set_cache(namespace="apps", key="a", value=1, project_id="p1")
+    await caching.set_cache(namespace="apps", key="b", value=2, project_id="p1")
+    await caching.set_cache(namespace="envs", key="a", value=3, project_id="p1")
+    await caching.set_cache(namespace="apps", key="a", value=4, project_id="p2")
+
+    await caching.invalidate_cache(namespace="apps", project_id="p1")
+
+    assert redis.scans == 0
+    remaining = sorted(redis.data)
+    assert remaining == sorted(
+        [
+            caching.pack(namespace="envs", key="a", project_id="p1"),
+            caching.pack(namespace="apps", key="a", project_id="p2"),
+        ]
+    )
+    # The flushed tag is gone, the others still index their keys.
+    assert caching._tag(namespace="apps", project_id="p1") not in redis.sets
+    assert caching._tag(namespace="envs", project_id="p1") in redis.sets
+
+
+@pytest.mark.asyncio
+async def test_invalidate_whole_project_flushes_every_namespace(redis, monkeypatch):
+    monkeypatch.setattr(caching, "local_cache", _local())
+
+    await caching.set_cache(namespace="apps", key="a", value=1, project_id="p1")
+    await caching.set_cache(namespace="envs", key="a", value=2, project_id="p1")
+    await caching.set_cache(namespace="apps", key="a", value=3, project_id="p2")
+
+    await caching.invalidate_cache(project_id="p1")
+
+    assert list(redis.data) == [
+        caching.pack(namespace="apps", key="a", project_id="p2")
+    ]
+
+
+@pytest.mark.asyncio
+async def test_invalidate_unknown_scope_is_a_noop(redis, monkeypatch):
+    monkeypatch.setattr(caching, "local_cache", _local())
+
+    assert await caching.invalidate_cache(namespace="apps", project_id="p9") is True
+    assert redis.scans == 0
+
+
+@pytest.mark.asyncio
+async def test_prune_drops_members_whose_keys_expired(redis):
+    tag = caching._tag(namespace="apps", project_id="p1")
+    redis.sets[tag] = {"cache:live", "cache:expired"}
+    redis.data["cache:live"] = b"1"
+
+    await caching._prune_tag(tag)
+
+    assert redis.sets[tag] == {"cache:live"}
@@ -0,0 +1,146 @@
+"""Cache invalidation latency: keyspace SCAN vs tag-indexed invalidate_cache.
+
+    cd api && uv run python ../benchmarks/cache-invalidation/run_benchmark.py
+    cd api && uv run python ../benchmarks/cache-invalidation/run_benchmark.py --sizes 10000 100000 --rounds 5
+
+Needs the volatile Redis the API caches in, addressed the same way the API addresses it:
+REDIS_URI_VOLATILE (or REDIS_URI). Every key and tag is written under random project ids and
+removed afterwards, so the benchmark can run against a shared development Redis. Use an idle
+instance for stable numbers: the SCAN leg's cost is the size of the whole keyspace, not just
+the keys written here.
+
+WHAT IS COMPARED
+
+  scan    SCAN MATCH cache:p:<project>:u:*:<namespace>:* in 500-key pages, DEL in batches
+          (invalidate_cache before tag indexing)
+  tags    invalidate_cache: RENAME the scope's tag set aside, SSCAN it, UNLINK in batches
+
+Each size N fills Redis with N cache entries spread over 1000 projects (as set_cache writes
+them, tags included), then invalidates one namespace of one project (N / 1000 keys) per round.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import pathlib
+import statistics
+import sys
+import time
+from uuid import uuid4
+
+API_ROOT = pathlib.Path(__file__).resolve().parents[2] / "api"
+sys.path.insert(0, str(API_ROOT))
+
+from oss.src.utils import caching  # noqa: E402
+from oss.src.utils.env import env  # noqa: E402
+
+PROJECTS = 1000
+NAMESPACE = "bench"
+WRITE_BATCH = 10_000
+SCAN_BATCH = 500  # the page size invalidate_cache used to SCAN with
+
+
+async def fill(redis, project_ids: list[str], per_project: int) -> None:
+    """Write per_project entries for every project, with the tags set_cache adds."""
+    ttl_ms = caching.AGENTA_CACHE_TTL * 1000
+    pending = 0
+    pipe = redis.pipeline(transaction=False)
+    for project_id in project_ids:
+        tags = (
+            caching._tag(namespace=NAMESPACE, project_id=project_id),
+            caching._tag(project_id=project_id),
+        )
+        for i in range(per_project):
+            name = caching.pack(namespace=NAMESPACE, key=str(i), project_id=project_id)
+            pipe.set(name, b"1", px=ttl_ms)
+            for tag in tags:
+                pipe.sadd(tag, name)
+            pending += 1
+            if pending >= WRITE_BATCH:
+                await pipe.execute()
+                pending = 0
+        for tag in tags:
+            pipe.pexpire(tag, ttl_ms)
+    await pipe.execute()
+
+
+async def refill(redis, project_id: str, per_project: int) -> None:
+    await fill(redis, [project_id], per_project)
+
+
+async def invalidate_scan(redis, project_id: str) -> int:
+    pattern = caching.pack(namespace=NAMESPACE, project_id=project_id, pattern=True)
+    keys = []
+    cursor = 0
+    while True:
+        cursor, batch = await redis.scan(cursor=cursor, match=pattern, count=SCAN_BATCH)
+        keys.extend(batch)
+        if cursor == 0:
+            break
+    deleted = 0
+    for i in range(0, len(keys), caching.AGENTA_CACHE_DELETE_BATCH_SIZE):
+        deleted += await redis.delete(
+            *keys[i : i + caching.AGENTA_CACHE_DELETE_BATCH_SIZE]
+        )
+    return deleted
+
+
+async def invalidate_tags(redis, project_id: str) -> None:
+    await caching.invalidate_cache(namespace=NAMESPACE, project_id=project_id)
+
+
+async def measure(redis, n: int, rounds: int) -> dict[str, list[float]]:
+    project_ids = [uuid4().hex for _ in range(PROJECTS)]
+    per_project = max(1, n // PROJECTS)
+    await fill(redis, project_ids, per_project)
+
+    timings: dict[str, list[float]] = {"scan": [], "tags": []}
+    try:
+        for r in range(rounds):
+            project_id = project_ids[r % PROJECTS]
+            for leg, invalidate in (
+                ("scan", invalidate_scan),
+                ("tags", invalidate_tags),
+            ):
+                started = time.perf_counter()
+                await invalidate(redis, project_id)
+                timings[leg].append((time.perf_counter() - started) * 1000)
+                await refill(redis, project_id, per_project)
+    finally:
+        for project_id in project_ids:
+            await caching.invalidate_cache(project_id=project_id)
+            await caching.invalidate_cache(namespace=NAMESPACE, project_id=project_id)
+    return timings
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    env.agenta.api.caching.enabled = True
+    redis = caching._cache_engine
+
+    print(
+        "| cached keys | keys invalidated | scan ms (median) | tags ms (median) | speedup |"
+    )
+    print("|---:|---:|---:|---:|---:|")
+    for n in args.sizes:
+        timings = await measure(redis, n, args.rounds)
+        scan = statistics.median(timings["scan"])
+        tags = statistics.median(timings["tags"])
+        print(
+            f"| {n:,} | {max(1, n // PROJECTS):,} | {scan:,.1f} | {tags:,.1f} "
+            f"| {scan / tags:.0f}x |"
+        )
+
+    await redis.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,224 @@
+"""Event-loop latency under OTLP load: inline decoding vs the off-loop OTLP decoder.
+
+    cd api && uv run python ../benchmarks/otlp-ingest-load/run_benchmark.py
+    cd api && uv run python ../benchmarks/otlp-ingest-load/run_benchmark.py --spans 2000 --senders 8 --seconds 20
+
+Runs a minimal FastAPI app on uvicorn in a server process: the real OTLPRouter plus an
+unrelated `GET /health`. Publishing is stubbed (no Redis) and access checks are allowed, so the only work
+on the OTLP path is the decode stage this benchmark is about. While `--senders` clients post
+OTLP batches back to back, a prober calls `/health` every 10ms and records its latency.
+
+WHAT IS COMPARED
+
+  inline    decode on the event loop (OTLPRouter before offloading)
+  thread    OTLPDecoder(processes=0): default thread pool, bounded admission
+  process   OTLPDecoder(processes=N): spawned process pool, bounded admission
+
+Reported per leg: /health p50/p99/max, OTLP batches accepted, OTLP batches shed with 503.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+import pathlib
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+from uuid import uuid4
+
+API_ROOT = pathlib.Path(__file__).resolve().parents[2] / "api"
+sys.path.insert(0, str(API_ROOT))
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+from fastapi import FastAPI, Request  # noqa: E402
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import (  # noqa: E402
+    ExportTraceServiceRequest,
+)
+
+from oss.src.apis.fastapi.otlp import router as otlp_router  # noqa: E402
+from oss.src.apis.fastapi.otlp.utils.decoding import (  # noqa: E402
+    DecodedOTLP,
+    OTLPDecoder,
+    OTLPDecoderSaturated,
+    decode_otlp_stream,
+)
+
+PORT = 8765
+PROBE_INTERVAL_S = 0.01
+
+
+class InlineDecoder(OTLPDecoder):
+    """The pre-offload behaviour: decode synchronously on the event loop."""
+
+    async def decode(self, otlp_stream: bytes, is_json: bool = False) -> DecodedOTLP:
+        if self.saturated:
+            self.rejected += 1
+            raise OTLPDecoderSaturated()
+        return decode_otlp_stream(otlp_stream, is_json)
+
+
+class NullTracingService:
+    async def ingest_span_dtos(self, **kwargs):
+        return []
+
+
+def make_payload(n: int) -> bytes:
+    """One OTLP request with n spans in traces of 10, with realistic attributes."""
+    request = ExportTraceServiceRequest()
+    scope_spans = request.resource_spans.add().scope_spans.add()
+    trace_id = uuid4().bytes
+    for i in range(n):
+        if i % 10 == 0:
+            trace_id = uuid4().bytes
+        span = scope_spans.spans.add()
+        span.trace_id = trace_id
+        span.span_id = uuid4().bytes[:8]
+        span.name = f"span-{i}"
+        span.kind = 1
+        span.start_time_unix_nano = 1_700_000_000_000_000_000 + i * 1_000
+        span.end_time_unix_nano = 1_700_000_000_000_000_000 + i * 1_000 + 500
+        for key, value in (
+            ("ag.type.node", "task"),
+            ("ag.data.inputs.prompt", "x" * 256),
+            ("ag.data.outputs.completion", "y" * 256),
+        ):
+            attribute = span.attributes.add()
+            attribute.key = key
+            attribute.value.string_value = value
+        attribute = span.attributes.add()
+        attribute.key = "ag.metrics.tokens.incremental.total"
+        attribute.value.int_value = 42
+    return request.SerializeToString()
+
+
+def make_app(decoder: OTLPDecoder) -> FastAPI:
+    app = FastAPI()
+    otlp = otlp_router.OTLPRouter(tracing_service=NullTracingService(), decoder=decoder)
+
+    @app.middleware("http")
+    async def _state(request: Request, call_next):
+        request.state.project_id = str(uuid4())
+        request.state.organization_id = str(uuid4())
+        request.state.user_id = str(uuid4())
+        return await call_next(request)
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    app.include_router(otlp.router, prefix="/otlp/v1")
+    return app
+
+
+def serve(leg: str, processes: int, max_pending: int) -> None:
+    """Server process: the event loop whose latency is measured."""
+
+    # Benchmark harness only: no auth database behind the router.
+    async def _allow(*_args, **_kwargs):
+        return True
+
+    otlp_router.check_action_access = _allow
+
+    if leg == "inline":
+        decoder = InlineDecoder(max_pending=max_pending)
+    else:
+        decoder = OTLPDecoder(
+            processes=processes if leg == "process" else 0,
+            max_pending=max_pending,
+        )
+    uvicorn.run(make_app(decoder), port=PORT, log_level="error", lifespan="off")
+
+
+async def run_leg(leg: str, *, args, payload: bytes):
+    server = multiprocessing.get_context("spawn").Process(
+        target=serve,
+        args=(leg, args.processes, args.max_pending),
+    )
+    server.start()
+
+    stats = SimpleNamespace(accepted=0, shed=0, probes=[])
+    try:
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{PORT}", timeout=120
+        ) as client:
+            while True:
+                try:
+                    await client.get("/health")
+                    break
+                except httpx.TransportError:
+                    await asyncio.sleep(0.1)
+
+            # Warm up the decoder (pool spawn, imports) outside the measurement.
+            for _ in range(max(1, args.processes)):
+                await client.post("/otlp/v1/traces", content=payload)
+
+            deadline = time.perf_counter() + args.seconds
+
+            async def send():
+                while time.perf_counter() < deadline:
+                    response = await client.post(
+                        "/otlp/v1/traces",
+                        content=payload,
+                        headers={"Content-Type": "application/x-protobuf"},
+                    )
+                    if response.status_code == 200:
+                        stats.accepted += 1
+                    elif response.status_code == 503:
+                        stats.shed += 1
+                        await asyncio.sleep(
+                            float(response.headers.get("retry-after", 1))
+                        )
+
+            async def probe():
+                while time.perf_counter() < deadline:
+                    started = time.perf_counter()
+                    await client.get("/health")
+                    stats.probes.append((time.perf_counter() - started) * 1000)
+                    await asyncio.sleep(PROBE_INTERVAL_S)
+
+            await asyncio.gather(probe(), *(send() for _ in range(args.senders)))
+    finally:
+        server.terminate()
+        server.join()
+
+    return stats
+
+
+def percentile(values: list[float], pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--spans", type=int, default=1000, help="spans per OTLP batch")
+    parser.add_argument("--senders", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--processes", type=int, default=2)
+    parser.add_argument("--max-pending", type=int, default=4)
+    args = parser.parse_args()
+
+    payload = make_payload(args.spans)
+    print(f"payload: {args.spans} spans, {len(payload) / 1024:,.0f} KiB")
+    print()
+    print(
+        "| leg | /health p50 ms | /health p99 ms | /health max ms | accepted | shed (503) |"
+    )
+    print("|---|---:|---:|---:|---:|---:|")
+
+    for leg in ("inline", "thread", "process"):
+        stats = await run_leg(leg, args=args, payload=payload)
+        print(
+            f"| {leg} | {statistics.median(stats.probes):.1f} "
+            f"| {percentile(stats.probes, 99):.1f} | {max(stats.probes):.1f} "
+            f"| {stats.accepted} | {stats.shed} |"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,141 @@
+"""Middleware overhead per invocation: a client per call vs the pooled SDK transport.
+
+    cd sdks/python && uv run python ../../benchmarks/sdk-http-pooling/run_benchmark.py
+    cd sdks/python && uv run python ../../benchmarks/sdk-http-pooling/run_benchmark.py --requests 2000
+
+Starts a mock Agenta API (uvicorn, plain HTTP on 127.0.0.1) that allows every permission
+check, then drives a mocked invocation through the SDK's own `create_app` stack (OTel + auth
+middleware, credential caching off so every invocation checks) in-process over ASGI.
+
+WHAT IS COMPARED
+
+  baseline  auth middleware disabled: the invocation without any call to the API
+  per-call  the permission check opens and closes an httpx.AsyncClient per call
+            (the SDK before the pooled transport)
+  pooled    the permission check borrows agenta.sdk.utils.transport.get_async_client()
+
+The overhead column is each leg's p50 minus the baseline p50.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import pathlib
+import socket
+import statistics
+import sys
+import threading
+import time
+
+SDK_ROOT = pathlib.Path(__file__).resolve().parents[2] / "sdks" / "python"
+sys.path.insert(0, str(SDK_ROOT))
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+from starlette.applications import Starlette  # noqa: E402
+from starlette.responses import JSONResponse  # noqa: E402
+from starlette.routing import Route  # noqa: E402
+
+import agenta as ag  # noqa: E402
+from agenta.sdk.decorators.routing import create_app  # noqa: E402
+from agenta.sdk.middlewares.routing import auth  # noqa: E402
+from agenta.sdk.utils import transport  # noqa: E402
+
+
+async def _allow(request):
+    return JSONResponse({"effect": "allow", "credentials": "ApiKey bench"})
+
+
+def start_mock_api() -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    app = Starlette(routes=[Route("/api/access/permissions/check", _allow)])
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return f"http://127.0.0.1:{port}"
+
+
+class PerCallClient:
+    """The pre-pooling call shape: `async with httpx.AsyncClient() as client`."""
+
+    async def get(self, *args, **kwargs):
+        async with httpx.AsyncClient() as client:
+            return await client.get(*args, **kwargs)
+
+
+def make_app():
+    app = create_app()
+
+    @app.post("/invoke")
+    async def invoke():
+        return {"data": {"outputs": "ok"}}
+
+    return app
+
+
+async def run_leg(host: str, requests: int, warmup: int) -> list[float]:
+    ag.DEFAULT_AGENTA_SINGLETON_INSTANCE.host = host
+    app = make_app()
+    samples = []
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://sdk"
+    ) as client:
+        for i in range(warmup + requests):
+            t0 = time.perf_counter()
+            response = await client.post(
+                "/invoke", headers={"Authorization": "ApiKey bench"}
+            )
+            elapsed = (time.perf_counter() - t0) * 1000
+            if response.status_code != 200:
+                raise SystemExit(
+                    f"invocation failed: {response.status_code} {response.text}"
+                )
+            if i >= warmup:
+                samples.append(elapsed)
+    await transport.aclose_clients()
+    return samples
+
+
+def p(samples: list[float], q: float) -> float:
+    return statistics.quantiles(samples, n=100)[int(q) - 1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=50)
+    args = parser.parse_args()
+
+    host = start_mock_api()
+    auth._CACHE_ENABLED = False
+
+    legs = {}
+
+    auth._AUTH_ENABLED = False
+    legs["baseline"] = asyncio.run(run_leg(host, args.requests, args.warmup))
+
+    auth._AUTH_ENABLED = True
+    pooled_client = auth.get_async_client
+    auth.get_async_client = PerCallClient
+    legs["per-call"] = asyncio.run(run_leg(host, args.requests, args.warmup))
+
+    auth.get_async_client = pooled_client
+    legs["pooled"] = asyncio.run(run_leg(host, args.requests, args.warmup))
+
+    base = statistics.median(legs["baseline"])
+    print("| leg | p50 ms | p99 ms | overhead p50 ms |")
+    print("|:----|-------:|-------:|----------------:|")
+    for name, samples in legs.items():
+        p50 = statistics.median(samples)
+        print(f"| {name} | {p50:.2f} | {p(samples, 99):.2f} | {p50 - base:.2f} |")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Cold-start cost of `import agenta`, from `python -X importtime`, and a guard on what it loads.
+
+    cd sdks/python && uv run python ../../benchmarks/sdk-import-time/run_benchmark.py
+    cd sdks/python && uv run python ../../benchmarks/sdk-import-time/run_benchmark.py --rounds 10 --budget-ms 4000
+    cd sdks/python && uv run python ../../benchmarks/sdk-import-time/run_benchmark.py --sdk-root /path/to/other/checkout/sdks/python
+
+Every round is a fresh interpreter, so nothing is warm but the OS page cache (the first round
+is dropped to warm that too).
+
+WHAT IS MEASURED
+
+  import agenta          what a workflow service or CLI pays before its first line runs
+  ... + ag.ConfigManager first use of a manager
+  ... + ag.app           first use of the FastAPI app (pulls FastAPI)
+
+For each statement: the median wall time of the interpreter, and that time minus a bare
+`python -c pass` (the interpreter's own startup). For `import agenta`, where the time goes is
+listed too: `importtime` self time summed per package (per `agenta.sdk.<subpackage>` for the
+SDK's own modules).
+
+THE GUARD
+
+`import agenta` must not load any of the DEFERRED modules below (each is loaded on the first
+`ag.<name>` that needs it). The script exits non-zero if one is loaded, or if `--budget-ms` is
+given and `import agenta` costs more than that over a bare interpreter.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import pathlib
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+SDK_ROOT = pathlib.Path(__file__).resolve().parents[2] / "sdks" / "python"
+
+STATEMENTS = [
+    ("import agenta", "import agenta"),
+    ("... + ag.ConfigManager", "import agenta as ag; ag.ConfigManager"),
+    ("... + ag.app", "import agenta as ag; ag.app"),
+]
+
+DEFERRED = [
+    "litellm",
+    "fastapi",
+    "daytona",
+    "agenta.sdk.agents.platform",
+    "agenta.sdk.decorators.routing",
+    "agenta.sdk.managers.apps",
+]
+
+
+def _run(sdk_root: pathlib.Path, statement: str) -> Tuple[float, str]:
+    env = dict(os.environ, PYTHONPATH=str(sdk_root))
+    started = time.perf_counter()
+    done = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=sdk_root,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return (time.perf_counter() - started) * 1000, done.stderr
+
+
+def _parse(importtime: str) -> List[Tuple[int, int, int, str]]:
+    """(depth, self us, cumulative us, module) per `import time:` line."""
+    rows = []
+    for line in importtime.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative, name = line[len("import time:") :].split("|")
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        rows.append((depth, int(self_us), int(cumulative), name.strip()))
+    return rows
+
+
+def _package(name: str) -> str:
+    parts = name.split(".")
+    return ".".join(parts[:3]) if parts[:2] == ["agenta", "sdk"] else parts[0]
+
+
+def _inside_agenta(rows: List[Tuple[int, int, int, str]]) -> Dict[str, int]:
+    """Self time per package for the modules imported while `agenta` was importing."""
+    # importtime prints a module after its imports, so the `agenta` line closes the span.
+    end = next(i for i, row in enumerate(rows) if row[0] == 0 and row[3] == "agenta")
+    start = end
+    while start > 0 and rows[start - 1][0] > 0:
+        start -= 1
+
+    per_package: Dict[str, int] = {}
+    for _, self_us, _, name in rows[start : end + 1]:
+        per_package[_package(name)] = per_package.get(_package(name), 0) + self_us
+    return per_package
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    parser.add_argument("--sdk-root", type=pathlib.Path, default=SDK_ROOT)
+    args = parser.parse_args()
+
+    bare_ms = statistics.median(
+        _run(args.sdk_root, "pass")[0] for _ in range(args.rounds + 1)
+    )
+
+    results: Dict[str, float] = {}
+    per_package: Dict[str, int] = {}
+    loaded: List[str] = []
+
+    for label, statement in STATEMENTS:
+        _run(args.sdk_root, statement)
+        walls = []
+        for _ in range(args.rounds):
+            wall_ms, importtime = _run(args.sdk_root, statement)
+            walls.append(wall_ms)
+            if statement == "import agenta":
+                rows = _parse(importtime)
+                per_package = _inside_agenta(rows)
+                names = {row[3] for row in rows}
+                loaded = [module for module in DEFERRED if module in names]
+        results[label] = statistics.median(walls)
+
+    print("| statement | wall ms (p50) | over bare interpreter ms |")
+    print("|:----------|--------------:|-------------------------:|")
+    for label, wall_ms in results.items():
+        print(f"| {label} | {wall_ms:.0f} | {wall_ms - bare_ms:.0f} |")
+
+    print()
+    print("| package (under import agenta, last round) | self ms |")
+    print("|:------------------------------------------|--------:|")
+    for package, us in sorted(per_package.items(), key=lambda item: -item[1])[
+        : args.top
+    ]:
+        print(f"| {package} | {us / 1000:.0f} |")
+
+    failures = []
+    if loaded:
+        failures.append(f"`import agenta` loaded deferred modules: {', '.join(loaded)}")
+    import_ms = results["import agenta"] - bare_ms
+    if args.budget_ms is not None and import_ms > args.budget_ms:
+        failures.append(
+            f"`import agenta` took {import_ms:.0f} ms, over the {args.budget_ms:.0f} ms budget"
+        )
+    if failures:
+        raise SystemExit("\n".join(failures))
+
+
+if __name__ == "__main__":
+    main()
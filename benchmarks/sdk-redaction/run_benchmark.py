@@ -0,0 +1,159 @@
+"""Known-value redaction throughput: per-variant loop vs the compiled matcher.
+
+    cd sdks/python && uv run python ../../benchmarks/sdk-redaction/run_benchmark.py
+    cd sdks/python && uv run python ../../benchmarks/sdk-redaction/run_benchmark.py --secrets 10 100 500 --rounds 10
+
+No services needed: both legs run in-process on generated payloads.
+
+WHAT IS COMPARED
+
+  loop      Redactor._known_value_pass before compilation: reread AGENTA_REDACTION_MODE, then
+            for every variant longest-first `in` + `str.replace` (word-bounded parts through a
+            regex compiled on the spot)
+  compiled  Redactor._known_value_pass: one prefix-trie regex built in with_known_secrets,
+            one `sub` per string
+
+Each secret count seeds both legs with the same secrets, two of every five shaped as DSNs so
+the word-bounded parts are exercised. Each leg then redacts two 1 MB payloads:
+
+  string    one 1 MB string (a large LLM output or error body)
+  json      1 MB of span inputs/outputs: dicts of ~100-character strings, ~10k strings
+
+One in every thousand strings carries a secret. Both legs must produce identical output.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import pathlib
+import random
+import re
+import statistics
+import string
+import sys
+import time
+
+SDK_ROOT = pathlib.Path(__file__).resolve().parents[2] / "sdks" / "python"
+sys.path.insert(0, str(SDK_ROOT))
+
+from agenta.sdk.redaction import metrics  # noqa: E402
+from agenta.sdk.redaction.redactor import (  # noqa: E402
+    Redactor,
+    _placeholder,
+    redaction_mode,
+)
+
+PAYLOAD_BYTES = 1_000_000
+STRING_CHARS = 100
+
+
+class LoopRedactor(Redactor):
+    """The known-value pass as it was before the compiled matcher."""
+
+    def with_known_secrets(self, values, *, kind="secret"):
+        super().with_known_secrets(values, kind=kind)
+        self._sorted_values = sorted(self._known, key=len, reverse=True)
+        return self
+
+    def _known_value_pass(self, value: str, *, sink: str) -> str:
+        if redaction_mode() == "off" or not self._sorted_values or not value:
+            return self._shape_pass(value, sink=sink)
+
+        out = value
+        for variant in self._sorted_values:
+            kind = self._known[variant]
+            if variant in self._bounded:
+                pattern = re.compile(r"(?<!\w)" + re.escape(variant) + r"(?!\w)")
+                if pattern.search(out):
+                    out = pattern.sub(_placeholder(kind, variant), out)
+                    metrics.increment(sink, kind)
+            elif variant in out:
+                out = out.replace(variant, _placeholder(kind, variant))
+                metrics.increment(sink, kind)
+        return self._shape_pass(out, sink=sink)
+
+
+def make_secrets(rng: random.Random, count: int) -> list[str]:
+    alphabet = string.ascii_letters + string.digits
+    secrets = []
+    for i in range(count):
+        token = "".join(rng.choices(alphabet, k=40))
+        if i % 5 < 2:
+            secrets.append(f"postgres://svc{i}:{token[:16]}@db{i}.internal:5432/app")
+        else:
+            secrets.append(f"sk-{token}")
+    return secrets
+
+
+def make_text(rng: random.Random, chars: int, secrets: list[str], every: int) -> str:
+    words = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9)))
+        for _ in range(2000)
+    ]
+    parts, size, n = [], 0, 0
+    while size < chars:
+        n += 1
+        word = rng.choice(secrets) if n % every == 0 else rng.choice(words)
+        parts.append(word)
+        size += len(word) + 1
+    return " ".join(parts)[:chars]
+
+
+def make_payloads(rng: random.Random, secrets: list[str]) -> dict:
+    one = make_text(rng, PAYLOAD_BYTES, secrets, every=1000)
+    strings = [
+        make_text(rng, STRING_CHARS, secrets, every=1000 * STRING_CHARS // 6)
+        for _ in range(PAYLOAD_BYTES // STRING_CHARS)
+    ]
+    for i in range(0, len(strings), 1000):
+        strings[i] = f"{strings[i][:40]} {rng.choice(secrets)}"
+    json_payload = {
+        "inputs": {"messages": [{"role": "user", "content": s} for s in strings[::2]]},
+        "outputs": {"choices": [{"text": s} for s in strings[1::2]]},
+    }
+    return {"string": one, "json": json_payload}
+
+
+def time_leg(redactor: Redactor, payload, rounds: int) -> tuple[float, object]:
+    samples, out = [], None
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        out = redactor.redact_json(payload)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples), out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--secrets", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    os.environ.setdefault("AGENTA_REDACTION_MODE", "known")
+
+    print("| secrets | variants | payload | loop ms | compiled ms | speedup |")
+    print("|--------:|---------:|:--------|--------:|------------:|--------:|")
+    for count in args.secrets:
+        rng = random.Random(args.seed)
+        secrets = make_secrets(rng, count)
+        payloads = make_payloads(rng, secrets)
+
+        loop = LoopRedactor().with_known_secrets(secrets)
+        compiled = Redactor().with_known_secrets(secrets)
+
+        for name, payload in payloads.items():
+            loop_ms, loop_out = time_leg(loop, payload, args.rounds)
+            compiled_ms, compiled_out = time_leg(compiled, payload, args.rounds)
+            if loop_out != compiled_out:
+                raise SystemExit(f"outputs differ for {count} secrets, {name} payload")
+            print(
+                f"| {count} | {len(compiled._known)} | {name} | {loop_ms:.1f} "
+                f"| {compiled_ms:.1f} | {loop_ms / compiled_ms:.1f}x |"
+            )
+        metrics.reset()
+
+
+if __name__ == "__main__":
+    main()
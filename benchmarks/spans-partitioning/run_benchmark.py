@@ -0,0 +1,239 @@
+"""Spans table layout: one heap vs daily RANGE (start_time) partitions.
+
+    cd api && uv run python ../benchmarks/spans-partitioning/run_benchmark.py
+    cd api && uv run python ../benchmarks/spans-partitioning/run_benchmark.py --spans 100000000 --days 30
+
+Needs a tracing database, addressed the same way the API addresses it: POSTGRES_URI_TRACING
+(or the POSTGRES_* parts it is composed from). Everything is written to a scratch schema,
+`bench_spans_partitioning`, which is dropped at the end unless --keep is given; `public.spans`
+is never touched.
+
+WHAT IS COMPARED
+
+  heap         one table, the layout before oss000000005
+  partitioned  PARTITION BY RANGE (start_time), one partition per UTC day, as created by
+               SpansPartitionsDAO.ensure_partitions
+
+Both tables carry the columns and indexes the queries and the retention job use: the primary
+key, (project_id, start_time) and the partial root-span index on (project_id, created_at,
+trace_id). Rows are generated server-side, spread evenly over --days days and --projects
+projects, ten spans per trace.
+
+  ingest     INSERT ... SELECT of --spans rows, in --chunk row statements
+  window     the newest 100 root spans of one project in the last day, and their count
+  retention  the oldest day: DELETE of its rows (heap) vs DETACH + DROP of its partition
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import pathlib
+import statistics
+import sys
+import time
+from datetime import datetime, time as day_start, timedelta, timezone
+
+API_ROOT = pathlib.Path(__file__).resolve().parents[2] / "api"
+sys.path.insert(0, str(API_ROOT))
+
+from sqlalchemy import text  # noqa: E402
+
+from oss.src.dbs.postgres.shared.engine import get_analytics_engine  # noqa: E402
+from oss.src.dbs.postgres.tracing.partitions import (  # noqa: E402
+    SPANS_STORAGE_PARAMETERS,
+    partition_bounds,
+    partition_name,
+)
+
+SCHEMA = "bench_spans_partitioning"
+
+COLUMNS = """
+    project_id uuid NOT NULL,
+    trace_id uuid NOT NULL,
+    span_id uuid NOT NULL,
+    parent_id uuid,
+    start_time timestamptz NOT NULL,
+    created_at timestamptz NOT NULL,
+    attributes jsonb
+"""
+
+
+async def execute(engine, sql: str, params: dict | None = None):
+    async with engine.session() as session:
+        result = await session.execute(text(sql), params or {})
+        await session.commit()
+        return result
+
+
+async def timed(engine, sql: str, params: dict | None = None) -> float:
+    started = time.perf_counter()
+    await execute(engine, sql, params)
+    return time.perf_counter() - started
+
+
+async def create_tables(engine, *, first_day, days: int) -> None:
+    await execute(engine, f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;")
+    await execute(engine, f"CREATE SCHEMA {SCHEMA};")
+
+    await execute(
+        engine,
+        f"CREATE TABLE {SCHEMA}.heap ({COLUMNS}, "
+        f"PRIMARY KEY (project_id, trace_id, span_id)) "
+        f"WITH ({SPANS_STORAGE_PARAMETERS});",
+    )
+    await execute(
+        engine,
+        f"CREATE TABLE {SCHEMA}.partitioned ({COLUMNS}, "
+        f"PRIMARY KEY (project_id, trace_id, span_id, start_time)) "
+        f"PARTITION BY RANGE (start_time);",
+    )
+    for offset in range(days):
+        day = first_day + timedelta(days=offset)
+        lower, upper = partition_bounds(day)
+        await execute(
+            engine,
+            f"CREATE TABLE {SCHEMA}.{partition_name(day)} "
+            f"PARTITION OF {SCHEMA}.partitioned "
+            f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}') "
+            f"WITH ({SPANS_STORAGE_PARAMETERS});",
+        )
+
+    for table in ("heap", "partitioned"):
+        await execute(
+            engine,
+            f"CREATE INDEX ON {SCHEMA}.{table} (project_id, start_time);",
+        )
+        await execute(
+            engine,
+            f"CREATE INDEX ON {SCHEMA}.{table} (project_id, created_at, trace_id) "
+            f"WHERE parent_id IS NULL;",
+        )
+
+
+def insert_sql(table: str) -> str:
+    # Row n: project n % projects, trace n / 10 (root every 10th span), start
+    # times spread evenly over the window.
+    return f"""
+        INSERT INTO {SCHEMA}.{table}
+        SELECT
+          md5('project' || (n % :projects))::uuid,
+          md5('trace' || (n / 10))::uuid,
+          md5('span' || n)::uuid,
+          CASE WHEN n % 10 = 0 THEN NULL ELSE md5('span' || (n - n % 10))::uuid END,
+          :oldest + (:window * n / :spans),
+          :oldest + (:window * n / :spans),
+          jsonb_build_object('ag', jsonb_build_object('data', repeat('x', 256)))
+        FROM generate_series(CAST(:lower AS bigint), CAST(:upper AS bigint) - 1) AS n;
+    """
+
+
+async def ingest(engine, table: str, *, args, oldest) -> float:
+    elapsed = 0.0
+    for lower in range(0, args.spans, args.chunk):
+        elapsed += await timed(
+            engine,
+            insert_sql(table),
+            {
+                "projects": args.projects,
+                "spans": args.spans,
+                "oldest": oldest,
+                "window": timedelta(days=args.days),
+                "lower": lower,
+                "upper": min(lower + args.chunk, args.spans),
+            },
+        )
+    await execute(engine, f"ANALYZE {SCHEMA}.{table};")
+    return elapsed
+
+
+async def window(engine, table: str, *, newest, rounds: int) -> float:
+    params = {"project": "project1", "oldest": newest - timedelta(days=1)}
+    sql = f"""
+        SELECT span_id, start_time
+        FROM {SCHEMA}.{table}
+        WHERE project_id = md5(:project)::uuid
+          AND parent_id IS NULL
+          AND start_time >= :oldest
+        ORDER BY start_time DESC
+        LIMIT 100;
+        SELECT count(*)
+        FROM {SCHEMA}.{table}
+        WHERE project_id = md5(:project)::uuid
+          AND parent_id IS NULL
+          AND start_time >= :oldest;
+    """
+    latencies = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for statement in filter(str.strip, sql.split(";")):
+            await execute(engine, statement, params)
+        latencies.append(time.perf_counter() - started)
+    return statistics.median(latencies)
+
+
+async def retention(engine, table: str, *, first_day) -> float:
+    if table == "heap":
+        _, upper = partition_bounds(first_day)
+        return await timed(
+            engine,
+            f"DELETE FROM {SCHEMA}.heap WHERE start_time < :upper;",
+            {"upper": upper},
+        )
+
+    partition = f"{SCHEMA}.{partition_name(first_day)}"
+    started = time.perf_counter()
+    await execute(
+        engine, f"ALTER TABLE {SCHEMA}.partitioned DETACH PARTITION {partition};"
+    )
+    await execute(engine, f"DROP TABLE {partition};")
+    return time.perf_counter() - started
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--spans", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--projects", type=int, default=100)
+    parser.add_argument("--chunk", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--keep", action="store_true")
+    args = parser.parse_args()
+
+    engine = get_analytics_engine()
+
+    today = datetime.now(timezone.utc).date()
+    first_day = today - timedelta(days=args.days - 1)
+    oldest = datetime.combine(first_day, day_start.min, tzinfo=timezone.utc)
+    newest = oldest + timedelta(days=args.days)
+
+    await create_tables(engine, first_day=first_day, days=args.days)
+
+    results = {}
+    try:
+        for table in ("heap", "partitioned"):
+            results[table] = (
+                await ingest(engine, table, args=args, oldest=oldest),
+                await window(engine, table, newest=newest, rounds=args.rounds),
+                await retention(engine, table, first_day=first_day),
+            )
+    finally:
+        if not args.keep:
+            await execute(engine, f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;")
+        await engine.close()
+
+    print(f"{args.spans:,} spans over {args.days} days, {args.projects} projects")
+    print()
+    print("| table | ingest spans/s | window query ms | drop oldest day ms |")
+    print("|---|---:|---:|---:|")
+    for table, (ingested, windowed, retained) in results.items():
+        print(
+            f"| {table} | {args.spans / ingested:,.0f} | {windowed * 1000:,.1f} "
+            f"| {retained * 1000:,.1f} |"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
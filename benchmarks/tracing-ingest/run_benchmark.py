@@ -0,0 +1,136 @@
+"""Span ingest throughput: per-span upserts vs the batched TracingDAO.ingest.
+
+    cd api && uv run python ../benchmarks/tracing-ingest/run_benchmark.py
+    cd api && uv run python ../benchmarks/tracing-ingest/run_benchmark.py --sizes 50 500 --rounds 5
+
+Needs a tracing database with the `spans` table migrated, addressed the same way the API
+addresses it: POSTGRES_URI_TRACING (or the POSTGRES_* parts it is composed from). Every
+round writes under a fresh random project_id and deletes it afterwards, so the benchmark can
+run against a shared development database without leaving rows behind.
+
+WHAT IS COMPARED
+
+  loop    one INSERT ... ON CONFLICT DO UPDATE per span, one transaction per batch
+          (TracingDAO.ingest before batching)
+  batch   TracingDAO.ingest: multi-row upserts, split only by the bind-parameter limit
+
+Both legs build the same rows with the same mapping and the same conflict clause, so the
+difference is round-trips and statement overhead, nothing else.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import pathlib
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+API_ROOT = pathlib.Path(__file__).resolve().parents[2] / "api"
+sys.path.insert(0, str(API_ROOT))
+
+from sqlalchemy import delete  # noqa: E402
+
+from oss.src.core.tracing.dtos import OTelFlatSpan  # noqa: E402
+from oss.src.dbs.postgres.shared.engine import get_analytics_engine  # noqa: E402
+from oss.src.dbs.postgres.tracing.dao import TracingDAO, _upsert_spans_stmt  # noqa: E402
+from oss.src.dbs.postgres.tracing.dbes import SpanDBE  # noqa: E402
+from oss.src.dbs.postgres.tracing.mappings import map_span_dto_to_span_dbe  # noqa: E402
+
+
+def make_spans(n: int) -> list[OTelFlatSpan]:
+    """One trace per 10 spans, realistic attribute payloads, unique span ids."""
+    now = datetime.now(timezone.utc)
+    spans = []
+    trace_id = uuid4().hex
+    for i in range(n):
+        if i % 10 == 0:
+            trace_id = uuid4().hex
+        spans.append(
+            OTelFlatSpan(
+                trace_id=trace_id,
+                span_id=uuid4().hex,
+                span_name=f"span-{i}",
+                start_time=now + timedelta(milliseconds=i),
+                end_time=now + timedelta(milliseconds=i + 5),
+                attributes={
+                    "ag": {
+                        "data": {
+                            "inputs": {"prompt": "x" * 256},
+                            "outputs": {"completion": "y" * 256},
+                        },
+                        "metrics": {"tokens": {"incremental": {"total": 42}}},
+                    }
+                },
+            )
+        )
+    return spans
+
+
+async def ingest_loop(engine, *, project_id, user_id, span_dtos) -> None:
+    async with engine.session() as session:
+        for span_dto in span_dtos:
+            span_dbe = map_span_dto_to_span_dbe(
+                project_id=project_id,
+                user_id=user_id,
+                span_dto=span_dto,
+            )
+            values = {
+                c.name: getattr(span_dbe, c.name) for c in SpanDBE.__table__.columns
+            }
+            await session.execute(
+                _upsert_spans_stmt(values_list=[values], user_id=user_id)
+            )
+        await session.commit()
+
+
+async def cleanup(engine, *, project_id) -> None:
+    async with engine.session() as session:
+        await session.execute(delete(SpanDBE).where(SpanDBE.project_id == project_id))
+        await session.commit()
+
+
+async def measure(leg: str, n: int, rounds: int) -> list[float]:
+    engine = get_analytics_engine()
+    dao = TracingDAO(engine=engine)
+    rates = []
+    for _ in range(rounds):
+        project_id, user_id = uuid4(), uuid4()
+        span_dtos = make_spans(n)
+        started = time.perf_counter()
+        if leg == "loop":
+            await ingest_loop(
+                engine, project_id=project_id, user_id=user_id, span_dtos=span_dtos
+            )
+        else:
+            await dao.ingest(
+                project_id=project_id, user_id=user_id, span_dtos=span_dtos
+            )
+        elapsed = time.perf_counter() - started
+        rates.append(n / elapsed)
+        await cleanup(engine, project_id=project_id)
+    return rates
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 5000])
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    print("| spans/batch | loop spans/s | batch spans/s | speedup |")
+    print("|---:|---:|---:|---:|")
+    for n in args.sizes:
+        loop = statistics.median(await measure("loop", n, args.rounds))
+        batch = statistics.median(await measure("batch", n, args.rounds))
+        print(f"| {n} | {loop:,.0f} | {batch:,.0f} | {batch / loop:.1f}x |")
+
+    await get_analytics_engine().close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,154 @@
+"""Span cost calculation: litellm's cost_per_token per span vs the model pricing index.
+
+    cd api && uv run python ../benchmarks/tracing-pricing/run_benchmark.py
+    cd api && uv run python ../benchmarks/tracing-pricing/run_benchmark.py --spans 100000 --models 20
+
+CPU only, no database: the spans are built in memory, with token counts (a third of them
+with cached prompt tokens) on models taken from litellm's model map.
+
+WHAT IS COMPARED
+
+  litellm  cost_calculator.cost_per_token for every LLM span (calculate_costs before the
+           pricing index)
+  index    calculate_costs: per-token rates read off litellm once per model, then applied
+           with arithmetic
+
+Both legs price the same spans; the benchmark checks that they bill the same amounts.
+"""
+
+from __future__ import annotations
+
+import argparse
+import pathlib
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from uuid import uuid4
+
+API_ROOT = pathlib.Path(__file__).resolve().parents[2] / "api"
+sys.path.insert(0, str(API_ROOT))
+
+from litellm import cost_calculator, model_cost  # noqa: E402
+
+from oss.src.core.tracing.dtos import OTelFlatSpan, SpanType  # noqa: E402
+from oss.src.core.tracing.utils.pricing import refresh_model_pricing  # noqa: E402
+from oss.src.core.tracing.utils.trees import calculate_costs  # noqa: E402
+
+
+def pick_models(n: int) -> list[str]:
+    """Chat models with flat per-token and cache-read prices."""
+    return [
+        model
+        for model, info in model_cost.items()
+        if isinstance(info, dict)
+        and info.get("mode") == "chat"
+        and info.get("input_cost_per_token")
+        and info.get("cache_read_input_token_cost")
+        and not any("above" in key for key in info)
+    ][:n]
+
+
+def make_spans(n: int, models: list[str]) -> list[OTelFlatSpan]:
+    now = datetime.now(timezone.utc)
+    spans = []
+    for i in range(n):
+        tokens = {"prompt": 2_000 + i % 500, "completion": 100 + i % 50}
+        if i % 3 == 0:
+            tokens["cache_read"] = 1_500
+        spans.append(
+            OTelFlatSpan(
+                trace_id=uuid4().hex,
+                span_id=uuid4().hex,
+                span_name="chat",
+                span_type=SpanType.CHAT,
+                start_time=now,
+                end_time=now,
+                attributes={
+                    "ag": {
+                        "meta": {"response": {"model": models[i % len(models)]}},
+                        "metrics": {"tokens": {"incremental": tokens}},
+                    }
+                },
+            )
+        )
+    return spans
+
+
+def litellm_leg(spans: list[OTelFlatSpan]) -> list[tuple[float, float]]:
+    costs = []
+    for span in spans:
+        ag = span.attributes["ag"]
+        tokens = ag["metrics"]["tokens"]["incremental"]
+        cached = tokens.get("cache_read", 0)
+        costs.append(
+            cost_calculator.cost_per_token(
+                model=ag["meta"]["response"]["model"],
+                prompt_tokens=tokens["prompt"],
+                completion_tokens=tokens["completion"],
+                **({"cache_read_input_tokens": cached} if cached else {}),
+            )
+        )
+    return costs
+
+
+def index_leg(spans: list[OTelFlatSpan]) -> list[tuple[float, float]]:
+    calculate_costs({span.span_id: span for span in spans})
+    return [
+        (
+            span.attributes["ag"]["metrics"]["costs"]["incremental"]["prompt"],
+            span.attributes["ag"]["metrics"]["costs"]["incremental"]["completion"],
+        )
+        for span in spans
+    ]
+
+
+def timed(leg, spans, rounds: int, *, fresh: bool = False) -> tuple[float, list]:
+    samples = []
+    result = None
+    for _ in range(rounds):
+        if fresh:
+            # Includes reading the rates, once per model.
+            refresh_model_pricing()
+        started = time.perf_counter()
+        result = leg(spans)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples), result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--spans", type=int, default=10_000)
+    parser.add_argument("--models", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    models = pick_models(args.models)
+    spans = make_spans(args.spans, models)
+
+    litellm_s, expected = timed(litellm_leg, spans, args.rounds)
+    index_s, actual = timed(index_leg, spans, args.rounds, fresh=True)
+
+    mismatches = sum(
+        1
+        for (ep, ec), (ap, ac) in zip(expected, actual)
+        if abs(ep - ap) > 1e-12 + 1e-9 * ep or abs(ec - ac) > 1e-12 + 1e-9 * ec
+    )
+
+    print(
+        f"{args.spans:,} LLM spans over {len(models)} models, median of {args.rounds}"
+    )
+    print()
+    print("| leg | ms | us/span |")
+    print("|---|---:|---:|")
+    for name, seconds in (("litellm", litellm_s), ("index", index_s)):
+        print(f"| {name} | {seconds * 1000:,.1f} | {seconds * 1e6 / args.spans:,.2f} |")
+    print()
+    print(f"speedup: {litellm_s / index_s:,.1f}x")
+    print(f"cost mismatches: {mismatches}")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""Tracing analytics of the default specs: raw root spans vs the span rollups.
+
+    cd api && uv run python ../benchmarks/tracing-rollups/run_benchmark.py
+    cd api && uv run python ../benchmarks/tracing-rollups/run_benchmark.py --traces 1000000 --days 30
+
+Needs a tracing database migrated up to oss000000006, addressed the same way the API
+addresses it: POSTGRES_URI_TRACING (or the POSTGRES_* parts it is composed from). The
+traces are written under a fresh random project_id, with created_at spread evenly over the
+last --days days, and deleted afterwards together with their rollups.
+
+WHAT IS COMPARED
+
+  spans    TracingDAO._analytics_from_spans: the base/extract/statistics CTEs over the
+           root spans of the window (every request before the rollups)
+  rollups  TracingDAO.analytics: the same request served from span_rollups
+
+Both legs answer the request the overview dashboard sends: DEFAULT_ANALYTICS_SPECS over the
+whole window, in buckets of --interval minutes, for all of the project's traces.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import pathlib
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+API_ROOT = pathlib.Path(__file__).resolve().parents[2] / "api"
+sys.path.insert(0, str(API_ROOT))
+
+from sqlalchemy import delete  # noqa: E402
+
+from oss.src.core.shared.dtos import Windowing  # noqa: E402
+from oss.src.core.tracing.dtos import (  # noqa: E402
+    DEFAULT_ANALYTICS_SPECS,
+    MetricSpec,
+    OTelFlatSpan,
+    TracingQuery,
+)
+from oss.src.dbs.postgres.shared.engine import get_analytics_engine  # noqa: E402
+from oss.src.dbs.postgres.tracing.dao import (  # noqa: E402
+    INGEST_CHUNK_SIZE,
+    TracingDAO,
+    _upsert_spans_stmt,
+)
+from oss.src.dbs.postgres.tracing.dbes import (  # noqa: E402
+    SpanDBE,
+    SpanRollupCoverageDBE,
+    SpanRollupDBE,
+)
+from oss.src.dbs.postgres.tracing.mappings import map_span_dto_to_span_dbe  # noqa: E402
+from oss.src.dbs.postgres.tracing.rollups import write_rollups  # noqa: E402
+
+SPECS = [MetricSpec(type=t, path=p) for t, p in DEFAULT_ANALYTICS_SPECS]
+
+
+def root_values(*, project_id, user_id, created_at) -> dict:
+    duration = random.lognormvariate(0, 1)
+    span_dbe = map_span_dto_to_span_dbe(
+        project_id=project_id,
+        user_id=user_id,
+        span_dto=OTelFlatSpan(
+            trace_id=uuid4().hex,
+            span_id=uuid4().hex,
+            span_name="benchmark",
+            start_time=created_at,
+            end_time=created_at + timedelta(seconds=duration),
+            attributes={
+                "ag": {
+                    "type": {"trace": "invocation", "span": "workflow"},
+                    "metrics": {
+                        "duration": {"cumulative": duration * 1000},
+                        "errors": {"cumulative": int(random.random() < 0.05)},
+                        "costs": {"cumulative": {"total": random.random() / 100}},
+                        "tokens": {"cumulative": {"total": random.randint(10, 4000)}},
+                    },
+                }
+            },
+        ),
+    )
+    span_dbe.created_at = created_at
+    return {c.name: getattr(span_dbe, c.name) for c in SpanDBE.__table__.columns}
+
+
+async def load(engine, *, project_id, args, newest) -> None:
+    user_id = uuid4()
+    window = timedelta(days=args.days)
+    oldest = newest - window
+
+    for lower in range(0, args.traces, INGEST_CHUNK_SIZE):
+        upper = min(lower + INGEST_CHUNK_SIZE, args.traces)
+        values_list = [
+            root_values(
+                project_id=project_id,
+                user_id=user_id,
+                created_at=oldest + window * n / args.traces,
+            )
+            for n in range(lower, upper)
+        ]
+        async with engine.session() as session:
+            await session.execute(
+                _upsert_spans_stmt(values_list=values_list, user_id=user_id)
+            )
+            await write_rollups(
+                session,
+                project_id=project_id,
+                values_list=values_list,
+            )
+            await session.commit()
+
+    async with engine.session() as session:
+        session.add(SpanRollupCoverageDBE(project_id=project_id, since=oldest))
+        await session.commit()
+
+
+async def cleanup(engine, *, project_id) -> None:
+    async with engine.session() as session:
+        for dbe in (SpanDBE, SpanRollupDBE, SpanRollupCoverageDBE):
+            await session.execute(delete(dbe).where(dbe.project_id == project_id))
+        await session.commit()
+
+
+async def median_latency(call, *, rounds: int) -> float:
+    latencies = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        await call()
+        latencies.append(time.perf_counter() - started)
+    return statistics.median(latencies)
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--traces", type=int, default=100_000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--interval", type=int, default=12 * 60)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    engine = get_analytics_engine()
+    dao = TracingDAO(engine=engine)
+    project_id = uuid4()
+
+    now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+
+    def query() -> TracingQuery:
+        return TracingQuery(
+            windowing=Windowing(
+                oldest=now - timedelta(days=args.days),
+                newest=now,
+                interval=args.interval,
+            )
+        )
+
+    try:
+        await load(engine, project_id=project_id, args=args, newest=now)
+
+        spans = await median_latency(
+            lambda: dao._analytics_from_spans(
+                project_id=project_id, query=query(), specs=SPECS
+            ),
+            rounds=args.rounds,
+        )
+        rollups = await median_latency(
+            lambda: dao.analytics(project_id=project_id, query=query(), specs=SPECS),
+            rounds=args.rounds,
+        )
+    finally:
+        await cleanup(engine, project_id=project_id)
+        await engine.close()
+
+    print(
+        f"{args.traces:,} traces over {args.days} days, "
+        f"{args.interval}-minute buckets, median of {args.rounds}"
+    )
+    print()
+    print("| leg | latency ms |")
+    print("|---|---:|")
+    print(f"| spans | {spans * 1000:,.1f} |")
+    print(f"| rollups | {rollups * 1000:,.1f} |")
+    print()
+    print(f"speedup: {spans / rollups:,.1f}x")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
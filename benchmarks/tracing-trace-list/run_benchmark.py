@@ -0,0 +1,200 @@
+"""Trace lists: the page of traces picked off the spans vs off the trace summaries.
+
+    cd api && uv run python ../benchmarks/tracing-trace-list/run_benchmark.py
+    cd api && uv run python ../benchmarks/tracing-trace-list/run_benchmark.py --traces 1000000 --spans 8
+
+Needs a tracing database migrated up to oss000000007, addressed the same way the API
+addresses it: POSTGRES_URI_TRACING (or the POSTGRES_* parts it is composed from). The
+traces are written under a fresh random project_id, with start times spread evenly over
+the last --days days, and deleted afterwards together with their summaries.
+
+WHAT IS COMPARED
+
+  spans      TracingDAO.query, focus=trace, without summaries coverage: DISTINCT ON over
+             the spans of the window, then the spans of the page (every request before)
+  summaries  TracingDAO.query, focus=trace, with coverage: the page off `traces`, then
+             the spans of that page
+
+Both legs answer the request the observability page sends first: the newest --limit
+traces of the window, for all of the project's traces.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import pathlib
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+API_ROOT = pathlib.Path(__file__).resolve().parents[2] / "api"
+sys.path.insert(0, str(API_ROOT))
+
+from sqlalchemy import delete  # noqa: E402
+
+from oss.src.core.shared.dtos import Windowing  # noqa: E402
+from oss.src.core.tracing.dtos import (  # noqa: E402
+    Focus,
+    Formatting,
+    OTelFlatSpan,
+    TracingQuery,
+)
+from oss.src.dbs.postgres.shared.engine import get_analytics_engine  # noqa: E402
+from oss.src.dbs.postgres.tracing.dao import (  # noqa: E402
+    INGEST_CHUNK_SIZE,
+    TracingDAO,
+    _upsert_spans_stmt,
+)
+from oss.src.dbs.postgres.tracing.dbes import (  # noqa: E402
+    SpanDBE,
+    TraceCoverageDBE,
+    TraceDBE,
+)
+from oss.src.dbs.postgres.tracing.mappings import map_span_dto_to_span_dbe  # noqa: E402
+from oss.src.dbs.postgres.tracing.summaries import write_trace_summaries  # noqa: E402
+
+
+def trace_values(*, project_id, user_id, start_time, spans) -> list:
+    root_id = uuid4().hex
+    trace_id = uuid4().hex
+    values_list = []
+
+    for n in range(spans):
+        span_dbe = map_span_dto_to_span_dbe(
+            project_id=project_id,
+            user_id=user_id,
+            span_dto=OTelFlatSpan(
+                trace_id=trace_id,
+                span_id=root_id if n == 0 else uuid4().hex,
+                parent_id=None if n == 0 else root_id,
+                span_name="benchmark" if n == 0 else f"step-{n}",
+                start_time=start_time + timedelta(milliseconds=n),
+                end_time=start_time + timedelta(milliseconds=n + 1),
+                attributes={"ag": {"type": {"trace": "invocation", "span": "task"}}},
+            ),
+        )
+        values_list.append(
+            {c.name: getattr(span_dbe, c.name) for c in SpanDBE.__table__.columns}
+        )
+
+    return values_list
+
+
+async def load(engine, *, project_id, args, newest) -> None:
+    user_id = uuid4()
+    window = timedelta(days=args.days)
+    oldest = newest - window
+    traces_per_chunk = max(1, INGEST_CHUNK_SIZE // args.spans)
+
+    for lower in range(0, args.traces, traces_per_chunk):
+        upper = min(lower + traces_per_chunk, args.traces)
+        values_list = [
+            values
+            for n in range(lower, upper)
+            for values in trace_values(
+                project_id=project_id,
+                user_id=user_id,
+                start_time=oldest + window * n / args.traces,
+                spans=args.spans,
+            )
+        ]
+        async with engine.session() as session:
+            await session.execute(
+                _upsert_spans_stmt(values_list=values_list, user_id=user_id)
+            )
+            await write_trace_summaries(
+                session,
+                project_id=project_id,
+                values_list=values_list,
+            )
+            await session.commit()
+
+
+async def cover(engine, *, project_id, since) -> None:
+    async with engine.session() as session:
+        session.add(TraceCoverageDBE(project_id=project_id, since=since))
+        await session.commit()
+
+
+async def cleanup(engine, *, project_id) -> None:
+    async with engine.session() as session:
+        for dbe in (SpanDBE, TraceDBE, TraceCoverageDBE):
+            await session.execute(delete(dbe).where(dbe.project_id == project_id))
+        await session.commit()
+
+
+async def median_latency(call, *, rounds: int) -> float:
+    latencies = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        await call()
+        latencies.append(time.perf_counter() - started)
+    return statistics.median(latencies)
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--traces", type=int, default=100_000)
+    parser.add_argument("--spans", type=int, default=4)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    engine = get_analytics_engine()
+    dao = TracingDAO(engine=engine)
+    project_id = uuid4()
+
+    now = datetime.now(timezone.utc)
+    oldest = now - timedelta(days=args.days)
+
+    def query() -> TracingQuery:
+        return TracingQuery(
+            formatting=Formatting(focus=Focus.TRACE),
+            windowing=Windowing(oldest=oldest, newest=now, limit=args.limit),
+        )
+
+    try:
+        await load(engine, project_id=project_id, args=args, newest=now)
+
+        spans_page = await dao.query(project_id=project_id, query=query())
+        spans = await median_latency(
+            lambda: dao.query(project_id=project_id, query=query()),
+            rounds=args.rounds,
+        )
+
+        await cover(engine, project_id=project_id, since=oldest)
+
+        summaries_page = await dao.query(project_id=project_id, query=query())
+        summaries = await median_latency(
+            lambda: dao.query(project_id=project_id, query=query()),
+            rounds=args.rounds,
+        )
+    finally:
+        await cleanup(engine, project_id=project_id)
+        await engine.close()
+
+    same = [(s.trace_id, s.span_id) for s in spans_page] == [
+        (s.trace_id, s.span_id) for s in summaries_page
+    ]
+
+    print(
+        f"{args.traces:,} traces of {args.spans} spans over {args.days} days, "
+        f"pages of {args.limit}, median of {args.rounds}"
+    )
+    print()
+    print("| leg | latency ms |")
+    print("|---|---:|")
+    print(f"| spans | {spans * 1000:,.1f} |")
+    print(f"| summaries | {summaries * 1000:,.1f} |")
+    print()
+    print(f"speedup: {spans / summaries:,.1f}x, same page: {same}")
+
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -1058,6 +1058,18 @@ imagePullSecrets:
 - name: AGENTA_API_CACHING_ENABLED
   value: {{ $apiCaching.enabled | quote }}
 {{- end }}
+{{- if hasKey $apiCaching "localNamespaces" }}
+- name: AGENTA_CACHE_LOCAL_NAMESPACES
+  value: {{ $apiCaching.localNamespaces | quote }}
+{{- end }}
+{{- if $apiCaching.localMaxsize }}
+- name: AGENTA_CACHE_LOCAL_MAXSIZE
+  value: {{ $apiCaching.localMaxsize | quote }}
+{{- end }}
+{{- if $apiCaching.localTtl }}
+- name: AGENTA_CACHE_LOCAL_TTL
+  value: {{ $apiCaching.localTtl | quote }}
+{{- end }}
 {{- /* agenta.logging — log destination + levels */}}
 {{- if hasKey $logging "consoleEnabled" }}
 - name: AGENTA_LOGGING_CONSOLE_ENABLED
@@ -1092,6 +1104,18 @@ imagePullSecrets:
 - name: AGENTA_OTLP_MAX_BATCH_BYTES
   value: {{ $otlp.maxBatchBytes | quote }}
 {{- end }}
+{{- if hasKey $otlp "decodeProcesses" }}
+- name: AGENTA_OTLP_DECODE_PROCESSES
+  value: {{ $otlp.decodeProcesses | quote }}
+{{- end }}
+{{- if $otlp.decodeMaxPending }}
+- name: AGENTA_OTLP_DECODE_MAX_PENDING
+  value: {{ $otlp.decodeMaxPending | quote }}
+{{- end }}
+{{- if $otlp.retryAfterSeconds }}
+- name: AGENTA_OTLP_RETRY_AFTER_SECONDS
+  value: {{ $otlp.retryAfterSeconds | quote }}
+{{- end }}
 {{- /* agenta.insecureEgressAllowed — SSRF guard override for webhooks/hooks/custom-provider egress.
      Canonical key wins; falls back to the deprecated agenta.webhooks.allowInsecure /
      agenta.services.hook.allowInsecure keys so values.yaml files predating the rename keep working. */}}
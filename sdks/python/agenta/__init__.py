@@ -5,15 +5,11 @@ try:
 except Exception:
     __version__ = "0.0.0-dev"
 
+from importlib import import_module
 from typing import Any, Callable, Optional
 
-import agenta.client.types as client_types  # pylint: disable=wrong-import-order
-from agenta.client import AgentaApi, AsyncAgentaApi
-
 from .sdk.utils import assets as assets
 
-# evaluations
-from .sdk import testsets as testsets
 from .sdk.utils.init import AgentaSingleton
 from .sdk.utils.init import init as _init
 from .sdk.contexts.running import workflow_mode_enabled  # noqa: F401
@@ -22,68 +18,89 @@ from .sdk.decorators.running import (
     evaluator,  # noqa: F401
     workflow,  # noqa: F401
 )
-from .sdk.decorators.routing import default_app as app, route, create_app  # noqa: F401
 from .sdk.decorators.tracing import instrument  # noqa: F401
-from .sdk.managers.apps import AppManager  # noqa: F401
-from .sdk.managers.config import ConfigManager  # noqa: F401
-from .sdk.managers.deployment import DeploymentManager  # noqa: F401
-from .sdk.managers.secrets import SecretsManager  # noqa: F401
-from .sdk.managers.variant import VariantManager  # noqa: F401
-from .sdk.managers.vault import VaultManager  # noqa: F401
 from .sdk.engines.tracing import Tracing, get_tracer  # noqa: F401
 from .sdk.engines.tracing.conventions import Reference  # noqa: F401
-from .sdk.utils.types import (
-    BinaryParam,  # noqa: F401
-    DictInput,  # noqa: F401
-    FileInputURL,  # noqa: F401
-    FloatParam,  # noqa: F401
-    GroupedMultipleChoiceParam,  # noqa: F401
-    IntParam,  # noqa: F401
-    MCField,  # noqa: F401
-    Message,  # noqa: F401
-    Messages,  # noqa: F401
-    MultipleChoice,  # noqa: F401
-    MultipleChoiceParam,  # noqa: F401
-    Prompt,  # noqa: F401
-    PromptTemplate,  # noqa: F401
-    TextParam,  # noqa: F401
-)
 from .sdk.utils.costs import calculate_token_usage  # noqa: F401
 from .sdk.utils.logging import get_module_logger  # noqa: F401
 from .sdk.utils.preinit import PreInitObject  # noqa: F401
 
-# Agent runtime (the agents subsystem). `Message` is intentionally not re-exported here:
-# `agenta.Message` already names the prompt message type; import the agents one from
-# `agenta.sdk.agents` when needed.
-from .sdk.agents import (  # noqa: F401
-    AgentaHarness,
-    AgentTemplate,
-    ClaudeHarness,
-    Environment,
-    LocalBackend,
-    PiHarness,
-    SandboxAgentBackend,
-    SessionConfig,
-    make_harness,
-)
+# Everything else is imported on first access, so `import agenta` stays cheap for what a
+# service needs at startup: `ag.init`, `@ag.workflow` and `@ag.instrument`. The generated API
+# client, the FastAPI app, the managers, the parameter types and the agent runtime are loaded
+# by the first `ag.<name>` that needs them.
+_LAZY_ATTRIBUTES = {
+    # API clients (`api` and `async_api` are replaced by instances on `ag.init`)
+    "types": ("agenta.client.types", None),
+    "client_types": ("agenta.client.types", None),
+    "api": ("agenta.client", "AgentaApi"),
+    "async_api": ("agenta.client", "AsyncAgentaApi"),
+    "AgentaApi": ("agenta.client", "AgentaApi"),
+    "AsyncAgentaApi": ("agenta.client", "AsyncAgentaApi"),
+    # evaluations
+    "testsets": ("agenta.sdk.managers.testsets", None),
+    # routing
+    "app": ("agenta.sdk.decorators.routing", "default_app"),
+    "route": ("agenta.sdk.decorators.routing", "route"),
+    "create_app": ("agenta.sdk.decorators.routing", "create_app"),
+    # managers
+    "AppManager": ("agenta.sdk.managers.apps", "AppManager"),
+    "ConfigManager": ("agenta.sdk.managers.config", "ConfigManager"),
+    "DeploymentManager": ("agenta.sdk.managers.deployment", "DeploymentManager"),
+    "SecretsManager": ("agenta.sdk.managers.secrets", "SecretsManager"),
+    "VariantManager": ("agenta.sdk.managers.variant", "VariantManager"),
+    "VaultManager": ("agenta.sdk.managers.vault", "VaultManager"),
+    # parameter types
+    "BinaryParam": ("agenta.sdk.utils.types", "BinaryParam"),
+    "DictInput": ("agenta.sdk.utils.types", "DictInput"),
+    "FileInputURL": ("agenta.sdk.utils.types", "FileInputURL"),
+    "FloatParam": ("agenta.sdk.utils.types", "FloatParam"),
+    "GroupedMultipleChoiceParam": (
+        "agenta.sdk.utils.types",
+        "GroupedMultipleChoiceParam",
+    ),
+    "IntParam": ("agenta.sdk.utils.types", "IntParam"),
+    "MCField": ("agenta.sdk.utils.types", "MCField"),
+    "Message": ("agenta.sdk.utils.types", "Message"),
+    "Messages": ("agenta.sdk.utils.types", "Messages"),
+    "MultipleChoice": ("agenta.sdk.utils.types", "MultipleChoice"),
+    "MultipleChoiceParam": ("agenta.sdk.utils.types", "MultipleChoiceParam"),
+    "Prompt": ("agenta.sdk.utils.types", "Prompt"),
+    "PromptTemplate": ("agenta.sdk.utils.types", "PromptTemplate"),
+    "TextParam": ("agenta.sdk.utils.types", "TextParam"),
+    # Agent runtime (the agents subsystem). `Message` is intentionally not re-exported here:
+    # `agenta.Message` already names the prompt message type; import the agents one from
+    # `agenta.sdk.agents` when needed.
+    "AgentaHarness": ("agenta.sdk.agents", "AgentaHarness"),
+    "AgentTemplate": ("agenta.sdk.agents", "AgentTemplate"),
+    "ClaudeHarness": ("agenta.sdk.agents", "ClaudeHarness"),
+    "Environment": ("agenta.sdk.agents", "Environment"),
+    "LocalBackend": ("agenta.sdk.agents", "LocalBackend"),
+    "PiHarness": ("agenta.sdk.agents", "PiHarness"),
+    "SandboxAgentBackend": ("agenta.sdk.agents", "SandboxAgentBackend"),
+    "SessionConfig": ("agenta.sdk.agents", "SessionConfig"),
+    "make_harness": ("agenta.sdk.agents", "make_harness"),
+    # litellm callbacks
+    "callbacks": ("agenta.sdk.litellm.litellm", None),
+}
 
 DEFAULT_AGENTA_SINGLETON_INSTANCE = AgentaSingleton()
 
-types = client_types
-
-api = AgentaApi
-async_api = AsyncAgentaApi
-
 tracing = DEFAULT_AGENTA_SINGLETON_INSTANCE.tracing  # type: ignore
 tracer = get_tracer(tracing)
 
 
 def __getattr__(name: str):
-    if name == "callbacks":
-        from .sdk.litellm import litellm as callbacks
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+    module_name, attribute = _LAZY_ATTRIBUTES[name]
+    value = import_module(module_name)
+    if attribute is not None:
+        value = getattr(value, attribute)
 
-        return callbacks
-    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    globals()[name] = value
+    return value
 
 
 def init(
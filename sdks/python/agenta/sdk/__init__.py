@@ -1,4 +1,5 @@
 import sys
+from importlib import import_module
 from typing import Optional, Callable, Any
 
 from .utils.preinit import PreInitObject  # always the first import!  # noqa: F401
@@ -47,25 +48,8 @@ __all__ = [
     "types",
 ]
 
-import agenta.client.types as client_types  # noqa: E402, F401
-import agenta.sdk.utils.types as types  # noqa: E402, F401
 import agenta.sdk.utils.assets as assets  # noqa: E402, F401
 
-from .utils.types import (  # noqa: E402
-    DictInput,
-    MultipleChoice,
-    FloatParam,
-    IntParam,
-    MultipleChoiceParam,
-    GroupedMultipleChoiceParam,
-    TextParam,
-    Message,
-    Messages,
-    FileInputURL,
-    BinaryParam,
-    Prompt,
-)
-
 from .engines.tracing import Tracing, get_tracer
 from agenta.sdk.decorators.tracing import instrument
 from agenta.sdk.decorators.running import (
@@ -73,19 +57,55 @@ from agenta.sdk.decorators.running import (
     application,
     evaluator,
 )
-from agenta.sdk.decorators.routing import route, default_app as app
 from .engines.tracing.conventions import Reference
 from .utils.init import AgentaSingleton, init as _init
 from .utils.costs import calculate_token_usage
-from .managers.apps import AppManager
-from .managers.vault import VaultManager
-from .managers.secrets import SecretsManager
-from .managers.config import ConfigManager
-from .managers.variant import VariantManager
-from .managers.deployment import DeploymentManager
-from .managers import testsets as testsets
-
-sys.modules.setdefault("agenta.sdk.types", types)
+
+# Imported on first access: the parameter types and their schemas, the FastAPI app, the
+# managers and the generated client are not needed to init, trace or define a workflow.
+_LAZY_ATTRIBUTES = {
+    "client_types": ("agenta.client.types", None),
+    "types": ("agenta.sdk.utils.types", None),
+    "DictInput": ("agenta.sdk.utils.types", "DictInput"),
+    "MultipleChoice": ("agenta.sdk.utils.types", "MultipleChoice"),
+    "FloatParam": ("agenta.sdk.utils.types", "FloatParam"),
+    "IntParam": ("agenta.sdk.utils.types", "IntParam"),
+    "MultipleChoiceParam": ("agenta.sdk.utils.types", "MultipleChoiceParam"),
+    "GroupedMultipleChoiceParam": (
+        "agenta.sdk.utils.types",
+        "GroupedMultipleChoiceParam",
+    ),
+    "TextParam": ("agenta.sdk.utils.types", "TextParam"),
+    "Message": ("agenta.sdk.utils.types", "Message"),
+    "Messages": ("agenta.sdk.utils.types", "Messages"),
+    "FileInputURL": ("agenta.sdk.utils.types", "FileInputURL"),
+    "BinaryParam": ("agenta.sdk.utils.types", "BinaryParam"),
+    "Prompt": ("agenta.sdk.utils.types", "Prompt"),
+    "route": ("agenta.sdk.decorators.routing", "route"),
+    "app": ("agenta.sdk.decorators.routing", "default_app"),
+    "AppManager": ("agenta.sdk.managers.apps", "AppManager"),
+    "VaultManager": ("agenta.sdk.managers.vault", "VaultManager"),
+    "SecretsManager": ("agenta.sdk.managers.secrets", "SecretsManager"),
+    "ConfigManager": ("agenta.sdk.managers.config", "ConfigManager"),
+    "VariantManager": ("agenta.sdk.managers.variant", "VariantManager"),
+    "DeploymentManager": ("agenta.sdk.managers.deployment", "DeploymentManager"),
+    "testsets": ("agenta.sdk.managers.testsets", None),
+}
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+    module_name, attribute = _LAZY_ATTRIBUTES[name]
+    value = import_module(module_name)
+    if attribute is not None:
+        value = getattr(value, attribute)
+
+    globals()[name] = value
+    return value
+
+
 sys.modules.setdefault("agenta.sdk.assets", assets)
 
 # Compat shims: agenta.sdk.workflows.* → agenta.sdk.engines.running.*
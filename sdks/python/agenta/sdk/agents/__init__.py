@@ -151,11 +151,6 @@ from .tools import (
     coerce_tool_configs,
     parse_tool_config,
 )
-from .adapters.vercel import (
-    from_ui_messages,
-    to_ui_message,
-    ui_message_stream,
-)
 
 __all__ = [
     # DTOs
@@ -285,3 +280,13 @@ __all__ = [
     "AgentaHarness",
     "make_harness",
 ]
+
+
+def __getattr__(name: str):
+    # The former flat Vercel adapter names resolve on first use: the adapter pulls in FastAPI,
+    # which defining and running an agent does not need.
+    if name in ("from_ui_messages", "to_ui_message", "ui_message_stream"):
+        from .adapters import vercel
+
+        return getattr(vercel, name)
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
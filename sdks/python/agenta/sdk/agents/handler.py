@@ -34,11 +34,6 @@ from agenta.sdk.agents.adapters import SandboxAgentBackend, make_harness
 from agenta.sdk.agents.errors import SandboxNotAllowedError
 from agenta.sdk.agents.sandbox_providers import sandbox_provider_enabled
 from agenta.sdk.agents.mcp import ResolvedMCPServer
-from agenta.sdk.agents.platform import (
-    resolve_connection as _platform_resolve_connection,
-)
-from agenta.sdk.agents.platform import resolve_mcp as _platform_resolve_mcp
-from agenta.sdk.agents.platform import resolve_tools as _platform_resolve_tools
 
 from agenta.sdk.agents.fold import fold, trim_to_trailing_unit
 from agenta.sdk.agents.tracing import (
@@ -91,19 +86,29 @@ def _default_select_backend(agent_template: AgentTemplate) -> Backend:
     return SandboxAgentBackend(sandbox=agent_template.sandbox, url=url, cwd=os.getcwd())
 
 
+# The platform resolvers are imported on first run: `agenta.sdk.agents.platform` builds the
+# platform op catalog, whose schemas pull in the model catalog (and litellm for its costs).
+
+
 async def _default_resolve_tools(tools, **kwargs) -> ResolvedToolSet:
-    return await _platform_resolve_tools(tools, **kwargs)
+    from agenta.sdk.agents.platform import resolve_tools
+
+    return await resolve_tools(tools, **kwargs)
 
 
 async def _default_resolve_mcp_servers(
     mcp_servers, **kwargs
 ) -> List[ResolvedMCPServer]:
     """Resolve external MCP server declarations for one run."""
-    return await _platform_resolve_mcp(mcp_servers, **kwargs)
+    from agenta.sdk.agents.platform import resolve_mcp
+
+    return await resolve_mcp(mcp_servers, **kwargs)
 
 
 async def _default_resolve_connection(*, model, context) -> ResolvedConnection:
-    return await _platform_resolve_connection(model=model, context=context)
+    from agenta.sdk.agents.platform import resolve_connection
+
+    return await resolve_connection(model=model, context=context)
 
 
 def _check_harness_pre_resolve(model_ref: ModelRef, harness: Optional[str]) -> None:
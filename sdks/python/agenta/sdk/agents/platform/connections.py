@@ -14,9 +14,9 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
 
-import httpx
 
 from agenta.sdk.utils.logging import get_module_logger
+from agenta.sdk.utils.transport import get_async_client
 from agenta.sdk.utils.net import assert_endpoint_url_allowed
 
 from ..capabilities import (
@@ -643,11 +643,12 @@ class VaultConnectionResolver:
             )
 
         try:
-            async with httpx.AsyncClient(timeout=self._connection.timeout) as client:
-                response = await client.get(
-                    f"{api_base}/secrets/",
-                    headers=self._connection.headers(),
-                )
+            client = get_async_client()
+            response = await client.get(
+                f"{api_base}/secrets/",
+                headers=self._connection.headers(),
+                timeout=self._connection.timeout,
+            )
         except Exception as exc:  # pylint: disable=broad-except
             log.warning(
                 "agent: secrets fetch for connection resolution failed", exc_info=True
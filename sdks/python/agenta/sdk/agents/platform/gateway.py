@@ -26,6 +26,7 @@ from agenta.sdk.agents.tools import (
     UnsupportedToolProviderError,
 )
 from agenta.sdk.utils.logging import get_module_logger
+from agenta.sdk.utils.transport import get_async_client
 
 from .connection import PlatformConnection
 
@@ -146,12 +147,13 @@ class AgentaGatewayToolResolver:
             configs_by_reference[reference] = tool_config
 
         try:
-            async with httpx.AsyncClient(timeout=self._connection.timeout) as client:
-                response = await client.post(
-                    f"{api_base}/tools/resolve",
-                    json={"tools": references},
-                    headers=headers,
-                )
+            client = get_async_client()
+            response = await client.post(
+                f"{api_base}/tools/resolve",
+                json={"tools": references},
+                headers=headers,
+                timeout=self._connection.timeout,
+            )
         except httpx.HTTPError as exc:
             log.warning(
                 "agent: gateway tool resolution request failed for %d tool(s)",
@@ -790,6 +790,27 @@ _QUERY_SPANS_INPUT_SCHEMA: Dict[str, Any] = {
                 "`oldest`/`newest` and set a sensible `limit`."
             ),
         },
+        "fields": {
+            "anyOf": [
+                {"type": "array", "items": {"type": "string"}},
+                {"type": "null"},
+            ],
+            "default": None,
+            "description": (
+                "JSON fields to return: `attributes`, `events`, `links`, `references`, "
+                "`hashes`, or parts of attributes by path such as "
+                "`attributes.ag.data.outputs`. Others are returned as null. All by "
+                "default."
+            ),
+        },
+        "truncate": {
+            "anyOf": [{"type": "integer", "exclusiveMinimum": 0}, {"type": "null"}],
+            "default": None,
+            "description": (
+                "Cap the returned parts of attributes, and `ag.data.inputs`/"
+                "`ag.data.outputs` within whole attributes, at this many characters."
+            ),
+        },
         "query_ref": {
             "anyOf": [{"$ref": "#/$defs/Reference"}, {"type": "null"}],
             "default": None,
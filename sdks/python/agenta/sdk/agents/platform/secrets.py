@@ -18,9 +18,9 @@ from __future__ import annotations
 from typing import Any, Dict, Mapping, Optional, Sequence
 from urllib.parse import quote
 
-import httpx
 
 from agenta.sdk.utils.logging import get_module_logger
+from agenta.sdk.utils.transport import get_async_client
 
 from ..capabilities import PROVIDER_ENV_VARS
 from .connection import PlatformConnection
@@ -46,25 +46,24 @@ async def resolve_named_secrets(
     resolved: Dict[str, str] = {}
     headers = connection.headers()
 
-    async with httpx.AsyncClient(timeout=connection.timeout) as client:
-        for name in requested:
-            try:
-                response = await client.get(
-                    f"{api_base}/secrets/{quote(name, safe='')}",
-                    headers=headers,
-                )
-                if response.status_code == 404:
-                    continue
-                if response.status_code >= 400:
-                    log.warning(
-                        "agent: named-secret read HTTP %s", response.status_code
-                    )
-                    continue
-                value = _text_custom_secret_value(response.json())
-                if value is not None:
-                    resolved[name] = value
-            except Exception:  # pylint: disable=broad-except
-                log.warning("agent: named-secret read failed", exc_info=True)
+    client = get_async_client()
+    for name in requested:
+        try:
+            response = await client.get(
+                f"{api_base}/secrets/{quote(name, safe='')}",
+                headers=headers,
+                timeout=connection.timeout,
+            )
+            if response.status_code == 404:
+                continue
+            if response.status_code >= 400:
+                log.warning("agent: named-secret read HTTP %s", response.status_code)
+                continue
+            value = _text_custom_secret_value(response.json())
+            if value is not None:
+                resolved[name] = value
+        except Exception:  # pylint: disable=broad-except
+            log.warning("agent: named-secret read failed", exc_info=True)
 
     missing_count = len(requested) - len(resolved)
     if missing_count:
@@ -123,10 +122,12 @@ async def resolve_provider_keys(
         return {}
 
     try:
-        async with httpx.AsyncClient(timeout=connection.timeout) as client:
-            response = await client.get(
-                f"{api_base}/secrets/", headers=connection.headers()
-            )
+        client = get_async_client()
+        response = await client.get(
+            f"{api_base}/secrets/",
+            headers=connection.headers(),
+            timeout=connection.timeout,
+        )
         if response.status_code >= 400:
             log.warning("agent: vault secrets fetch HTTP %s", response.status_code)
             return {}
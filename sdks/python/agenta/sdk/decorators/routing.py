@@ -1,6 +1,7 @@
 # /agenta/sdk/decorators/routing.py
 
 import warnings
+from contextlib import asynccontextmanager
 from typing import Any, Callable, Optional, AsyncGenerator, Union
 from json import dumps
 from uuid import UUID
@@ -11,6 +12,7 @@ from fastapi.responses import JSONResponse, StreamingResponse, Response
 from starlette.routing import Mount
 
 from agenta.sdk.utils.exceptions import suppress
+from agenta.sdk.utils.transport import aclose_clients
 from agenta.sdk.models.workflows import (
     WorkflowInvokeRequest,
     WorkflowInspectRequest,
@@ -70,10 +72,28 @@ def _validate_path(path: str) -> None:
 # ---------------------------------------------------------------------------
 
 
+def _closing_http_clients(lifespan: Optional[Callable] = None) -> Callable:
+    """Wrap an app lifespan (or none) so the pooled HTTP clients close on shutdown."""
+
+    @asynccontextmanager
+    async def _lifespan(app: FastAPI):
+        try:
+            if lifespan is None:
+                yield
+            else:
+                async with lifespan(app) as state:
+                    yield state
+        finally:
+            await aclose_clients()
+
+    return _lifespan
+
+
 def create_app(**kwargs: Any) -> FastAPI:
     kwargs.setdefault("openapi_url", None)
     kwargs.setdefault("docs_url", None)
     kwargs.setdefault("redoc_url", None)
+    kwargs["lifespan"] = _closing_http_clients(kwargs.get("lifespan"))
 
     app = FastAPI(**kwargs)
 
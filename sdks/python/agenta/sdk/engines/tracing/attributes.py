@@ -1,4 +1,4 @@
-from json import dumps
+from json import dumps, loads
 from typing import Optional, Union, Sequence, Any, Dict
 
 Primitive = Union[str, int, float, bool, bytes]
@@ -201,3 +201,72 @@ def serialize(
     }
 
     return _attributes
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, str) and value.startswith("@ag.type=json:"):
+        try:
+            return loads(value[len("@ag.type=json:") :])
+        except ValueError:
+            return value
+
+    if isinstance(value, tuple):
+        return list(value)
+
+    return value
+
+
+def _unmarshall(marshalled: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Inverse of `_marshall`: rebuilds the nested dictionary from dotted keys,
+    turning numeric segments into list indices.
+    """
+    unmarshalled: Dict[str, Any] = {}
+
+    for compound_key, value in marshalled.items():
+        keys = compound_key.split(".")
+        current: Any = unmarshalled
+
+        for i, key in enumerate(keys):
+            is_last = i == len(keys) - 1
+            index = int(key) if key.isdigit() else None
+
+            if is_last:
+                if isinstance(current, list) and index is not None:
+                    while len(current) <= index:
+                        current.append(None)
+                    current[index] = value
+                elif isinstance(current, dict):
+                    current[key] = value
+                continue
+
+            child: Any = [] if keys[i + 1].isdigit() else {}
+
+            if isinstance(current, list) and index is not None:
+                while len(current) <= index:
+                    current.append(None)
+                if current[index] is None:
+                    current[index] = child
+                current = current[index]
+            elif isinstance(current, dict):
+                if not isinstance(current.get(key), (dict, list)):
+                    current[key] = child
+                current = current[key]
+            else:
+                break
+
+    return unmarshalled
+
+
+def deserialize(
+    *,
+    attributes: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Inverse of `serialize`: nests the dotted span attributes and decodes the
+    JSON-encoded values, the way the API does when it stores a span.
+    """
+    if not attributes:
+        return {}
+
+    return _unmarshall({key: _decode_value(value) for key, value in attributes.items()})
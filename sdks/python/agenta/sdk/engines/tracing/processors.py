@@ -1,5 +1,7 @@
+from collections import OrderedDict
+from contextlib import contextmanager
 from threading import Lock
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 
 
 from agenta.sdk.contexts.tracing import TracingContext
@@ -18,6 +20,10 @@ from agenta.sdk.models.tracing import BaseModel
 
 log = get_module_logger(__name__)
 
+# Finished traces kept for in-process readers while a `retaining()` scope is open.
+# Bounded, oldest evicted first, so traces nobody takes cannot pile up.
+MAX_RETAINED_TRACES = 1024
+
 
 def _as_otel_id(value) -> int:
     # Link ids arrive as bare hex (live spans) or as dashed UUIDs (recovered from
@@ -44,6 +50,10 @@ class TraceProcessor(SpanProcessor):
         self._exporter = span_exporter
         self._spans: Dict[int, List[ReadableSpan]] = dict()
 
+        self._retaining = 0
+        self._retained: "OrderedDict[int, List[ReadableSpan]]" = OrderedDict()
+        self._retained_lock = Lock()
+
         # --- DISTRIBUTED
         if not self.inline:
             self._delegate = BatchSpanProcessor(
@@ -189,6 +199,9 @@ class TraceProcessor(SpanProcessor):
             spans = self._spans.pop(trace_id, [])
             self._registry.pop(trace_id, None)
 
+            if self._retaining:
+                self._retain(trace_id, spans)
+
             # --- INLINE
             if self.inline:
                 self._exporter.export(spans)
@@ -202,6 +215,40 @@ class TraceProcessor(SpanProcessor):
                 self._delegate.force_flush()
             # --- DISTRIBUTED
 
+    @contextmanager
+    def retaining(self) -> Iterator["TraceProcessor"]:
+        """Keep finished traces for `take` while the scope is open (scopes nest).
+
+        Export is unaffected: a retained trace is still sent to the exporter.
+        """
+        with self._retained_lock:
+            self._retaining += 1
+        try:
+            yield self
+        finally:
+            with self._retained_lock:
+                self._retaining -= 1
+                if not self._retaining:
+                    self._retained.clear()
+
+    def _retain(
+        self,
+        trace_id: int,
+        spans: List[ReadableSpan],
+    ) -> None:
+        with self._retained_lock:
+            self._retained[trace_id] = list(spans)
+            while len(self._retained) > MAX_RETAINED_TRACES:
+                self._retained.popitem(last=False)
+
+    def take(
+        self,
+        trace_id: int,
+    ) -> Optional[List[ReadableSpan]]:
+        """Pop the finished spans of `trace_id`, if retained."""
+        with self._retained_lock:
+            return self._retained.pop(trace_id, None)
+
     def force_flush(
         self,
         timeout_millis: int = None,
@@ -1,5 +1,6 @@
 import warnings
-from typing import Optional, Any, Dict, Callable
+from contextlib import nullcontext
+from typing import ContextManager, Optional, Any, Dict, Callable
 from enum import Enum
 
 from pydantic import BaseModel
@@ -27,6 +28,7 @@ from agenta.sdk.engines.tracing.processors import (
 )
 from agenta.sdk.engines.tracing.exporters import OTLPExporter
 from agenta.sdk.engines.tracing.spans import CustomSpan
+from agenta.sdk.engines.tracing.trees import spans_to_trace
 from agenta.sdk.engines.tracing.conventions import Reference, is_valid_attribute_key
 from agenta.sdk.engines.tracing.propagation import extract, inject
 from agenta.sdk.utils.cache import TTLLRUCache
@@ -75,6 +77,8 @@ class Tracing(metaclass=Singleton):
         self.tracer_provider: Optional[TracerProvider] = None
         # TRACER
         self.tracer: Optional[Tracer] = None
+        # PROCESSOR
+        self.processor: Optional[TraceProcessor] = None
 
         # REDACT
         self.redact = redact
@@ -113,6 +117,7 @@ class Tracing(metaclass=Singleton):
             )
 
             self.tracer_provider.add_span_processor(_otlp)
+            self.processor = _otlp
         except Exception:  # pylint: disable=bare-except
             log.warning("Agenta - OTLP unreachable, skipping exports.")
 
@@ -121,6 +126,28 @@ class Tracing(metaclass=Singleton):
         # TRACER
         self.tracer: Tracer = self.tracer_provider.get_tracer("agenta.tracer")
 
+    def retain_traces(self) -> ContextManager[Any]:
+        """Keep the traces that finish in this process for `take_trace` while open."""
+        if self.processor is None:
+            return nullcontext()
+
+        return self.processor.retaining()
+
+    def take_trace(
+        self,
+        trace_id: str,
+    ) -> Optional[Dict[str, Any]]:
+        """Pop a trace retained by `retain_traces`, shaped like a fetched trace."""
+        if self.processor is None:
+            return None
+
+        try:
+            spans = self.processor.take(int(str(trace_id).replace("-", ""), 16))
+        except ValueError:
+            return None
+
+        return spans_to_trace(spans) if spans else None
+
     def get_current_span(self):
         _span = None
 
@@ -0,0 +1,90 @@
+"""Trace trees assembled in-process from finished spans.
+
+Shapes a finished trace the way `GET /tracing/traces/{trace_id}` returns it: a
+`spans` map keyed by span name, each span's children nested under its own `spans`
+(a list when siblings share a name). Code that reads fetched traces can read a
+local one. It carries what the SDK recorded; what the API adds at ingestion
+(cumulative metrics, semantic-convention mapping) is not there.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+from opentelemetry.sdk.trace import ReadableSpan
+
+from agenta.sdk.engines.tracing.attributes import deserialize
+
+# Non-dict outputs are recorded under this key (see `decorators.tracing`); the API
+# unwraps it when it returns a span, and so does this.
+_DEFAULT_KEY = "__default__"
+
+
+def _timestamp(ns: Optional[int]) -> Optional[str]:
+    if ns is None:
+        return None
+    return datetime.fromtimestamp(ns / 1e9, tz=timezone.utc).isoformat()
+
+
+def _attributes(span: ReadableSpan) -> Dict[str, Any]:
+    attributes = deserialize(attributes=dict(span.attributes or {}))
+
+    ag = attributes.get("ag")
+    data = ag.get("data") if isinstance(ag, dict) else None
+    outputs = data.get("outputs") if isinstance(data, dict) else None
+    if isinstance(outputs, dict) and _DEFAULT_KEY in outputs:
+        data["outputs"] = outputs[_DEFAULT_KEY]
+
+    return attributes
+
+
+def _node(span: ReadableSpan) -> Dict[str, Any]:
+    context = span.get_span_context()
+    attributes = _attributes(span)
+    types = (attributes.get("ag") or {}).get("type") or {}
+
+    return dict(
+        trace_id=format(context.trace_id, "032x"),
+        span_id=format(context.span_id, "016x"),
+        parent_id=format(span.parent.span_id, "016x") if span.parent else None,
+        trace_type=types.get("trace") if isinstance(types, dict) else None,
+        span_type=types.get("span") if isinstance(types, dict) else None,
+        span_kind=f"SPAN_KIND_{span.kind.name}",
+        span_name=span.name,
+        start_time=_timestamp(span.start_time),
+        end_time=_timestamp(span.end_time),
+        status_code=f"STATUS_CODE_{span.status.status_code.name}",
+        status_message=span.status.description,
+        attributes=attributes,
+    )
+
+
+def _attach(parent: Dict[str, Any], node: Dict[str, Any]) -> None:
+    spans = parent.setdefault("spans", {})
+    name = node["span_name"]
+
+    if name not in spans:
+        spans[name] = node
+    elif isinstance(spans[name], list):
+        spans[name].append(node)
+    else:
+        spans[name] = [spans[name], node]
+
+
+def spans_to_trace(spans: Sequence[ReadableSpan]) -> Optional[Dict[str, Any]]:
+    """Nest the finished spans of one trace into `{trace_id, spans}`, or None if empty."""
+    if not spans:
+        return None
+
+    ordered: List[ReadableSpan] = sorted(spans, key=lambda span: span.start_time or 0)
+    nodes = {span.get_span_context().span_id: _node(span) for span in ordered}
+
+    trace: Dict[str, Any] = dict(trace_id=next(iter(nodes.values()))["trace_id"])
+
+    for span in ordered:
+        node = nodes[span.get_span_context().span_id]
+        parent = nodes.get(span.parent.span_id) if span.parent else None
+        # A span whose parent is not part of this trace (e.g. a remote parent)
+        # is a root here.
+        _attach(parent if parent is not None else trace, node)
+
+    return trace
@@ -1,4 +1,5 @@
-from typing import Dict, List, Any, Union, Optional
+from contextlib import nullcontext
+from typing import ContextManager, Dict, List, Any, Union, Optional
 from uuid import UUID
 from copy import deepcopy
 from datetime import datetime
@@ -31,7 +32,7 @@ from agenta.sdk.evaluations.runs import (
 )
 from agenta.sdk.evaluations.scenarios import (
     aadd as aadd_scenarios,
-    aedit_scenario,
+    aedit_scenarios,
 )
 from agenta.sdk.evaluations.results import (
     apopulate as apopulate_slice,
@@ -51,6 +52,8 @@ from agenta.sdk.evaluations.preview.utils import afetch_trace
 
 from agenta.sdk.utils.logging import get_module_logger
 
+import agenta as ag
+
 
 log = get_module_logger(__name__)
 
@@ -395,6 +398,17 @@ async def _prepare_run_data(
     )
 
 
+# `ag.tracing` is set (and rebound) by `ag.init`, so it is looked up on every use.
+
+
+def _retain_local_traces() -> ContextManager[Any]:
+    return ag.tracing.retain_traces() if ag.tracing is not None else nullcontext()
+
+
+def _take_local_trace(*, trace_id: str) -> Optional[Dict[str, Any]]:
+    return ag.tracing.take_trace(trace_id) if ag.tracing is not None else None
+
+
 def _build_local_runner() -> AsyncioEvaluationTaskRunner:
     """Wire the in-process runner from the SDK's module-level API wrappers.
 
@@ -409,9 +423,10 @@ def _build_local_runner() -> AsyncioEvaluationTaskRunner:
         retrieve_evaluator=aretrieve_evaluator,
         #
         fetch_trace=afetch_trace,
+        load_local_trace=_take_local_trace,
         #
         add_scenarios=aadd_scenarios,
-        edit_scenario=aedit_scenario,
+        edit_scenarios=aedit_scenarios,
         #
         populate_slice=apopulate_slice,
         refresh_metrics=arefresh,
@@ -485,10 +500,13 @@ async def aevaluate(
 
     runner = _build_local_runner()
 
-    scenarios, run_status = await runner.process_run_locally(
-        run_id=run.id,
-        run_data=run_data,
-    )
+    # The steps run in this process: their traces are kept as they finish and
+    # handed to the engine directly instead of being read back from the API.
+    with _retain_local_traces():
+        scenarios, run_status = await runner.process_run_locally(
+            run_id=run.id,
+            run_data=run_data,
+        )
 
     if not scenarios:
         log.warning(
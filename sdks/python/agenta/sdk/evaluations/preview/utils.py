@@ -690,11 +690,21 @@ from agenta.sdk.utils.client import authed_async_api  # noqa: E402
 from typing import Dict, Any, Optional  # noqa: E402
 
 
+# Seconds the API holds one trace request until the trace is committed; under the
+# client's request timeout so a long poll never reads as a failure.
+_TRACE_WAIT_SECONDS = 5.0
+
+
 async def afetch_trace(
     trace_id: str, max_retries: int = 30, delay: float = 1.0
 ) -> Optional[Dict[str, Any]]:
     """
-    Fetch trace data from the API with retry logic.
+    Fetch trace data from the API, waiting for it to be committed.
+
+    Each request asks the API to hold it until the trace is stored (`wait`), so
+    a trace is returned as soon as the ingestion worker commits it. An API that
+    does not support `wait` answers at once; the attempt then sleeps `delay` as
+    before. Either way the whole fetch gives up after `max_retries * delay` seconds.
 
     Args:
         trace_id: The trace ID to fetch
@@ -704,16 +714,24 @@ async def afetch_trace(
     Returns:
         Trace data dictionary or None if not found
     """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_retries * delay
+
     for attempt in range(max_retries):
+        started = loop.time()
+        remaining = deadline - started
+        if remaining <= 0:
+            break
+
         try:
             response = await authed_async_api()(
-                method="GET", endpoint=f"/tracing/traces/{trace_id}"
+                method="GET",
+                endpoint=f"/tracing/traces/{trace_id}",
+                params={"wait": round(min(remaining, _TRACE_WAIT_SECONDS), 3)},
             )
             response.raise_for_status()
             trace_data = response.json()
 
-            # print(trace_data)
-
             # Get the traces dictionary
             traces = trace_data.get("traces", {})
             if traces:
@@ -726,8 +744,8 @@ async def afetch_trace(
                     ):
                         return trace_content
 
-            # If no data yet, retry on next iteration
-            if attempt < max_retries - 1:
+            # An empty answer that came back early was not held by the API.
+            if attempt < max_retries - 1 and loop.time() - started < delay:
                 await asyncio.sleep(delay)
 
         except Exception as e:
@@ -1,7 +1,12 @@
 from asyncio import Semaphore, gather
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from agenta.sdk.decorators.running import invoke_application, invoke_evaluator
+from agenta.sdk.evaluations.runtime.buffers import (
+    DEFAULT_MAX_DELAY,
+    DEFAULT_MAX_SIZE,
+    WriteBuffer,
+)
 from agenta.sdk.evaluations.runtime.models import (
     WorkflowExecutionRequest,
     WorkflowExecutionResult,
@@ -81,19 +86,32 @@ class SDKWorkflowRunner:
 
 
 class SDKResultSetter:
-    """Result setter that WRITES each cell live, like the API's APIResultSetter.
-
-    Aligns the SDK with the API persistence model: each finished cell is
-    populated to the backend as the engine produces it (one `populate` call per
-    cell), instead of collected and bulk-written after the slice. Writing live is
-    what lets the engine's inline per-scenario metric refresh see persisted
-    cells, so the SDK gets the SAME variational-inline + global-at-end refresh
-    shape as the API. The returned dict is what the engine remembers as the
-    cell's value.
+    """Result setter that WRITES each cell behind, like the API's bound setter.
+
+    Each finished cell is shaped into a populate-ready dict and handed to a
+    `WriteBuffer`, which writes the cells the engine produced in between in one
+    `populate` call: when the buffer fills or its delay expires, and on `flush`.
+    The executor flushes before every metric refresh, so the engine's inline
+    per-scenario refresh still sees persisted cells — the SAME
+    variational-inline + global-at-end refresh shape as the API — and once more
+    when the slice is done. The returned dict is what the engine remembers as
+    the cell's value.
     """
 
-    def __init__(self, *, populate: Any) -> None:
+    def __init__(
+        self,
+        *,
+        populate: Any,
+        #
+        max_size: int = DEFAULT_MAX_SIZE,
+        max_delay: Optional[float] = DEFAULT_MAX_DELAY,
+    ) -> None:
         self._populate = populate
+        self._buffer = WriteBuffer(
+            write=self._write,
+            max_size=max_size,
+            max_delay=max_delay,
+        )
 
     async def set(
         self,
@@ -121,40 +139,70 @@ class SDKResultSetter:
             else None,
             error=error if error is not None else cell.error,
         )
-        await self._populate(results=[payload])
+        await self._buffer.add(payload)
         return payload
 
+    async def flush(self) -> None:
+        await self._buffer.flush()
+
+    async def _write(self, results: List[Dict[str, Any]]) -> None:
+        await self._populate(results=results)
+
 
 class SDKScenarioEditor:
     """Engine `edit_scenario` adapter — SDK peer of `APIScenarioEditor`.
 
-    Bridges the engine's `(scenario, status)` contract to the SDK client's
-    `aedit_scenario(scenario_id=, status=, tags=, meta=)`, carrying the
-    scenario's tags/meta through like the API adapter. The injected `edit`
-    client tolerates a run closed mid-flight (HTTP 409 -> None).
+    Bridges the engine's `(scenario, status)` contract to the SDK client's bulk
+    `aedit_scenarios(scenarios=[...])`, carrying the scenario's tags/meta
+    through like the API adapter. Statuses are written behind, like result
+    cells: the buffer is flushed when the slice is done. The injected `edit`
+    client tolerates a run closed mid-flight (HTTP 409 -> []).
     """
 
-    def __init__(self, *, edit: Any) -> None:
+    def __init__(
+        self,
+        *,
+        edit: Any,
+        #
+        max_size: int = DEFAULT_MAX_SIZE,
+        max_delay: Optional[float] = DEFAULT_MAX_DELAY,
+    ) -> None:
         self._edit = edit
+        self._buffer = WriteBuffer(
+            write=self._write,
+            max_size=max_size,
+            max_delay=max_delay,
+        )
 
-    async def __call__(self, *, scenario: Any, status: Any) -> Any:
-        return await self._edit(
-            scenario_id=scenario.id,
-            #
-            status=getattr(status, "value", status),
-            #
-            # The edit is a full PUT, not a partial PATCH: every field not sent is
-            # overwritten to its default. Carry EVERY persisted scenario field so
-            # the status write does not wipe them (a dropped `flags` is what
-            # leaves a scenario grey instead of green in the UI).
-            flags=getattr(scenario, "flags", None),
-            tags=getattr(scenario, "tags", None),
-            meta=getattr(scenario, "meta", None),
-            #
-            interval=getattr(scenario, "interval", None),
-            timestamp=getattr(scenario, "timestamp", None),
+    async def __call__(self, *, scenario: Any, status: Any) -> None:
+        await self._buffer.add(
+            dict(
+                scenario_id=scenario.id,
+                #
+                status=getattr(status, "value", status),
+                #
+                # The edit is a full PUT, not a partial PATCH: every field not
+                # sent is overwritten to its default. Carry EVERY persisted
+                # scenario field so the status write does not wipe them (a
+                # dropped `flags` is what leaves a scenario grey instead of green
+                # in the UI).
+                flags=getattr(scenario, "flags", None),
+                tags=getattr(scenario, "tags", None),
+                meta=getattr(scenario, "meta", None),
+                #
+                interval=getattr(scenario, "interval", None),
+                timestamp=getattr(scenario, "timestamp", None),
+            )
         )
 
+    async def flush(self) -> None:
+        await self._buffer.flush()
+
+    async def _write(self, scenarios: List[Dict[str, Any]]) -> None:
+        # A scenario written twice in one batch keeps its last status.
+        latest = {str(scenario["scenario_id"]): scenario for scenario in scenarios}
+        await self._edit(scenarios=list(latest.values()))
+
 
 class SDKMetricsRefresher:
     """Engine `refresh_metrics` adapter — SDK peer of `APIMetricsRefresher`.
@@ -163,10 +211,16 @@ class SDKMetricsRefresher:
     `(run_id, None)` once at the end (global). Wraps the injected `arefresh`
     client; the SDK has no temporal axis, so unlike the API adapter it does not
     handle timestamp/interval buckets.
+
+    The API computes metrics from stored result cells and traces, so `settle`
+    first writes the buffered cells (see `SDKResultSetter`) and, when the engine
+    was handed local traces (see `SDKTraceFetcher`), waits for those to be
+    committed server-side.
     """
 
-    def __init__(self, *, refresh: Any) -> None:
+    def __init__(self, *, refresh: Any, settle: Optional[Any] = None) -> None:
         self._refresh = refresh
+        self._settle = settle
 
     async def __call__(
         self,
@@ -175,6 +229,9 @@ class SDKMetricsRefresher:
         #
         scenario_id: Any = None,
     ) -> Any:
+        if self._settle is not None:
+            await self._settle()
+
         return await self._refresh(
             run_id=run_id,
             #
@@ -187,22 +244,47 @@ class SDKTraceFetcher:
 
     A callable `(trace_id) -> trace | None`, wrapping the injected `afetch_trace`
     client so the engine loads a runner's trace after a step executes.
+
+    A step run in this process has already finished its trace here, so the
+    injected `local` loader (`(trace_id) -> trace | None`) is tried first and the
+    engine moves on without a round trip. The ids served that way are pending
+    until `settle` has seen them committed server-side through `fetch`.
     """
 
     def __init__(
         self,
         *,
         fetch: Any,
+        local: Optional[Any] = None,
     ) -> None:
         self._fetch = fetch
+        self._local = local
+        self._pending: Dict[str, None] = {}
 
     async def __call__(
         self,
         *,
         trace_id: str,
     ) -> Any:
+        if self._local is not None:
+            trace = self._local(trace_id=trace_id)
+            if trace is not None:
+                self._pending[trace_id] = None
+                return trace
+
         return await self._fetch(trace_id=trace_id)
 
+    async def settle(self) -> None:
+        """Wait until every locally served trace is readable from the API."""
+        pending = list(self._pending)
+        if not pending:
+            return
+
+        await gather(*(self._fetch(trace_id=trace_id) for trace_id in pending))
+
+        for trace_id in pending:
+            self._pending.pop(trace_id, None)
+
 
 def _normalize_service_response(response: Any) -> WorkflowExecutionResult:
     # A response with no trace_id is treated as a FAILURE on purpose: the SDK
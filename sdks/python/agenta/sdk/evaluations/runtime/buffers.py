@@ -0,0 +1,115 @@
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional
+
+from agenta.sdk.utils.logging import get_module_logger
+
+_log = get_module_logger(__name__)
+
+# A buffer writes as soon as it holds this many items...
+DEFAULT_MAX_SIZE = 100
+# ...or this many seconds after its oldest unwritten item was added.
+DEFAULT_MAX_DELAY = 1.0
+
+
+class WriteBuffer:
+    """Write-behind buffer coalescing single writes into bulk ones.
+
+    The engine persists one result cell (and one scenario status) at a time;
+    the stores it writes to take lists. Items `add`ed here are handed to the
+    bulk `write(items)` together: when `max_size` are held, when the oldest has
+    waited `max_delay` seconds, or on an explicit `flush`. Drivers flush before
+    reading back what was written (the metrics refresh) and once the slice is
+    done, including when it failed.
+
+    Writes are serialized, so items reach the store in the order they were
+    added. A failed write is not retried: its error is raised to the caller
+    that flushed, like the single write it replaces. A failure of the delayed
+    write has no caller, so it is raised by the next `flush` instead.
+    """
+
+    def __init__(
+        self,
+        *,
+        write: Callable[[List[Any]], Awaitable[Any]],
+        #
+        max_size: int = DEFAULT_MAX_SIZE,
+        max_delay: Optional[float] = DEFAULT_MAX_DELAY,
+    ) -> None:
+        self._write = write
+        self._max_size = max(1, max_size)
+        self._max_delay = max_delay
+
+        self._items: List[Any] = []
+        self._lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+        self._error: Optional[Exception] = None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    async def add(self, item: Any) -> None:
+        self._items.append(item)
+
+        if len(self._items) >= self._max_size:
+            await self.flush()
+        elif self._timer is None and self._max_delay is not None:
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def flush(self) -> None:
+        """Write everything added so far, then raise a pending delayed-write error."""
+        # A timer still sleeping is no longer needed. One that woke up has
+        # already cleared itself and is writing: it is never cancelled mid-write.
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        async with self._lock:
+            items, self._items = self._items, []
+            if items:
+                await self._write(items)
+
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self._max_delay)
+        self._timer = None
+
+        async with self._lock:
+            items, self._items = self._items, []
+            if not items:
+                return
+            try:
+                await self._write(items)
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                _log.warning(
+                    "[BUFFER] delayed write failed",
+                    items=len(items),
+                    exc_info=True,
+                )
+                self._error = exc
+
+
+async def flush_each(*targets: Any, raise_errors: bool = True) -> None:
+    """Flush `targets` in order, each one also when an earlier one failed.
+
+    Failures are logged. The first is raised once every target was flushed,
+    unless `raise_errors` is off: a slice that failed flushes that way, so its
+    own error is the one that propagates.
+    """
+    error: Optional[Exception] = None
+
+    for target in targets:
+        try:
+            await target.flush()
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            _log.error(
+                "[BUFFER] flush failed",
+                target=type(target).__name__,
+                exc_info=True,
+            )
+            error = error or exc
+
+    if error is not None and raise_errors:
+        raise error
@@ -9,6 +9,7 @@ from agenta.sdk.evaluations.runtime.adapters import (
     SDKMetricsRefresher,
     SDKTraceFetcher,
 )
+from agenta.sdk.evaluations.runtime.buffers import flush_each
 from agenta.sdk.evaluations.runtime.models import (
     EvaluationStep,
     PlannedCell,
@@ -135,7 +136,8 @@ class AsyncioEvaluationTaskRunner:
 
       1. add_scenarios — bulk-mint N skeleton scenarios (the `add_scenarios` op),
       2. process — ONE slice over all scenarios via the SDK engine with local
-         runners. Each cell is written live (SDKResultSetter -> populate), the
+         runners. Cells and statuses are written behind in bulk
+         (SDKResultSetter -> populate, SDKScenarioEditor -> edit_scenarios), the
          engine refreshes metrics inline per scenario (variational) and once at
          the end (global), and writes each scenario's status — the SAME shape as
          the API worker, only the runner is local.
@@ -151,23 +153,25 @@ class AsyncioEvaluationTaskRunner:
         add_scenarios: Callable[..., Awaitable[List[Any]]],
         populate_slice: Callable[..., Awaitable[Any]],
         refresh_metrics: Callable[..., Awaitable[Any]],
-        edit_scenario: Callable[..., Awaitable[Any]],
+        edit_scenarios: Callable[..., Awaitable[Any]],
         retrieve_testset: Callable[..., Awaitable[Any]],
         retrieve_application: Callable[..., Awaitable[Any]],
         retrieve_evaluator: Callable[..., Awaitable[Any]],
         workflow_runner: Any,
         fetch_trace: Any,
+        load_local_trace: Optional[Callable[..., Optional[Any]]] = None,
     ):
         self._process_sources = process_sources
         self._add_scenarios = add_scenarios
         self._populate_slice = populate_slice
         self._refresh_metrics = refresh_metrics
-        self._edit_scenario = edit_scenario
+        self._edit_scenarios = edit_scenarios
         self._retrieve_testset = retrieve_testset
         self._retrieve_application = retrieve_application
         self._retrieve_evaluator = retrieve_evaluator
         self._workflow_runner = workflow_runner
         self._fetch_trace = fetch_trace
+        self._load_local_trace = load_local_trace
 
     def _build_steps_and_runners(
         self,
@@ -401,7 +405,7 @@ class AsyncioEvaluationTaskRunner:
         (`_retrieve_revisions`, via injected retrievers) — mirroring the API
         executor, which fetches its revisions inside `process`, not before. Per
         testset: add_scenarios (bulk) -> ONE process_sources slice over all
-        scenarios (live cell writes, inline + global metric refresh, status
+        scenarios (buffered cell writes, inline + global metric refresh, status
         writes). Empty/unresolved testsets are skipped, not failed.
         """
         (
@@ -464,34 +468,62 @@ class AsyncioEvaluationTaskRunner:
             # the scenarios concurrently (bounded by batch_size), which is what
             # makes concurrency real; an outer per-scenario loop would feed the
             # engine one item at a time and leave the semaphore inert.
-            # Live persistence, aligned with the API: each cell is populated as
-            # the engine produces it (SDKResultSetter), so the engine's inline
-            # per-scenario metric refresh (arefresh) sees persisted cells, and
-            # the engine's end-of-slice global refresh rolls up the run — the
-            # same variational-inline + global-at-end shape as the API worker.
-            processed = await self._process_sources(
-                run_id=run_id,
-                #
-                steps=steps,
-                repeats=repeats,
-                #
-                source_items=source_items,
-                #
-                revisions=revisions,
-                runners=runners,
-                #
-                create_scenario=_PreMintedScenarios(minted),
-                edit_scenario=SDKScenarioEditor(edit=self._edit_scenario),
-                set_results=SDKResultSetter(populate=self._populate_slice),
-                refresh_metrics=SDKMetricsRefresher(refresh=self._refresh_metrics),
-                fetch_trace=SDKTraceFetcher(fetch=self._fetch_trace),
-                # The SDK evaluate() loop IS the executor for custom-origin steps.
-                execute_custom=True,
+            # Write-behind persistence, aligned with the API: cells and
+            # statuses are buffered as the engine produces them and written in
+            # bulk (SDKResultSetter -> populate, SDKScenarioEditor ->
+            # edit_scenarios). Every metric refresh first flushes the cells, so
+            # the engine's inline per-scenario refresh (arefresh) sees them
+            # persisted, and the engine's end-of-slice global refresh rolls up
+            # the run — the same variational-inline + global-at-end shape as the
+            # API worker. Steps run in this process, so their traces are loaded
+            # from it; the metric refresh also waits for those to be committed
+            # before reading them.
+            trace_fetcher = SDKTraceFetcher(
+                fetch=self._fetch_trace,
+                local=self._load_local_trace,
             )
+            result_setter = SDKResultSetter(populate=self._populate_slice)
+            scenario_editor = SDKScenarioEditor(edit=self._edit_scenarios)
+
+            async def _settle() -> None:
+                await result_setter.flush()
+                await trace_fetcher.settle()
+
+            try:
+                processed = await self._process_sources(
+                    run_id=run_id,
+                    #
+                    steps=steps,
+                    repeats=repeats,
+                    #
+                    source_items=source_items,
+                    #
+                    revisions=revisions,
+                    runners=runners,
+                    #
+                    create_scenario=_PreMintedScenarios(minted),
+                    edit_scenario=scenario_editor,
+                    set_results=result_setter,
+                    refresh_metrics=SDKMetricsRefresher(
+                        refresh=self._refresh_metrics,
+                        settle=_settle,
+                    ),
+                    fetch_trace=trace_fetcher,
+                    # The SDK evaluate() loop IS the executor for custom-origin
+                    # steps.
+                    execute_custom=True,
+                )
+            except BaseException:
+                # Whatever is still buffered is written before the run is
+                # closed, also when the slice failed, whose error is the one
+                # raised: cells before statuses.
+                await flush_each(result_setter, scenario_editor, raise_errors=False)
+                raise
+
+            await flush_each(result_setter, scenario_editor)
 
-            # Cells are live-written and status is written in-loop by the engine's
-            # edit_scenario adapter (same as the API), so here we only assemble
-            # the return payload.
+            # Cells and statuses are written by the engine's adapters (same as
+            # the API), so here we only assemble the return payload.
             for item in processed:
                 scenarios.append(
                     {
@@ -94,7 +94,7 @@ async def acreate(
     return scenario
 
 
-async def aedit_scenario(
+def _scenario_edit(
     *,
     scenario_id: UUID,
     status: str,
@@ -103,21 +103,7 @@ async def aedit_scenario(
     meta: Optional[Dict[str, Any]] = None,
     interval: Optional[int] = None,
     timestamp: Optional[Any] = None,
-) -> Optional[EvaluationScenario]:
-    """Edit a single scenario (status, and optionally tags/meta).
-
-    Mirrors `PATCH /evaluations/scenarios/{scenario_id}` (operation
-    `edit_scenario`); the body's `scenario.id` must match the path id. Used by
-    the SDK evaluate loop's `edit_scenario` adapter to flip each scenario to its
-    computed SUCCESS/ERRORS/PENDING status after its cells are written.
-
-    Carries `flags`/`tags`/`meta` like the API's `APIScenarioEditor` (the edit is
-    a full PUT, so omitting them would wipe them), and tolerates a
-    run closed mid-flight: the API returns 409 (EvaluationClosedException) for an
-    edit against a locked run — closing is a lock, not a failure, so we return
-    None rather than raising, matching the API adapter's
-    `except EvaluationClosedConflict`.
-    """
+) -> Dict[str, Any]:
     scenario: Dict[str, Any] = dict(
         id=str(scenario_id),
         status=status,
@@ -137,6 +123,42 @@ async def aedit_scenario(
         scenario["timestamp"] = (
             timestamp.isoformat() if hasattr(timestamp, "isoformat") else timestamp
         )
+    return scenario
+
+
+async def aedit_scenario(
+    *,
+    scenario_id: UUID,
+    status: str,
+    flags: Optional[Dict[str, Any]] = None,
+    tags: Optional[Dict[str, Any]] = None,
+    meta: Optional[Dict[str, Any]] = None,
+    interval: Optional[int] = None,
+    timestamp: Optional[Any] = None,
+) -> Optional[EvaluationScenario]:
+    """Edit a single scenario (status, and optionally tags/meta).
+
+    Mirrors `PATCH /evaluations/scenarios/{scenario_id}` (operation
+    `edit_scenario`); the body's `scenario.id` must match the path id. The SDK
+    evaluate loop writes its computed SUCCESS/ERRORS/PENDING statuses through
+    the bulk `aedit_scenarios` instead.
+
+    Carries `flags`/`tags`/`meta` like the API's `APIScenarioEditor` (the edit is
+    a full PUT, so omitting them would wipe them), and tolerates a
+    run closed mid-flight: the API returns 409 (EvaluationClosedException) for an
+    edit against a locked run — closing is a lock, not a failure, so we return
+    None rather than raising, matching the API adapter's
+    `except EvaluationClosedConflict`.
+    """
+    scenario = _scenario_edit(
+        scenario_id=scenario_id,
+        status=status,
+        flags=flags,
+        tags=tags,
+        meta=meta,
+        interval=interval,
+        timestamp=timestamp,
+    )
 
     response = await authed_async_api()(
         method="PATCH",
@@ -162,3 +184,42 @@ async def aedit_scenario(
 
     scenario_data = response.get("scenario")
     return EvaluationScenario(**scenario_data) if scenario_data else None
+
+
+async def aedit_scenarios(
+    *,
+    scenarios: List[Dict[str, Any]],
+) -> List[EvaluationScenario]:
+    """Edit many scenarios in one call (the bulk `edit_scenarios` op).
+
+    Mirrors `PATCH /evaluations/scenarios/`: each item takes the keyword
+    arguments of `aedit_scenario` (scenario_id, status, and the flags/tags/meta
+    the full PUT must carry). Used by the SDK evaluate loop to write the status
+    of every scenario finished since the last write at once. A run closed
+    mid-flight (HTTP 409) skips the write and returns [], like `aedit_scenario`.
+    """
+    if not scenarios:
+        return []
+
+    response = await authed_async_api()(
+        method="PATCH",
+        endpoint="/evaluations/scenarios/",
+        json=dict(scenarios=[_scenario_edit(**scenario) for scenario in scenarios]),
+    )
+
+    if response.status_code == 409:
+        return []
+
+    try:
+        response.raise_for_status()
+    except Exception:
+        log.error(
+            "API request failed",
+            endpoint="/evaluations/scenarios/",
+            response_text=response.text,
+        )
+        raise
+
+    response = response.json()
+
+    return [EvaluationScenario(**s) for s in response.get("scenarios", [])]
@@ -10,6 +10,7 @@ from fastapi import Request
 from fastapi.responses import JSONResponse
 
 from agenta.sdk.utils.logging import get_module_logger
+from agenta.sdk.utils.transport import get_async_client
 from agenta.sdk.utils.exceptions import display_exception
 from agenta.sdk.utils.cache import TTLLRUCache
 from agenta.sdk.utils.constants import TRUTHY
@@ -139,97 +140,95 @@ async def get_credentials(
                 return credentials
 
         try:
-            async with httpx.AsyncClient() as client:
-                try:
-                    response = await client.get(
-                        f"{host}/api/access/permissions/check",
-                        headers=headers,
-                        cookies=cookies,
-                        params=params,
-                        timeout=30.0,
-                    )
-                except httpx.TimeoutException as exc:
-                    raise DenyException(
-                        status_code=504,
-                        content=f"Could not verify credentials: connection to {host} timed out. Please check your network connection.",
-                    ) from exc
-                except httpx.ConnectError as exc:
-                    raise DenyException(
-                        status_code=503,
-                        content=f"Could not verify credentials: connection to {host} failed. Please check if agenta is available.",
-                    ) from exc
-                except httpx.NetworkError as exc:
-                    raise DenyException(
-                        status_code=503,
-                        content=f"Could not verify credentials: connection to {host} failed. Please check your network connection.",
-                    ) from exc
-                except httpx.HTTPError as exc:
-                    raise DenyException(
-                        status_code=502,
-                        content=f"Could not verify credentials: connection to {host} failed. Please check if agenta is available.",
-                    ) from exc
-
-                if response.status_code == 401:
-                    raise DenyException(
-                        status_code=401,
-                        content="Invalid credentials. Please check your credentials or login again.",
-                    )
-                elif response.status_code == 403:
-                    raise DenyException(
-                        status_code=403,
-                        content="Permission denied. Please check your permissions or contact your administrator.",
-                    )
-                elif response.status_code == 429:
-                    resp_headers = {
-                        key: value
-                        for key, value in {
-                            "Retry-After": response.headers.get("retry-after"),
-                            "X-RateLimit-Limit": response.headers.get(
-                                "x-ratelimit-limit"
-                            ),
-                            "X-RateLimit-Remaining": response.headers.get(
-                                "x-ratelimit-remaining"
-                            ),
-                        }.items()
-                        if value is not None
-                    }
-                    raise DenyException(
-                        status_code=429,
-                        content="API Rate limit exceeded. Please try again later or upgrade your plan.",
-                        headers=resp_headers or None,
-                    )
-                elif response.status_code != 200:
-                    raise DenyException(
-                        status_code=500,
-                        content=f"Could not verify credentials: {host} returned unexpected status code {response.status_code}. Please try again later or contact support if the issue persists.",
-                    )
-
-                try:
-                    auth = response.json()
-                except ValueError as exc:
-                    raise DenyException(
-                        status_code=500,
-                        content=f"Could not verify credentials: {host} returned unexpected invalid JSON response. Please try again later or contact support if the issue persists.",
-                    ) from exc
-
-                if not isinstance(auth, dict):
-                    raise DenyException(
-                        status_code=500,
-                        content=f"Could not verify credentials: {host} returned unexpected invalid response format. Please try again later or contact support if the issue persists.",
-                    )
-
-                effect = auth.get("effect")
-                if effect != "allow":
-                    raise DenyException(
-                        status_code=403,
-                        content="Permission denied. Please check your permissions or contact your administrator.",
-                    )
-
-                credentials = auth.get("credentials")
-
-                _cache.put(_hash, credentials)
+            client = get_async_client()
+            try:
+                response = await client.get(
+                    f"{host}/api/access/permissions/check",
+                    headers=headers,
+                    cookies=cookies,
+                    params=params,
+                    timeout=30.0,
+                )
+            except httpx.TimeoutException as exc:
+                raise DenyException(
+                    status_code=504,
+                    content=f"Could not verify credentials: connection to {host} timed out. Please check your network connection.",
+                ) from exc
+            except httpx.ConnectError as exc:
+                raise DenyException(
+                    status_code=503,
+                    content=f"Could not verify credentials: connection to {host} failed. Please check if agenta is available.",
+                ) from exc
+            except httpx.NetworkError as exc:
+                raise DenyException(
+                    status_code=503,
+                    content=f"Could not verify credentials: connection to {host} failed. Please check your network connection.",
+                ) from exc
+            except httpx.HTTPError as exc:
+                raise DenyException(
+                    status_code=502,
+                    content=f"Could not verify credentials: connection to {host} failed. Please check if agenta is available.",
+                ) from exc
+
+            if response.status_code == 401:
+                raise DenyException(
+                    status_code=401,
+                    content="Invalid credentials. Please check your credentials or login again.",
+                )
+            elif response.status_code == 403:
+                raise DenyException(
+                    status_code=403,
+                    content="Permission denied. Please check your permissions or contact your administrator.",
+                )
+            elif response.status_code == 429:
+                resp_headers = {
+                    key: value
+                    for key, value in {
+                        "Retry-After": response.headers.get("retry-after"),
+                        "X-RateLimit-Limit": response.headers.get("x-ratelimit-limit"),
+                        "X-RateLimit-Remaining": response.headers.get(
+                            "x-ratelimit-remaining"
+                        ),
+                    }.items()
+                    if value is not None
+                }
+                raise DenyException(
+                    status_code=429,
+                    content="API Rate limit exceeded. Please try again later or upgrade your plan.",
+                    headers=resp_headers or None,
+                )
+            elif response.status_code != 200:
+                raise DenyException(
+                    status_code=500,
+                    content=f"Could not verify credentials: {host} returned unexpected status code {response.status_code}. Please try again later or contact support if the issue persists.",
+                )
 
-                return credentials
+            try:
+                auth = response.json()
+            except ValueError as exc:
+                raise DenyException(
+                    status_code=500,
+                    content=f"Could not verify credentials: {host} returned unexpected invalid JSON response. Please try again later or contact support if the issue persists.",
+                ) from exc
+
+            if not isinstance(auth, dict):
+                raise DenyException(
+                    status_code=500,
+                    content=f"Could not verify credentials: {host} returned unexpected invalid response format. Please try again later or contact support if the issue persists.",
+                )
+
+            effect = auth.get("effect")
+            if effect != "allow":
+                raise DenyException(
+                    status_code=403,
+                    content="Permission denied. Please check your permissions or contact your administrator.",
+                )
+
+            credentials = auth.get("credentials")
+
+            _cache.put(_hash, credentials)
+
+            return credentials
 
         except DenyException as deny:
             raise deny
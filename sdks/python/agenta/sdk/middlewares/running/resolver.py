@@ -1,7 +1,6 @@
 # /agenta/sdk/middlewares/running/resolver.py
 from typing import Callable, Any, Optional, Dict
 
-import httpx
 import agenta as ag
 
 from agenta.sdk.models.workflows import (
@@ -21,6 +20,7 @@ from agenta.sdk.engines.running.errors import (
     InvalidInterfaceURIV0Error,
     MissingConfigurationParameterV0Error,
 )
+from agenta.sdk.utils.transport import get_async_client
 
 # Internal embeds resolution defaults (not user-configurable)
 _EMBEDS_MAX_CHECKS = 20
@@ -382,87 +382,87 @@ async def resolve_references_with_info(
             retrieve_url = f"{api_url}/workflows/revisions/retrieve"
             response_key = "workflow_revision"
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                retrieve_url,
+        client = get_async_client()
+        response = await client.post(
+            retrieve_url,
+            headers=headers,
+            json=body,
+            timeout=30.0,
+        )
+
+        response.raise_for_status()
+        result = response.json()
+
+        revision, retrieval_references, retrieval_selector = _revision_from_result(
+            result,
+            response_key,
+        )
+        if revision:
+            return revision, retrieval_references, retrieval_selector
+        if has_application_refs:
+            # Compatibility fallback for deployments where application retrieve
+            # does not resolve but equivalent workflow retrieve does.
+            fallback_body: Dict[str, Any] = {"resolve": True}
+            application_to_workflow_mapping = [
+                ("workflow_ref", "application"),
+                ("workflow_variant_ref", "application_variant"),
+                ("workflow_revision_ref", "application_revision"),
+                ("environment_ref", "environment"),
+                ("environment_variant_ref", "environment_variant"),
+                ("environment_revision_ref", "environment_revision"),
+            ]
+            for field, ref_key in application_to_workflow_mapping:
+                d = _ref_dict(ref_key)
+                if d is not None:
+                    fallback_body[field] = d
+            if key:
+                fallback_body["key"] = key
+
+            fallback_response = await client.post(
+                f"{api_url}/workflows/revisions/retrieve",
                 headers=headers,
-                json=body,
+                json=fallback_body,
                 timeout=30.0,
             )
-
-            response.raise_for_status()
-            result = response.json()
-
+            fallback_response.raise_for_status()
+            fallback_result = fallback_response.json()
             revision, retrieval_references, retrieval_selector = _revision_from_result(
-                result,
-                response_key,
+                fallback_result, "workflow_revision"
+            )
+            if revision:
+                return revision, retrieval_references, retrieval_selector
+        if has_evaluator_refs:
+            # Compatibility fallback for deployments where evaluator retrieve
+            # does not resolve but equivalent workflow retrieve does.
+            fallback_body = {"resolve": True}
+            evaluator_to_workflow_mapping = [
+                ("workflow_ref", "evaluator"),
+                ("workflow_variant_ref", "evaluator_variant"),
+                ("workflow_revision_ref", "evaluator_revision"),
+                ("environment_ref", "environment"),
+                ("environment_variant_ref", "environment_variant"),
+                ("environment_revision_ref", "environment_revision"),
+            ]
+            for field, ref_key in evaluator_to_workflow_mapping:
+                d = _ref_dict(ref_key)
+                if d is not None:
+                    fallback_body[field] = d
+            if key:
+                fallback_body["key"] = key
+
+            fallback_response = await client.post(
+                f"{api_url}/workflows/revisions/retrieve",
+                headers=headers,
+                json=fallback_body,
+                timeout=30.0,
+            )
+            fallback_response.raise_for_status()
+            fallback_result = fallback_response.json()
+            revision, retrieval_references, retrieval_selector = _revision_from_result(
+                fallback_result, "workflow_revision"
             )
             if revision:
                 return revision, retrieval_references, retrieval_selector
-            if has_application_refs:
-                # Compatibility fallback for deployments where application retrieve
-                # does not resolve but equivalent workflow retrieve does.
-                fallback_body: Dict[str, Any] = {"resolve": True}
-                application_to_workflow_mapping = [
-                    ("workflow_ref", "application"),
-                    ("workflow_variant_ref", "application_variant"),
-                    ("workflow_revision_ref", "application_revision"),
-                    ("environment_ref", "environment"),
-                    ("environment_variant_ref", "environment_variant"),
-                    ("environment_revision_ref", "environment_revision"),
-                ]
-                for field, ref_key in application_to_workflow_mapping:
-                    d = _ref_dict(ref_key)
-                    if d is not None:
-                        fallback_body[field] = d
-                if key:
-                    fallback_body["key"] = key
-
-                fallback_response = await client.post(
-                    f"{api_url}/workflows/revisions/retrieve",
-                    headers=headers,
-                    json=fallback_body,
-                    timeout=30.0,
-                )
-                fallback_response.raise_for_status()
-                fallback_result = fallback_response.json()
-                revision, retrieval_references, retrieval_selector = (
-                    _revision_from_result(fallback_result, "workflow_revision")
-                )
-                if revision:
-                    return revision, retrieval_references, retrieval_selector
-            if has_evaluator_refs:
-                # Compatibility fallback for deployments where evaluator retrieve
-                # does not resolve but equivalent workflow retrieve does.
-                fallback_body = {"resolve": True}
-                evaluator_to_workflow_mapping = [
-                    ("workflow_ref", "evaluator"),
-                    ("workflow_variant_ref", "evaluator_variant"),
-                    ("workflow_revision_ref", "evaluator_revision"),
-                    ("environment_ref", "environment"),
-                    ("environment_variant_ref", "environment_variant"),
-                    ("environment_revision_ref", "environment_revision"),
-                ]
-                for field, ref_key in evaluator_to_workflow_mapping:
-                    d = _ref_dict(ref_key)
-                    if d is not None:
-                        fallback_body[field] = d
-                if key:
-                    fallback_body["key"] = key
-
-                fallback_response = await client.post(
-                    f"{api_url}/workflows/revisions/retrieve",
-                    headers=headers,
-                    json=fallback_body,
-                    timeout=30.0,
-                )
-                fallback_response.raise_for_status()
-                fallback_result = fallback_response.json()
-                revision, retrieval_references, retrieval_selector = (
-                    _revision_from_result(fallback_result, "workflow_revision")
-                )
-                if revision:
-                    return revision, retrieval_references, retrieval_selector
 
         return None, None, None
 
@@ -518,25 +518,25 @@ async def resolve_embeds(
         if credentials:
             headers["Authorization"] = credentials
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{api_url}/workflows/revisions/resolve",
-                headers=headers,
-                json={
-                    "workflow_revision": {"data": {"parameters": parameters}},
-                    "max_depth": max_depth,
-                    "max_embeds": max_embed_count,
-                    "error_policy": error_policy,
-                },
-                timeout=30.0,
-            )
+        client = get_async_client()
+        response = await client.post(
+            f"{api_url}/workflows/revisions/resolve",
+            headers=headers,
+            json={
+                "workflow_revision": {"data": {"parameters": parameters}},
+                "max_depth": max_depth,
+                "max_embeds": max_embed_count,
+                "error_policy": error_policy,
+            },
+            timeout=30.0,
+        )
 
-            response.raise_for_status()
-            result = response.json()
+        response.raise_for_status()
+        result = response.json()
 
-            revision = result.get("workflow_revision")
-            if revision and revision.get("data"):
-                return revision["data"].get("parameters", parameters)
+        revision = result.get("workflow_revision")
+        if revision and revision.get("data"):
+            return revision["data"].get("parameters", parameters)
 
         return parameters
 
@@ -5,6 +5,7 @@ from typing import Callable, Dict, Optional, List, Any
 import httpx
 
 from agenta.sdk.utils.logging import get_module_logger
+from agenta.sdk.utils.transport import get_async_client
 from agenta.sdk.utils.constants import TRUTHY
 from agenta.sdk.utils.cache import TTLLRUCache
 from agenta.sdk.utils.exceptions import suppress, display_exception
@@ -172,93 +173,91 @@ async def _allow_local_secrets(
                 raise access
 
         try:
-            async with httpx.AsyncClient() as client:
-                try:
-                    response = await client.get(
-                        f"{host}/api/access/permissions/check",
-                        headers=headers,
-                        params=params,
-                        timeout=30.0,
-                    )
-                except httpx.TimeoutException as exc:
-                    raise DenyException(
-                        status_code=504,
-                        content=f"Could not verify secrets access: connection to {host} timed out. Please check your network connection.",
-                    ) from exc
-                except httpx.ConnectError as exc:
-                    raise DenyException(
-                        status_code=503,
-                        content=f"Could not verify secrets access: connection to {host} failed. Please check if agenta is available.",
-                    ) from exc
-                except httpx.NetworkError as exc:
-                    raise DenyException(
-                        status_code=503,
-                        content=f"Could not verify secrets access: connection to {host} failed. Please check your network connection.",
-                    ) from exc
-                except httpx.HTTPError as exc:
-                    raise DenyException(
-                        status_code=502,
-                        content=f"Could not verify secrets access: connection to {host} failed. Please check if agenta is available.",
-                    ) from exc
-
-                if response.status_code == 401:
-                    raise DenyException(
-                        status_code=401,
-                        content="Invalid credentials. Please check your credentials or login again.",
-                    )
-                elif response.status_code == 403:
-                    raise DenyException(
-                        status_code=403,
-                        content="Out of credits. Please set your LLM provider API keys or contact support.",
-                    )
-                elif response.status_code == 429:
-                    resp_headers = {
-                        key: value
-                        for key, value in {
-                            "Retry-After": response.headers.get("retry-after"),
-                            "X-RateLimit-Limit": response.headers.get(
-                                "x-ratelimit-limit"
-                            ),
-                            "X-RateLimit-Remaining": response.headers.get(
-                                "x-ratelimit-remaining"
-                            ),
-                        }.items()
-                        if value is not None
-                    }
-                    raise DenyException(
-                        status_code=429,
-                        content="API Rate limit exceeded. Please try again later or upgrade your plan.",
-                        headers=resp_headers or None,
-                    )
-                elif response.status_code != 200:
-                    raise DenyException(
-                        status_code=500,
-                        content=f"Could not verify secrets access: {host} returned unexpected status code {response.status_code}. Please try again later or contact support if the issue persists.",
-                    )
-
-                try:
-                    auth = response.json()
-                except ValueError as exc:
-                    raise DenyException(
-                        status_code=500,
-                        content=f"Could not verify secrets access: {host} returned unexpected invalid JSON response. Please try again later or contact support if the issue persists.",
-                    ) from exc
-
-                if not isinstance(auth, dict):
-                    raise DenyException(
-                        status_code=500,
-                        content=f"Could not verify secrets access: {host} returned unexpected invalid response format. Please try again later or contact support if the issue persists.",
-                    )
-
-                effect = auth.get("effect")
-
-                if effect != "allow":
-                    raise DenyException(
-                        status_code=403,
-                        content="Out of credits. Please set your LLM provider API keys or contact support.",
-                    )
-
-                return
+            client = get_async_client()
+            try:
+                response = await client.get(
+                    f"{host}/api/access/permissions/check",
+                    headers=headers,
+                    params=params,
+                    timeout=30.0,
+                )
+            except httpx.TimeoutException as exc:
+                raise DenyException(
+                    status_code=504,
+                    content=f"Could not verify secrets access: connection to {host} timed out. Please check your network connection.",
+                ) from exc
+            except httpx.ConnectError as exc:
+                raise DenyException(
+                    status_code=503,
+                    content=f"Could not verify secrets access: connection to {host} failed. Please check if agenta is available.",
+                ) from exc
+            except httpx.NetworkError as exc:
+                raise DenyException(
+                    status_code=503,
+                    content=f"Could not verify secrets access: connection to {host} failed. Please check your network connection.",
+                ) from exc
+            except httpx.HTTPError as exc:
+                raise DenyException(
+                    status_code=502,
+                    content=f"Could not verify secrets access: connection to {host} failed. Please check if agenta is available.",
+                ) from exc
+
+            if response.status_code == 401:
+                raise DenyException(
+                    status_code=401,
+                    content="Invalid credentials. Please check your credentials or login again.",
+                )
+            elif response.status_code == 403:
+                raise DenyException(
+                    status_code=403,
+                    content="Out of credits. Please set your LLM provider API keys or contact support.",
+                )
+            elif response.status_code == 429:
+                resp_headers = {
+                    key: value
+                    for key, value in {
+                        "Retry-After": response.headers.get("retry-after"),
+                        "X-RateLimit-Limit": response.headers.get("x-ratelimit-limit"),
+                        "X-RateLimit-Remaining": response.headers.get(
+                            "x-ratelimit-remaining"
+                        ),
+                    }.items()
+                    if value is not None
+                }
+                raise DenyException(
+                    status_code=429,
+                    content="API Rate limit exceeded. Please try again later or upgrade your plan.",
+                    headers=resp_headers or None,
+                )
+            elif response.status_code != 200:
+                raise DenyException(
+                    status_code=500,
+                    content=f"Could not verify secrets access: {host} returned unexpected status code {response.status_code}. Please try again later or contact support if the issue persists.",
+                )
+
+            try:
+                auth = response.json()
+            except ValueError as exc:
+                raise DenyException(
+                    status_code=500,
+                    content=f"Could not verify secrets access: {host} returned unexpected invalid JSON response. Please try again later or contact support if the issue persists.",
+                ) from exc
+
+            if not isinstance(auth, dict):
+                raise DenyException(
+                    status_code=500,
+                    content=f"Could not verify secrets access: {host} returned unexpected invalid response format. Please try again later or contact support if the issue persists.",
+                )
+
+            effect = auth.get("effect")
+
+            if effect != "allow":
+                raise DenyException(
+                    status_code=403,
+                    content="Out of credits. Please set your LLM provider API keys or contact support.",
+                )
+
+            return
 
         except DenyException as deny:
             if deny.status_code != 429:
@@ -328,35 +327,35 @@ async def get_secrets(
     vault_secrets: List[Dict[str, Any]] = []
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{api_url}/secrets/",
-                headers=headers,
-            )
+        client = get_async_client()
+        response = await client.get(
+            f"{api_url}/secrets/",
+            headers=headers,
+        )
 
-            if response.status_code == 429:
-                resp_headers = {
-                    key: value
-                    for key, value in {
-                        "Retry-After": response.headers.get("retry-after"),
-                        "X-RateLimit-Limit": response.headers.get("x-ratelimit-limit"),
-                        "X-RateLimit-Remaining": response.headers.get(
-                            "x-ratelimit-remaining"
-                        ),
-                    }.items()
-                    if value is not None
-                }
-                raise DenyException(
-                    status_code=429,
-                    content="API Rate limit exceeded. Please try again later or upgrade your plan.",
-                    headers=resp_headers or None,
-                )
+        if response.status_code == 429:
+            resp_headers = {
+                key: value
+                for key, value in {
+                    "Retry-After": response.headers.get("retry-after"),
+                    "X-RateLimit-Limit": response.headers.get("x-ratelimit-limit"),
+                    "X-RateLimit-Remaining": response.headers.get(
+                        "x-ratelimit-remaining"
+                    ),
+                }.items()
+                if value is not None
+            }
+            raise DenyException(
+                status_code=429,
+                content="API Rate limit exceeded. Please try again later or upgrade your plan.",
+                headers=resp_headers or None,
+            )
 
-            if response.status_code != 200:
-                vault_secrets = []
+        if response.status_code != 200:
+            vault_secrets = []
 
-            else:
-                vault_secrets = response.json()
+        else:
+            vault_secrets = response.json()
     except DenyException:
         raise
     except Exception:  # pylint: disable=bare-except
@@ -14,7 +14,7 @@ import base64
 import os
 import re
 import warnings
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 from urllib.parse import quote
 
 from agenta.sdk.redaction import metrics
@@ -101,6 +101,46 @@ def _decompose(value: str) -> List[str]:
     return [part for part in match.groups() if part]
 
 
+def _trie_pattern(values: Iterable[str], bounded: Iterable[str] = ()) -> str:
+    """A regex source matching any of `values`, factored into a prefix trie.
+
+    At any position the longest value wins: branches are tried before the shorter value ending
+    at their parent, so backtracking falls back to the shorter one only when the longer fails.
+    One scan of the input then costs about the same for 3 values as for 300, where a flat
+    `a|b|c` alternation retries every value at every offset. Values in `bounded` only match on
+    word boundaries, within the same trie, so they take part in longest-first like any other.
+    """
+    bounded = set(bounded)
+    root: Dict[str, Any] = {}
+    for value in values:
+        node = root
+        for char in value:
+            node = node.setdefault(char, {})
+        # End-of-value marker: for a bounded value, its length, to look back to where it starts.
+        node[""] = len(value) if value in bounded else None
+
+    def _build(node: Dict[str, Any]) -> str:
+        branches = []
+        for char in sorted(k for k in node if k):
+            # Walk unbranched runs iteratively: long values (PEM bodies, their base64) would
+            # otherwise recurse once per character.
+            run, child = [char], node[char]
+            while len(child) == 1 and "" not in child:
+                (next_char,) = child
+                run.append(next_char)
+                child = child[next_char]
+            branches.append(re.escape("".join(run)) + _build(child))
+        if "" not in node:
+            return "(?:" + "|".join(branches) + ")" if branches else ""
+        if node[""] is None:
+            return "(?:" + "|".join(branches) + ")?" if branches else ""
+        # Not followed by a word character, nor preceded by one where the value starts.
+        end = r"(?!\w)(?<!\w[\s\S]{%d})" % node[""]
+        return "(?:" + "|".join(branches + [end]) + ")"
+
+    return _build(root)
+
+
 class Redactor:
     """Known-value redaction: exact-match against a deny-set of live secrets.
 
@@ -118,7 +158,9 @@ class Redactor:
         # matching so a short part can't clip inside an unrelated word in user content; the full
         # value/encoding variants are high-entropy enough to substring-match safely.
         self._bounded: set = set()
-        self._sorted_values: List[str] = []  # longest-first, recomputed on seed
+        # One compiled matcher over every variant, rebuilt on seed; None when there is nothing to
+        # match or `AGENTA_REDACTION_MODE=off` (read once per seed, not once per string).
+        self._matcher: Optional[re.Pattern] = None
 
     def with_known_secrets(
         self,
@@ -141,9 +183,18 @@ class Redactor:
                 if part and len(part) >= 8:
                     self._known.setdefault(part, kind)
                     self._bounded.add(part)
-        self._sorted_values = sorted(self._known.keys(), key=len, reverse=True)
+        self._matcher = self._compile()
         return self
 
+    def _compile(self) -> Optional[re.Pattern]:
+        if not self._known or redaction_mode() == "off":
+            return None
+        # One trie across both groups, so the longest variant wins wherever a shorter one (of
+        # either group) is its prefix.
+        return re.compile(
+            _trie_pattern(self._known, bounded=self._bounded & self._known.keys())
+        )
+
     def redact_string(
         self, value: Optional[str], *, sink: str = "unknown"
     ) -> Optional[str]:
@@ -155,20 +206,20 @@ class Redactor:
             return _PLACEHOLDER_BARE
 
     def _known_value_pass(self, value: str, *, sink: str) -> str:
-        if redaction_mode() == "off" or not self._sorted_values or not value:
+        if self._matcher is None or not value:
             return self._shape_pass(value, sink=sink)
 
-        out = value
-        for variant in self._sorted_values:
-            kind = self._known[variant]
-            if variant in self._bounded:
-                pattern = re.compile(r"(?<!\w)" + re.escape(variant) + r"(?!\w)")
-                if pattern.search(out):
-                    out = pattern.sub(_placeholder(kind, variant), out)
-                    metrics.increment(sink, kind)
-            elif variant in out:
-                out = out.replace(variant, _placeholder(kind, variant))
-                metrics.increment(sink, kind)
+        found: set = set()
+
+        def _replace(match: "re.Match[str]") -> str:
+            variant = match.group()
+            found.add(variant)
+            return _placeholder(self._known[variant], variant)
+
+        out = self._matcher.sub(_replace, value)
+        # One count per distinct variant matched, however often it occurs.
+        for variant in found:
+            metrics.increment(sink, self._known[variant])
         return self._shape_pass(out, sink=sink)
 
     def redact_json(self, obj: Any, *, sink: str = "unknown") -> Any:
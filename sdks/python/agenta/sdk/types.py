@@ -0,0 +1,7 @@
+import sys
+
+from agenta.sdk.utils import types
+
+# `agenta.sdk.types` is the public name of `agenta.sdk.utils.types`. A module rather than an
+# alias set by `agenta.sdk` so the parameter types are only imported when asked for.
+sys.modules[__name__] = types
@@ -1,2 +1,14 @@
-from agenta.sdk.utils.assets import *  # noqa: F401, F403
-from agenta.sdk.utils.types import *  # noqa: F401, F403
+from importlib import import_module
+
+# The public names of `assets` and `types` stay reachable as `agenta.sdk.utils.<name>`, but
+# are only imported on first use: every `agenta.sdk.utils.*` import runs this file first.
+_REEXPORTED = ("agenta.sdk.utils.assets", "agenta.sdk.utils.types")
+
+
+def __getattr__(name: str):
+    if not name.startswith("_"):
+        for module_name in _REEXPORTED:
+            module = import_module(module_name)
+            if hasattr(module, name):
+                return getattr(module, name)
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
@@ -1,7 +1,6 @@
+from functools import lru_cache
 from typing import Dict, Optional, Tuple
 
-from litellm import cost_calculator
-
 
 supported_llm_models = {
     "anthropic": [
@@ -291,6 +290,8 @@ def _get_model_costs(model: str) -> Optional[Tuple[float, float]]:
         Tuple of (input_cost, output_cost) per 1M tokens, or None if not found.
     """
     try:
+        from litellm import cost_calculator  # pylint: disable=import-outside-toplevel
+
         costs = cost_calculator.cost_per_token(
             model=model,
             prompt_tokens=1_000_000,
@@ -305,10 +306,14 @@ def _get_model_costs(model: str) -> Optional[Tuple[float, float]]:
     return None
 
 
+@lru_cache(maxsize=1)
 def _build_model_metadata() -> Dict[str, Dict[str, Dict[str, float]]]:
     """
     Build metadata dictionary with costs for all supported models.
 
+    Built on first access to ``model_metadata``, not at import: it needs litellm, whose import
+    alone costs seconds.
+
     Returns:
         Nested dict: {provider: {model: {"input": cost, "output": cost}}}
     """
@@ -327,10 +332,14 @@ def _build_model_metadata() -> Dict[str, Dict[str, Dict[str, float]]]:
     return metadata
 
 
-model_metadata = _build_model_metadata()
-
 model_to_provider_mapping = {
     model: provider
     for provider, models in supported_llm_models.items()
     for model in models
 }
+
+
+def __getattr__(name: str):
+    if name == "model_metadata":
+        return _build_model_metadata()
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
@@ -1,9 +1,8 @@
 import os
 
-import httpx
-
 import agenta as ag
 from agenta.sdk.utils.logging import get_module_logger
+from agenta.sdk.utils.transport import get_async_client, get_client
 
 BASE_TIMEOUT = 10
 
@@ -22,7 +21,8 @@ def _authorization(api_key):
 
 def authed_api():
     """
-    Preconfigured httpx client for authenticated endpoints (supports all methods).
+    Preconfigured httpx client for authenticated endpoints (supports all methods),
+    on the pooled sync client.
     """
 
     api_url = ag.DEFAULT_AGENTA_SINGLETON_INSTANCE.api_url
@@ -39,21 +39,21 @@ def authed_api():
         headers = kwargs.pop("headers", {})
         headers.setdefault("Authorization", authorization)
 
-        with httpx.Client() as client:
-            return client.request(
-                method=method,
-                url=url,
-                headers=headers,
-                timeout=BASE_TIMEOUT,
-                **kwargs,
-            )
+        return get_client().request(
+            method=method,
+            url=url,
+            headers=headers,
+            timeout=BASE_TIMEOUT,
+            **kwargs,
+        )
 
     return _request
 
 
 def authed_async_api():
     """
-    Async preconfigured httpx client for authenticated endpoints.
+    Async preconfigured httpx client for authenticated endpoints, on the pooled
+    async client of the running event loop.
     """
 
     api_url = ag.DEFAULT_AGENTA_SINGLETON_INSTANCE.api_url
@@ -70,13 +70,12 @@ def authed_async_api():
         headers = kwargs.pop("headers", {})
         headers.setdefault("Authorization", authorization)
 
-        async with httpx.AsyncClient() as client:
-            return await client.request(
-                method=method,
-                url=url,
-                headers=headers,
-                timeout=BASE_TIMEOUT,
-                **kwargs,
-            )
+        return await get_async_client().request(
+            method=method,
+            url=url,
+            headers=headers,
+            timeout=BASE_TIMEOUT,
+            **kwargs,
+        )
 
     return _request
@@ -2,12 +2,12 @@ from importlib.metadata import version
 from os import getenv
 from typing import Any, Callable, Optional
 
-import httpx
 from agenta.client import AgentaApi, AsyncAgentaApi
 from agenta.sdk.engines.tracing import Tracing
 from agenta.sdk.utils.globals import set_global
 from agenta.sdk.utils.helpers import parse_url
 from agenta.sdk.utils.logging import get_module_logger
+from agenta.sdk.utils.transport import get_client
 
 log = get_module_logger(__name__)
 
@@ -181,14 +181,13 @@ class AgentaSingleton:
             return None
 
         try:
-            with httpx.Client() as client:
-                response = client.get(
-                    f"{self.api_url}/projects/current",
-                    headers={"Authorization": f"ApiKey {self.api_key}"},
-                    timeout=10,
-                )
-                response.raise_for_status()
-                project_info = response.json()
+            response = get_client().get(
+                f"{self.api_url}/projects/current",
+                headers={"Authorization": f"ApiKey {self.api_key}"},
+                timeout=10,
+            )
+            response.raise_for_status()
+            project_info = response.json()
 
             if not project_info:
                 log.error(
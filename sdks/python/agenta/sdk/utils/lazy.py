@@ -13,6 +13,7 @@ if TYPE_CHECKING:
     from openai import AsyncOpenAI, OpenAIError
     from starlette.responses import Response as StarletteResponse, StreamingResponse
     from jsonpath import JSONPointer
+    from mystace import MustacheRenderer
 
 
 class _JsonpathModule(Protocol):
@@ -54,7 +55,7 @@ _jinja_cached: Optional[Tuple[type["SandboxedEnvironment"], type["TemplateError"
 )
 _jinja_checked = False
 
-_mystace_render: Optional[Callable[..., str]] = None
+_mystace_renderer: Optional[type["MustacheRenderer"]] = None
 _mystace_checked = False
 
 _fastapi_module: Optional[_FastAPIModule] = None
@@ -197,31 +198,32 @@ def _load_jinja2() -> Tuple[type["SandboxedEnvironment"], type["TemplateError"]]
     return _jinja_cached
 
 
-def _load_mystace() -> Callable[..., str]:
-    """Return ``mystace.render_from_template``, the Mustache render entry point.
+def _load_mystace() -> type["MustacheRenderer"]:
+    """Return ``mystace.MustacheRenderer``, which compiles a Mustache template once
+    and renders it many times.
 
     Loaded lazily so importing the renderer module does not pull ``mystace`` in
     on the ``curly`` / ``fstring`` / ``jinja2`` paths.
     """
 
-    global _mystace_render, _mystace_checked  # pylint: disable=global-statement
+    global _mystace_renderer, _mystace_checked  # pylint: disable=global-statement
 
     if _mystace_checked:
-        if _mystace_render is None:
+        if _mystace_renderer is None:
             raise ImportError("mystace is required for mustache template rendering.")
-        return _mystace_render
+        return _mystace_renderer
 
     _mystace_checked = True
     try:
-        from mystace import render_from_template
+        from mystace import MustacheRenderer
     except Exception as exc:
-        _mystace_render = None
+        _mystace_renderer = None
         raise ImportError(
             "mystace is required for mustache template rendering."
         ) from exc
 
-    _mystace_render = render_from_template
-    return _mystace_render
+    _mystace_renderer = MustacheRenderer
+    return _mystace_renderer
 
 
 def _load_fastapi() -> _FastAPIModule:
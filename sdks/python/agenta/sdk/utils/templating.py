@@ -13,7 +13,13 @@ required for WP-B2 (message renderer + JSON-return renderer) and WP-B3
 
 JSONPath (``{{$...}}``) is handled uniformly across ``curly``, ``mustache``, and
 ``jinja2`` — resolved as inert data, with :class:`UnresolvedVariablesError` on
-failure (see ``_render_with_jsonpath``).
+failure (see ``_shield_jsonpath`` / ``_resolve_jsonpath``).
+
+Templates are compiled once per ``(mode, template)`` and kept in a bounded LRU
+(``TEMPLATE_CACHE_MAXSIZE``): the Jinja2 template on one shared sandboxed
+environment, the ``mystace`` tree, the ``curly`` placeholder set, and the
+``{{$...}}`` shielding. A render then only resolves the context. Handlers render
+the same prompt for every row of an evaluation, so compilation is paid once.
 
 Behavior:
 - ``mustache``: real Mustache rendering through ``mystace`` (sections, inverted
@@ -37,15 +43,22 @@ Behavior:
 
 import re
 import json
-from typing import Any, Callable, Mapping, Literal, Optional
+from functools import lru_cache
+from typing import Any, Callable, List, Mapping, Literal, Optional, Tuple
 
-from agenta.sdk.utils.helpers import apply_replacements_with_tracking, _PLACEHOLDER_RE
+from agenta.sdk.utils.helpers import _PLACEHOLDER_RE
 from agenta.sdk.utils.lazy import _load_jinja2, _load_jsonpath, _load_mystace
 from agenta.sdk.utils.resolvers import resolve_any, resolve_json_path
 
 
 TemplateMode = Literal["mustache", "curly", "fstring", "jinja2"]
 
+# Compiled templates kept per ``(mode, template)``, least recently used evicted.
+TEMPLATE_CACHE_MAXSIZE = 512
+
+# A compiled template: renders a context to a string.
+_Renderer = Callable[[Mapping[str, Any]], str]
+
 
 class UnresolvedVariablesError(ValueError):
     """Raised by ``curly`` rendering when one or more placeholders cannot be resolved.
@@ -71,7 +84,7 @@ class MustacheTemplateError(ValueError):
     Mustache engine: unsupported partials (``{{>...}}``), empty placeholders
     (``{{}}``), and normalized ``mystace`` parse errors. (JSONPath ``{{$...}}``
     resolution failures are reported as :class:`UnresolvedVariablesError`, the
-    same as ``curly`` — see :func:`_render_with_jsonpath`.) Subclass of
+    same as ``curly`` — see :func:`_resolve_jsonpath`.) Subclass of
     ``ValueError`` so existing ``except ValueError`` paths keep working.
     """
 
@@ -109,50 +122,71 @@ def _missing_lib_hint(unreplaced: set) -> Optional[str]:
 # ---- Per-mode renderers ----
 
 
-def _render_curly(template: str, context: Mapping[str, Any]) -> str:
-    placeholders: set = set()
-    for match in _PLACEHOLDER_RE.finditer(template):
-        placeholders.add(match.group(1).strip())
+def _compile_curly(template: str) -> _Renderer:
+    # ``split`` alternates literal text and placeholder bodies, so a render
+    # only fills the odd slots instead of rescanning the template.
+    parts = _PLACEHOLDER_RE.split(template)
+    exprs = [expr.strip() for expr in parts[1::2]]
+    placeholders = frozenset(exprs)
+
+    def _render(context: Mapping[str, Any]) -> str:
+        replacements: dict = {}
+        for expr in placeholders:
+            try:
+                value = resolve_any(expr, context)
+            except Exception:
+                continue
+            # Joined verbatim, never re-parsed: values that look like
+            # placeholders or regex backrefs are inert.
+            replacements[expr] = _coerce_to_str(value)
+
+        unresolved = placeholders - replacements.keys()
+        if unresolved:
+            raise UnresolvedVariablesError(
+                unresolved=set(unresolved),
+                hint=_missing_lib_hint(unresolved),
+            )
 
-    replacements: dict = {}
-    for expr in placeholders:
-        try:
-            value = resolve_any(expr, context)
-        except Exception:
-            continue
-        # ``apply_replacements_with_tracking`` calls ``re.sub`` with a function
-        # callable, which uses the return value verbatim — no backslash-escape
-        # processing — so the replacement string can be passed through as-is.
-        replacements[expr] = _coerce_to_str(value)
-
-    result, successfully_replaced = apply_replacements_with_tracking(
-        template, replacements
-    )
-
-    truly_unreplaced = placeholders - successfully_replaced
-    if truly_unreplaced:
-        raise UnresolvedVariablesError(
-            unresolved=truly_unreplaced,
-            hint=_missing_lib_hint(truly_unreplaced),
-        )
+        segments = list(parts)
+        segments[1::2] = [replacements[expr] for expr in exprs]
+        return "".join(segments)
 
-    return result
+    return _render
 
 
 def _render_fstring(template: str, context: Mapping[str, Any]) -> str:
     return template.format(**context)
 
 
-def _render_jinja2(template: str, context: Mapping[str, Any]) -> str:
-    # ``{{$...}}`` JSONPath is resolved around the engine (see _render_with_jsonpath);
+_jinja2_env = None
+
+
+def _jinja2_environment():
+    """The one ``SandboxedEnvironment`` every ``jinja2`` template compiles on.
+
+    Compiled templates are never mutated by rendering, and nothing here adds
+    filters or globals to the environment, so sharing it is safe across
+    threads and tasks.
+    """
+
+    global _jinja2_env  # pylint: disable=global-statement
+
+    if _jinja2_env is None:
+        SandboxedEnvironment, _TemplateError = _load_jinja2()
+        _jinja2_env = SandboxedEnvironment()
+    return _jinja2_env
+
+
+def _compile_jinja2(template: str) -> _Renderer:
+    # ``{{$...}}`` JSONPath is resolved around the engine (see _shield_jsonpath);
     # ``skip`` leaves tags inside ``{% raw %}`` / ``{# #}`` to Jinja2.
-    SandboxedEnvironment, _TemplateError = _load_jinja2()
-    env = SandboxedEnvironment()
+    masked, shielded = _shield_jsonpath(template, skip=_JINJA2_RAW_RE)
+    compiled = _jinja2_environment().from_string(masked)
 
-    def _engine(masked: str) -> str:
-        return env.from_string(masked).render(**context)
+    def _render(context: Mapping[str, Any]) -> str:
+        return _resolve_jsonpath(compiled.render(**context), shielded, context)
 
-    return _render_with_jsonpath(template, context, engine=_engine, skip=_JINJA2_RAW_RE)
+    return _render
 
 
 # A Mustache tag: ``{{`` then an optional sigil and body, then ``}}``. The body
@@ -202,18 +236,16 @@ _JINJA2_RAW_RE = re.compile(
 )
 
 
-def _render_with_jsonpath(
+def _shield_jsonpath(
     template: str,
-    context: Mapping[str, Any],
     *,
-    engine: Callable[[str], str],
     skip: Optional["re.Pattern[str]"] = None,
-) -> str:
-    """Resolve ``{{$...}}`` JSONPath tags as inert data around a template ``engine``.
+) -> Tuple[str, List[str]]:
+    """Replace ``{{$...}}`` JSONPath tags with sentinels before a template engine runs.
 
-    Shield tags, render, then substitute resolved values last (never re-parsed).
-    Matches ``curly``: a failed tag raises :class:`UnresolvedVariablesError`.
-    ``skip`` marks spans whose ``{{$...}}`` tags are left to the engine.
+    Returns the masked template and the shielded expressions, by sentinel index.
+    ``skip`` marks spans whose ``{{$...}}`` tags are left to the engine. Both
+    depend on the template alone, so they are computed once at compile time.
     """
 
     # NUL would collide with the shield sentinel; it cannot occur in a real prompt.
@@ -222,7 +254,7 @@ def _render_with_jsonpath(
     if "\x00" in template:
         raise ValueError("Template contains a NUL byte (\\x00), which is not allowed.")
 
-    shielded: list[str] = []
+    shielded: List[str] = []
 
     def _shield(match: "re.Match[str]") -> str:
         shielded.append(match.group(1))
@@ -233,7 +265,7 @@ def _render_with_jsonpath(
     else:
         # Shield ``{{$...}}`` only outside the skipped spans.
         pos = 0
-        parts: list[str] = []
+        parts: List[str] = []
         for region in skip.finditer(template):
             parts.append(
                 _MUSTACHE_JSONPATH_TAG_RE.sub(_shield, template[pos : region.start()])
@@ -243,7 +275,20 @@ def _render_with_jsonpath(
         parts.append(_MUSTACHE_JSONPATH_TAG_RE.sub(_shield, template[pos:]))
         masked = "".join(parts)
 
-    rendered = engine(masked)
+    return masked, shielded
+
+
+def _resolve_jsonpath(
+    rendered: str,
+    shielded: List[str],
+    context: Mapping[str, Any],
+) -> str:
+    """Substitute the shielded ``{{$...}}`` tags into an engine's output.
+
+    Resolved values go in last, so they are never re-parsed as template syntax.
+    Matches ``curly``: a failed tag raises :class:`UnresolvedVariablesError`.
+    """
+
     if not shielded:
         return rendered
 
@@ -271,8 +316,8 @@ def _render_with_jsonpath(
     return result
 
 
-def _render_mustache(template: str, context: Mapping[str, Any]) -> str:
-    """Render via ``mystace`` with shared ``{{$...}}`` JSONPath handling.
+def _compile_mustache(template: str) -> _Renderer:
+    """Compile via ``mystace`` with shared ``{{$...}}`` JSONPath handling.
 
     Rejects unsupported tags first. HTML escaping is off (prompt text is not HTML)
     and ``stringify`` matches ``curly`` coercion (whole objects -> compact JSON).
@@ -280,33 +325,52 @@ def _render_mustache(template: str, context: Mapping[str, Any]) -> str:
 
     _reject_unsupported_mustache_tags(template)
 
-    render_from_template = _load_mystace()
+    try:
+        masked, shielded = _shield_jsonpath(template)
+    except ValueError as exc:
+        # Mode-agnostic helper errors (e.g. the NUL-byte guard) surface as
+        # MustacheTemplateError on the mustache path.
+        raise MustacheTemplateError(str(exc)) from exc
+
+    MustacheRenderer = _load_mystace()
 
-    def _engine(masked: str) -> str:
+    def _engine_error(exc: Exception) -> MustacheTemplateError:
+        return MustacheTemplateError(
+            f"Mustache template error in content: '{template}'. Error: {exc}"
+        )
+
+    try:
+        compiled = MustacheRenderer.from_template(masked)
+    except Exception as exc:
+        raise _engine_error(exc) from exc
+
+    def _render(context: Mapping[str, Any]) -> str:
         try:
-            return render_from_template(
-                masked,
+            rendered = compiled.render(
                 dict(context),
                 stringify=_coerce_to_str,
                 html_escape_fn=lambda text: text,
             )
-        except MustacheTemplateError:
-            raise
         except Exception as exc:
-            raise MustacheTemplateError(
-                f"Mustache template error in content: '{template}'. Error: {exc}"
-            ) from exc
+            raise _engine_error(exc) from exc
+        return _resolve_jsonpath(rendered, shielded, context)
 
-    try:
-        return _render_with_jsonpath(template, context, engine=_engine)
-    except UnresolvedVariablesError:
-        raise
-    except MustacheTemplateError:
-        raise
-    except ValueError as exc:
-        # Mode-agnostic helper errors (e.g. the NUL-byte guard) surface as
-        # MustacheTemplateError on the mustache path.
-        raise MustacheTemplateError(str(exc)) from exc
+    return _render
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_MAXSIZE)
+def _compile_template(mode: str, template: str) -> _Renderer:
+    """Compile ``template`` for ``mode``; cached, so each pair compiles once.
+
+    Compile errors are raised, not cached: an invalid template raises the same
+    error on every render.
+    """
+
+    if mode == "mustache":
+        return _compile_mustache(template)
+    if mode == "curly":
+        return _compile_curly(template)
+    return _compile_jinja2(template)
 
 
 # ---- Public entry point ----
@@ -345,12 +409,8 @@ def render_template(
             containing a NUL byte.
     """
 
-    if mode == "mustache":
-        return _render_mustache(template, context)
-    if mode == "curly":
-        return _render_curly(template, context)
     if mode == "fstring":
         return _render_fstring(template, context)
-    if mode == "jinja2":
-        return _render_jinja2(template, context)
+    if mode in ("mustache", "curly", "jinja2"):
+        return _compile_template(mode, template)(context)
     raise ValueError(f"Unknown template format: {mode}")
@@ -0,0 +1,132 @@
+"""Process-wide pooled HTTP clients for the SDK's calls to the Agenta API.
+
+Every middleware, resolver and helper that talks to the Agenta API borrows its client from
+here instead of opening an ``httpx.AsyncClient()`` per call, so a workflow invocation reuses
+warm keep-alive connections rather than paying a TCP + TLS handshake per request.
+
+- Async clients are kept per event loop: httpx connections are bound to the loop that opened
+  them, and the SDK is driven from more than one (the service loop, ``asyncio.run`` in
+  scripts, a fresh loop per test).
+- The sync client is shared by every thread.
+- Both keep no cookies between requests. A shared jar would carry one caller's session
+  cookies into another caller's request, so per-request ``cookies=`` are still sent but
+  response cookies are never stored.
+- ``timeout`` stays httpx's 5s default; call sites pass their own per request.
+
+Not for tenant-configured endpoints (webhooks, custom providers): those are connected to by
+pinned IP with an SNI override, and a pooled connection must never be reused across them.
+
+Closed by ``aclose_clients`` (wired into ``create_app``'s lifespan) and at interpreter exit.
+"""
+
+import asyncio
+import atexit
+import weakref
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from os import getenv
+from threading import Lock
+from typing import Any, Dict, Optional
+
+import httpx
+
+from agenta.sdk.utils.constants import TRUTHY
+from agenta.sdk.utils.logging import get_module_logger
+
+log = get_module_logger(__name__)
+
+# The pooled clients only reach the Agenta API, so the pool limits are per-host limits.
+HTTP_MAX_CONNECTIONS = int(getenv("AGENTA_HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(
+    getenv("AGENTA_HTTP_MAX_KEEPALIVE_CONNECTIONS", "20")
+)
+HTTP_KEEPALIVE_EXPIRY = float(getenv("AGENTA_HTTP_KEEPALIVE_EXPIRY", "5"))
+HTTP2_ENABLED = (getenv("AGENTA_HTTP2_ENABLED") or "false").lower() in TRUTHY
+
+# event loop -> its client; an entry goes with its loop.
+_async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_sync_client: Optional[httpx.Client] = None
+_sync_lock = Lock()
+
+
+class _NoStoreCookiePolicy(DefaultCookiePolicy):
+    """Sends the cookies a request carries, never keeps the ones a response sets."""
+
+    def set_ok(self, cookie, request):  # pylint: disable=unused-argument
+        return False
+
+
+def _http2() -> bool:
+    if not HTTP2_ENABLED:
+        return False
+    try:
+        import h2  # noqa: F401  # pylint: disable=unused-import,import-outside-toplevel
+    except ImportError:
+        log.warning(
+            "AGENTA_HTTP2_ENABLED is set but the 'h2' package is not installed "
+            "(pip install 'httpx[http2]'); using HTTP/1.1."
+        )
+        return False
+    return True
+
+
+def _client_kwargs() -> Dict[str, Any]:
+    return dict(
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+        http2=_http2(),
+        cookies=CookieJar(policy=_NoStoreCookiePolicy()),
+    )
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """The pooled async client for the running event loop. Never close it per call."""
+
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(**_client_kwargs())
+        _async_clients[loop] = client
+
+    return client
+
+
+def get_client() -> httpx.Client:
+    """The pooled sync client, shared across threads. Never close it per call."""
+
+    global _sync_client  # pylint: disable=global-statement
+
+    with _sync_lock:
+        if _sync_client is None or _sync_client.is_closed:
+            _sync_client = httpx.Client(**_client_kwargs())
+
+        return _sync_client
+
+
+def close_clients() -> None:
+    """Close the sync client. Async clients are closed by ``aclose_clients`` on their loop."""
+
+    global _sync_client  # pylint: disable=global-statement
+
+    with _sync_lock:
+        client, _sync_client = _sync_client, None
+
+    if client is not None:
+        client.close()
+
+
+async def aclose_clients() -> None:
+    """Close the running loop's async client and the sync client (shutdown hook)."""
+
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+
+    if client is not None:
+        await client.aclose()
+
+    close_clients()
+
+
+atexit.register(close_clients)
@@ -2,6 +2,7 @@ import json
 from copy import deepcopy
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
 from typing import Annotated, ClassVar, List, Union, Optional, Dict, Literal, Any
 
 from pydantic import ConfigDict, BaseModel, HttpUrl, RootModel
@@ -12,7 +13,8 @@ from agenta.sdk.agents.dtos import HARNESS_IDENTITIES, SandboxPermission
 from agenta.sdk.agents.mcp import MCPServerConfig
 from agenta.sdk.agents.tools import ToolConfig
 from agenta.sdk.agents.wire_models import run_contract_schemas
-from agenta.sdk.utils.assets import supported_llm_models, model_metadata
+from agenta.sdk.utils import assets
+from agenta.sdk.utils.assets import supported_llm_models
 from agenta.sdk.utils.helpers import _PLACEHOLDER_RE
 from agenta.sdk.utils.rendering import (
     StructuredRenderingError,
@@ -53,11 +55,17 @@ def MCField(  # pylint: disable=invalid-name
 ) -> Field:
     # Pydantic 2.12+ no longer allows post-creation mutation of field properties
     if isinstance(choices, dict):
-        json_extra = {
-            "choices": choices,
-            "x-ag-type": "grouped_choice",
-            "x-ag-metadata": model_metadata,
-        }
+
+        def json_extra(schema: Dict[str, Any]) -> None:
+            # Model costs come from litellm, so they are read when the schema is built.
+            schema.update(
+                {
+                    "choices": choices,
+                    "x-ag-type": "grouped_choice",
+                    "x-ag-metadata": assets.model_metadata,
+                }
+            )
+
     elif isinstance(choices, list):
         json_extra = {"choices": choices, "x-ag-type": "choice"}
     else:
@@ -1067,7 +1075,7 @@ def _model_catalog_type() -> dict:
         "default": "gpt-4o-mini",
         "choices": deepcopy(supported_llm_models),
         "x-ag-type": "grouped_choice",
-        "x-ag-metadata": deepcopy(model_metadata),
+        "x-ag-metadata": deepcopy(assets.model_metadata),
     }
 
 
@@ -1647,28 +1655,41 @@ class _ToolEmbedRefSchema(BaseModel):
 AgentTemplateSchema.model_rebuild()
 
 
-CATALOG_TYPES = {
-    Message.ag_type(): _dereference_schema(Message.model_json_schema()),
-    Messages.ag_type(): _dereference_schema(Messages.model_json_schema()),
-    "model": _model_catalog_type(),
-    AgLLM.ag_type(): _dereference_schema(AgLLM.model_json_schema()),
-    AgLLMs.ag_type(): _dereference_schema(AgLLMs.model_json_schema()),
-    AgLoop.ag_type(): _dereference_schema(AgLoop.model_json_schema()),
-    AgTool.ag_type(): _dereference_schema(AgTool.model_json_schema()),
-    AgTools.ag_type(): _dereference_schema(AgTools.model_json_schema()),
-    AgContext.ag_type(): _dereference_schema(AgContext.model_json_schema()),
-    AgPermissions.ag_type(): _dereference_schema(AgPermissions.model_json_schema()),
-    AgResponse.ag_type(): _dereference_schema(AgResponse.model_json_schema()),
-    PromptTemplate.ag_type(): _dereference_schema(PromptTemplate.model_json_schema()),
-    AgentTemplateSchema.ag_type(): _dereference_schema(
-        AgentTemplateSchema.model_json_schema()
-    ),
-    SkillTemplateSchema.ag_type(): _dereference_schema(
-        SkillTemplateSchema.model_json_schema()
-    ),
-    # The `/run` wire contract (request + result), exported from the dedicated Pydantic wire
-    # models in `agenta.sdk.agents.wire_models`. This puts the service<->runner wire interface in
-    # the SDK the same way the other catalog types are exposed; a freshness test asserts these
-    # entries match a fresh export so the schema cannot drift from the models.
-    **run_contract_schemas(),
-}
+@lru_cache(maxsize=1)
+def _catalog_types() -> Dict[str, Dict[str, Any]]:
+    return {
+        Message.ag_type(): _dereference_schema(Message.model_json_schema()),
+        Messages.ag_type(): _dereference_schema(Messages.model_json_schema()),
+        "model": _model_catalog_type(),
+        AgLLM.ag_type(): _dereference_schema(AgLLM.model_json_schema()),
+        AgLLMs.ag_type(): _dereference_schema(AgLLMs.model_json_schema()),
+        AgLoop.ag_type(): _dereference_schema(AgLoop.model_json_schema()),
+        AgTool.ag_type(): _dereference_schema(AgTool.model_json_schema()),
+        AgTools.ag_type(): _dereference_schema(AgTools.model_json_schema()),
+        AgContext.ag_type(): _dereference_schema(AgContext.model_json_schema()),
+        AgPermissions.ag_type(): _dereference_schema(AgPermissions.model_json_schema()),
+        AgResponse.ag_type(): _dereference_schema(AgResponse.model_json_schema()),
+        PromptTemplate.ag_type(): _dereference_schema(
+            PromptTemplate.model_json_schema()
+        ),
+        AgentTemplateSchema.ag_type(): _dereference_schema(
+            AgentTemplateSchema.model_json_schema()
+        ),
+        SkillTemplateSchema.ag_type(): _dereference_schema(
+            SkillTemplateSchema.model_json_schema()
+        ),
+        # The `/run` wire contract (request + result), exported from the dedicated Pydantic
+        # wire models in `agenta.sdk.agents.wire_models`. This puts the service<->runner wire
+        # interface in the SDK the same way the other catalog types are exposed; a freshness
+        # test asserts these entries match a fresh export so the schema cannot drift from the
+        # models.
+        **run_contract_schemas(),
+    }
+
+
+def __getattr__(name: str):
+    # `CATALOG_TYPES` is exported lazily: it dumps every catalog model's schema and the model
+    # costs, which need litellm.
+    if name == "CATALOG_TYPES":
+        return _catalog_types()
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
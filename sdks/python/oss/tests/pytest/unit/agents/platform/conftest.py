@@ -1,8 +1,8 @@
 """Fixtures for the platform-adapter tests: a fake httpx client and a pinned connection.
 
 These tests exercise the real adapter code against a mocked HTTP boundary (no live backend,
-no respx/pytest-httpx dependency). ``fake_http`` patches ``httpx.AsyncClient`` on a given
-adapter module and returns a ``capture`` dict the test asserts the outgoing request against.
+no respx/pytest-httpx dependency). ``fake_http`` patches the pooled ``get_async_client`` on a
+given adapter module and returns a ``capture`` dict the test asserts the outgoing request against.
 The base URL and authorization are supplied by injecting a :class:`PlatformConnection`, not
 by patching module globals, which is the adapter's real seam.
 """
@@ -52,28 +52,19 @@ class _FakeResponse:
 
 def _fake_async_client(*, response, raises, capture: Dict[str, Any]):
     class _Client:
-        def __init__(self, *args, **kwargs) -> None:
-            pass
-
-        async def __aenter__(self):
-            return self
-
-        async def __aexit__(self, *args):
-            return False
-
-        async def post(self, url, json=None, headers=None):
+        async def post(self, url, json=None, headers=None, timeout=None):
             capture.update(method="POST", url=url, json=json, headers=headers)
             if raises:
                 raise raises
             return response
 
-        async def get(self, url, headers=None):
+        async def get(self, url, headers=None, timeout=None):
             capture.update(method="GET", url=url, headers=headers)
             if raises:
                 raise raises
             return response
 
-    return _Client
+    return _Client()
 
 
 @pytest.fixture
@@ -88,11 +79,8 @@ def fake_http(monkeypatch):
     ) -> Dict[str, Any]:
         capture: Dict[str, Any] = {}
         response = _FakeResponse(status, payload, text)
-        monkeypatch.setattr(
-            module.httpx,
-            "AsyncClient",
-            _fake_async_client(response=response, raises=raises, capture=capture),
-        )
+        client = _fake_async_client(response=response, raises=raises, capture=capture)
+        monkeypatch.setattr(module, "get_async_client", lambda: client)
         return capture
 
     return _install
@@ -433,11 +433,20 @@ async def test_query_spans_emits_project_scoped_read_call(connection):
     assert set(spec.input_schema["properties"]) == {
         "filtering",
         "windowing",
+        "fields",
+        "truncate",
         "query_ref",
         "query_variant_ref",
         "query_revision_ref",
     }
     assert "required" not in spec.input_schema
+    # Projection and truncation are optional, so an unset call still returns whole spans.
+    fields_schema = spec.input_schema["properties"]["fields"]
+    assert fields_schema["default"] is None
+    assert {"type": "array", "items": {"type": "string"}} in fields_schema["anyOf"]
+    truncate_schema = spec.input_schema["properties"]["truncate"]
+    assert truncate_schema["default"] is None
+    assert {"type": "integer", "exclusiveMinimum": 0} in truncate_schema["anyOf"]
     assert {
         "focus",
         "format",
@@ -158,12 +158,6 @@ async def test_embed_skill_resolves_to_a_concrete_package_on_the_wire(make_env):
     post_mock = AsyncMock(return_value=endpoint_response)
 
     class _FakeAsyncClient:
-        async def __aenter__(self):
-            return self
-
-        async def __aexit__(self, *exc):
-            return False
-
         async def post(self, *args, **kwargs):
             return await post_mock(*args, **kwargs)
 
@@ -173,7 +167,7 @@ async def test_embed_skill_resolves_to_a_concrete_package_on_the_wire(make_env):
     with (
         patch.object(ag, "async_api", fake_async_api),
         patch(
-            "agenta.sdk.middlewares.running.resolver.httpx.AsyncClient",
+            "agenta.sdk.middlewares.running.resolver.get_async_client",
             return_value=_FakeAsyncClient(),
         ),
         patch(
@@ -1,3 +1,4 @@
+import asyncio
 from types import SimpleNamespace
 from unittest.mock import AsyncMock
 from uuid import uuid4
@@ -6,7 +7,11 @@ import pytest
 
 import agenta.sdk.evaluations.preview.evaluate as preview_evaluate
 import agenta.sdk.evaluations.runtime.adapters as runtime_adapters
-from agenta.sdk.evaluations.runtime.executor import execute_workflow_batch
+from agenta.sdk.evaluations.runtime.buffers import WriteBuffer, flush_each
+from agenta.sdk.evaluations.runtime.executor import (
+    AsyncioEvaluationTaskRunner,
+    execute_workflow_batch,
+)
 from agenta.sdk.evaluations.runtime.models import (
     EvaluationStep,
     PlannedCell,
@@ -1233,12 +1238,12 @@ async def test_sdk_evaluator_order_invariant_under_repeats():
 
 
 @pytest.mark.asyncio
-async def test_sdk_result_setter_writes_populate_ready_cell_live():
-    """SDKResultSetter writes each cell LIVE via populate as the engine produces it.
+async def test_sdk_result_setter_buffers_populate_ready_cells_until_flushed():
+    """SDKResultSetter writes cells behind, in one populate call per flush.
 
     It shapes the cell into a populate-ready dict — preserving repeat_idx and the
-    cell's bound trace/testcase — writes it immediately (one populate call per
-    cell), and returns that dict as the engine's remembered value.
+    cell's bound trace/testcase — returns that dict as the engine's remembered
+    value, and writes it with the other buffered cells on `flush`.
     """
     run_id = uuid4()
     scenario_id = uuid4()
@@ -1265,6 +1270,10 @@ async def test_sdk_result_setter_writes_populate_ready_cell_live():
         cell=cell,
         trace_id="trace-repeat",
     )
+    again = await setter.set(
+        cell=cell.model_copy(update={"repeat_idx": 3}),
+        trace_id="trace-repeat",
+    )
 
     expected = {
         "run_id": str(run_id),
@@ -1278,8 +1287,201 @@ async def test_sdk_result_setter_writes_populate_ready_cell_live():
         "error": None,
     }
     assert returned == expected
-    # written live: one populate call carrying exactly this cell.
-    assert populate_calls == [[expected]]
+    assert populate_calls == []
+
+    await setter.flush()
+
+    # written behind: one populate call carrying both cells, in order.
+    assert populate_calls == [[expected, again]]
+
+
+async def test_write_buffer_flushes_by_size_and_by_delay():
+    """A buffer writes when it is full, or once its oldest item has waited."""
+    writes = []
+
+    async def write(items):
+        writes.append(list(items))
+
+    by_size = WriteBuffer(write=write, max_size=2, max_delay=None)
+    await by_size.add(1)
+    assert writes == []
+    await by_size.add(2)
+    assert writes == [[1, 2]]
+
+    by_delay = WriteBuffer(write=write, max_size=100, max_delay=0.01)
+    await by_delay.add(3)
+    await by_delay.add(4)
+    await asyncio.sleep(0.05)
+    assert writes == [[1, 2], [3, 4]]
+    assert len(by_delay) == 0
+
+
+async def test_write_buffer_raises_a_failed_delayed_write_on_next_flush():
+    """The delayed write has no caller: its error is raised by the next flush."""
+    attempts = []
+
+    async def write(items):
+        attempts.append(list(items))
+        if len(attempts) == 1:
+            raise RuntimeError("store unavailable")
+
+    buffer = WriteBuffer(write=write, max_delay=0.01)
+    await buffer.add("lost")
+    await asyncio.sleep(0.05)
+    await buffer.add("kept")
+
+    with pytest.raises(RuntimeError, match="store unavailable"):
+        await buffer.flush()
+
+    assert attempts == [["lost"], ["kept"]]
+    await buffer.flush()
+
+
+async def test_flush_each_flushes_every_target_before_raising():
+    """A failed flush does not skip the next one; the first failure is raised."""
+    flushed = []
+
+    class _Target:
+        def __init__(self, name, error=None):
+            self.name, self.error = name, error
+
+        async def flush(self):
+            flushed.append(self.name)
+            if self.error:
+                raise self.error
+
+    targets = [
+        _Target("cells", RuntimeError("cells failed")),
+        _Target("statuses", RuntimeError("statuses failed")),
+    ]
+
+    with pytest.raises(RuntimeError, match="cells failed"):
+        await flush_each(*targets)
+    assert flushed == ["cells", "statuses"]
+
+    await flush_each(*targets, raise_errors=False)
+    assert flushed == ["cells", "statuses"] * 2
+
+
+@pytest.mark.parametrize("populate_fails", [False, True])
+async def test_sdk_local_runner_flushes_buffered_writes_when_the_slice_fails(
+    populate_fails,
+):
+    """Cells and statuses buffered before a slice failure are still written.
+
+    A failed cells write neither skips the statuses nor masks the slice's error.
+    """
+    run_id = uuid4()
+    scenario = SimpleNamespace(id=uuid4())
+    testcase = SimpleNamespace(
+        id=uuid4(),
+        data={"prompt": "a"},
+        model_dump=lambda **kwargs: {"data": {"prompt": "a"}},
+    )
+    testset_revision = SimpleNamespace(
+        id=uuid4(),
+        testset_id=uuid4(),
+        testset_slug="ts-main",
+        testset_variant_id=uuid4(),
+        testset_variant_slug="tsv-main",
+        slug="main",
+        version="1",
+        data=SimpleNamespace(testcases=[testcase]),
+    )
+    journal = []
+
+    async def process_sources(*, set_results, edit_scenario, **kwargs):
+        cell = PlannedCell(
+            run_id=run_id,
+            scenario_id=scenario.id,
+            step_key="testset-main",
+            step_type="input",
+            step_origin="custom",
+            repeat_idx=0,
+            status=EvaluationStatus.SUCCESS,
+        )
+        await set_results.set(cell=cell)
+        await edit_scenario(scenario=scenario, status=EvaluationStatus.ERRORS)
+        raise RuntimeError("slice failed")
+
+    async def populate_slice(*, results):
+        journal.append(("populate", [r["step_key"] for r in results]))
+        if populate_fails:
+            raise RuntimeError("store unavailable")
+
+    async def edit_scenarios(*, scenarios):
+        journal.append(("edit", [s["status"] for s in scenarios]))
+
+    runner = AsyncioEvaluationTaskRunner(
+        process_sources=process_sources,
+        add_scenarios=AsyncMock(return_value=[scenario]),
+        populate_slice=populate_slice,
+        refresh_metrics=AsyncMock(),
+        edit_scenarios=edit_scenarios,
+        retrieve_testset=AsyncMock(return_value=testset_revision),
+        retrieve_application=AsyncMock(),
+        retrieve_evaluator=AsyncMock(),
+        workflow_runner=None,
+        fetch_trace=AsyncMock(),
+    )
+
+    with pytest.raises(RuntimeError, match="slice failed"):
+        await runner.process_run_locally(
+            run_id=run_id,
+            run_data=SimpleNamespace(
+                testset_steps={testset_revision.id: "custom"},
+                application_steps={},
+                evaluator_steps={},
+                repeats=1,
+            ),
+        )
+
+    assert journal == [
+        ("populate", ["testset-main"]),
+        ("edit", ["errors"]),
+    ]
+
+
+async def test_sdk_trace_fetcher_serves_local_traces_and_settles_before_refresh():
+    """A trace finished in this process is handed to the engine without a fetch.
+
+    Metrics are computed server-side from stored traces, so the refresher first
+    settles: it waits (through the fetch, which long-polls) until every locally
+    served trace is committed, once per trace.
+    """
+    journal = []
+    local_traces = {"local-trace": {"trace_id": "local-trace", "spans": {}}}
+
+    def load_local(*, trace_id):
+        return local_traces.pop(trace_id, None)
+
+    async def fetch(*, trace_id):
+        journal.append(("fetch", trace_id))
+        return {"trace_id": trace_id, "spans": {}}
+
+    async def refresh(*, run_id, scenario_id=None):
+        journal.append(("refresh", scenario_id))
+
+    fetcher = runtime_adapters.SDKTraceFetcher(fetch=fetch, local=load_local)
+    refresher = runtime_adapters.SDKMetricsRefresher(
+        refresh=refresh,
+        settle=fetcher.settle,
+    )
+
+    assert (await fetcher(trace_id="local-trace"))["trace_id"] == "local-trace"
+    assert journal == []
+
+    assert (await fetcher(trace_id="remote-trace"))["trace_id"] == "remote-trace"
+    assert journal == [("fetch", "remote-trace")]
+
+    await refresher(run_id=uuid4(), scenario_id="scenario")
+    await refresher(run_id=uuid4())
+
+    assert journal[1:] == [
+        ("fetch", "local-trace"),
+        ("refresh", "scenario"),
+        ("refresh", None),
+    ]
 
 
 @pytest.mark.asyncio
@@ -1365,17 +1567,10 @@ async def test_sdk_preview_evaluate_logs_repeat_aware_results(monkeypatch):
         # scenario_id is set, global when it is None.
         refresh_calls.append((run_id, scenario_id))
 
-    async def fake_edit_scenario(
-        *,
-        scenario_id,
-        status,
-        flags=None,
-        tags=None,
-        meta=None,
-        interval=None,
-        timestamp=None,
-    ):
-        edit_status_calls.append((scenario_id, status))
+    async def fake_edit_scenarios(*, scenarios):
+        edit_status_calls.extend(
+            (scenario["scenario_id"], scenario["status"]) for scenario in scenarios
+        )
 
     async def fake_invoke_application(**kwargs):
         return SimpleNamespace(
@@ -1424,12 +1619,12 @@ async def test_sdk_preview_evaluate_logs_repeat_aware_results(monkeypatch):
     )
     monkeypatch.setattr(preview_evaluate, "acreate_run", fake_create_run)
     # the SDK mirrors the API: bulk add_scenarios -> ONE slice over all scenarios
-    # with live per-cell populate, inline per-scenario + global metric refresh,
+    # with buffered bulk populate, inline per-scenario + global metric refresh,
     # and per-scenario status writes.
     monkeypatch.setattr(preview_evaluate, "aadd_scenarios", fake_add_scenarios)
     monkeypatch.setattr(preview_evaluate, "apopulate_slice", fake_populate_slice)
     monkeypatch.setattr(preview_evaluate, "arefresh", fake_refresh)
-    monkeypatch.setattr(preview_evaluate, "aedit_scenario", fake_edit_scenario)
+    monkeypatch.setattr(preview_evaluate, "aedit_scenarios", fake_edit_scenarios)
     monkeypatch.setattr(preview_evaluate, "aquery_global", AsyncMock(return_value=None))
     monkeypatch.setattr(
         preview_evaluate, "aquery_variational", AsyncMock(return_value=[])
@@ -1448,8 +1643,8 @@ async def test_sdk_preview_evaluate_logs_repeat_aware_results(monkeypatch):
     )
 
     assert result["run"].id == run_id
-    # cells written live (one cell per populate call), repeat-aware, in plan
-    # order. populated_cells accumulates them across the per-cell writes.
+    # cells written behind in bulk, repeat-aware, in plan order.
+    # populated_cells accumulates them across the bulk writes.
     assert [(cell["step_key"], cell["repeat_idx"]) for cell in populated_cells] == [
         ("testset-main", 0),
         ("testset-main", 1),
@@ -1531,7 +1726,7 @@ async def test_sdk_preview_evaluate_processes_all_scenarios_in_one_slice(monkeyp
     async def fake_add_scenarios(*, run_id, count, timestamp=None):
         return [SimpleNamespace(id=next(minted_ids)) for _ in range(count)]
 
-    # cells are written live (one cell per populate call); collect every cell.
+    # cells are written behind in bulk; collect every cell.
     populated_cells = []
 
     async def fake_populate_slice(*, results):
@@ -1544,17 +1739,10 @@ async def test_sdk_preview_evaluate_processes_all_scenarios_in_one_slice(monkeyp
     async def fake_refresh(run_id, scenario_id=None):
         refresh_calls.append((run_id, scenario_id))
 
-    async def fake_edit_scenario(
-        *,
-        scenario_id,
-        status,
-        flags=None,
-        tags=None,
-        meta=None,
-        interval=None,
-        timestamp=None,
-    ):
-        edit_status_calls.append((scenario_id, status))
+    async def fake_edit_scenarios(*, scenarios):
+        edit_status_calls.extend(
+            (scenario["scenario_id"], scenario["status"]) for scenario in scenarios
+        )
 
     async def fake_invoke_application(**kwargs):
         return SimpleNamespace(
@@ -1586,7 +1774,7 @@ async def test_sdk_preview_evaluate_processes_all_scenarios_in_one_slice(monkeyp
     monkeypatch.setattr(preview_evaluate, "aadd_scenarios", fake_add_scenarios)
     monkeypatch.setattr(preview_evaluate, "apopulate_slice", fake_populate_slice)
     monkeypatch.setattr(preview_evaluate, "arefresh", fake_refresh)
-    monkeypatch.setattr(preview_evaluate, "aedit_scenario", fake_edit_scenario)
+    monkeypatch.setattr(preview_evaluate, "aedit_scenarios", fake_edit_scenarios)
     monkeypatch.setattr(preview_evaluate, "aquery_global", AsyncMock(return_value=None))
     monkeypatch.setattr(
         preview_evaluate, "aquery_variational", AsyncMock(return_value=[])
@@ -1606,7 +1794,7 @@ async def test_sdk_preview_evaluate_processes_all_scenarios_in_one_slice(monkeyp
         repeats=1,
     )
 
-    # TWO scenarios processed in ONE slice: every cell written live, carrying
+    # TWO scenarios processed in ONE slice: every cell written, carrying
     # both scenarios' ids.
     assert {c["scenario_id"] for c in populated_cells} == {
         str(scenario_a),
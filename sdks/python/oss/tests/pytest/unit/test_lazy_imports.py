@@ -0,0 +1,81 @@
+"""Pins the lazy import surface of `import agenta`.
+
+`import agenta` loads what `ag.init`, `@ag.workflow` and `@ag.instrument` need, and nothing
+else: litellm, FastAPI, the managers and the platform op catalog load on the first
+`ag.<name>` that needs them. Each check runs in a fresh interpreter, since the test
+session has imported all of it already.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+SDK_ROOT = Path(__file__).resolve().parents[4]
+
+DEFERRED = [
+    "litellm",
+    "fastapi",
+    "daytona",
+    "agenta.sdk.agents.platform",
+    "agenta.sdk.decorators.routing",
+    "agenta.sdk.managers.apps",
+]
+
+
+def _loaded_after(statement: str) -> list:
+    script = (
+        f"import json, sys\n{statement}\n"
+        f"print(json.dumps([m for m in {DEFERRED!r} if m in sys.modules]))"
+    )
+    done = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=SDK_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(done.stdout.strip().splitlines()[-1])
+
+
+def test_import_agenta_defers_heavy_modules():
+    assert _loaded_after("import agenta") == []
+
+
+def test_workflow_and_instrument_stay_import_cheap():
+    statement = (
+        "import agenta as ag\n"
+        "@ag.workflow()\n"
+        "def wf(x: str): return x\n"
+        "@ag.instrument()\n"
+        "def step(x: str): return x\n"
+    )
+
+    assert _loaded_after(statement) == []
+
+
+def test_lazy_names_resolve_to_their_modules():
+    import agenta as ag
+    from agenta.client import AgentaApi
+    from agenta.sdk.decorators.routing import default_app
+    from agenta.sdk.managers.config import ConfigManager
+    from agenta.sdk.utils import types
+
+    assert ag.ConfigManager is ConfigManager
+    assert ag.app is default_app
+    assert ag.PromptTemplate is types.PromptTemplate
+    assert ag.api is AgentaApi or isinstance(ag.api, AgentaApi)
+
+
+def test_sdk_types_is_the_utils_types_module():
+    import agenta.sdk.types
+    from agenta.sdk.utils import types
+
+    assert agenta.sdk.types is types
+
+
+def test_catalog_types_resolve_model_costs_on_first_use():
+    from agenta.sdk.utils.types import CATALOG_TYPES
+
+    assert CATALOG_TYPES["model"]["x-ag-type"] == "grouped_choice"
+    assert "x-ag-metadata" in CATALOG_TYPES["model"]
@@ -19,6 +19,9 @@ behavior the call sites depend on. Organized by section:
 9. Call-site preservation: ``PromptTemplate.format`` and the handlers'
    ``_format_with_template`` continue to produce the same outputs they did
    before the helper extraction.
+
+Later sections cover mustache, JSONPath parity across formats, and the compiled
+template cache.
 """
 
 import pytest
@@ -27,8 +30,11 @@ from agenta.sdk.engines.running.handlers import _format_with_template
 from agenta.sdk.types import PromptTemplate, TemplateFormatError
 from agenta.sdk.utils.lazy import _load_jinja2
 from agenta.sdk.utils.templating import (
+    TEMPLATE_CACHE_MAXSIZE,
     MustacheTemplateError,
     UnresolvedVariablesError,
+    _compile_template,
+    _jinja2_environment,
     render_template,
 )
 
@@ -1342,3 +1348,65 @@ def test_jsonpath_failure_parity_across_formats(template, context):
     for mode in ("curly", "mustache", "jinja2"):
         with pytest.raises(UnresolvedVariablesError):
             render_template(template=template, mode=mode, context=context)
+
+
+# =============================================================================
+# 18. Compiled template cache
+# =============================================================================
+
+
+@pytest.mark.parametrize("mode", ["curly", "mustache", "jinja2"])
+def test_repeated_renders_compile_once(mode):
+    template = f"cache probe ({mode}) {{{{name}}}} / {{{{$.n}}}}"
+    before = _compile_template.cache_info()
+
+    first = render_template(template=template, mode=mode, context={"name": "a", "n": 1})
+    second = render_template(
+        template=template, mode=mode, context={"name": "b", "n": 2}
+    )
+
+    after = _compile_template.cache_info()
+    assert (first, second) == (
+        f"cache probe ({mode}) a / 1",
+        f"cache probe ({mode}) b / 2",
+    )
+    assert after.misses - before.misses == 1
+    assert after.hits - before.hits == 1
+
+
+def test_cache_is_keyed_by_mode_as_well_as_template():
+    template = "{{#on}}yes{{/on}}"
+    assert _mustache(template, {"on": True}) == "yes"
+    # Same source, different mode: compiled separately, rendered by its own rules.
+    with pytest.raises(UnresolvedVariablesError):
+        render_template(template=template, mode="curly", context={"on": True})
+
+
+def test_cached_curly_template_still_reports_unresolved_per_context():
+    template = "{{a}} {{b}}"
+    assert (
+        render_template(template=template, mode="curly", context={"a": 1, "b": 2})
+        == "1 2"
+    )
+    with pytest.raises(UnresolvedVariablesError) as exc:
+        render_template(template=template, mode="curly", context={"a": 1})
+    assert exc.value.unresolved == {"b"}
+
+
+def test_invalid_templates_raise_on_every_render():
+    for _ in range(2):
+        with pytest.raises(MustacheTemplateError, match="Partials"):
+            _mustache("{{>partial}}", {})
+        with pytest.raises(_load_jinja2()[1]):
+            render_template(template="{% if %}", mode="jinja2", context={})
+
+
+def test_jinja2_templates_share_one_sandboxed_environment():
+    SandboxedEnvironment, _ = _load_jinja2()
+    env = _jinja2_environment()
+    assert isinstance(env, SandboxedEnvironment)
+    assert _jinja2_environment() is env
+
+
+def test_compiled_template_cache_is_bounded():
+    assert _compile_template.cache_info().maxsize == TEMPLATE_CACHE_MAXSIZE
@@ -1,4 +1,4 @@
-from agenta.sdk.engines.tracing.attributes import serialize
+from agenta.sdk.engines.tracing.attributes import deserialize, serialize
 
 
 def test_serialize_handles_nested_lists_in_message_payloads():
@@ -30,3 +30,23 @@ def test_serialize_handles_nested_lists_in_message_payloads():
     assert serialized["ag.data.inputs.prompt.0.content.1.content.0.value.ok"] is True
     assert serialized["ag.data.inputs.prompt.0.content.1.content.1.0"] == "nested"
     assert serialized["ag.data.inputs.prompt.0.content.1.content.1.1"] == "list"
+
+
+def test_deserialize_inverts_serialize():
+    attributes = {
+        "inputs": {
+            "prompt": [
+                {"role": "user", "content": [{"type": "text", "text": "hello"}]},
+                ["nested", "list"],
+            ]
+        },
+        "outputs": {"answer": "hi", "scores": [1, 2]},
+    }
+
+    serialized = serialize(namespace="data", attributes=attributes, max_depth=2)
+
+    assert serialized["ag.data.inputs.prompt"].startswith("@ag.type=json:")
+    assert deserialize(attributes=serialized) == {"ag": {"data": attributes}}
+    assert deserialize(
+        attributes=serialize(namespace="data", attributes=attributes)
+    ) == {"ag": {"data": attributes}}
@@ -0,0 +1,121 @@
+"""In-process handoff of finished traces.
+
+While a `retaining()` scope is open, `TraceProcessor` keeps each trace it has
+finished, still exporting it; `Tracing.take_trace` hands it out once, shaped like
+`GET /tracing/traces/{trace_id}` returns it, so a local evaluation need not read
+its own traces back from the API.
+"""
+
+from unittest.mock import Mock
+from uuid import UUID
+
+from opentelemetry.sdk.trace import TracerProvider
+
+from agenta.sdk.engines.tracing import processors
+from agenta.sdk.engines.tracing.attributes import serialize
+from agenta.sdk.engines.tracing.processors import TraceProcessor
+from agenta.sdk.engines.tracing.tracing import Tracing
+
+
+def _tracer():
+    exporter = Mock()
+    processor = TraceProcessor(span_exporter=exporter, inline=True)
+    provider = TracerProvider()
+    provider.add_span_processor(processor)
+    return provider.get_tracer("test"), processor, exporter
+
+
+def _run_trace(tracer) -> int:
+    with tracer.start_as_current_span("app") as root:
+        root.set_attributes(
+            serialize(
+                namespace="data",
+                attributes={
+                    "inputs": {"prompt": "hi"},
+                    "outputs": {"__default__": "hello"},
+                },
+            )
+        )
+        root.set_attribute("ag.type.span", "workflow")
+        for _ in range(2):
+            with tracer.start_as_current_span("llm"):
+                pass
+        with tracer.start_as_current_span("tool"):
+            pass
+    return root.get_span_context().trace_id
+
+
+def _tracing(processor) -> Tracing:
+    tracing = object.__new__(Tracing)
+    tracing.processor = processor
+    return tracing
+
+
+def test_finished_traces_are_not_kept_outside_a_scope():
+    tracer, processor, _ = _tracer()
+
+    trace_id = _run_trace(tracer)
+
+    assert processor.take(trace_id) is None
+
+
+def test_take_trace_returns_the_fetched_trace_shape_once():
+    tracer, processor, exporter = _tracer()
+    tracing = _tracing(processor)
+
+    with tracing.retain_traces():
+        trace_id = _run_trace(tracer)
+        trace = tracing.take_trace(format(trace_id, "032x"))
+        again = tracing.take_trace(format(trace_id, "032x"))
+
+    # Still exported: retention is a copy for local readers, not a detour.
+    assert exporter.export.call_count == 1
+    assert again is None
+
+    assert trace["trace_id"] == format(trace_id, "032x")
+    (name, root), *others = trace["spans"].items()
+    assert (name, others) == ("app", [])
+    assert root["parent_id"] is None
+    assert root["span_type"] == "workflow"
+    assert root["attributes"]["ag"]["data"] == {
+        "inputs": {"prompt": "hi"},
+        "outputs": "hello",
+    }
+    assert isinstance(root["spans"]["llm"], list) and len(root["spans"]["llm"]) == 2
+    assert root["spans"]["tool"]["parent_id"] == root["span_id"]
+
+
+def test_take_trace_accepts_dashed_ids_and_ignores_garbage():
+    tracer, processor, _ = _tracer()
+    tracing = _tracing(processor)
+
+    with tracing.retain_traces():
+        trace_id = _run_trace(tracer)
+
+        assert tracing.take_trace("not-a-trace-id") is None
+        assert tracing.take_trace(str(UUID(int=trace_id))) is not None
+
+
+def test_retention_is_bounded_and_released_with_the_last_scope(monkeypatch):
+    monkeypatch.setattr(processors, "MAX_RETAINED_TRACES", 2)
+    tracer, processor, _ = _tracer()
+
+    with processor.retaining():
+        with processor.retaining():
+            first, second, third = (_run_trace(tracer) for _ in range(3))
+
+            assert processor.take(first) is None
+            assert processor.take(second) is not None
+
+        # The outer scope is still open.
+        assert processor.take(third) is not None
+        fourth = _run_trace(tracer)
+
+    assert processor.take(fourth) is None
+
+
+def test_unconfigured_tracing_has_nothing_to_hand_out():
+    tracing = _tracing(None)
+
+    with tracing.retain_traces():
+        assert tracing.take_trace("0" * 32) is None
@@ -0,0 +1,85 @@
+"""Unit tests for the pooled SDK HTTP clients (`agenta.sdk.utils.transport`).
+
+No network: cookie handling is driven through an ``httpx.MockTransport`` on a client built
+with the same settings the pooled clients use.
+"""
+
+import asyncio
+
+import httpx
+
+from agenta.sdk.decorators.routing import _closing_http_clients
+from agenta.sdk.utils import transport
+
+
+async def test_async_client_is_reused_within_a_loop():
+    client = transport.get_async_client()
+    try:
+        assert transport.get_async_client() is client
+        assert not client.is_closed
+    finally:
+        await transport.aclose_clients()
+
+
+def test_each_event_loop_gets_its_own_async_client():
+    async def _borrow():
+        client = transport.get_async_client()
+        await transport.aclose_clients()
+        return client
+
+    first = asyncio.run(_borrow())
+    second = asyncio.run(_borrow())
+
+    assert first is not second
+    assert first.is_closed and second.is_closed
+
+
+async def test_aclose_clients_replaces_the_client_on_next_use():
+    client = transport.get_async_client()
+    await transport.aclose_clients()
+
+    assert client.is_closed
+    replacement = transport.get_async_client()
+    try:
+        assert replacement is not client
+        assert not replacement.is_closed
+    finally:
+        await transport.aclose_clients()
+
+
+def test_sync_client_is_shared_until_closed():
+    client = transport.get_client()
+    assert transport.get_client() is client
+
+    transport.close_clients()
+
+    assert client.is_closed
+    replacement = transport.get_client()
+    assert replacement is not client
+    transport.close_clients()
+
+
+async def test_pooled_settings_never_store_response_cookies():
+    seen = []
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("cookie"))
+        return httpx.Response(200, headers={"set-cookie": "sAccessToken=caller-a"})
+
+    async with httpx.AsyncClient(
+        transport=httpx.MockTransport(_handler), **transport._client_kwargs()
+    ) as client:
+        await client.get("http://api.test/one")
+        await client.get("http://api.test/two")
+        await client.get("http://api.test/three", cookies={"sAccessToken": "caller-b"})
+
+    # Caller A's cookie never reaches caller B's request; B's own cookie is still sent.
+    assert seen == [None, None, "sAccessToken=caller-b"]
+
+
+async def test_app_lifespan_closes_the_pooled_clients():
+    async with _closing_http_clients()(app=None):
+        client = transport.get_async_client()
+        assert not client.is_closed
+
+    assert client.is_closed
@@ -48,16 +48,10 @@ def fetch(monkeypatch):
         monkeypatch.setattr(vault, "getenv", lambda name, *_: env.get(name))
 
         class _Client:
-            async def __aenter__(self):
-                return self
-
-            async def __aexit__(self, *_):
-                return False
-
             async def get(self, *_args, **_kwargs):
                 return _Response(vault_payload)
 
-        monkeypatch.setattr(vault.httpx, "AsyncClient", _Client)
+        monkeypatch.setattr(vault, "get_async_client", _Client)
 
         try:
             return await vault.get_secrets("http://api", None)
@@ -371,12 +371,6 @@ class TestResolverMiddlewareEmbedGate:
         post_mock = AsyncMock(return_value=endpoint_response)
 
         class _FakeAsyncClient:
-            async def __aenter__(self):
-                return self
-
-            async def __aexit__(self, *exc):
-                return False
-
             async def post(self, *args, **kwargs):
                 return await post_mock(*args, **kwargs)
 
@@ -386,7 +380,7 @@ class TestResolverMiddlewareEmbedGate:
         with (
             patch.object(ag, "async_api", fake_async_api),
             patch(
-                "agenta.sdk.middlewares.running.resolver.httpx.AsyncClient",
+                "agenta.sdk.middlewares.running.resolver.get_async_client",
                 return_value=_FakeAsyncClient(),
             ),
             patch(
@@ -71,7 +71,9 @@ export const fetchGenerationsDashboardData = async (
             throw new Error("Custom range startTime is required")
         }
     } else {
-        startTime = options.range.sorted
+        // Whole minutes, so the backend can serve the default charts from its
+        // per-minute/per-hour rollups instead of scanning the spans.
+        startTime = dayjs(options.range.sorted).utc().startOf("minute").format()
         endTime = undefined // implied "now" for standard ranges
     }
 